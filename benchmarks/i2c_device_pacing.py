@@ -0,0 +1,99 @@
+"""Benchmark I2CDevice transaction throughput with different pacing
+policies.
+
+The I2C bus is replaced by a fake character device: data is written to
+and read from /dev/zero, and the I2C ioctls are answered in-process, so
+the results reflect the cost of pacing rather than of the bus itself.
+
+Usage:
+    python benchmarks/i2c_device_pacing.py [--transactions N] [--work SECONDS]
+"""
+
+import argparse
+import sys
+from os import path
+from time import monotonic, sleep
+from unittest.mock import patch
+
+sys.path.append(path.join(path.dirname(__file__), "..", "packages", "common"))
+
+from pitop.common import i2c_device  # noqa: E402
+from pitop.common.i2c_device import I2CDevice, I2CPacing  # noqa: E402
+
+FAKE_DEVICE_PATH = "/dev/zero"
+FAKE_DEVICE_ADDRESS = 0x11
+
+
+class FixedDelayPacing(I2CPacing):
+    """Sleeps for the full delay after every transfer, as I2CDevice did
+    before deadline-based pacing."""
+
+    def wait_until_ready(self):
+        pass
+
+    def write_done(self):
+        sleep(self.post_write_delay)
+
+    def read_done(self):
+        sleep(self.post_read_delay)
+
+
+def fake_ioctl(device, request, argument):
+    if request == I2CDevice.I2C_RDWR:
+        read_message = argument.msgs[argument.nmsgs - 1]
+        for i in range(read_message.len):
+            read_message.buf[i] = 0
+
+
+def run(pacing: I2CPacing, transactions: int, work: float) -> float:
+    """Run a workload of register reads separated by `work` seconds of
+    application time, and return the achieved transactions per second."""
+    with patch.object(i2c_device, "ioctl", fake_ioctl):
+        device = I2CDevice(FAKE_DEVICE_PATH, FAKE_DEVICE_ADDRESS, pacing=pacing)
+        device.connect(read_test=False)
+
+        start = monotonic()
+        for _ in range(transactions):
+            device.read_unsigned_word(0xE0)
+            if work > 0:
+                sleep(work)
+        elapsed = monotonic() - start
+
+        device.disconnect()
+
+    return transactions / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=50)
+    parser.add_argument(
+        "--work",
+        type=float,
+        default=0.010,
+        help="seconds of application work between transactions",
+    )
+    parser.add_argument("--delay", type=float, default=0.020)
+    args = parser.parse_args()
+
+    policies = {
+        "fixed sleeps (previous)": FixedDelayPacing(args.delay, args.delay),
+        "deadline pacing": I2CPacing(args.delay, args.delay),
+        "deadline pacing, combined reads": I2CPacing(
+            args.delay, args.delay, combined_read=True
+        ),
+    }
+
+    print(
+        f"{args.transactions} register reads, {args.work * 1000:.1f} ms of work between reads, "
+        f"{args.delay * 1000:.1f} ms device turnaround"
+    )
+    baseline = None
+    for name, pacing in policies.items():
+        rate = run(pacing, args.transactions, args.work)
+        baseline = baseline or rate
+        print(f"{name:>32}: {rate:8.1f} transactions/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
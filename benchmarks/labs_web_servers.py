@@ -0,0 +1,227 @@
+"""Benchmark the gevent and asyncio web controller servers under many viewers.
+
+Each server runs a WebController in a process of its own, streaming a
+synthetic camera at a fixed frame rate. Viewers stream its video at the same
+quality while a control client measures the round trip time of messages, as
+a rover's joystick would send them. The server's CPU time is measured while
+it's under load.
+
+Usage:
+    python benchmarks/labs_web_servers.py [--viewers N] [--duration S]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+from base64 import b64encode
+from os import path
+from statistics import mean, quantiles
+from time import perf_counter, process_time, sleep
+
+PACKAGES_DIR = path.join(path.dirname(__file__), "..", "packages")
+for package in os.listdir(PACKAGES_DIR):
+    sys.path.append(path.join(PACKAGES_DIR, package))
+
+SERVERS = ("gevent", "asyncio")
+
+
+class FrameSource:
+    """Returns frames of a moving square at a fixed frame rate."""
+
+    def __init__(self, fps, width, height):
+        import numpy as np
+
+        self.interval = 1 / fps
+        self.frames = []
+        for i in range(fps):
+            frame = np.zeros((height, width, 3), dtype=np.uint8)
+            frame[:, :, 1] = np.linspace(0, 255, width, dtype=np.uint8)
+            x = i * (width - 64) // fps
+            frame[height // 2 - 32 : height // 2 + 32, x : x + 64] = 255
+            self.frames.append(frame)
+        self.__count = 0
+        self.__next_time = None
+
+    def get_frame(self):
+        now = perf_counter()
+        if self.__next_time is not None and self.__next_time > now:
+            sleep(self.__next_time - now)
+        self.__next_time = max(now, self.__next_time or now) + self.interval
+        self.__count += 1
+        return self.frames[self.__count % len(self.frames)]
+
+
+def serve(server_name, fps, width, height, ports, started, stopped, results):
+    from pitop.labs import WebController
+
+    source = FrameSource(fps, width, height)
+    controller = WebController(
+        get_frame=source.get_frame,
+        message_handlers={
+            "ping": lambda data, send: send({"type": "pong", "data": data})
+        },
+        port=0,
+        server=server_name,
+    )
+    controller.start()
+    ports.put(getattr(controller, "server_port", None) or controller.port)
+
+    if server_name == "gevent":
+        import gevent
+
+        def wait(event):
+            while not event.is_set():
+                gevent.sleep(0.05)
+
+    else:
+
+        def wait(event):
+            event.wait()
+
+    wait(started)
+    cpu_start = process_time()
+    wait(stopped)
+    results.put(process_time() - cpu_start)
+    controller.stop()
+
+
+async def view(port, duration, stats):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /video.mjpg?quality=high HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+
+    frames = 0
+    received = 0
+    tail = b""
+    end = perf_counter() + duration
+    try:
+        while perf_counter() < end:
+            chunk = await asyncio.wait_for(reader.read(65536), end - perf_counter())
+            if not chunk:
+                break
+            received += len(chunk)
+            # Count frame boundaries, including those split between chunks
+            data = tail + chunk
+            frames += data.count(b"--frame\r\n")
+            tail = data[-9:]
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        writer.close()
+
+    stats.append((frames, received))
+
+
+def masked_frame(payload):
+    mask = os.urandom(4)
+    masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return bytes([0x81, 0x80 | len(payload)]) + mask + masked
+
+
+async def ping(port, duration, interval, round_trips):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = b64encode(os.urandom(16)).decode()
+    writer.write(
+        (
+            "GET /messaging HTTP/1.1\r\nHost: localhost\r\n"
+            "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        ).encode()
+    )
+    await reader.readuntil(b"\r\n\r\n")
+
+    end = perf_counter() + duration
+    try:
+        while perf_counter() < end:
+            sent = perf_counter()
+            writer.write(
+                masked_frame(json.dumps({"type": "ping", "data": sent}).encode())
+            )
+            await writer.drain()
+            header = await reader.readexactly(2)
+            await reader.readexactly(header[1] & 0x7F)
+            round_trips.append(perf_counter() - sent)
+            await asyncio.sleep(interval)
+    finally:
+        writer.close()
+
+
+async def load(port, viewers, duration):
+    stats = []
+    round_trips = []
+    await asyncio.gather(
+        ping(port, duration, 0.05, round_trips),
+        *[view(port, duration, stats) for _ in range(viewers)],
+    )
+    return stats, round_trips
+
+
+def run(server_name, args):
+    context = multiprocessing.get_context("spawn")
+    ports = context.Queue()
+    results = context.Queue()
+    started = context.Event()
+    stopped = context.Event()
+    process = context.Process(
+        target=serve,
+        args=(
+            server_name,
+            args.fps,
+            args.width,
+            args.height,
+            ports,
+            started,
+            stopped,
+            results,
+        ),
+    )
+    process.start()
+    port = ports.get(timeout=30)
+
+    started.set()
+    stats, round_trips = asyncio.run(load(port, args.viewers, args.duration))
+    stopped.set()
+    cpu_time = results.get(timeout=30)
+    process.join(timeout=30)
+
+    frame_rates = [frames / args.duration for frames, _ in stats]
+    megabits = sum(received for _, received in stats) * 8 / args.duration / 1e6
+    percentiles = quantiles(round_trips, n=100)
+    return {
+        "fps": mean(frame_rates),
+        "min_fps": min(frame_rates),
+        "mbps": megabits,
+        "cpu": cpu_time / args.duration * 100,
+        "rtt_p50": percentiles[49] * 1000,
+        "rtt_p99": percentiles[98] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    print(
+        f"{args.viewers} viewers of a {args.width}x{args.height} video at "
+        f"{args.fps} fps for {args.duration:g} s"
+    )
+    for server_name in SERVERS:
+        result = run(server_name, args)
+        print(
+            f"{server_name:>8}: {result['fps']:5.1f} fps/viewer "
+            f"(min {result['min_fps']:5.1f}), {result['mbps']:7.1f} Mbit/s, "
+            f"server CPU {result['cpu']:5.1f}%, message round trip "
+            f"p50 {result['rtt_p50']:6.1f} ms, p99 {result['rtt_p99']:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark the cost of sending frames to the SH1106 miniscreen display.
+
+The SPI interface is replaced by a stub that only counts bytes, so the
+results reflect the CPU time spent encoding frames in Python.
+
+Usage:
+    python benchmarks/oled_frame_encoding.py [--frames N]
+"""
+
+import argparse
+import sys
+from os import path
+from time import perf_counter
+from unittest.mock import MagicMock
+
+import PIL.Image
+import PIL.ImageDraw
+
+PACKAGES_DIR = path.join(path.dirname(__file__), "..", "packages")
+for package in ("common", "core", "miniscreen"):
+    sys.path.append(path.join(PACKAGES_DIR, package))
+
+from pitop.miniscreen.oled.core.contrib.luma.oled.device import sh1106  # noqa: E402
+
+
+class PerPixelSH1106(sh1106):
+    """Encodes and sends every page of every frame with a per-pixel loop, as
+    sh1106.display did before page packing was vectorised."""
+
+    def display(self, image):
+        image_data = image.getdata()
+        set_page_address = 0xB0
+        pixels_per_page = self.width * 8
+        buf = bytearray(self.width)
+
+        for y in range(0, int(self._pages * pixels_per_page), pixels_per_page):
+            self.command(set_page_address, 0x02, 0x10)
+            set_page_address += 1
+            offsets = [y + self.width * i for i in range(8)]
+
+            for x in range(self.width):
+                buf[x] = (
+                    (image_data[x + offsets[0]] and 0x01)
+                    | (image_data[x + offsets[1]] and 0x02)
+                    | (image_data[x + offsets[2]] and 0x04)
+                    | (image_data[x + offsets[3]] and 0x08)
+                    | (image_data[x + offsets[4]] and 0x10)
+                    | (image_data[x + offsets[5]] and 0x20)
+                    | (image_data[x + offsets[6]] and 0x40)
+                    | (image_data[x + offsets[7]] and 0x80)
+                )
+
+            self.data(list(buf))
+
+
+def dashboard_frames(number_of_frames):
+    """Frames of a status dashboard: static labels and a changing value."""
+    for i in range(number_of_frames):
+        image = PIL.Image.new("1", (128, 64))
+        draw = PIL.ImageDraw.Draw(image)
+        draw.rectangle((0, 0, 127, 63), outline=1)
+        draw.text((4, 4), "CPU", fill=1)
+        draw.text((4, 24), "Battery", fill=1)
+        draw.text((80, 4), f"{i % 100:3d}%", fill=1)
+        yield image
+
+
+def run(device_class, frames):
+    serial_interface = MagicMock()
+    bytes_sent = 0
+
+    def count_bytes(data):
+        nonlocal bytes_sent
+        bytes_sent += len(data)
+
+    serial_interface.data.side_effect = count_bytes
+    device = device_class(serial_interface=serial_interface)
+
+    images = list(dashboard_frames(frames))
+    bytes_sent = 0
+    start = perf_counter()
+    for image in images:
+        device.display(image)
+    elapsed = perf_counter() - start
+
+    return elapsed / frames * 1e6, bytes_sent / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.frames} dashboard frames")
+    baseline = None
+    for name, device_class in (
+        ("per-pixel, full frames (previous)", PerPixelSH1106),
+        ("vectorised, changed columns", sh1106),
+    ):
+        frame_us, frame_bytes = run(device_class, args.frames)
+        baseline = baseline or frame_us
+        print(
+            f"{name:>34}: {frame_us:8.1f} us/frame, {frame_bytes:6.1f} bytes/frame "
+            f"({baseline / frame_us:.1f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
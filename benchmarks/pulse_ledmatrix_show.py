@@ -0,0 +1,120 @@
+"""Benchmark the cost of updating the pi-topPULSE LED matrix.
+
+The serial port is replaced by a stub that only counts bytes, and the
+pause between the columns sent to the device is skipped, so the results
+reflect the CPU time spent preparing frames in Python.
+
+Usage:
+    python benchmarks/pulse_ledmatrix_show.py [--frames N]
+"""
+
+import argparse
+import sys
+from copy import deepcopy
+from os import listdir, path
+from time import perf_counter
+
+PACKAGES_DIR = path.join(path.dirname(__file__), "..", "packages")
+# pitop imports all of its subpackages
+for package in listdir(PACKAGES_DIR):
+    sys.path.append(path.join(PACKAGES_DIR, package))
+
+from pitop.pulse import ledmatrix  # noqa: E402
+
+
+def nested_list_show(pixel_map, rotation, write):
+    """Sends a frame the way ledmatrix.show did before the pixel map was
+    stored in a NumPy array: a deep-copied nested list, rotated with zip()
+    and packed into a string of chr() values for each column."""
+
+    rotated_pixel_map = deepcopy(pixel_map)
+    count = (6 - ((int(rotation / 90) + 1) % 4)) % 4
+    for _ in range(count):
+        rotated_pixel_map = list(zip(*rotated_pixel_map[::-1]))
+
+    total_rgb = [0, 0, 0]
+    for x in range(7):
+        for y in range(7):
+            for c in range(3):
+                total_rgb[c] = total_rgb[c] + pixel_map[x][y][c]
+    avg_rgb = [int(round(val / 49)) for val in total_rgb]
+
+    def rgb_to_bytes(rgb):
+        r, g, b = rgb
+        byte0 = ((r >> 3) & 0x1F | (g >> 1) & 0x60) & 0xFF
+        byte1 = ((b >> 3) & 0x1F | (g << 2) & 0xE0) & 0xFF
+        return byte0, byte1
+
+    for x in range(7):
+        pixel_map_buffer = chr(x)
+        for y in range(8):
+            rgb = avg_rgb if y == 7 else rotated_pixel_map[x][y]
+            byte0, byte1 = rgb_to_bytes(rgb)
+            pixel_map_buffer += chr(byte0)
+            pixel_map_buffer += chr(byte1)
+        write(bytearray(pixel_map_buffer, "Latin_1"))
+
+
+class ByteCountingSerial:
+    def __init__(self):
+        self.bytes_sent = 0
+
+    def write(self, data):
+        self.bytes_sent += len(data)
+
+
+def set_pattern(frame):
+    for x in range(7):
+        for y in range(7):
+            ledmatrix.set_pixel(x, y, (x * 36 + frame) % 256, y * 36, frame % 256)
+
+
+def run(show, frames):
+    serial_device = ledmatrix._serial_device = ByteCountingSerial()
+
+    elapsed = 0.0
+    for frame in range(frames):
+        set_pattern(frame)
+        start = perf_counter()
+        show()
+        elapsed += perf_counter() - start
+
+    return elapsed / frames * 1e6, serial_device.bytes_sent / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    ledmatrix._initialised = True
+    ledmatrix.sleep = lambda seconds: None
+
+    def previous_show():
+        write = ledmatrix._serial_device.write
+        write(ledmatrix._sync)
+        pixel_map = ledmatrix._pixel_map.tolist()
+        nested_list_show(pixel_map, ledmatrix._rotation, write)
+
+    print(f"{args.frames} frames")
+    baseline = None
+    for name, show in (
+        ("nested lists (previous)", previous_show),
+        ("numpy", ledmatrix.show),
+    ):
+        frame_us, frame_bytes = run(show, args.frames)
+        baseline = baseline or frame_us
+        print(
+            f"{name:>23}: {frame_us:8.1f} us/frame, {frame_bytes:6.1f} bytes/frame "
+            f"({baseline / frame_us:.1f}x faster)"
+        )
+
+    start = perf_counter()
+    for frame in range(args.frames):
+        ledmatrix.set_all(frame % 256, 128, 64)
+    set_all_us = (perf_counter() - start) / args.frames * 1e6
+    print(f"{'set_all':>23}: {set_all_us:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
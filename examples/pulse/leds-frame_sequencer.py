@@ -0,0 +1,19 @@
+import numpy as np
+
+from pitop.pulse import ledmatrix
+from pitop.pulse.frame_sequencer import FrameSequencer
+
+# A band of color sweeping across the matrix, one frame per column
+frames = np.zeros((7, 7, 7, 3), dtype=np.uint8)
+for i in range(7):
+    frames[i, :, i] = (0, 128, 255)
+
+sequencer = FrameSequencer(fps=25)
+
+try:
+    sequencer.queue(frames, loop=True)
+    sequencer.wait(timeout=10)
+    print(f"Shown at {sequencer.fps:.1f} frames per second")
+finally:
+    sequencer.stop()
+    ledmatrix.off()
@@ -0,0 +1,33 @@
+import numpy as np
+
+from pitop.pulse import ledmatrix, microphone
+from pitop.pulse.audio_analysis import AudioAnalyser
+
+# Show the level of each of the analyser's 7 frequency bands in a column of
+# the LED matrix
+frame = np.zeros((7, 7, 3), dtype=np.uint8)
+rows = np.arange(7)[:, np.newaxis]
+
+
+def show_levels(features):
+    # Mean square levels to a 0-7 scale, boosted as speech is quiet
+    levels = np.clip(np.sqrt(features.band_energies) * 50, 0, 7)
+    frame[:] = 0
+    frame[rows < levels] = (0, 255, 64)
+    ledmatrix.set_frame(frame)
+    ledmatrix.show()
+
+
+analyser = AudioAnalyser(
+    show_levels,
+    sample_rate=microphone.get_sample_rate(),
+    hop_size=microphone.get_sample_rate() // 25,
+)
+
+try:
+    for audio_frame in microphone.stream():
+        analyser.process(audio_frame)
+except KeyboardInterrupt:
+    pass
+finally:
+    ledmatrix.off()
@@ -6,7 +6,15 @@ from pitop.core import ImageFunctions
 from pitop.core.mixins import Recreatable, Stateful
 from pitop.pma.common import type_check
 
-from .core import CameraTypes, FileSystemCamera, FrameHandler, UsbCamera
+from .core import (
+    CameraTypes,
+    FileSystemCamera,
+    Frame,
+    FrameHandler,
+    FrameLane,
+    FramePolicy,
+    UsbCamera,
+)
 from .core.capture_actions import CaptureActions
 
 
@@ -20,6 +28,18 @@ class Camera(Stateful, Recreatable):
         ID of the video capturing device to open.
         Passing `None` will cause the backend to autodetect the
         available video capture devices and attempt to use them.
+    :type frame_policy: str or FramePolicy
+    :param frame_policy:
+        Frames are captured on their own thread, and processed by
+        :data:`on_frame` and by each capture action on threads of their
+        own. This sets what's done with new frames while one of them is
+        busy: "latest" keeps only the newest frame, "queue" keeps up to
+        :data:`frame_buffer_size` frames, dropping the oldest, and
+        "block" waits for room, slowing capture down.
+    :type frame_buffer_size: int
+    :param frame_buffer_size:
+        Number of frames that can wait to be processed with the "queue"
+        and "block" policies.
     """
 
     __VALID_FORMATS = ("opencv", "pil")
@@ -35,6 +55,8 @@ class Camera(Stateful, Recreatable):
         flip_left_right: bool = False,
         rotate_angle=0,
         name="camera",
+        frame_policy=FramePolicy.LATEST,
+        frame_buffer_size=2,
     ):
         # Initialise private variables
         self._resolution = resolution
@@ -67,7 +89,15 @@ class Camera(Stateful, Recreatable):
             self._camera = FileSystemCamera(self._path_to_images)
 
         self._continue_processing = True
-        self._frame_handler = FrameHandler()
+        self._frame_handler = FrameHandler(
+            policy=frame_policy, buffer_size=frame_buffer_size
+        )
+        self._on_frame_lane = FrameLane(
+            self.__call_on_frame,
+            policy=frame_policy,
+            buffer_size=frame_buffer_size,
+            name="on_frame",
+        )
         self._new_frame_event = Event()
         self._process_image_thread = Thread(
             target=self.__process_camera_output, daemon=True
@@ -90,6 +120,8 @@ class Camera(Stateful, Recreatable):
                 "flip_top_bottom": self._flip_top_bottom,
                 "flip_left_right": self._flip_left_right,
                 "rotate_angle": self._rotate_angle,
+                "frame_policy": self._frame_handler.policy.value,
+                "frame_buffer_size": frame_buffer_size,
             },
         )
 
@@ -128,6 +160,8 @@ class Camera(Stateful, Recreatable):
         self._continue_processing = False
         if self._process_image_thread.is_alive():
             self._process_image_thread.join()
+        self._on_frame_lane.stop()
+        self._frame_handler.stop()
 
     def is_recording(self):
         """Returns True if recording mode is enabled."""
@@ -279,34 +313,48 @@ class Camera(Stateful, Recreatable):
         self._frame_handler.remove_action(CaptureActions.HANDLE_FRAME)
 
     def __get_processed_current_frame(self):
-        image = self._frame_handler.frame
-        if self.format.lower() == "opencv":
-            image = ImageFunctions.convert(image, format="opencv")
+        return self._frame_handler.converted_frame(self.format)
 
-        return image
+    def __call_on_frame(self, frame):
+        on_frame = self.on_frame
+        if callable(on_frame):
+            on_frame(frame.as_format(self.format))
 
     def __process_camera_output(self):
+        sequence = 0
         while (
             self._camera
             and self._camera.is_opened()
             and self._continue_processing is True
         ):
-            self._frame_handler.frame = self._camera.get_frame()
-            self._new_frame_event.set()
-
-            if callable(self.on_frame):
-                self.on_frame(self.__get_processed_current_frame())
+            # Frames are processed on other threads, so that capturing
+            # isn't slowed down by processing
+            frame = Frame(self._camera.read_frame(), sequence=sequence)
+            sequence += 1
 
             try:
-                self._frame_handler.process()
+                self._frame_handler.submit(frame)
             except Exception as e:
                 print(f"Error in camera frame handler: {e}")
+            self._new_frame_event.set()
+
+            if callable(self.on_frame):
+                self._on_frame_lane.put(frame)
+
+    @property
+    def last_frame(self):
+        """The last :class:`Frame` captured by the camera, or None. Besides
+        the image, it has its sequence number and capture timestamp, so
+        that the latency of processing it can be measured."""
+        return self._frame_handler.current_frame
 
     def current_frame(self, format=None):
         """Returns the latest frame captured by the camera. This method is non-
         blocking and can return the same frame multiple times.
 
         By default the returned image is formatted as a :class:`PIL.Image.Image`.
+        The image is shared with the other users of the frame, so copy it
+        before modifying it.
 
         :type format: string
         :param format:
@@ -324,6 +372,9 @@ class Camera(Stateful, Recreatable):
         """Returns the next frame captured by the camera. This method blocks
         until a new frame is available.
 
+        The image is shared with the other users of the frame, so copy it
+        before modifying it.
+
         :type format: string
         :param format: DEPRECATED. Set 'camera.format' directly, and
             call this function directly instead.
@@ -10,4 +10,6 @@ from .capture_actions import (
     StoreFrame,
     VideoCapture,
 )
+from .frame import Frame
 from .frame_handler import FrameHandler
+from .frame_lane import FrameLane, FramePolicy
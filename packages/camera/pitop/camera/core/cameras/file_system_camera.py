@@ -79,6 +79,10 @@ class FileSystemCamera:
     def is_opened(self):
         return self.__current_image is not None
 
-    def get_frame(self):
+    def read_frame(self):
+        """Returns the next image, as loaded from the file system."""
         self.__advance()
         return self.__current_image.data
+
+    def get_frame(self):
+        return self.read_frame()
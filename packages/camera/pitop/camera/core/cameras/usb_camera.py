@@ -1,7 +1,5 @@
 from os import environ, listdir
 
-from PIL import Image
-
 from pitop.core.ImageFunctions import convert
 from pitop.core.import_opencv import import_opencv
 
@@ -78,7 +76,13 @@ class UsbCamera:
             # Camera was not initialized
             pass
 
-    def get_frame(self):
+    def read_frame(self):
+        """Returns the next frame from the camera as an OpenCV BGR
+        :class:`numpy.ndarray`, rotated and flipped as configured.
+
+        Frames are kept in the format they're captured in, so that
+        consumers that work on NumPy arrays don't have to convert them.
+        """
         if not self.is_opened():
             raise IOError("Camera not connected")
 
@@ -86,16 +90,30 @@ class UsbCamera:
         if not result:
             raise ValueError("Couldn't grab frame from camera")
 
-        # Always PIL format
-        pil_image = convert(frame, "PIL").rotate(angle=self._rotate_angle, expand=True)
+        cv2 = import_opencv()
 
-        if self._flip_top_bottom:
-            pil_image = pil_image.transpose(method=Image.FLIP_TOP_BOTTOM)
+        # Angles are anticlockwise, as in PIL's Image.rotate
+        rotate_angle = self._rotate_angle % 360
+        if rotate_angle == 90:
+            frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        elif rotate_angle == 180:
+            frame = cv2.rotate(frame, cv2.ROTATE_180)
+        elif rotate_angle == 270:
+            frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
 
-        if self._flip_left_right:
-            pil_image = pil_image.transpose(method=Image.FLIP_LEFT_RIGHT)
+        if self._flip_top_bottom and self._flip_left_right:
+            frame = cv2.flip(frame, -1)
+        elif self._flip_top_bottom:
+            frame = cv2.flip(frame, 0)
+        elif self._flip_left_right:
+            frame = cv2.flip(frame, 1)
 
-        return pil_image
+        return frame
+
+    def get_frame(self):
+        """Returns the next frame from the camera as a
+        :class:`PIL.Image.Image`."""
+        return convert(self.read_frame(), "PIL")
 
     def is_opened(self):
         return self._camera is not None and self._camera.isOpened()
@@ -6,7 +6,11 @@ from time import strftime
 
 class CaptureActionBase(ABC):
     """Abstract class from which all capture actions classes must inherit
-    from."""
+    from.
+
+    Frames are passed to :data:`process` as a :class:`Frame`, so that the
+    representations derived from them are shared between actions.
+    """
 
     @abstractmethod
     def process(self, frame):
@@ -1,8 +1,6 @@
 from concurrent.futures import ThreadPoolExecutor
 from inspect import signature
 
-from pitop.core import ImageFunctions
-
 from .capture_action_base import CaptureActionBase
 
 
@@ -21,7 +19,7 @@ class GenericAction(CaptureActionBase):
         self.__event_executor = ThreadPoolExecutor()
         self.__frame_interval = frame_interval
         self.__elapsed_frames = 0
-        self.__format = format
+        self.__format = format if isinstance(format, str) else "PIL"
 
         callback_signature = signature(callback_on_frame)
         self.callback_has_argument = len(callback_signature.parameters) > 0
@@ -30,9 +28,7 @@ class GenericAction(CaptureActionBase):
         self.stop()
 
     def process(self, frame):
-        if isinstance(self.__format, str) and self.__format.lower() == "opencv":
-            frame = ImageFunctions.convert(frame, format="opencv")
-
+        frame = frame.as_format(self.__format)
         if self.__elapsed_frames % self.__frame_interval == 0:
             if self.callback_has_argument:
                 self.__event_executor.submit(self.__generic_action_callback, frame)
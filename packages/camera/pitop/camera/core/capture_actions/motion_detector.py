@@ -32,12 +32,8 @@ class MotionDetector(CaptureActionBase):
         self.stop()
 
     def process(self, frame):
-        from numpy import asarray
-
-        frame = asarray(frame)
         # Use greyscale and blurred for motion detection
-        gray = self.cv2.cvtColor(frame, self.cv2.COLOR_BGR2GRAY)
-        gray = self.cv2.GaussianBlur(gray, (21, 21), 0)
+        gray = self.cv2.GaussianBlur(frame.grayscale, (21, 21), 0)
 
         if self.__motion_detect_previous_frame is None:
             self.__motion_detect_previous_frame = gray
@@ -65,8 +61,10 @@ class MotionDetector(CaptureActionBase):
 
                 if area > self.__motion_detect_threshold:
                     if self.callback_has_argument:
+                        # Callbacks get the frame with RGB channels
                         self.__event_executor.submit(
-                            self.__motion_detect_callback, frame
+                            self.__motion_detect_callback,
+                            self.cv2.cvtColor(frame.opencv, self.cv2.COLOR_BGR2RGB),
                         )
                     else:
                         self.__event_executor.submit(self.__motion_detect_callback)
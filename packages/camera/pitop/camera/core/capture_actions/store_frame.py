@@ -12,8 +12,7 @@ class StoreFrame(CaptureActionBase):
         self.__output_file_name = output_file_name
 
     def process(self, frame):
-        if hasattr(frame, "save"):
-            frame.save(self.__output_file_name)
+        frame.pil.save(self.__output_file_name)
 
     def stop(self):
         pass
@@ -44,10 +44,12 @@ class VideoCapture(CaptureActionBase):
         )
 
     def process(self, frame):
-        from numpy import asarray
+        from pitop.core.import_opencv import import_opencv
 
+        cv2 = import_opencv()
+        # The writer takes frames with RGB channels
         self.__video_output_writer.append_data(
-            asarray(frame.resize(self.__video_resolution))
+            cv2.cvtColor(frame.resized(*self.__video_resolution), cv2.COLOR_BGR2RGB)
         )
 
     def stop(self):
@@ -0,0 +1,134 @@
+from collections import Counter
+from threading import RLock
+from time import monotonic
+
+from PIL import Image
+
+from pitop.core import ImageFunctions
+from pitop.core.import_opencv import import_opencv
+
+
+class Frame:
+    """A frame captured by a camera, with the representations derived from
+    it memoized, so that they're only computed once per frame however many
+    users of the frame ask for them.
+
+    Representations are shared, so they shouldn't be modified.
+
+    :param image: frame as captured, as a :class:`PIL.Image.Image` or an
+        OpenCV BGR :class:`numpy.ndarray`
+    :param int sequence: number of the frame in the sequence of frames
+        captured by the camera
+    :param float timestamp: time the frame was captured at, from
+        :func:`time.monotonic`; the time the frame is created if not
+        provided
+    """
+
+    def __init__(self, image, sequence=None, timestamp=None):
+        self.image = image
+        self.sequence = sequence
+        self.timestamp = monotonic() if timestamp is None else timestamp
+
+        self.__hits = Counter()
+        self.__misses = Counter()
+
+        self.__representations = {}
+        # Representations can be derived from others
+        self.__lock = RLock()
+
+    def __get(self, name, compute):
+        with self.__lock:
+            if name in self.__representations:
+                self.__hits[name] += 1
+            else:
+                self.__misses[name] += 1
+                self.__representations[name] = compute()
+            return self.__representations[name]
+
+    @property
+    def age(self) -> float:
+        """Time since the frame was captured, in seconds."""
+        return monotonic() - self.timestamp
+
+    @property
+    def hits(self) -> Counter:
+        """Number of times each representation was reused."""
+        with self.__lock:
+            return self.__hits.copy()
+
+    @property
+    def misses(self) -> Counter:
+        """Number of times each representation was computed."""
+        with self.__lock:
+            return self.__misses.copy()
+
+    @property
+    def size(self):
+        """Width and height of the frame, in pixels."""
+        if isinstance(self.image, Image.Image):
+            return self.image.size
+        height, width = self.image.shape[:2]
+        return width, height
+
+    @property
+    def opencv(self):
+        """Frame as an OpenCV BGR :class:`numpy.ndarray`."""
+        return self.__get(
+            "opencv", lambda: ImageFunctions.convert(self.image, format="opencv")
+        )
+
+    @property
+    def pil(self):
+        """Frame as an RGB :class:`PIL.Image.Image`."""
+        return self.__get("pil", lambda: ImageFunctions.convert(self.image, "pil"))
+
+    @property
+    def grayscale(self):
+        """Frame as a single channel :class:`numpy.ndarray`."""
+
+        def compute():
+            frame = self.opencv
+            if frame.ndim == 2:
+                return frame
+            cv2 = import_opencv()
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        return self.__get("grayscale", compute)
+
+    @property
+    def hsv(self):
+        """Frame as an OpenCV HSV :class:`numpy.ndarray`."""
+
+        def compute():
+            cv2 = import_opencv()
+            return cv2.cvtColor(self.opencv, cv2.COLOR_BGR2HSV)
+
+        return self.__get("hsv", compute)
+
+    def as_format(self, format):
+        """Returns the frame in the given format.
+
+        :param str format: "PIL" or "OpenCV"
+        """
+        ImageFunctions.image_format_check(format)
+        return self.pil if format.lower() == "pil" else self.opencv
+
+    def resized(self, width, height=None):
+        """Returns the frame resized, as an OpenCV BGR
+        :class:`numpy.ndarray`.
+
+        :param int width: width of the resized frame
+        :param int height: height of the resized frame; if not provided,
+            the aspect ratio of the frame is kept
+        """
+        if height is None:
+            frame_width, frame_height = self.size
+            height = max(1, round(frame_height * width / frame_width))
+
+        def compute():
+            cv2 = import_opencv()
+            return cv2.resize(
+                self.opencv, (width, height), interpolation=cv2.INTER_AREA
+            )
+
+        return self.__get(f"resized_{width}x{height}", compute)
@@ -1,9 +1,13 @@
+from collections import Counter
 from enum import Enum
+from functools import partial
 from threading import Lock
 
 from pitop.pma.common import type_check
 
 from .capture_actions import CaptureActions
+from .frame import Frame
+from .frame_lane import FrameLane, FramePolicy
 
 
 class FrameHandler:
@@ -11,30 +15,96 @@ class FrameHandler:
 
     :data:`CaptureActions` must be registered, alongside an object using the :data:`register_action` method.
     These actions will be run whenever the :data:`process` method is called.
+
+    Frames are kept as a :class:`Frame`, so that the representations the
+    actions need are computed once per frame and shared between them.
+
+    Frames passed to :data:`submit` are processed by each action on its own
+    :class:`FrameLane`, so that a slow action only drops frames for itself.
+
+    :param FramePolicy policy: what each action's lane does with new
+        frames while the action is busy
+    :param int buffer_size: number of frames that can wait in each lane,
+        with the QUEUE and BLOCK policies
     """
 
-    def __init__(self) -> None:
+    def __init__(self, policy=FramePolicy.LATEST, buffer_size=2) -> None:
         self._capture_actions = {}
+        self.__lanes = {}
         self.__frame = None
+        self.policy = FramePolicy(policy)
+        self.buffer_size = buffer_size
+
+        # Cache statistics of the frames that have been replaced
+        self.__previous_hits = Counter()
+        self.__previous_misses = Counter()
 
         self.__process_lock = Lock()
         self.__frame_lock = Lock()
 
     @property
     def frame(self):
+        """The current frame, as captured."""
         with self.__frame_lock:
             f = self.__frame
-        return f
+        return f.image if f is not None else None
 
     @frame.setter
     def frame(self, frame):
+        if frame is not None and not isinstance(frame, Frame):
+            frame = Frame(frame)
+
         with self.__frame_lock:
+            if self.__frame is not None:
+                self.__previous_hits.update(self.__frame.hits)
+                self.__previous_misses.update(self.__frame.misses)
             self.__frame = frame
 
+    @property
+    def current_frame(self):
+        """The current :class:`Frame`."""
+        with self.__frame_lock:
+            return self.__frame
+
+    def converted_frame(self, format=None):
+        """Returns the current frame in the given format. The frame is only
+        converted the first time it's requested in each format, so the
+        image returned is shared and shouldn't be modified.
+
+        :param str format: "PIL" or "OpenCV"; the frame is returned as
+            captured if not provided
+        """
+        frame = self.current_frame
+        if frame is None or format is None:
+            return self.frame
+        return frame.as_format(format)
+
+    @property
+    def cache_hits(self) -> Counter:
+        """Number of times each representation of the frames was reused
+        instead of being computed again."""
+        with self.__frame_lock:
+            hits = self.__previous_hits.copy()
+            if self.__frame is not None:
+                hits.update(self.__frame.hits)
+        return hits
+
+    @property
+    def cache_misses(self) -> Counter:
+        """Number of times each representation of the frames was
+        computed."""
+        with self.__frame_lock:
+            misses = self.__previous_misses.copy()
+            if self.__frame is not None:
+                misses.update(self.__frame.misses)
+        return misses
+
     def process(self) -> None:
         """Executes all the actions registered in the FrameHandler object."""
         with self.__process_lock:
-            frame = self.frame
+            # The same frame is processed by all actions, even if a new one
+            # is captured meanwhile
+            frame = self.current_frame
 
             capture_actions = self._capture_actions
             actions_to_remove = [CaptureActions.CAPTURE_SINGLE_FRAME]
@@ -50,6 +120,85 @@ class FrameHandler:
                 if self.is_running_action(action_name):
                     self._capture_actions.pop(action_name)
 
+    def submit(self, frame) -> None:
+        """Makes the given frame the current one, and adds it to the lane of
+        each registered action, which processes it on its own thread.
+
+        :param frame: :class:`Frame` or image captured
+        """
+        self.frame = frame
+        frame = self.current_frame
+
+        with self.__process_lock:
+            for action, action_object in list(self._capture_actions.items()):
+                if action not in self.__lanes:
+                    self.__lanes[action] = FrameLane(
+                        partial(self.__process_in_lane, action, action_object),
+                        policy=self.policy,
+                        buffer_size=self.buffer_size,
+                        name=action.name,
+                    )
+            lanes = list(self.__lanes.values())
+
+        # Outside of the lock, as lanes with the BLOCK policy wait for room
+        for lane in lanes:
+            lane.put(frame)
+
+    def __process_in_lane(self, action, action_object, frame):
+        if self._capture_actions.get(action) is not action_object:
+            # Removed while the frame was waiting
+            return
+
+        try:
+            action_object.process(frame)
+        except Exception as e:
+            print(f"Error processing {action}: {e}.")
+            self.remove_action(action)
+            return
+
+        if action == CaptureActions.CAPTURE_SINGLE_FRAME:
+            self.remove_action(action)
+
+    def wait(self, timeout=None) -> bool:
+        """Waits until the actions have processed the frames submitted.
+
+        :param float timeout: maximum time to wait for each action, in
+            seconds
+        :return: bool, True if all the actions are idle
+        """
+        with self.__process_lock:
+            lanes = list(self.__lanes.values())
+        return all([lane.wait(timeout) for lane in lanes])
+
+    def lane_statistics(self) -> dict:
+        """Returns the number of frames processed and dropped by the lane of
+        each action, and the age in seconds of the last frame it started
+        processing.
+
+        :return: dict
+        """
+        with self.__process_lock:
+            lanes = dict(self.__lanes)
+        return {
+            action.name: {
+                "processed": lane.frames_processed,
+                "dropped": lane.frames_dropped,
+                "latency": lane.latency,
+            }
+            for action, lane in lanes.items()
+        }
+
+    def stop(self) -> None:
+        """Stops the threads processing submitted frames.
+
+        They're started again when frames are submitted.
+        """
+        with self.__process_lock:
+            lanes = list(self.__lanes.values())
+            self.__lanes.clear()
+        for lane in lanes:
+            lane.stop()
+
     @type_check
     def register_action(self, action: CaptureActions, args_dict: dict) -> None:
         """Registers an action to be processed when running the :data:`process`
@@ -78,9 +227,15 @@ class FrameHandler:
         :param CaptureActions action: type of action being removed
         """
         with self.__process_lock:
-            if action in self._capture_actions:
-                action_object = self._capture_actions.pop(action)
-                action_object.stop()
+            action_object = self._capture_actions.pop(action, None)
+            lane = self.__lanes.pop(action, None)
+
+        # Stop processing frames before stopping the action, e.g. so that
+        # a video isn't closed while a frame is being written
+        if lane is not None:
+            lane.stop()
+        if action_object is not None:
+            action_object.stop()
 
     def current_actions(self) -> list:
         """Returns a list with the currently registered actions.
@@ -0,0 +1,124 @@
+import logging
+from collections import deque
+from enum import Enum
+from threading import Condition, Thread, current_thread
+
+logger = logging.getLogger(__name__)
+
+
+class FramePolicy(Enum):
+    """What a :class:`FrameLane` does with new frames while it's busy.
+
+    - LATEST: only the newest frame waits to be processed; older ones are
+      dropped.
+    - QUEUE: frames wait in a bounded queue; the oldest one is dropped
+      when it's full.
+    - BLOCK: frames wait in a bounded queue; adding a frame waits until
+      there's room, so the producer goes at the pace of the lane.
+    """
+
+    LATEST = "latest"
+    QUEUE = "queue"
+    BLOCK = "block"
+
+
+class FrameLane:
+    """Processes frames with a function on its own thread, so that a slow
+    function only drops frames for itself instead of delaying the camera
+    and everything else using its frames.
+
+    :param function process: function called with each :class:`Frame`
+    :param FramePolicy policy: what to do with new frames while busy
+    :param int buffer_size: number of frames that can wait to be
+        processed with the QUEUE and BLOCK policies
+    :param str name: name of the lane, used in logs
+    """
+
+    def __init__(self, process, policy=FramePolicy.LATEST, buffer_size=2, name=""):
+        if buffer_size < 1:
+            raise ValueError("Buffer size must be at least 1")
+
+        self.name = name
+        self.policy = FramePolicy(policy)
+        self.buffer_size = 1 if self.policy == FramePolicy.LATEST else buffer_size
+
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.latency = None
+
+        self.__process = process
+        self.__frames = deque()
+        self.__busy = False
+        self.__running = True
+        self.__condition = Condition()
+
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        with self.__condition:
+            return self.__running
+
+    def put(self, frame) -> None:
+        """Adds a frame to be processed, following the lane's policy.
+
+        :param Frame frame: frame to process
+        """
+        with self.__condition:
+            if self.policy == FramePolicy.BLOCK:
+                self.__condition.wait_for(
+                    lambda: len(self.__frames) < self.buffer_size or not self.__running
+                )
+            if not self.__running:
+                return
+
+            while len(self.__frames) >= self.buffer_size:
+                self.__frames.popleft()
+                self.frames_dropped += 1
+            self.__frames.append(frame)
+            self.__condition.notify_all()
+
+    def wait(self, timeout=None) -> bool:
+        """Waits until all the frames added have been processed.
+
+        :param float timeout: maximum time to wait, in seconds
+        :return: bool, True if the lane is idle
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: not self.__frames and not self.__busy, timeout=timeout
+            )
+
+    def stop(self) -> None:
+        """Stops processing frames, dropping the ones waiting. Waits for the
+        frame being processed, unless called while processing it."""
+        with self.__condition:
+            self.__running = False
+            self.frames_dropped += len(self.__frames)
+            self.__frames.clear()
+            self.__condition.notify_all()
+
+        if current_thread() is not self.__thread:
+            self.__thread.join()
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                self.__busy = False
+                self.__condition.notify_all()
+                self.__condition.wait_for(lambda: self.__frames or not self.__running)
+                if not self.__running:
+                    return
+                frame = self.__frames.popleft()
+                self.__busy = True
+                self.latency = frame.age
+                self.__condition.notify_all()
+
+            try:
+                self.__process(frame)
+            except Exception as e:
+                logger.error(f"Error processing frame in {self.name} lane: {e}")
+
+            with self.__condition:
+                self.frames_processed += 1
@@ -1,5 +1,5 @@
 from .cli_base import CliBaseClass
-from .support_core import HealthCheck, Links
+from .support_core import HealthCheck, Links, LockStatus
 
 
 class SupportCLI(CliBaseClass):
@@ -29,6 +29,8 @@ class SupportCLI(CliBaseClass):
         elif self.args.help_subcommand == "health_check":
             hc = HealthCheck()
             hc.run()
+        elif self.args.help_subcommand == "locks":
+            LockStatus().print_lock_stats()
         return 0
 
     @classmethod
@@ -68,3 +70,9 @@ class SupportCLI(CliBaseClass):
         subparser.add_parser(
             "health_check", help="Perform a system verification to find possible issues"
         )
+
+        # pi-top support locks
+        subparser.add_parser(
+            "locks",
+            help="Show which processes hold the pi-top hardware locks and how long others wait for them",
+        )
@@ -1,2 +1,3 @@
 from .health_check import HealthCheck
 from .links import Links
+from .lock_status import LockStatus
@@ -0,0 +1,56 @@
+from pitop.common.lock import (
+    LOCK_FILE_PATH_PREFIX,
+    is_process_running,
+    read_lock_stats,
+)
+
+from ..formatter import StdoutFormat, StdoutTable
+
+
+class LockStatus:
+    def format_histogram(self, buckets, histogram):
+        labels = [f"<{bound * 1000:g}ms" for bound in buckets]
+        labels.append(f">{buckets[-1] * 1000:g}ms")
+        return " ".join(
+            f"{label}:{count}" for label, count in zip(labels, histogram) if count > 0
+        )
+
+    def format_pid(self, pid):
+        if pid is None:
+            return "None"
+        return f"{pid}" if is_process_running(pid) else f"{pid} (exited)"
+
+    def print_lock_stats(self):
+        StdoutFormat.print_header("pi-top SDK LOCKS")
+
+        # statistics left behind by processes that have exited are skipped
+        lock_stats = [
+            stats for stats in read_lock_stats() if is_process_running(stats["pid"])
+        ]
+        if len(lock_stats) == 0:
+            print("No lock statistics found: no running process is using pi-top locks.")
+            return
+
+        t = StdoutTable()
+        t.title_format = StdoutFormat.print_subsection
+        for stats in lock_stats:
+            name = stats["path"].replace(LOCK_FILE_PATH_PREFIX, "")
+            holder_pid = stats["holder_pid"]
+            data_arr = [
+                ("Held by PID", f"{holder_pid if holder_pid else 'not held'}"),
+                ("Acquisitions", f"{stats['acquisitions']}"),
+                ("Acquisitions/sec", f"{stats['acquisitions_per_second']:.1f}"),
+                ("Contended", f"{stats['contended']}"),
+                ("Timeouts", f"{stats['timeouts']}"),
+                ("Max wait", f"{stats['max_wait_time'] * 1000:.2f} ms"),
+                ("Total wait", f"{stats['total_wait_time'] * 1000:.2f} ms"),
+                (
+                    "Wait times",
+                    self.format_histogram(
+                        stats["wait_time_buckets"], stats["wait_time_histogram"]
+                    ),
+                ),
+                ("Last holder PID", self.format_pid(stats["last_holder_pid"])),
+            ]
+            t.add_section(f"{name} (PID {stats['pid']})", data_arr)
+        t.print()
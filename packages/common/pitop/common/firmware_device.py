@@ -1,8 +1,18 @@
+import json
+import logging
 from datetime import datetime
 from math import ceil
+from os import replace
+from pathlib import Path
+from threading import RLock
+from time import time
 
 from pitop.common.common_ids import FirmwareDeviceID
-from pitop.common.i2c_device import I2CDevice
+from pitop.common.i2c_device import I2CDevice, I2CPacing
+from pitop.common.singleton import Singleton
+from pitop.common.state_manager import StateManager
+
+logger = logging.getLogger(__name__)
 
 
 class PTInvalidFirmwareDeviceException(Exception):
@@ -41,11 +51,170 @@ def int_to_date_unix(value):
         return "Returned value invalid"
 
 
+def get_boot_id() -> str:
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+class DeviceInfoCache(metaclass=Singleton):
+    """Process-wide cache of the device information read from firmware
+    devices, keyed by :class:`FirmwareDeviceID`.
+
+    Entries expire after `ttl` seconds and can be invalidated explicitly,
+    e.g. when pi-topd reports that a peripheral was connected or
+    disconnected. Entries are also stored on disk so that new processes
+    started during the same boot don't need to read the devices again.
+
+    :param path: file used to store the cache on disk
+    :param ttl: time in seconds an entry is considered valid
+    """
+
+    DEFAULT_TTL = 300.0
+
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL):
+        if path is None:
+            path = f"{StateManager.folder('pi-top-python-sdk')}/device_info.json"
+        self.path = path
+        self.ttl = ttl
+
+        self.__lock = RLock()
+        self.__boot_id = get_boot_id()
+        self.__entries = self.__load()
+        self.__subscribe_client = None
+
+    def get(self, device_id: FirmwareDeviceID):
+        """Returns the cached device information of a device, or None if
+        there's no valid entry for it."""
+        with self.__lock:
+            entry = self.__entries.get(device_id.name)
+            if entry is None:
+                return None
+
+            age = time() - entry["timestamp"]
+            if age < 0 or age > self.ttl:
+                return None
+            return dict(entry["info"])
+
+    def update(self, device_id: FirmwareDeviceID, info: dict) -> None:
+        with self.__lock:
+            self.__entries[device_id.name] = {"timestamp": time(), "info": dict(info)}
+            self.__save()
+
+    def invalidate(self, device_id: FirmwareDeviceID = None) -> None:
+        """Removes the entry of a device from the cache, or all of them if no
+        device is provided."""
+        with self.__lock:
+            if device_id is None:
+                changed = len(self.__entries) > 0
+                self.__entries.clear()
+            else:
+                changed = self.__entries.pop(device_id.name, None) is not None
+
+            if changed:
+                self.__save()
+
+    def listen_for_peripheral_events(self) -> None:
+        """Invalidates the cache every time pi-topd reports that a peripheral
+        was connected or disconnected.
+
+        Intended for long-running processes; the events are received
+        from pi-topd in a background thread.
+        """
+        from pitop.common.ptdm import Message, PTDMSubscribeClient
+
+        with self.__lock:
+            if self.__subscribe_client is not None:
+                return
+
+            self.__subscribe_client = PTDMSubscribeClient()
+            self.__subscribe_client.initialise(
+                {
+                    Message.PUB_PERIPHERAL_CONNECTED: self.__on_peripheral_event,
+                    Message.PUB_PERIPHERAL_DISCONNECTED: self.__on_peripheral_event,
+                }
+            )
+            self.__subscribe_client.start_listening()
+
+    def stop_listening_for_peripheral_events(self) -> None:
+        with self.__lock:
+            if self.__subscribe_client is None:
+                return
+            self.__subscribe_client.stop_listening()
+            self.__subscribe_client = None
+
+    def __on_peripheral_event(self):
+        logger.debug("Peripheral connection changed, invalidating device info cache")
+        self.invalidate()
+
+    def __load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get("boot_id") != self.__boot_id:
+            return {}
+        return data.get("entries", {})
+
+    def __save(self) -> None:
+        # the on-disk copy is only an optimisation, so failing to write it
+        # (e.g. without write access to the state folder) is not an error
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"boot_id": self.__boot_id, "entries": self.__entries}, f)
+            replace(temp_path, self.path)
+        except Exception as e:
+            logger.debug(f"Unable to store device info cache in {self.path}: {e}")
+
+
 class FirmwareDevice(object):
+    # plate MCUs are also read with SMBus block reads, so they are known to
+    # support combined write-then-read transactions
     device_info = {
-        FirmwareDeviceID.pt4_hub: {"part_name": 0x0607, "i2c_addr": 0x11},
-        FirmwareDeviceID.pt4_foundation_plate: {"part_name": 0x1111, "i2c_addr": 0x04},
-        FirmwareDeviceID.pt4_expansion_plate: {"part_name": 0x2222, "i2c_addr": 0x04},
+        FirmwareDeviceID.pt4_hub: {
+            "part_name": 0x0607,
+            "i2c_addr": 0x11,
+            "combined_read": False,
+        },
+        FirmwareDeviceID.pt4_foundation_plate: {
+            "part_name": 0x1111,
+            "i2c_addr": 0x04,
+            "combined_read": True,
+        },
+        FirmwareDeviceID.pt4_expansion_plate: {
+            "part_name": 0x2222,
+            "i2c_addr": 0x04,
+            "combined_read": True,
+        },
+    }
+
+    # device information fields, read together and cached in DeviceInfoCache
+    info_fields = {
+        "fw_version_major": ("read_unsigned_byte", DeviceInfo.ID__MCU_SOFT_VERS_MAJOR),
+        "fw_version_minor": ("read_unsigned_byte", DeviceInfo.ID__MCU_SOFT_VERS_MINOR),
+        "sch_hardware_version_major": (
+            "read_unsigned_byte",
+            DeviceInfo.ID__SCH_REV_MAJOR,
+        ),
+        "fw_update_schema": (
+            "read_n_unsigned_bytes",
+            DeviceInfo.FW_UPDATE_SCHEMA_VER,
+            3,
+        ),
+        "is_release_build": ("read_unsigned_byte", DeviceInfo.ID__IS_RELEASE_BUILD),
+        "git_commit_hash": ("read_n_unsigned_bytes", DeviceInfo.ID__GIT_COMMIT_HASH, 4),
+        "ci_build_no": ("read_unsigned_word", DeviceInfo.ID__CI_BUILD_NO),
+        "build_unix_timestamp": (
+            "read_n_unsigned_bytes",
+            DeviceInfo.ID__BUILD_UNIX_TIMESTAMP,
+            4,
+        ),
     }
 
     def __init__(
@@ -54,35 +223,86 @@ class FirmwareDevice(object):
         if id not in self.device_info.keys():
             raise AttributeError("Invalid device Id")
 
+        self.id = id
         self.str_name = id.name
         self.addr = self.device_info[id]["i2c_addr"]
         self.part_name = self.device_info[id]["part_name"]
-        self._i2c_device = I2CDevice("/dev/i2c-1", self.addr)
+        self._i2c_device = I2CDevice(
+            "/dev/i2c-1",
+            self.addr,
+            pacing=I2CPacing.for_device(
+                "/dev/i2c-1",
+                self.addr,
+                combined_read=self.device_info[id]["combined_read"],
+            ),
+        )
 
         if send_packet_interval:
             self._i2c_device.set_delays(send_packet_interval, send_packet_interval)
 
+        # the part name is always read from the device, to check that it's
+        # connected before any cached information is used
         try:
             self._i2c_device.connect()
+            part_name = self.get_part_name()
         except Exception:
+            DeviceInfoCache().invalidate(id)
             raise ConnectionError("Device is not plugged. Skipping.")
 
-        if self.part_name != self.get_part_name():
+        if self.part_name != part_name:
+            DeviceInfoCache().invalidate(id)
             raise PTInvalidFirmwareDeviceException(
                 "Part name provided does not match. {} != {}".format(
-                    hex(self.part_name), hex(self.get_part_name())
+                    hex(self.part_name), hex(part_name)
                 )
             )
 
+        # devices sharing the address can't be connected at the same time
+        for other_id, other_info in self.device_info.items():
+            if other_id != id and other_info["i2c_addr"] == self.addr:
+                DeviceInfoCache().invalidate(other_id)
+
     @classmethod
     def valid_device_ids(self) -> list:
         return list(self.device_info.keys())
 
+    @classmethod
+    def get_device_info(cls, id: FirmwareDeviceID) -> dict:
+        """Returns the device information fields of a device.
+
+        The device's part name is read to check that it's connected; the
+        other fields are only read if they aren't cached.
+
+        :raises ConnectionError: if the device isn't connected
+        :raises PTInvalidFirmwareDeviceException: if a different device
+            is connected at its address
+        """
+        return cls(id).__get_info()
+
+    def read_device_info(self) -> dict:
+        """Reads all the device information fields from the device and
+        stores them in the cache."""
+        info = {}
+        for field, (method, *args) in self.info_fields.items():
+            info[field] = getattr(self._i2c_device, method)(*args)
+
+        DeviceInfoCache().update(self.id, info)
+        return info
+
+    def __get_info(self) -> dict:
+        info = DeviceInfoCache().get(self.id)
+        if info is None:
+            info = self.read_device_info()
+        return info
+
+    def __get_info_field(self, field: str):
+        return self.__get_info()[field]
+
     def get_part_name(self) -> int:
         return self._i2c_device.read_unsigned_word(DeviceInfo.ID__PART_NAME)
 
     def get_sch_hardware_version_major(self) -> int:
-        return self._i2c_device.read_unsigned_byte(DeviceInfo.ID__SCH_REV_MAJOR)
+        return self.__get_info_field("sch_hardware_version_major")
 
     def get_fw_version(self) -> str:
         major_ver = self.get_fw_version_major()
@@ -90,15 +310,13 @@ class FirmwareDevice(object):
         return str(major_ver) + "." + str(minor_ver)
 
     def get_fw_version_major(self) -> int:
-        return self._i2c_device.read_unsigned_byte(DeviceInfo.ID__MCU_SOFT_VERS_MAJOR)
+        return self.__get_info_field("fw_version_major")
 
     def get_fw_version_minor(self) -> int:
-        return self._i2c_device.read_unsigned_byte(DeviceInfo.ID__MCU_SOFT_VERS_MINOR)
+        return self.__get_info_field("fw_version_minor")
 
     def get_fw_version_update_schema(self) -> int:
-        resp = self._i2c_device.read_n_unsigned_bytes(
-            DeviceInfo.FW_UPDATE_SCHEMA_VER, 3
-        )
+        resp = self.__get_info_field("fw_update_schema")
         # First 2 bytes for verification: 0x55, 0xAA
         # Range is 55AA00 - 55AAFF
         if resp > 0x55AA00 and resp <= 0x55AAFF:
@@ -113,43 +331,32 @@ class FirmwareDevice(object):
         if self.has_extended_build_info():
             return None
         else:
-            result = self._i2c_device.read_unsigned_byte(
-                DeviceInfo.ID__IS_RELEASE_BUILD
-            )
-            return result == 1
+            return self.__get_info_field("is_release_build") == 1
 
     def get_git_commit_hash(self) -> int:
         if self.has_extended_build_info():
             return None
         else:
-            return int_to_hex(
-                self._i2c_device.read_n_unsigned_bytes(
-                    DeviceInfo.ID__GIT_COMMIT_HASH, 4
-                )
-            )
+            return int_to_hex(self.__get_info_field("git_commit_hash"))
 
     def get_ci_build_no(self) -> int:
         if self.has_extended_build_info():
             return None
         else:
-            return self._i2c_device.read_unsigned_word(DeviceInfo.ID__CI_BUILD_NO)
+            return self.__get_info_field("ci_build_no")
 
     def get_raw_build_timestamp(self) -> str:
-        return self._i2c_device.read_n_unsigned_bytes(
-            DeviceInfo.ID__BUILD_UNIX_TIMESTAMP, 4
-        )
+        return self.__get_info_field("build_unix_timestamp")
 
     def get_build_timestamp(self) -> str:
         if self.has_extended_build_info():
             return None
         else:
-            return int_to_date_unix(
-                self._i2c_device.read_n_unsigned_bytes(
-                    DeviceInfo.ID__BUILD_UNIX_TIMESTAMP, 4
-                )
-            )
+            return int_to_date_unix(self.get_raw_build_timestamp())
 
     def send_packet(self, hardware_reg, packet) -> None:
+        # firmware updates change the device information
+        DeviceInfoCache().invalidate(self.id)
         self._i2c_device.write_n_bytes(hardware_reg, packet)
 
     def get_check_fw_okay(self) -> int:
@@ -158,6 +365,7 @@ class FirmwareDevice(object):
     def reset(self):
         if self.get_fw_version_update_schema() >= 1:
             self._i2c_device.write_byte(DeviceInfo.SYSTEM_REBOOT, 1)
+            DeviceInfoCache().invalidate(self.id)
 
     @classmethod
     def str_name_to_device_id(cls, str_name: str) -> FirmwareDeviceID:
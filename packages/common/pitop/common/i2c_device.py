@@ -1,32 +1,213 @@
+import ctypes
 import logging
 from fcntl import ioctl
 from io import open as iopen
-from time import sleep
+from mmap import mmap
+from os import O_CREAT, O_RDWR, chmod, close, fstat, ftruncate
+from os import open as os_open
+from os.path import exists
+from struct import Struct
+from threading import Lock
+from time import monotonic, sleep
 
 from pitop.common.bitwise_ops import get_bits, join_bytes, split_into_bytes
-from pitop.common.lock import PTLock
+from pitop.common.lock import LOCK_FILE_PATH_PREFIX, PTLock
 
 logger = logging.getLogger(__name__)
 
 
+class _I2CMsg(ctypes.Structure):
+    # struct i2c_msg from linux/i2c.h
+    _fields_ = [
+        ("addr", ctypes.c_uint16),
+        ("flags", ctypes.c_uint16),
+        ("len", ctypes.c_uint16),
+        ("buf", ctypes.POINTER(ctypes.c_uint8)),
+    ]
+
+
+class _I2CRdwrIoctlData(ctypes.Structure):
+    # struct i2c_rdwr_ioctl_data from linux/i2c-dev.h
+    _fields_ = [
+        ("msgs", ctypes.POINTER(_I2CMsg)),
+        ("nmsgs", ctypes.c_uint32),
+    ]
+
+
+class I2CPacing:
+    """Pacing policy for transactions with an I2C device.
+
+    Instead of sleeping after every transfer, the time at which the
+    device will be ready again is recorded as a monotonic-clock deadline,
+    and a transaction only waits if it starts before that deadline.
+
+    The policies returned by :meth:`for_device` are shared by every
+    :class:`I2CDevice` in this process that talks to the same device, and
+    keep the deadline in a file shared with other processes, since the
+    device's lock can be taken by another process as soon as a transfer
+    ends. The deadline must only be accessed while holding that lock.
+
+    :param post_write_delay: minimum time in seconds between a write and
+        the next transfer
+    :param post_read_delay: minimum time in seconds between a read and
+        the next transfer
+    :param combined_read: if True, register reads are performed as a
+        single write-then-read transaction (repeated start) via the
+        I2C_RDWR ioctl, with no turnaround between writing the register
+        address and reading the response
+    :param shared_state_path: file in which the deadline is shared with
+        other processes; if not provided, it's only kept in this process
+    """
+
+    __device_pacing = {}
+    __device_pacing_lock = Lock()
+    __READY_AT = Struct("d")
+
+    def __init__(
+        self,
+        post_write_delay: float = 0.020,
+        post_read_delay: float = 0.020,
+        combined_read: bool = False,
+        shared_state_path: str = None,
+    ):
+        self.post_write_delay = post_write_delay
+        self.post_read_delay = post_read_delay
+        self.combined_read = combined_read
+        self.__ready_at = 0.0
+        self.__shared_state = None
+        if shared_state_path is not None:
+            self.__shared_state = self.__open_shared_state(shared_state_path)
+
+    @classmethod
+    def for_device(cls, device_path: str, device_address: int, **kwargs):
+        """Get the pacing policy for a device, creating it with `kwargs` if
+        this is the first time it is requested.
+
+        :raises ValueError: if the policy already exists with different
+            settings than the ones in `kwargs`
+        """
+        key = (device_path, device_address)
+        with cls.__device_pacing_lock:
+            pacing = cls.__device_pacing.get(key)
+            if pacing is None:
+                pacing = cls(
+                    shared_state_path=f"{LOCK_FILE_PATH_PREFIX}i2c_{device_address:#0{4}x}.pacing",
+                    **kwargs,
+                )
+                cls.__device_pacing[key] = pacing
+                return pacing
+
+        conflicts = {
+            name: value
+            for name, value in kwargs.items()
+            if getattr(pacing, name) != value
+        }
+        if conflicts:
+            raise ValueError(
+                f"Pacing of I2C device {device_address:#0{4}x} already exists with "
+                f"different settings than {conflicts}"
+            )
+        return pacing
+
+    @classmethod
+    def __open_shared_state(cls, path: str):
+        try:
+            file_already_existed = exists(path)
+            fd = os_open(path, O_RDWR | O_CREAT, 0o666)
+            try:
+                if not file_already_existed:
+                    # the file is created with the umask applied
+                    chmod(path, 0o666)
+                if fstat(fd).st_size < cls.__READY_AT.size:
+                    ftruncate(fd, cls.__READY_AT.size)
+                return mmap(fd, cls.__READY_AT.size)
+            finally:
+                close(fd)
+        except OSError as e:
+            logger.warning(
+                f"Unable to share I2C pacing through {path}, it will only apply to this process: {e}"
+            )
+            return None
+
+    @property
+    def ready_at(self) -> float:
+        """Monotonic time at which the device is ready for the next
+        transfer."""
+        if self.__shared_state is None:
+            return self.__ready_at
+        return self.__READY_AT.unpack_from(self.__shared_state)[0]
+
+    @ready_at.setter
+    def ready_at(self, ready_at: float) -> None:
+        if self.__shared_state is None:
+            self.__ready_at = ready_at
+        else:
+            self.__READY_AT.pack_into(self.__shared_state, 0, ready_at)
+
+    def wait_until_ready(self) -> None:
+        """Block only for the remaining turnaround time of the previous
+        transfer, if any."""
+        remaining = self.ready_at - monotonic()
+        if remaining > 0:
+            sleep(remaining)
+
+    def write_done(self, delay: float = None) -> None:
+        """Start the turnaround after a write.
+
+        :param delay: turnaround time; `post_write_delay` if not provided
+        """
+        if delay is None:
+            delay = self.post_write_delay
+        self.ready_at = monotonic() + delay
+
+    def read_done(self, delay: float = None) -> None:
+        """Start the turnaround after a read.
+
+        :param delay: turnaround time; `post_read_delay` if not provided
+        """
+        if delay is None:
+            delay = self.post_read_delay
+        self.ready_at = monotonic() + delay
+
+
 class I2CDevice:
     I2C_SLAVE = 0x0703
+    I2C_RDWR = 0x0707
+    I2C_M_RD = 0x0001
 
-    def __init__(self, device_path: str, device_address: int):
+    def __init__(self, device_path: str, device_address: int, pacing: I2CPacing = None):
         self._device_path = device_path
         self._device_address = device_address
 
-        self._post_read_delay = 0.020
-        self._post_write_delay = 0.020
+        if pacing is None:
+            pacing = I2CPacing.for_device(device_path, device_address)
+        self._pacing = pacing
+        # delays of this instance, set with set_delays
+        self.__post_read_delay = None
+        self.__post_write_delay = None
 
         self._lock = PTLock(f"i2c_{device_address:#0{4}x}")
 
         self._read_device = None
         self._write_device = None
 
+    @property
+    def _post_read_delay(self):
+        if self.__post_read_delay is None:
+            return self._pacing.post_read_delay
+        return self.__post_read_delay
+
+    @property
+    def _post_write_delay(self):
+        if self.__post_write_delay is None:
+            return self._pacing.post_write_delay
+        return self.__post_write_delay
+
     def set_delays(self, read_delay: float, write_delay: float):
-        self._post_read_delay = read_delay
-        self._post_write_delay = write_delay
+        """Set the turnaround times after the transfers of this instance,
+        without changing the pacing shared with other instances."""
+        self.__post_read_delay = read_delay
+        self.__post_write_delay = write_delay
 
     def connect(self, read_test=True):
         logger.debug(
@@ -191,21 +372,57 @@ class I2CDevice:
     ####################
     def __run_transaction(self, listin: list, expected_read_length: int):
         with self._lock:
+            self._pacing.wait_until_ready()
+
+            if expected_read_length > 0 and self._pacing.combined_read:
+                result_array = self.__write_then_read_data(listin, expected_read_length)
+                self._pacing.read_done(self._post_read_delay)
+                return result_array
+
             self.__write_data(bytearray(listin))
-            return self.__read_data(expected_read_length)
+            self._pacing.write_done(self._post_write_delay)
+
+            if expected_read_length == 0:
+                return 0
+
+            # the device needs time to prepare the response
+            self._pacing.wait_until_ready()
+            result_array = self.__read_data(expected_read_length)
+            self._pacing.read_done(self._post_read_delay)
+            return result_array
+
+    def __write_then_read_data(self, data: list, expected_output_size: int):
+        write_buffer = (ctypes.c_uint8 * len(data))(*data)
+        read_buffer = (ctypes.c_uint8 * expected_output_size)()
+
+        messages = (_I2CMsg * 2)(
+            _I2CMsg(
+                self._device_address,
+                0,
+                len(data),
+                ctypes.cast(write_buffer, ctypes.POINTER(ctypes.c_uint8)),
+            ),
+            _I2CMsg(
+                self._device_address,
+                self.I2C_M_RD,
+                expected_output_size,
+                ctypes.cast(read_buffer, ctypes.POINTER(ctypes.c_uint8)),
+            ),
+        )
+        ioctl_data = _I2CRdwrIoctlData(
+            ctypes.cast(messages, ctypes.POINTER(_I2CMsg)), len(messages)
+        )
+        ioctl(self._read_device, self.I2C_RDWR, ioctl_data)
+
+        return list(read_buffer)
 
     def __write_data(self, data: bytearray):
         data = bytes(data)
         self._write_device.write(data)
-        sleep(self._post_write_delay)
 
     def __read_data(self, expected_output_size: int):
-        if expected_output_size == 0:
-            return 0
-
         result_array = list()
         data = self._read_device.read(expected_output_size)
-        sleep(self._post_read_delay)
 
         if len(data) != 0:
             for n in data:
@@ -1,21 +1,234 @@
+import atexit
+import json
 import logging
+from bisect import bisect_left
 from fcntl import LOCK_EX, LOCK_NB, LOCK_UN, flock
-from os import chmod
+from glob import glob
+from os import chmod, getpid, kill, remove, replace, stat
 from os.path import exists
 from stat import S_IWGRP, S_IWOTH, S_IWUSR
-from threading import Lock
+from threading import Lock, get_ident
+from time import monotonic, sleep
 
 logger = logging.getLogger(__name__)
 
+LOCK_FILE_PATH_PREFIX = "/tmp/.com.pi-top.sdk."
+
+
+def get_lock_holder_pid(path: str):
+    """Returns the PID of the process holding the lock file at the given
+    path, or None if the file is not locked."""
+    try:
+        inode = stat(path).st_ino
+        with open("/proc/locks") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    for line in lines:
+        fields = line.split()
+        # blocked requests are listed as "<n>: -> FLOCK ..."
+        if len(fields) < 6 or fields[1] != "FLOCK":
+            continue
+        if int(fields[5].split(":")[-1]) == inode:
+            return int(fields[4])
+    return None
+
+
+class LockStats:
+    """Acquisition and contention statistics of a lock file, shared by all
+    the PTLock instances of a process using it.
+
+    Statistics are written next to the lock file at most once every
+    PUBLISH_INTERVAL seconds, so that they can be read from other
+    processes with :func:`read_lock_stats`. The file is removed when the
+    process exits.
+    """
+
+    # upper bounds in seconds of the wait time histogram buckets; waits
+    # longer than the last bound are counted in an extra bucket
+    WAIT_TIME_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+    PUBLISH_INTERVAL = 1.0
+
+    __registry = {}
+    __registry_lock = Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = Lock()
+        self.__published_pid = None
+        self.reset()
+
+    @classmethod
+    def for_path(cls, path: str) -> "LockStats":
+        with cls.__registry_lock:
+            if path not in cls.__registry:
+                cls.__registry[path] = cls(path)
+            return cls.__registry[path]
+
+    @property
+    def stats_path(self) -> str:
+        return f"{self.path}.stats.{getpid()}"
+
+    def reset(self) -> None:
+        with self.__lock:
+            self.acquisitions = 0
+            self.contended = 0
+            self.timeouts = 0
+            self.total_wait_time = 0.0
+            self.max_wait_time = 0.0
+            self.wait_time_histogram = [0] * (len(self.WAIT_TIME_BUCKETS) + 1)
+            self.last_holder_pid = None
+            self.__start_time = monotonic()
+            self.__last_publish_time = self.__start_time
+            self.__changed = False
+
+    def record_acquisition(
+        self, wait_time: float, contended: bool, holder_pid: int = None
+    ) -> None:
+        with self.__lock:
+            self.acquisitions += 1
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+            self.wait_time_histogram[
+                bisect_left(self.WAIT_TIME_BUCKETS, wait_time)
+            ] += 1
+            if contended:
+                self.contended += 1
+                if holder_pid is not None:
+                    self.last_holder_pid = holder_pid
+            self.__changed = True
+
+    def record_timeout(self, holder_pid: int = None) -> None:
+        with self.__lock:
+            self.timeouts += 1
+            if holder_pid is not None:
+                self.last_holder_pid = holder_pid
+            self.__changed = True
+
+    @property
+    def acquisitions_per_second(self) -> float:
+        elapsed = monotonic() - self.__start_time
+        return self.acquisitions / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        with self.__lock:
+            return {
+                "path": self.path,
+                "pid": getpid(),
+                "acquisitions": self.acquisitions,
+                "acquisitions_per_second": self.acquisitions_per_second,
+                "contended": self.contended,
+                "timeouts": self.timeouts,
+                "total_wait_time": self.total_wait_time,
+                "max_wait_time": self.max_wait_time,
+                "wait_time_buckets": list(self.WAIT_TIME_BUCKETS),
+                "wait_time_histogram": list(self.wait_time_histogram),
+                "last_holder_pid": self.last_holder_pid,
+            }
+
+    def publish(self, force: bool = False) -> None:
+        """Write the statistics to disk, at most once every
+        PUBLISH_INTERVAL seconds unless forced."""
+        now = monotonic()
+        # checked without taking the lock first, since this runs every time
+        # a lock is released
+        if not force and now - self.__last_publish_time < self.PUBLISH_INTERVAL:
+            return
+
+        with self.__lock:
+            if not force and (
+                not self.__changed
+                or now - self.__last_publish_time < self.PUBLISH_INTERVAL
+            ):
+                return
+
+            self.__last_publish_time = now
+            self.__changed = False
+
+        data = self.as_dict()
+        try:
+            temp_path = f"{self.stats_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(data, f)
+            replace(temp_path, self.stats_path)
+        except OSError as e:
+            logger.debug(f"Unable to write lock statistics for {self.path}: {e}")
+            return
+
+        # registered again in a forked process, which publishes to its own file
+        if self.__published_pid != getpid():
+            self.__published_pid = getpid()
+            atexit.register(self.remove_published)
+
+    def remove_published(self) -> None:
+        """Remove the statistics written to disk by this process."""
+        if self.__published_pid != getpid():
+            return
+        try:
+            remove(self.stats_path)
+        except OSError:
+            pass
+
+
+def is_process_running(pid) -> bool:
+    """Returns True if there's a process with the given PID."""
+    try:
+        pid = int(pid)
+        if pid <= 0:
+            return False
+        kill(pid, 0)
+    except (TypeError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        # running as another user
+        pass
+    return True
+
+
+def read_lock_stats() -> list:
+    """Returns the statistics published by the running processes using
+    PTLock, and the PID of the process currently holding each lock.
+
+    :return: list of dictionaries, one per lock file and process
+    """
+    stats = []
+    for stats_path in sorted(glob(f"{LOCK_FILE_PATH_PREFIX}*.lock.stats.*[0-9]")):
+        try:
+            with open(stats_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        if not is_process_running(data.get("pid")):
+            # left behind by a process that didn't exit cleanly
+            try:
+                remove(stats_path)
+            except OSError:
+                pass
+            continue
+
+        data["holder_pid"] = get_lock_holder_pid(data["path"])
+        stats.append(data)
+    return stats
+
 
 class PTLock(object):
+    """Lock shared by threads and processes, based on a lock file.
+
+    The lock is reentrant: a thread that holds it can acquire it again
+    without waiting, and must release it the same number of times.
+    """
+
     __lock_file_handle = None
-    __locked_by_self = False
 
     def __init__(self, id):
-        self.path = f"/tmp/.com.pi-top.sdk.{id}.lock"
+        self.path = f"{LOCK_FILE_PATH_PREFIX}{id}.lock"
 
         self._thread_lock = Lock()
+        self.__owner = None
+        self.__count = 0
+        self.__stats = LockStats.for_path(self.path)
 
         lock_file_already_existed = exists(self.path)
         self.__lock_file_handle = open(self.path, "w")
@@ -24,45 +237,69 @@ class PTLock(object):
 
         logger.debug("Creating PTLock with path: {}".format(self.path))
 
-    def acquire(self) -> bool:
-        """Block until lock can be acquired."""
-        if self._thread_lock.locked():
-            logger.debug(
-                "Attempting to acquire thread lock, which is currently already acquired."
-            )
+    @property
+    def stats(self) -> LockStats:
+        """Acquisition and contention statistics of the lock file in this
+        process."""
+        return self.__stats
 
-        if self.is_locked():
-            logger.debug(
-                f"Attempting to acquire lock file ({self.path}), which is currently already globally acquired."
-            )
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        """Acquire the lock.
 
-        logger.debug("Acquiring thread lock")
-        self._thread_lock.acquire()
-        logger.debug("Acquiring lock file at {}".format(self.path))
-        flock(self.__lock_file_handle, LOCK_EX)
-        self.__locked_by_self = True
-
-    def release(self) -> bool:
-        """Attempt to release lock."""
-        if not self._thread_lock.locked():
-            logger.debug(
-                "Attempting to release thread lock, which is currently already acquired."
-            )
+        :param blocking: if False, return immediately if the lock is held
+            by another thread or process
+        :param timeout: maximum time in seconds to wait for the lock; if
+            -1, wait until it's available
+        :return: whether the lock was acquired
+        """
+        if self.__owner == get_ident():
+            self.__count += 1
+            return True
 
-        if not self.is_locked():
-            logger.debug(
-                f"Attempting to release lock file ({self.path}), which is currently already globally acquired."
-            )
+        start_time = monotonic()
+        deadline = start_time + timeout if blocking and timeout >= 0 else None
 
-        logger.debug("Releasing thread lock")
-        self._thread_lock.release()
-        logger.debug("Releasing lock file at {}".format(self.path))
+        contended = not self._thread_lock.acquire(blocking=False)
+        if contended and not self._thread_lock.acquire(
+            blocking, self.__remaining(deadline)
+        ):
+            self.__stats.record_timeout()
+            return False
+
+        holder_pid = None
+        try:
+            flock(self.__lock_file_handle, LOCK_EX | LOCK_NB)
+        except BlockingIOError:
+            contended = True
+            holder_pid = get_lock_holder_pid(self.path)
+            logger.debug(f"Waiting for lock file {self.path} held by PID {holder_pid}")
+            if not self.__wait_for_lock_file(blocking, deadline):
+                self._thread_lock.release()
+                self.__stats.record_timeout(holder_pid)
+                return False
+
+        self.__owner = get_ident()
+        self.__count = 1
+        self.__stats.record_acquisition(monotonic() - start_time, contended, holder_pid)
+        return True
+
+    def release(self) -> None:
+        """Release the lock."""
+        if self.__count == 0:
+            raise RuntimeError("Attempting to release a lock that is not acquired")
+
+        self.__count -= 1
+        if self.__count > 0:
+            return
+
+        self.__owner = None
         flock(self.__lock_file_handle, LOCK_UN)
-        self.__locked_by_self = False
+        self._thread_lock.release()
+        self.__stats.publish()
 
     def is_locked(self):
-        if self.__locked_by_self:
-            return self.__locked_by_self
+        if self.__count > 0:
+            return True
 
         lock_status = False
         try:
@@ -78,7 +315,35 @@ class PTLock(object):
         )
         return lock_status
 
-    __enter__ = acquire
+    def __remaining(self, deadline):
+        if deadline is None:
+            return -1
+        return max(deadline - monotonic(), 0)
+
+    def __wait_for_lock_file(self, blocking, deadline) -> bool:
+        if not blocking:
+            return False
+
+        if deadline is None:
+            flock(self.__lock_file_handle, LOCK_EX)
+            return True
+
+        # flock can't time out, so poll it until the deadline
+        poll_interval = 0.0005
+        while True:
+            try:
+                flock(self.__lock_file_handle, LOCK_EX | LOCK_NB)
+                return True
+            except BlockingIOError:
+                remaining = self.__remaining(deadline)
+                if remaining <= 0:
+                    return False
+                sleep(min(poll_interval, remaining))
+                poll_interval = min(poll_interval * 2, 0.01)
+
+    def __enter__(self):
+        self.acquire()
+        return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.release()
@@ -1,4 +1,5 @@
 import logging
+import struct
 
 from smbus2 import SMBus
 
@@ -7,6 +8,69 @@ from pitop.common.bitwise_ops import get_bits, join_bytes, split_into_bytes
 logger = logging.getLogger(__name__)
 
 
+class RegisterBlock:
+    """Layout of a contiguous range of registers that can be read in a single
+    I2C block transaction.
+
+    Each field occupies one register address, starting at
+    `start_address`, and is described by a `struct` format string. A
+    field with more than one value (e.g. "hh") is decoded as a tuple.
+    """
+
+    MAX_BLOCK_SIZE = 32
+
+    def __init__(self, start_address: int, fields: list, little_endian: bool = True):
+        byte_order = "<" if little_endian else ">"
+        self.start_address = start_address
+        self._fields = []
+        for key, field_format in fields:
+            field_struct = struct.Struct(byte_order + field_format)
+            no_of_values = len(field_struct.unpack(bytes(field_struct.size)))
+            self._fields.append((key, no_of_values))
+
+        self._struct = struct.Struct(
+            byte_order + "".join(field_format for _, field_format in fields)
+        )
+        if self._struct.size > self.MAX_BLOCK_SIZE:
+            raise ValueError(
+                f"Register block is {self._struct.size} bytes; SMBus block reads are limited to {self.MAX_BLOCK_SIZE} bytes"
+            )
+
+    @classmethod
+    def from_registers(
+        cls, registers: dict, field_format: str, little_endian: bool = True
+    ):
+        """Build a block from a dictionary of {key: register address}, where
+        every register has the same format and the addresses are
+        contiguous."""
+        keys_by_address = {address: key for key, address in registers.items()}
+        addresses = sorted(keys_by_address)
+        if addresses != list(range(addresses[0], addresses[0] + len(addresses))):
+            raise ValueError("Registers in a block must have contiguous addresses")
+
+        return cls(
+            addresses[0],
+            [(keys_by_address[address], field_format) for address in addresses],
+            little_endian=little_endian,
+        )
+
+    @property
+    def size(self) -> int:
+        return self._struct.size
+
+    def decode(self, data) -> dict:
+        """Decode the raw bytes of a block read into a dictionary of
+        {key: value}."""
+        values = self._struct.unpack(bytes(data))
+        snapshot = {}
+        index = 0
+        for key, no_of_values in self._fields:
+            field_values = values[index : index + no_of_values]
+            snapshot[key] = field_values[0] if no_of_values == 1 else field_values
+            index += no_of_values
+        return snapshot
+
+
 class SMBusDevice:
     """Wrapper for smbus for when standard I2C protocol is required, in
     contrast to the less-than-standard I2C used on older devices."""
@@ -121,6 +185,39 @@ class SMBusDevice:
 
         return result
 
+    def read_block(self, register_address: int, number_of_bytes: int):
+        """Read `number_of_bytes` starting at `register_address` in a single
+        transaction, returning the raw bytes.
+
+        :return: bytes read, or None if the response length is incorrect
+        """
+        result_array = self._bus.read_i2c_block_data(
+            self._device_address, register_address, number_of_bytes
+        )
+
+        if len(result_array) != number_of_bytes:
+            return None
+
+        logger.debug(
+            "I2C: Read block of "
+            + str(number_of_bytes)
+            + " bytes from "
+            + hex(register_address)
+        )
+
+        return bytes(result_array)
+
+    def read_snapshot(self, register_block: RegisterBlock):
+        """Read every register in `register_block` in a single transaction.
+
+        :return: dictionary of {key: value} as described by the block,
+            or None if the read was incomplete
+        """
+        data = self.read_block(register_block.start_address, register_block.size)
+        if data is None:
+            return None
+        return register_block.decode(data)
+
     # HELPER FUNCTIONS TO SIMPLIFY EXTERNAL READABILITY
     def read_n_unsigned_bytes(
         self, register_address: int, number_of_bytes: int, little_endian=False
@@ -1 +1,2 @@
 from .miniscreen import Miniscreen
+from .oled import Animation, Compositor, Layer, Sprite
@@ -1 +1,3 @@
+from .animation import Animation
+from .compositor import Compositor, Layer, Sprite
 from .oled import OLED
@@ -0,0 +1,218 @@
+import hashlib
+import logging
+from io import BytesIO
+from os import environ, getpid, replace
+from pathlib import Path
+
+import numpy as np
+import PIL.Image
+
+from pitop.common.formatting import is_url
+
+from .core.contrib.luma.oled.device import sh1106
+
+logger = logging.getLogger(__name__)
+
+
+def get_animation_cache_folder() -> Path:
+    cache_home = environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_home) / "pi-top-python-sdk" / "animations"
+
+
+class Animation:
+    """Frames of an animated image, decoded once and stored in the page
+    layout of the miniscreen display, so they can be sent to it without
+    further processing. Identical frames are stored once.
+
+    Use :meth:`from_image` or :meth:`from_file` to create one.
+
+    :param pages: encoded frames, of shape (unique frames, pages, width)
+    :param frame_indices: index in `pages` of each frame of the animation
+    :param durations: duration of each frame of the animation, in seconds
+    """
+
+    # frames without a duration, or with a duration of 0, are shown for
+    # 100ms, like web browsers do
+    DEFAULT_FRAME_DURATION = 0.1
+
+    def __init__(self, pages, frame_indices, durations):
+        self.pages = np.asarray(pages, dtype=np.uint8)
+        self.frame_indices = np.asarray(frame_indices, dtype=np.intp)
+        self.durations = np.asarray(durations, dtype=np.float64)
+
+        if len(self.frame_indices) == 0:
+            raise ValueError("An animation must have at least one frame")
+        if len(self.frame_indices) != len(self.durations):
+            raise ValueError("Every frame of an animation must have a duration")
+
+        self.__end_times = np.cumsum(self.durations)
+
+    def __len__(self):
+        return len(self.frame_indices)
+
+    @property
+    def duration(self) -> float:
+        """Total duration of the animation, in seconds."""
+        return float(self.__end_times[-1])
+
+    @property
+    def size(self) -> tuple:
+        _, pages, width = self.pages.shape
+        return (width, pages * 8)
+
+    def frame_pages(self, index):
+        """Encoded pages of a frame, to be sent with
+        :meth:`sh1106.display_pages`."""
+        return self.pages[self.frame_indices[index]]
+
+    def frame_image(self, index):
+        """1-bit image of a frame.
+
+        :rtype: :class:`PIL.Image.Image`
+        """
+        return sh1106.decode_pages(self.frame_pages(index))
+
+    def frame_at(self, elapsed, loop=False):
+        """Finds the frame shown at a point of the animation.
+
+        :param float elapsed: seconds since the animation started
+        :param bool loop: whether the animation starts again when it
+            finishes
+        :return: the index of the frame and the seconds left until the
+            next one, or (None, 0.0) if the animation has finished
+        :rtype: tuple
+        """
+        if loop:
+            elapsed %= self.duration
+        elif elapsed >= self.duration:
+            return None, 0.0
+
+        index = int(np.searchsorted(self.__end_times, elapsed, side="right"))
+        index = min(index, len(self) - 1)
+        return index, float(self.__end_times[index] - elapsed)
+
+    @classmethod
+    def from_image(cls, image, assistant):
+        """Decodes all the frames of an image into an animation.
+
+        :param image: animated image, e.g. a GIF
+        :type image: :class:`PIL.Image.Image`
+        :param assistant: the display's
+            :class:`pitop.miniscreen.oled.assistant.MiniscreenAssistant`,
+            used to resize and convert the frames as `display_image` does
+        :rtype: Animation
+        """
+        unique_frames = {}
+        pages = []
+        frame_indices = []
+        durations = []
+
+        for frame in assistant.get_frame_iterator(image):
+            encoded = sh1106.encode_pages(assistant.process_image(frame))
+            index = unique_frames.setdefault(encoded.tobytes(), len(pages))
+            if index == len(pages):
+                pages.append(encoded)
+            frame_indices.append(index)
+
+            duration = frame.info.get("duration", 0) / 1000  # ms to s
+            durations.append(duration if duration > 0 else cls.DEFAULT_FRAME_DURATION)
+
+        return cls(np.stack(pages), frame_indices, durations)
+
+    @classmethod
+    def from_file(cls, file_path_or_url, assistant, cache=None):
+        """Decodes an animated image file into an animation, reusing the
+        result of decoding the same file before if it's in the cache.
+
+        :param str file_path_or_url: A file path or URL to the image
+        :param assistant: the display's
+            :class:`pitop.miniscreen.oled.assistant.MiniscreenAssistant`
+        :param cache: the :class:`AnimationCache` to use. A cache in the
+            user's cache folder is used if not provided; pass `False` to
+            disable caching.
+        :rtype: Animation
+        """
+        if is_url(file_path_or_url):
+            from urllib.request import urlopen
+
+            with urlopen(file_path_or_url) as response:
+                data = response.read()
+        else:
+            with open(file_path_or_url, "rb") as f:
+                data = f.read()
+
+        if cache is False:
+            return cls.from_image(PIL.Image.open(BytesIO(data)), assistant)
+
+        if cache is None:
+            cache = AnimationCache()
+
+        key = cache.key(data, assistant.image_size)
+        animation = cache.load(key)
+        if animation is None:
+            animation = cls.from_image(PIL.Image.open(BytesIO(data)), assistant)
+            cache.save(key, animation)
+        return animation
+
+    def save(self, file):
+        """Stores the animation in a file, to be loaded with :meth:`load`."""
+        np.savez(
+            file,
+            pages=self.pages,
+            frame_indices=self.frame_indices,
+            durations=self.durations,
+        )
+
+    @classmethod
+    def load(cls, file):
+        with np.load(file) as data:
+            return cls(data["pages"], data["frame_indices"], data["durations"])
+
+
+class AnimationCache:
+    """Stores decoded animations on disk, keyed by a hash of the image file
+    and the size of the display, so the same file doesn't need to be
+    decoded again.
+
+    :param folder: folder where the animations are stored. Defaults to
+        `pi-top-python-sdk/animations` in the user's cache folder.
+    """
+
+    VERSION = 1
+
+    def __init__(self, folder=None):
+        self.folder = (
+            Path(folder) if folder is not None else get_animation_cache_folder()
+        )
+
+    def key(self, data: bytes, size) -> str:
+        digest = hashlib.sha256(data)
+        digest.update(f"{self.VERSION}:{size[0]}x{size[1]}".encode())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.folder / f"{key}.npz"
+
+    def load(self, key: str):
+        """Loads a cached animation, or returns None if it's not cached."""
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            return Animation.load(path)
+        except Exception as e:
+            logger.debug(f"Unable to load cached animation {path}: {e}")
+            return None
+
+    def save(self, key: str, animation: Animation) -> None:
+        # the cache is only an optimisation, so failing to write to it is
+        # not an error
+        path = self.path(key)
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f"{path.name}.{getpid()}.tmp")
+            with open(temp_path, "wb") as f:
+                animation.save(f)
+            replace(temp_path, path)
+        except Exception as e:
+            logger.debug(f"Unable to cache animation in {path}: {e}")
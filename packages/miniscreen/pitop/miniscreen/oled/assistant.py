@@ -1,10 +1,11 @@
 import PIL.Image
-import PIL.ImageChops
 import PIL.ImageDraw
 import PIL.ImageFont
 import PIL.ImageOps
 import PIL.ImageSequence
 
+from .core.text_cache import LRUCache, get_font
+
 
 class Fonts:
     _roboto_directory = ""
@@ -27,10 +28,19 @@ class Fonts:
 
 class MiniscreenAssistant:
     resize_resampling_filter = PIL.Image.NEAREST
+    # maximum number of word widths kept for wrapping text
+    text_width_cache_size = 2048
+    # maximum size in bytes of the rendered text bitmaps kept
+    text_bitmap_cache_size = 64 * 1024
 
     def __init__(self, mode, size):
         self.image_mode = mode
         self.image_size = size
+        self._text_width_cache = LRUCache(self.text_width_cache_size)
+        self._text_bitmap_cache = LRUCache(
+            self.text_bitmap_cache_size, cost=self.__bitmap_size
+        )
+        self.__measuring_draw = None
 
     @property
     def _width(self):
@@ -40,7 +50,11 @@ class MiniscreenAssistant:
         return PIL.ImageSequence.Iterator(image)
 
     def images_match(self, image1, image2):
-        return PIL.ImageChops.difference(image1, image2).getbbox() is None
+        return (
+            image1.mode == image2.mode
+            and image1.size == image2.size
+            and image1.tobytes() == image2.tobytes()
+        )
 
     def clear(self, image):
         PIL.ImageDraw.Draw(image).rectangle(((0, 0), image.size), fill=0)
@@ -48,21 +62,33 @@ class MiniscreenAssistant:
     def invert(self, image):
         return PIL.ImageOps.invert(image.convert("L")).convert("1")
 
-    def _multiline_split(self, text, font, font_size, spacing):
-        def get_text_size(text):
-            return PIL.ImageDraw.Draw(self.empty_image).textsize(
-                text=str(text),
-                font=PIL.ImageFont.truetype(font, size=font_size),
-                spacing=spacing,
+    def clear_text_cache(self):
+        """Discards the cached text measurements and rendered text."""
+        self._text_width_cache.clear()
+        self._text_bitmap_cache.clear()
+
+    def _get_text_width(self, text, font, font_size):
+        key = (font, font_size, text)
+        width = self._text_width_cache.get(key)
+        if width is None:
+            if self.__measuring_draw is None:
+                self.__measuring_draw = PIL.ImageDraw.Draw(
+                    PIL.Image.new(self.image_mode, (1, 1))
+                )
+            width, _ = self.__measuring_draw.textsize(
+                text=text, font=get_font(font, font_size)
             )
+            self._text_width_cache.put(key, width)
+        return width
 
+    def _multiline_split(self, text, font, font_size, spacing):
         remaining = self._width
-        space_width, _ = get_text_size(" ")
+        space_width = self._get_text_width(" ", font, font_size)
         # use this list as a stack, push/popping each line
         output_text = []
         # split on whitespace...
         for word in text.split(None):
-            word_width, _ = get_text_size(word)
+            word_width = self._get_text_width(word, font, font_size)
             if word_width + space_width > remaining:
                 output_text.append(word)
                 remaining = self._width - word_width
@@ -89,11 +115,6 @@ class MiniscreenAssistant:
         fill=1,
         spacing=0,
     ):
-        if type(image) is PIL.Image.Image:
-            draw = PIL.ImageDraw.Draw(image)
-        else:
-            draw = image
-
         if xy is None:
             xy = self.get_recommended_text_pos()
 
@@ -109,6 +130,38 @@ class MiniscreenAssistant:
         if anchor is None:
             anchor = self.get_recommended_text_anchor()
 
+        text_args = (
+            str(text),
+            wrap,
+            tuple(xy),
+            font,
+            font_size,
+            align,
+            anchor,
+            spacing,
+        )
+
+        if type(image) is PIL.Image.Image and image.mode == "1":
+            # 1-bit text isn't antialiased, so it can be rendered once as a
+            # mask and pasted with any fill afterwards
+            key = (image.size,) + text_args
+            offset, bitmap = self._text_bitmap_cache.get(key, (None, None))
+            if offset is None:
+                offset, bitmap = self.__render_text_bitmap(image.size, *text_args)
+                self._text_bitmap_cache.put(key, (offset, bitmap))
+            if bitmap is not None:
+                image.paste(fill, box=offset, mask=bitmap)
+            return
+
+        if type(image) is PIL.Image.Image:
+            draw = PIL.ImageDraw.Draw(image)
+        else:
+            draw = image
+        self.__draw_text(draw, *text_args, fill=fill)
+
+    def __draw_text(
+        self, draw, text, wrap, xy, font, font_size, align, anchor, spacing, fill
+    ):
         if wrap:
             text = self._multiline_split(text, font, font_size, spacing)
             cmd = draw.text
@@ -117,14 +170,30 @@ class MiniscreenAssistant:
 
         cmd(
             xy,
-            str(text),
-            font=PIL.ImageFont.truetype(font, size=font_size),
+            text,
+            font=get_font(font, font_size),
             fill=fill,
             spacing=spacing,
             align=align,
             anchor=anchor,
         )
 
+    def __render_text_bitmap(self, size, *text_args):
+        layer = PIL.Image.new("1", size)
+        self.__draw_text(PIL.ImageDraw.Draw(layer), *text_args, fill=1)
+        bounding_box = layer.getbbox()
+        if bounding_box is None:
+            return (0, 0), None
+        return bounding_box[:2], layer.crop(bounding_box)
+
+    @staticmethod
+    def __bitmap_size(entry):
+        _, bitmap = entry
+        if bitmap is None:
+            return 0
+        width, height = bitmap.size
+        return (width + 7) // 8 * height
+
     def process_image(self, image_to_process):
         if image_to_process.size == self.image_size:
             image = image_to_process
@@ -158,7 +227,7 @@ class MiniscreenAssistant:
     def get_recommended_font(self, size=None):
         if size is None:
             size = self.get_recommended_font_size()
-        return PIL.ImageFont.truetype(self.get_recommended_font_path(size), size=size)
+        return get_font(self.get_recommended_font_path(size), size)
 
     def get_recommended_font_path(self, size=None):
         if size is None:
@@ -172,7 +241,7 @@ class MiniscreenAssistant:
     def get_regular_font(self, size=None):
         if size is None:
             size = self.get_recommended_font_size()
-        return PIL.ImageFont.truetype(self.get_regular_font_path(), size=size)
+        return get_font(self.get_regular_font_path(), size)
 
     def get_regular_font_path(self):
         return Fonts.regular()
@@ -180,7 +249,7 @@ class MiniscreenAssistant:
     def get_mono_font(self, size=11, bold=False, italics=False):
         if size is None:
             size = self.get_recommended_font_size()
-        return PIL.ImageFont.truetype(self.get_mono_font_path(bold, italics), size=size)
+        return get_font(self.get_mono_font_path(bold, italics), size)
 
     def get_mono_font_path(self, bold=False, italics=False):
         return Fonts.mono(bold, italics)
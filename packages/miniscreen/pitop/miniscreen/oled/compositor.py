@@ -0,0 +1,386 @@
+from threading import RLock
+
+import PIL.Image
+import PIL.ImageDraw
+
+
+def intersect(box1, box2):
+    """Intersection of two (left, top, right, bottom) rectangles, or None if
+    they don't overlap."""
+    left, top = max(box1[0], box2[0]), max(box1[1], box2[1])
+    right, bottom = min(box1[2], box2[2]), min(box1[3], box2[3])
+    if left >= right or top >= bottom:
+        return None
+    return (left, top, right, bottom)
+
+
+def union(box1, box2):
+    """Smallest rectangle containing two (left, top, right, bottom)
+    rectangles."""
+    return (
+        min(box1[0], box2[0]),
+        min(box1[1], box2[1]),
+        max(box1[2], box2[2]),
+        max(box1[3], box2[3]),
+    )
+
+
+def area(box):
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def merge_boxes(boxes):
+    """Merges overlapping rectangles, and rectangles that cover less area
+    together than apart, so that fewer and larger regions are redrawn.
+
+    :param list boxes: (left, top, right, bottom) rectangles
+    :rtype: list
+    """
+    merged = []
+    for box in boxes:
+        merging = True
+        while merging:
+            merging = False
+            for i, other in enumerate(merged):
+                combined = union(box, other)
+                if area(combined) <= area(box) + area(other):
+                    box = combined
+                    del merged[i]
+                    merging = True
+                    break
+        merged.append(box)
+    return merged
+
+
+class Sprite:
+    """An image drawn by a :class:`Compositor` at a position of the screen.
+
+    Changing the sprite's image, position or visibility marks the screen
+    regions it covered and now covers as damaged, so that only those are
+    redrawn. If the sprite's image is drawn on in place, use :meth:`draw`
+    or call :meth:`mark_dirty` afterwards.
+
+    :param image: image of the sprite, converted to 1-bit if needed
+    :type image: :class:`PIL.Image.Image`
+    :param tuple xy: position of the top-left corner of the sprite
+    :param bool transparent: if True, only the pixels that are on are
+        drawn, letting what's behind the sprite show through. Otherwise,
+        the sprite's bounding box is drawn opaque.
+    :param bool visible: whether the sprite is drawn
+    """
+
+    def __init__(self, image, xy=(0, 0), transparent=True, visible=True):
+        self.__image = self.__convert(image)
+        self.__xy = tuple(int(i) for i in xy)
+        self.__transparent = transparent
+        self.__visible = visible
+        self._layer = None
+
+    @staticmethod
+    def __convert(image):
+        return image if image.mode == "1" else image.convert("1")
+
+    @property
+    def image(self):
+        return self.__image
+
+    @image.setter
+    def image(self, image):
+        self.mark_dirty()
+        self.__image = self.__convert(image)
+        self.mark_dirty()
+
+    @property
+    def xy(self):
+        return self.__xy
+
+    @xy.setter
+    def xy(self, xy):
+        xy = tuple(int(i) for i in xy)
+        if xy == self.__xy:
+            return
+        self.mark_dirty()
+        self.__xy = xy
+        self.mark_dirty()
+
+    @property
+    def transparent(self):
+        return self.__transparent
+
+    @transparent.setter
+    def transparent(self, transparent):
+        self.__transparent = transparent
+        self.mark_dirty()
+
+    @property
+    def visible(self):
+        return self.__visible
+
+    @visible.setter
+    def visible(self, visible):
+        if visible == self.__visible:
+            return
+        self.__visible = visible
+        self._damage(self.bounding_box)
+
+    @property
+    def bounding_box(self):
+        """(left, top, right, bottom) rectangle covered by the sprite on the
+        screen, with exclusive right and bottom edges."""
+        x, y = self.__xy
+        width, height = self.__image.size
+        return (x, y, x + width, y + height)
+
+    def draw(self):
+        """Gets an :class:`PIL.ImageDraw.ImageDraw` to draw on the sprite's
+        image, marking the whole sprite as damaged.
+
+        :rtype: :class:`PIL.ImageDraw.ImageDraw`
+        """
+        self.mark_dirty()
+        return PIL.ImageDraw.Draw(self.__image)
+
+    def mark_dirty(self, box=None):
+        """Marks the sprite, or a region of it, as needing to be redrawn.
+
+        :param tuple box: (left, top, right, bottom) rectangle relative to
+            the sprite's top-left corner. The whole sprite if not provided.
+        """
+        if not self.__visible:
+            return
+        if box is None:
+            self._damage(self.bounding_box)
+            return
+        x, y = self.__xy
+        self._damage((box[0] + x, box[1] + y, box[2] + x, box[3] + y))
+
+    def _damage(self, box):
+        if self._layer is not None:
+            self._layer._damage(box)
+
+    def _draw_into(self, framebuffer, clip):
+        region = intersect(self.bounding_box, clip)
+        if region is None:
+            return
+        x, y = self.__xy
+        image = self.__image.crop(
+            (region[0] - x, region[1] - y, region[2] - x, region[3] - y)
+        )
+        if self.__transparent:
+            framebuffer.paste(1, box=region[:2], mask=image)
+        else:
+            framebuffer.paste(image, box=region[:2])
+
+
+class Layer:
+    """A group of sprites drawn by a :class:`Compositor`, in the order they
+    were added.
+
+    :param int z: layers with higher values are drawn on top
+    :param bool visible: whether the layer's sprites are drawn
+    """
+
+    def __init__(self, z=0, visible=True):
+        self.z = z
+        self.__visible = visible
+        self.__sprites = []
+        self._compositor = None
+
+    @property
+    def sprites(self):
+        return list(self.__sprites)
+
+    @property
+    def visible(self):
+        return self.__visible
+
+    @visible.setter
+    def visible(self, visible):
+        if visible == self.__visible:
+            return
+        self.__visible = visible
+        self.__damage_sprites()
+
+    def add(self, sprite):
+        """Adds a sprite on top of the layer's other sprites.
+
+        :param Sprite sprite: sprite to add
+        :return: the sprite
+        """
+        if sprite._layer is not None:
+            sprite._layer.remove(sprite)
+        self.__sprites.append(sprite)
+        sprite._layer = self
+        sprite.mark_dirty()
+        return sprite
+
+    def remove(self, sprite):
+        sprite.mark_dirty()
+        self.__sprites.remove(sprite)
+        sprite._layer = None
+
+    def _damage(self, box):
+        if self.__visible and self._compositor is not None:
+            self._compositor.damage(box)
+
+    def __damage_sprites(self):
+        if self._compositor is None:
+            return
+        for sprite in self.__sprites:
+            if sprite.visible:
+                self._compositor.damage(sprite.bounding_box)
+
+    def _draw_into(self, framebuffer, clip):
+        for sprite in self.__sprites:
+            if sprite.visible:
+                sprite._draw_into(framebuffer, clip)
+
+
+class Compositor:
+    """Retained-mode renderer for the miniscreen display.
+
+    Draws layers of sprites into a persistent 1-bit framebuffer. Changes to
+    sprites and layers are tracked as damaged rectangles, and only those
+    regions are redrawn by :meth:`render` and sent to the display by
+    :meth:`present`.
+
+    Example::
+
+        compositor = Compositor(miniscreen)
+        clock = compositor.add_sprite(Image.new("1", (40, 12)), xy=(44, 26))
+        while True:
+            draw = clock.draw()
+            draw.rectangle((0, 0, 39, 11), fill=0)
+            draw.text((0, 0), strftime("%H:%M"), fill=1)
+            compositor.present()
+
+    :param miniscreen: the :class:`pitop.miniscreen.Miniscreen` to draw on.
+        If not provided, frames are only rendered into :attr:`framebuffer`.
+    :param tuple size: size of the framebuffer; the size of the miniscreen
+        if not provided
+    :param int background: value of the pixels not covered by any sprite
+    """
+
+    def __init__(self, miniscreen=None, size=None, background=0):
+        if size is None:
+            size = miniscreen.size if miniscreen is not None else (128, 64)
+
+        self.__miniscreen = miniscreen
+        self.background = background
+        self.framebuffer = PIL.Image.new("1", size, background)
+        self.__layers = []
+        self.__damage = []
+        self.__lock = RLock()
+
+        self.add_layer()
+        self.damage()
+
+    @property
+    def size(self):
+        return self.framebuffer.size
+
+    @property
+    def bounding_box(self):
+        return (0, 0) + self.size
+
+    @property
+    def layers(self):
+        return list(self.__layers)
+
+    @property
+    def damaged_regions(self):
+        """Rectangles that will be redrawn by the next :meth:`render`.
+
+        :rtype: list
+        """
+        with self.__lock:
+            return merge_boxes(self.__damage)
+
+    def add_layer(self, layer=None, z=0):
+        """Adds a layer to the compositor.
+
+        :param Layer layer: layer to add; a new one is created if not
+            provided
+        :param int z: z-index of the created layer
+        :return: the layer
+        """
+        if layer is None:
+            layer = Layer(z=z)
+        with self.__lock:
+            self.__layers.append(layer)
+            # sort is stable, so layers with the same z keep their order
+            self.__layers.sort(key=lambda layer: layer.z)
+            layer._compositor = self
+        for sprite in layer.sprites:
+            layer._damage(sprite.bounding_box)
+        return layer
+
+    def remove_layer(self, layer):
+        for sprite in layer.sprites:
+            layer._damage(sprite.bounding_box)
+        with self.__lock:
+            self.__layers.remove(layer)
+            layer._compositor = None
+
+    def add_sprite(self, image, xy=(0, 0), layer=None, **kwargs):
+        """Creates a :class:`Sprite` and adds it on top of a layer.
+
+        :param image: image of the sprite
+        :param tuple xy: position of the sprite
+        :param Layer layer: layer to add the sprite to; the bottom layer
+            if not provided
+        :param kwargs: other :class:`Sprite` arguments
+        :rtype: Sprite
+        """
+        if layer is None:
+            layer = self.__layers[0]
+        return layer.add(Sprite(image, xy, **kwargs))
+
+    def damage(self, box=None):
+        """Marks a region of the screen as needing to be redrawn.
+
+        :param tuple box: (left, top, right, bottom) rectangle; the whole
+            screen if not provided
+        """
+        box = intersect(self.bounding_box if box is None else box, self.bounding_box)
+        if box is None:
+            return
+        with self.__lock:
+            self.__damage.append(box)
+
+    def render(self):
+        """Redraws the damaged regions of the framebuffer.
+
+        :return: the (left, top, right, bottom) rectangles that were
+            redrawn
+        :rtype: list
+        """
+        with self.__lock:
+            regions = merge_boxes(self.__damage)
+            self.__damage = []
+            for region in regions:
+                self.framebuffer.paste(self.background, box=region)
+                for layer in self.__layers:
+                    if layer.visible:
+                        layer._draw_into(self.framebuffer, region)
+            return regions
+
+    def present(self):
+        """Redraws the damaged regions of the framebuffer and sends them to
+        the miniscreen.
+
+        :return: the (left, top, right, bottom) rectangles that were sent
+        :rtype: list
+        """
+        with self.__lock:
+            regions = self.render()
+            if regions and self.__miniscreen is not None:
+                self.__miniscreen.display_regions(self.framebuffer, regions)
+            return regions
+
+    def invalidate(self):
+        """Redraws and sends the whole screen on the next :meth:`present`,
+        e.g. if something else was displayed on the miniscreen."""
+        self.damage()
+        if self.__miniscreen is not None:
+            self.__miniscreen.device.invalidate()
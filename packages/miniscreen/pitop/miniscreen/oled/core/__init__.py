@@ -1,3 +1,4 @@
 from .device_controller import OledDeviceController
 from .fps_regulator import FPS_Regulator
+from .frame_presenter import FramePresenter
 from .lock import MiniscreenLockFileMonitor
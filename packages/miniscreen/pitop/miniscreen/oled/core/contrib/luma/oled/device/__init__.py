@@ -1,22 +1,66 @@
+from time import perf_counter
+
+import numpy as np
+import PIL.Image
+
 import pitop.miniscreen.oled.core.contrib.luma.core.error
 import pitop.miniscreen.oled.core.contrib.luma.oled.const
 from pitop.miniscreen.oled.core.contrib.luma.core.device import device
 
 
+class FrameStats:
+    """Statistics of the frames sent to a display.
+
+    :param pages_sent: pages transmitted in the last frame
+    :param bytes_sent: data bytes transmitted in the last frame
+    :param encode_us: time spent encoding the last frame, in microseconds
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.pages_sent = 0
+        self.bytes_sent = 0
+        self.encode_us = 0.0
+        self.total_pages_sent = 0
+        self.total_bytes_sent = 0
+
+    def update(self, pages_sent, bytes_sent, encode_us):
+        self.frames += 1
+        self.pages_sent = pages_sent
+        self.bytes_sent = bytes_sent
+        self.encode_us = encode_us
+        self.total_pages_sent += pages_sent
+        self.total_bytes_sent += bytes_sent
+
+    def __repr__(self):
+        return (
+            f"FrameStats(frames={self.frames}, pages_sent={self.pages_sent}, "
+            f"bytes_sent={self.bytes_sent}, encode_us={self.encode_us:.1f})"
+        )
+
+
 class sh1106(device):
     """Serial interface to a monochrome SH1106 OLED display.
 
     On creation, an initialization sequence is pumped to the display to
     properly configure it. Further control commands can then be called
     to affect the brightness and other settings.
+
+    The last frame sent is kept, so that only the columns that changed
+    in each page are sent for the following frames.
     """
 
+    # the SH1106 has 132 columns of RAM; the 128 visible ones start at 2
+    COLUMN_OFFSET = 2
+
     def __init__(self, serial_interface=None, width=128, height=64, rotate=0, **kwargs):
         super(sh1106, self).__init__(
             pitop.miniscreen.oled.core.contrib.luma.oled.const.sh1106, serial_interface
         )
         self.capabilities(width, height, rotate)
         self._pages = self._h // 8
+        self._previous_pages = None
+        self.frame_stats = FrameStats()
 
         settings = {
             (128, 128): dict(multiplex=0xFF, displayoffset=0x02),
@@ -71,28 +115,135 @@ class sh1106(device):
         assert image.mode == self.mode
         assert image.size == self.size
 
-        image = self.preprocess(image)
-
-        set_page_address = 0xB0
-        image_data = image.getdata()
-        pixels_per_page = self.width * 8
-        buf = bytearray(self.width)
-
-        for y in range(0, int(self._pages * pixels_per_page), pixels_per_page):
-            self.command(set_page_address, 0x02, 0x10)
-            set_page_address += 1
-            offsets = [y + self.width * i for i in range(8)]
-
-            for x in range(self.width):
-                buf[x] = (
-                    (image_data[x + offsets[0]] and 0x01)
-                    | (image_data[x + offsets[1]] and 0x02)
-                    | (image_data[x + offsets[2]] and 0x04)
-                    | (image_data[x + offsets[3]] and 0x08)
-                    | (image_data[x + offsets[4]] and 0x10)
-                    | (image_data[x + offsets[5]] and 0x20)
-                    | (image_data[x + offsets[6]] and 0x40)
-                    | (image_data[x + offsets[7]] and 0x80)
-                )
-
-            self.data(list(buf))
+        start_time = perf_counter()
+        pages = self.encode_pages(self.preprocess(image))
+        encode_us = (perf_counter() - start_time) * 1e6
+
+        self.__send_pages(pages, 0, 0, self._w, encode_us)
+
+    def display_region(self, image, box):
+        """Sends the part of a 1-bit :py:mod:`PIL.Image` inside a rectangle to
+        the SH1106 OLED display, leaving the rest of the display untouched.
+
+        The whole image is sent if the content of the display isn't known,
+        or if the display is rotated.
+
+        :param image: Image to display, with the size of the display.
+        :type image: :py:mod:`PIL.Image`
+        :param tuple box: (left, top, right, bottom) rectangle to send
+        """
+        assert image.mode == self.mode
+        assert image.size == self.size
+
+        left, top, right, bottom = box
+        left, right = max(left, 0), min(right, self._w)
+        first_page, last_page = max(top, 0) // 8, (min(bottom, self._h) + 7) // 8
+        if left >= right or first_page >= last_page:
+            return
+
+        if self._previous_pages is None or self.rotate != 0:
+            self.display(image)
+            return
+
+        start_time = perf_counter()
+        pages = self.encode_pages(
+            image.crop((left, first_page * 8, right, last_page * 8))
+        )
+        encode_us = (perf_counter() - start_time) * 1e6
+
+        self.__send_pages(pages, first_page, left, right, encode_us)
+
+    def __send_pages(self, pages, first_page, left, right, encode_us):
+        """Sends the columns of each page that changed since the previous
+        frame.
+
+        :param pages: encoded pages, starting at page `first_page` and
+            covering columns `left` to `right`
+        """
+        previous_pages = self._previous_pages
+        if previous_pages is None:
+            previous_pages = self._previous_pages = np.zeros(
+                (self._pages, self._w), dtype=np.uint8
+            )
+            # nothing is known about the display, so send everything
+            changed = np.ones(pages.shape, dtype=bool)
+        else:
+            changed = (
+                pages
+                != previous_pages[first_page : first_page + len(pages), left:right]
+            )
+
+        pages_sent = 0
+        bytes_sent = 0
+        for offset, page in enumerate(pages):
+            changed_columns = np.flatnonzero(changed[offset])
+            if len(changed_columns) == 0:
+                continue
+            start, end = changed_columns[0], changed_columns[-1] + 1
+
+            page_number = first_page + offset
+            column = left + start + self.COLUMN_OFFSET
+            self.command(0xB0 + page_number, column & 0x0F, 0x10 | (column >> 4))
+            self.data(page[start:end].tolist())
+            pages_sent += 1
+            bytes_sent += end - start
+
+        previous_pages[first_page : first_page + len(pages), left:right] = pages
+        self.frame_stats.update(pages_sent, bytes_sent, encode_us)
+
+    def display_pages(self, pages):
+        """Sends a frame already encoded with :py:meth:`encode_pages` to the
+        SH1106 OLED display.
+
+        The frame is encoded from an image with the size of the display, as
+        passed to :py:meth:`display`. If the display is rotated, the frame
+        is decoded, rotated and encoded again before being sent.
+
+        :param pages: encoded frame, of shape (height / 8, width)
+        :type pages: numpy.ndarray
+        """
+        assert pages.shape == (self.height // 8, self.width)
+
+        if self.rotate != 0:
+            self.display(self.decode_pages(pages))
+            return
+
+        self.__send_pages(pages, 0, 0, self._w, 0.0)
+
+    @staticmethod
+    def encode_pages(image):
+        """Packs a 1-bit image into the display's page layout: one byte per
+        column and page, with the top row of the page in the least
+        significant bit.
+
+        :param image: Image to encode, with a height multiple of 8.
+        :type image: :py:mod:`PIL.Image`
+        :rtype: numpy.ndarray of shape (pages, width)
+        """
+        width, height = image.size
+        pixels = np.asarray(image, dtype=bool).reshape(height // 8, 8, width)
+        return np.packbits(pixels, axis=1, bitorder="little").reshape(
+            height // 8, width
+        )
+
+    @staticmethod
+    def decode_pages(pages):
+        """Unpacks pages encoded with :py:meth:`encode_pages` into a 1-bit
+        image.
+
+        :param pages: encoded pages, of shape (pages, width)
+        :type pages: numpy.ndarray
+        :rtype: :py:mod:`PIL.Image`
+        """
+        number_of_pages, width = pages.shape
+        pixels = np.unpackbits(
+            pages.reshape(number_of_pages, 1, width), axis=1, bitorder="little"
+        )
+        return PIL.Image.fromarray(
+            pixels.reshape(number_of_pages * 8, width).astype(bool)
+        )
+
+    def invalidate(self):
+        """Forget the last frame sent, so that the next one is sent in full,
+        e.g. if something else may have drawn on the display."""
+        self._previous_pages = None
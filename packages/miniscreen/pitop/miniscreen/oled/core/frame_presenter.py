@@ -0,0 +1,141 @@
+import logging
+from threading import Condition, Thread
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+
+class FramePresenter:
+    """Sends frames to a display from a background thread, so that callers
+    don't wait for frames to be encoded and transferred.
+
+    Frames are double-buffered: one frame is being presented while the
+    latest submitted frame waits in a second slot. A frame that is replaced
+    before it's presented is dropped.
+
+    :param present_function: function called on the presenter's thread
+        with each frame to present and whether the whole frame has to be
+        sent
+    :param fps_regulator: if provided, the
+        :class:`pitop.miniscreen.oled.core.FPS_Regulator` used to limit the
+        rate at which frames are presented
+    """
+
+    def __init__(self, present_function, fps_regulator=None):
+        self.__present = present_function
+        self.__fps_regulator = fps_regulator
+
+        self.__condition = Condition()
+        self.__pending_frame = None
+        self.__presenting = False
+        self.__running = True
+
+        self.frames_submitted = 0
+        self.frames_presented = 0
+        self.frames_dropped = 0
+        # seconds from a frame being submitted to it being sent
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.__total_latency = 0.0
+
+        self.__thread = Thread(target=self.__present_loop, daemon=True)
+        self.__thread.start()
+
+    @property
+    def is_running(self) -> bool:
+        return self.__running
+
+    @property
+    def average_latency(self) -> float:
+        if self.frames_presented == 0:
+            return 0.0
+        return self.__total_latency / self.frames_presented
+
+    def submit(self, image, force=False) -> None:
+        """Queues a frame to be presented, replacing the frame waiting to be
+        presented if there's one.
+
+        The image must not be modified after it's submitted.
+
+        :param image: frame to present
+        :type image: :class:`PIL.Image.Image`
+        :param bool force: whether the whole frame has to be sent. Kept if
+            the frame replaces another one that had to be sent in full.
+        """
+        with self.__condition:
+            if not self.__running:
+                raise RuntimeError("Frame presenter has been stopped")
+
+            if self.__pending_frame is not None:
+                self.frames_dropped += 1
+                force = force or self.__pending_frame[1]
+
+            self.__pending_frame = (image, force, perf_counter())
+            self.frames_submitted += 1
+            self.__condition.notify_all()
+
+    def wait(self, timeout=None) -> bool:
+        """Waits until all submitted frames are presented or dropped.
+
+        :param float timeout: maximum time to wait in seconds
+        :return: False if the timeout expired before then
+        :rtype: bool
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: self.__pending_frame is None and not self.__presenting,
+                timeout,
+            )
+
+    def stop(self) -> None:
+        """Presents the frame waiting to be presented, if any, and stops the
+        presenter's thread."""
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+        self.__thread.join()
+
+    def __next_frame(self):
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: self.__pending_frame is not None or not self.__running
+            )
+            if self.__pending_frame is None:
+                return None
+
+        if self.__fps_regulator is not None:
+            # wait before taking the frame, so that the latest one is sent
+            self.__fps_regulator.stop_timer()
+
+        with self.__condition:
+            frame = self.__pending_frame
+            self.__pending_frame = None
+            self.__presenting = True
+            return frame
+
+    def __present_loop(self):
+        while True:
+            frame = self.__next_frame()
+            if frame is None:
+                return
+
+            image, force, submit_time = frame
+            presented = True
+            try:
+                self.__present(image, force)
+            except Exception as e:
+                presented = False
+                logger.error(f"Error presenting frame: {e}")
+
+            if self.__fps_regulator is not None:
+                self.__fps_regulator.start_timer()
+
+            latency = perf_counter() - submit_time
+            with self.__condition:
+                if presented:
+                    self.frames_presented += 1
+                    self.last_latency = latency
+                    self.max_latency = max(self.max_latency, latency)
+                    self.__total_latency += latency
+                self.__presenting = False
+                self.__condition.notify_all()
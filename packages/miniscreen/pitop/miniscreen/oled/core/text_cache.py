@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+
+import PIL.ImageFont
+
+
+@lru_cache(maxsize=32)
+def get_font(path, size):
+    """Loads a TrueType or OpenType font, reusing it if it was already
+    loaded.
+
+    Fonts are shared between callers, so they should not be modified.
+
+    :param str path: filename or path of the font
+    :param int size: font size in pixels
+    :rtype: PIL.ImageFont.FreeTypeFont
+    """
+    return PIL.ImageFont.truetype(path, size=size)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a bounded total cost.
+
+    :param int max_cost: maximum total cost of the cached values; the
+        least recently used values are evicted when it's exceeded
+    :param cost: function returning the cost of a value. Each value costs
+        1 if not provided, which bounds the number of entries.
+    """
+
+    def __init__(self, max_cost, cost=None):
+        self.max_cost = max_cost
+        self.__cost = cost if cost is not None else lambda value: 1
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+        self.total_cost = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def get(self, key, default=None):
+        with self.__lock:
+            try:
+                value, _ = self.__entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        cost = self.__cost(value)
+        with self.__lock:
+            if key in self.__entries:
+                self.total_cost -= self.__entries.pop(key)[1]
+            if cost > self.max_cost:
+                return
+            self.__entries[key] = (value, cost)
+            self.total_cost += cost
+            while self.total_cost > self.max_cost:
+                _, (_, evicted_cost) = self.__entries.popitem(last=False)
+                self.total_cost -= evicted_cost
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.total_cost = 0
+            self.hits = 0
+            self.misses = 0
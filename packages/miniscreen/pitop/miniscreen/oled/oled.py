@@ -1,13 +1,14 @@
 import logging
 from atexit import register
-from threading import Thread, current_thread, main_thread
-from time import sleep
+from threading import Event, RLock, Thread, current_thread, main_thread
+from time import monotonic
 
 from pitop.common.ptdm import Message, PTDMSubscribeClient
 from pitop.core import ImageFunctions
 
+from .animation import Animation
 from .assistant import MiniscreenAssistant
-from .core import FPS_Regulator, OledDeviceController
+from .core import FPS_Regulator, FramePresenter, OledDeviceController
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,11 @@ class OLED:
 
         self.__visible = False
         self.__auto_play_thread = None
+        self.__stop_animation = Event()
+        self.__presenter = None
+        # held while sending anything to the display, which can happen from
+        # the presenter and animation threads as well as the caller's
+        self.__device_lock = RLock()
 
         self.reset()
 
@@ -162,11 +168,53 @@ class OLED:
         """
         self.__fps_regulator.set_max_fps(max_fps)
 
+    @property
+    def presenter(self):
+        """Gets the background presenter sending frames to the miniscreen
+        display, or None if frames are sent by the thread that displays
+        them.
+
+        The presenter provides counters of the frames presented and dropped,
+        and the latency of the frames.
+
+        :rtype: :class:`pitop.miniscreen.oled.core.FramePresenter`
+        """
+        return self.__presenter
+
+    def start_background_presenter(self):
+        """Sends frames to the miniscreen display from a background thread.
+
+        The display methods return as soon as the frame is queued, without
+        waiting for the frame to be sent or for the maximum frame rate. If
+        a new frame is displayed before the previous one was sent, the
+        previous one is dropped.
+        """
+        if self.__presenter is None:
+            self.__presenter = FramePresenter(
+                self.__present_frame, fps_regulator=self.__fps_regulator
+            )
+
+    def stop_background_presenter(self):
+        """Sends the frame waiting to be presented, if any, and goes back to
+        sending frames from the thread that displays them."""
+        presenter = self.__presenter
+        if presenter is not None:
+            self.__presenter = None
+            presenter.stop()
+
+    def __present_frame(self, image, force):
+        with self.__device_lock:
+            if force:
+                # the display may have been drawn to by something else
+                self.device.invalidate()
+            self.device.display(image)
+
     def show(self):
         """The miniscreen display comes out of low power mode showing the
         previous image shown before hide() was called (so long as display() has
         not been called)"""
-        self.device.show()
+        with self.__device_lock:
+            self.device.show()
         self.__visible = True
 
     def hide(self):
@@ -176,7 +224,8 @@ class OLED:
         even if the internal frame buffer has been changed (so long as
         display() has not been called).
         """
-        self.device.hide()
+        with self.__device_lock:
+            self.device.hide()
         self.__visible = False
 
     def contrast(self, new_contrast_value):
@@ -188,7 +237,8 @@ class OLED:
         """
         assert new_contrast_value in range(0, 256)
 
-        self.device.contrast(new_contrast_value)
+        with self.__device_lock:
+            self.device.contrast(new_contrast_value)
 
     def wake(self):
         """The miniscreen display is set to high contrast mode, without
@@ -214,8 +264,11 @@ class OLED:
             self.__display(self.image, force=True)
 
     def refresh(self):
-        self.set_control_to_pi()
-        self._controller.reset_device()
+        if self.__presenter is not None:
+            self.__presenter.wait()
+        with self.__device_lock:
+            self.set_control_to_pi()
+            self._controller.reset_device()
         self._redraw_last_image()
 
     def reset(self, force=True):
@@ -357,14 +410,60 @@ class OLED:
         if invert:
             image_to_display = self.assistant.invert(image_to_display)
 
+        if self.__presenter is not None:
+            redisplay = force or self.should_redisplay(image_to_display)
+            self.image = image_to_display.copy()
+            if redisplay:
+                self.__presenter.submit(self.image, force)
+            return
+
         self.__fps_regulator.stop_timer()
 
-        if force or self.should_redisplay(image_to_display):
-            self.device.display(image_to_display)
+        with self.__device_lock:
+            if force:
+                # the display may have been drawn to by something else
+                self.device.invalidate()
+
+            if force or self.should_redisplay(image_to_display):
+                self.device.display(image_to_display)
 
         self.__fps_regulator.start_timer()
         self.image = image_to_display.copy()
 
+    def display_regions(self, image, boxes):
+        """Render the parts of an image inside the given rectangles to the
+        screen, leaving the rest of the screen unchanged.
+
+        Only the display pages covered by the rectangles are encoded and
+        sent, which makes this faster than `display_image` for small
+        changes, e.g. when used by a
+        :class:`pitop.miniscreen.oled.compositor.Compositor`.
+
+        :param Image image: A 1-bit PIL Image object with the size of the screen
+        :param list boxes: (left, top, right, bottom) rectangles to render
+        """
+        self.stop_animated_image()
+
+        if self.image is None or self.image.size != image.size:
+            self.image = self.assistant.empty_image
+
+        if self.__presenter is not None:
+            # the presented frame must not change after it's submitted
+            self.image = self.image.copy()
+            for box in boxes:
+                self.image.paste(image.crop(box), box[:2])
+            self.__presenter.submit(self.image)
+            return
+
+        self.__fps_regulator.stop_timer()
+        with self.__device_lock:
+            for box in boxes:
+                self.device.display_region(image, box)
+        for box in boxes:
+            self.image.paste(image.crop(box), box[:2])
+
+        self.__fps_regulator.start_timer()
+
     def play_animated_image_file(self, file_path_or_url, background=False, loop=False):
         """Render an animated image to the screen from a file or URL.
 
@@ -374,22 +473,31 @@ class OLED:
         :param bool loop: Set whether the image animation should start
             again when it has finished
         """
-        image = ImageFunctions.get_pil_image_from_path(file_path_or_url)
-        self.play_animated_image(image, background, loop)
+        animation = Animation.from_file(file_path_or_url, self.assistant)
+        self.play_animated_image(animation, background, loop)
 
     def play_animated_image(self, image, background=False, loop=False):
         """Render an animation or a image to the screen.
 
+        The frames of the image are decoded before the animation starts,
+        and shown at the times given by their durations. Frames that can't
+        be shown on time are skipped, so the animation doesn't drift.
+
         Use stop_animated_image() to end a background animation
 
-        :param Image image: A PIL Image object to be rendered
+        :param Image image: A PIL Image object to be rendered, or an
+            :class:`pitop.miniscreen.oled.animation.Animation` that was
+            already decoded
         :param bool background: Set whether the image should be in a
             background thread or in the main thread.
         :param bool loop: Set whether the image animation should start
             again when it has finished
         """
         self.stop_animated_image()
-        self.__kill_thread = False
+        if not isinstance(image, Animation):
+            image = Animation.from_image(image, self.assistant)
+
+        self.__stop_animation.clear()
         if background is True:
             self.__auto_play_thread = Thread(
                 target=self.__auto_play, args=(image, loop), daemon=True
@@ -406,7 +514,7 @@ class OLED:
             return
 
         if self.__auto_play_thread is not None and self.__auto_play_thread.is_alive():
-            self.__kill_thread = True
+            self.__stop_animation.set()
             self.__auto_play_thread.join()
 
     ##################################################
@@ -541,20 +649,32 @@ class OLED:
     ####################
     # Internal support #
     ####################
-    def __auto_play(self, image, loop=False):
-        while True:
-            for frame in self.assistant.get_frame_iterator(image):
-                if self.__kill_thread:
-                    break
+    def __auto_play(self, animation, loop=False):
+        # frames are scheduled from the start time of the animation rather
+        # than from the previous frame, so that delays don't accumulate
+        start_time = monotonic()
+        shown_frame = None
+        while not self.__stop_animation.is_set():
+            frame, time_to_next_frame = animation.frame_at(
+                monotonic() - start_time, loop
+            )
+            if frame is None:
+                break
 
-                self.display_image(frame)
-                # Wait for animated image's frame length
-                sleep(float(frame.info["duration"] / 1000))  # ms to s
+            if frame != shown_frame:
+                self.image = animation.frame_image(frame)
+                if self.__presenter is not None:
+                    self.__presenter.submit(self.image)
+                else:
+                    with self.__device_lock:
+                        self.device.display_pages(animation.frame_pages(frame))
+                shown_frame = frame
 
-            if self.__kill_thread or not loop:
-                self.reset()
-                break
+            self.__stop_animation.wait(time_to_next_frame)
+
+        self.reset()
 
     def __cleanup(self):
         self.stop_animated_image()
+        self.stop_background_presenter()
         self._ptdm_subscribe_client.stop_listening()
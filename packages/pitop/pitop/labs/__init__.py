@@ -1,10 +1,17 @@
+from .web.asyncserver import AsyncWebServer
 from .web.blueprints import (
     BaseBlueprint,
     ControllerBlueprint,
     MessagingBlueprint,
     RoverControllerBlueprint,
+    TelemetryBlueprint,
     VideoBlueprint,
     WebComponentsBlueprint,
 )
-from .web.webcontroller import RoverWebController, WebController
+from .web.webcontroller import (
+    AsyncRoverWebController,
+    AsyncWebController,
+    RoverWebController,
+    WebController,
+)
 from .web.webserver import WebServer, create_app
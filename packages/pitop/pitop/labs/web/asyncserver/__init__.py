@@ -0,0 +1,3 @@
+from .http import AsyncRequest, AsyncStreamResponse
+from .server import AsyncWebServer
+from .websocket import AsyncWebSocket
@@ -0,0 +1,242 @@
+import asyncio
+import sys
+from http import HTTPStatus
+from io import BytesIO
+from urllib.parse import parse_qsl, unquote
+
+from werkzeug.datastructures import Headers, MultiDict
+
+# Largest request line and headers accepted, in bytes
+MAX_HEADER_SIZE = 1 << 16
+
+
+class BadRequest(Exception):
+    pass
+
+
+class AsyncRequest:
+    """An HTTP request received by an :class:`AsyncWebServer`.
+
+    :param str method: method of the request, e.g. "GET"
+    :param str target: path and query string of the request
+    :param str version: HTTP version of the request, e.g. "HTTP/1.1"
+    :param Headers headers: headers of the request
+    :param bytes body: body of the request
+    """
+
+    def __init__(self, method, target, version, headers, body=b""):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+        path, _, self.query_string = target.partition("?")
+        self.path = unquote(path)
+
+    @property
+    def args(self) -> MultiDict:
+        """Arguments of the query string, like :attr:`flask.Request.args`."""
+        return MultiDict(parse_qsl(self.query_string, keep_blank_values=True))
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants to send more requests on the connection."""
+        connection = self.headers.get("Connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+async def read_request(reader):
+    """Reads the next request of a connection.
+
+    :param asyncio.StreamReader reader: stream of the connection
+    :return: :class:`AsyncRequest`, or None if the connection is closed
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if len(e.partial) == 0:
+            return None
+        raise BadRequest("Incomplete request")
+    except asyncio.LimitOverrunError:
+        raise BadRequest("Request headers are too large")
+
+    request_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError:
+        raise BadRequest("Invalid request line")
+
+    headers = Headers()
+    for line in header_lines:
+        name, separator, value = line.partition(":")
+        if not separator:
+            raise BadRequest("Invalid header")
+        headers.add(name.strip(), value.strip())
+
+    if "chunked" in headers.get("Transfer-Encoding", "").lower():
+        raise BadRequest("Chunked request bodies are not supported")
+
+    body = b""
+    content_length = headers.get("Content-Length", 0, type=int)
+    if content_length:
+        body = await reader.readexactly(content_length)
+
+    return AsyncRequest(method, target, version, headers, body)
+
+
+def _response_head(status, headers):
+    lines = [f"HTTP/1.1 {status}"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_error(writer, status):
+    """Sends an empty response with an error status, closing the connection.
+
+    :param asyncio.StreamWriter writer: stream of the connection
+    :param HTTPStatus status: status to send
+    """
+    writer.write(
+        _response_head(
+            f"{status.value} {status.phrase}",
+            [("Content-Length", "0"), ("Connection", "close")],
+        )
+    )
+    await writer.drain()
+
+
+class AsyncStreamResponse:
+    """A response streamed to a client by an :class:`AsyncWebServer` route.
+    Writing waits until the client can take more data, so slow clients slow
+    down the route instead of data building up in memory.
+
+    :param asyncio.StreamWriter writer: stream of the connection
+    """
+
+    def __init__(self, writer):
+        self.bytes_sent = 0
+
+        self.__writer = writer
+        self.__started = False
+
+    @property
+    def started(self) -> bool:
+        return self.__started
+
+    async def start(self, status=HTTPStatus.OK, headers=()):
+        """Sends the status and headers of the response. The connection is
+        closed once the response ends.
+
+        :param HTTPStatus status: status of the response
+        :param headers: pairs of header names and values
+        """
+        status = HTTPStatus(status)
+        self.__started = True
+        self.__writer.write(
+            _response_head(
+                f"{status.value} {status.phrase}",
+                list(headers) + [("Connection", "close")],
+            )
+        )
+        await self.__writer.drain()
+
+    async def write(self, data):
+        """Sends part of the body of the response.
+
+        :param bytes data: data to send
+        """
+        if not self.__started:
+            await self.start()
+        self.__writer.write(data)
+        self.bytes_sent += len(data)
+        await self.__writer.drain()
+
+
+def _wsgi_environ(request, server_name, server_port, remote_address, url_scheme):
+    environ = {
+        "REQUEST_METHOD": request.method,
+        "SCRIPT_NAME": "",
+        "PATH_INFO": request.path,
+        "QUERY_STRING": request.query_string,
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": request.version,
+        "REMOTE_ADDR": remote_address,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": url_scheme,
+        "wsgi.input": BytesIO(request.body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in request.headers.items():
+        key = name.upper().replace("-", "_")
+        if key in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[key] = value
+            continue
+        key = f"HTTP_{key}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def respond_with_wsgi(app, request, writer, url_scheme="http"):
+    """Responds to a request with a WSGI app, e.g. a Flask app. The app is
+    run on the event loop's thread pool so that it doesn't block other
+    connections.
+
+    :param app: WSGI app
+    :param AsyncRequest request: request to respond to
+    :param asyncio.StreamWriter writer: stream of the connection
+    :param str url_scheme: "http" or "https"
+    :return: bool, whether the connection can be used for more requests
+    """
+    loop = asyncio.get_running_loop()
+    server_name, server_port = writer.get_extra_info("sockname")[:2]
+    peer = writer.get_extra_info("peername")
+    environ = _wsgi_environ(
+        request,
+        server_name,
+        server_port,
+        peer[0] if peer else "",
+        url_scheme,
+    )
+
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response["status"] = status
+        response["headers"] = headers
+
+    body = await loop.run_in_executor(None, app, environ, start_response)
+    iterator = iter(body)
+    try:
+        # Apps may only call start_response once they're iterated
+        first_chunk = await loop.run_in_executor(None, next, iterator, None)
+
+        headers = [
+            (name, value)
+            for name, value in response["headers"]
+            if name.lower() != "connection"
+        ]
+        has_length = any(name.lower() == "content-length" for name, _ in headers)
+        # The end of responses of unknown length is marked by closing the
+        # connection
+        keep_alive = request.keep_alive and has_length
+        headers.append(("Connection", "keep-alive" if keep_alive else "close"))
+
+        writer.write(_response_head(response["status"], headers))
+        chunk = first_chunk
+        while chunk is not None:
+            if request.method != "HEAD":
+                writer.write(chunk)
+            await writer.drain()
+            chunk = await loop.run_in_executor(None, next, iterator, None)
+        await writer.drain()
+        return keep_alive
+    finally:
+        if hasattr(body, "close"):
+            await loop.run_in_executor(None, body.close)
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+from contextlib import suppress
+from http import HTTPStatus
+from threading import Event, Thread
+
+from pitop.common.flask_sockets import Sockets
+
+from ..blueprints.base import BaseBlueprint
+from ..webserver import create_app, log_server_address
+from .http import (
+    MAX_HEADER_SIZE,
+    AsyncStreamResponse,
+    BadRequest,
+    read_request,
+    respond_with_wsgi,
+    send_error,
+)
+from .websocket import AsyncWebSocket, handshake_response, is_websocket_request
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWebServer:
+    """A web server built on asyncio, which can be used instead of
+    :class:`WebServer` with the same blueprints.
+
+    Blueprints with an :code:`async_routes` method serve those routes, e.g.
+    video streams, as coroutines on the event loop, and those with an
+    :code:`async_socket_routes` method serve WebSockets the same way. Other
+    requests are handled by the Flask app, on the event loop's thread pool.
+
+    :param int port: port to listen on, 8070 by default; 0 to use any free
+        port
+    :param app: Flask app; a new one if not provided
+    :param blueprints: Flask blueprints to register
+    :param ssl.SSLContext ssl_context: context to serve HTTPS with
+    """
+
+    # Time a WebSocket route has to finish after its client disconnects,
+    # before it's cancelled, in seconds
+    CLOSE_TIMEOUT = 5
+
+    def __init__(
+        self,
+        port=None,
+        app=None,
+        blueprints=[BaseBlueprint()],
+        ssl_context=None,
+    ):
+        if port is None:
+            port = 8070
+
+        if app is None:
+            app = create_app()
+
+        self.port = port
+        self.app = app
+        # Blueprints with WebSockets register them with sockets, which are
+        # only used by WebServer
+        self.sockets = Sockets(app)
+        self.ssl_context = ssl_context
+
+        self.__routes = {}
+        self.__socket_routes = {}
+        with self.app.app_context():
+            for blueprint in blueprints:
+                self.app.register_blueprint(blueprint, sockets=self.sockets)
+
+        # Child blueprints are registered with the app too
+        for blueprint in self.app.blueprints.values():
+            if hasattr(blueprint, "async_routes"):
+                self.__routes.update(blueprint.async_routes())
+            if hasattr(blueprint, "async_socket_routes"):
+                self.__socket_routes.update(blueprint.async_socket_routes())
+
+        self.streams_cancelled = 0
+
+        self.__loop = None
+        self.__stopped = None
+        self.__ready = Event()
+        self.__error = None
+        self.__thread = None
+
+    def route(self, path):
+        """Decorator that serves a path with a coroutine, called with an
+        :class:`AsyncRequest` and an :class:`AsyncStreamResponse`."""
+
+        def decorator(handler):
+            self.__routes[path] = handler
+            return handler
+
+        return decorator
+
+    def socket_route(self, path):
+        """Decorator that serves WebSockets at a path with a coroutine,
+        called with an :class:`AsyncWebSocket` and an
+        :class:`AsyncRequest`."""
+
+        def decorator(handler):
+            self.__socket_routes[path] = handler
+            return handler
+
+        return decorator
+
+    @property
+    def started(self) -> bool:
+        return self.__loop is not None
+
+    def start(self):
+        """Starts the server on a thread of its own, returning once it's
+        listening."""
+        self.__ready.clear()
+        self.__error = None
+        self.__thread = Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+        self.__ready.wait()
+        if self.__error is not None:
+            raise self.__error
+
+    def serve_forever(self):
+        """Starts the server and waits until it's stopped."""
+        self.__run()
+
+    def stop(self):
+        """Stops the server, closing its connections."""
+        if self.__loop is None:
+            return
+
+        with suppress(RuntimeError):
+            self.__loop.call_soon_threadsafe(self.__stopped.set)
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def __run(self):
+        try:
+            asyncio.run(self.__serve())
+        except Exception as e:
+            self.__error = e
+            if self.__thread is None:
+                raise
+        finally:
+            self.__loop = None
+            self.__ready.set()
+
+    async def __serve(self):
+        self.__stopped = asyncio.Event()
+        server = await asyncio.start_server(
+            self.__handle_connection,
+            "0.0.0.0",
+            self.port,
+            ssl=self.ssl_context,
+            limit=MAX_HEADER_SIZE,
+        )
+        # Use the port chosen by the system, if any port was asked for
+        self.port = server.sockets[0].getsockname()[1]
+        log_server_address(self.port, self.ssl_context)
+        self.__loop = asyncio.get_running_loop()
+        self.__ready.set()
+
+        try:
+            await self.__stopped.wait()
+        finally:
+            server.close()
+            # Close connections, e.g. video streams, which would otherwise
+            # go on until their clients disconnect
+            tasks = [
+                task
+                for task in asyncio.all_tasks()
+                if task is not asyncio.current_task()
+            ]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await server.wait_closed()
+
+    async def __handle_connection(self, reader, writer):
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await read_request(reader)
+                except BadRequest:
+                    await send_error(writer, HTTPStatus.BAD_REQUEST)
+                    return
+                if request is None:
+                    return
+                keep_alive = await self.__handle_request(request, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            # The server is stopping. Connection tasks end normally, as some
+            # versions of asyncio log an error for cancelled ones.
+            pass
+        except Exception as e:
+            logger.error(f"Error handling request: {e}")
+        finally:
+            writer.close()
+            with suppress(Exception):
+                await writer.wait_closed()
+
+    async def __handle_request(self, request, reader, writer):
+        socket_route = self.__socket_routes.get(request.path)
+        if socket_route is not None and is_websocket_request(request):
+            await self.__serve_websocket(socket_route, request, reader, writer)
+            return False
+
+        route = self.__routes.get(request.path)
+        if route is not None:
+            await self.__serve_stream(route, request, reader, writer)
+            return False
+
+        url_scheme = "https" if self.ssl_context else "http"
+        return await respond_with_wsgi(self.app, request, writer, url_scheme)
+
+    async def __serve_stream(self, route, request, reader, writer):
+        response = AsyncStreamResponse(writer)
+        stream = asyncio.ensure_future(route(request, response))
+        # Clients don't send anything while receiving a stream, so reaching
+        # the end of the connection means they've disconnected
+        disconnected = asyncio.ensure_future(reader.read())
+        try:
+            await asyncio.wait(
+                {stream, disconnected}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not stream.done():
+                self.streams_cancelled += 1
+                stream.cancel()
+            with suppress(asyncio.CancelledError, ConnectionError):
+                await stream
+        except Exception as e:
+            logger.error(f"Error streaming {request.path}: {e}")
+            if not response.started:
+                await send_error(writer, HTTPStatus.INTERNAL_SERVER_ERROR)
+        finally:
+            stream.cancel()
+            disconnected.cancel()
+
+    async def __serve_websocket(self, route, request, reader, writer):
+        try:
+            handshake = handshake_response(request)
+        except ValueError:
+            await send_error(writer, HTTPStatus.BAD_REQUEST)
+            return
+
+        writer.write(handshake)
+        await writer.drain()
+
+        ws = AsyncWebSocket(reader, writer)
+        receiving = asyncio.ensure_future(ws._read_messages())
+        handling = asyncio.ensure_future(route(ws, request))
+        try:
+            await asyncio.wait(
+                {receiving, handling}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not handling.done():
+                # Let the route handle the messages left and finish, e.g.
+                # stopping motors, before cancelling it
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(asyncio.shield(handling), self.CLOSE_TIMEOUT)
+            handling.cancel()
+            with suppress(asyncio.CancelledError, ConnectionError):
+                await handling
+        except Exception as e:
+            logger.error(f"Error handling WebSocket {request.path}: {e}")
+        finally:
+            handling.cancel()
+            receiving.cancel()
+            await ws.close()
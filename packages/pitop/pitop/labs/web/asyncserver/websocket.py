@@ -0,0 +1,268 @@
+import asyncio
+from base64 import b64encode
+from hashlib import sha1
+from struct import Struct
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+CONTINUATION = 0x0
+TEXT = 0x1
+BINARY = 0x2
+CLOSE = 0x8
+PING = 0x9
+PONG = 0xA
+
+NORMAL_CLOSURE = 1000
+PROTOCOL_ERROR = 1002
+INVALID_DATA = 1007
+MESSAGE_TOO_BIG = 1009
+
+_uint16 = Struct("!H")
+_uint64 = Struct("!Q")
+
+
+def is_websocket_request(request):
+    """Returns whether an HTTP request asks to upgrade to a WebSocket.
+
+    :param AsyncRequest request: request to check
+    :return: bool
+    """
+    return (
+        request.headers.get("Upgrade", "").lower() == "websocket"
+        and "upgrade" in request.headers.get("Connection", "").lower()
+    )
+
+
+def handshake_response(request):
+    """Returns the response accepting a WebSocket upgrade request.
+
+    :param AsyncRequest request: upgrade request
+    :return: bytes
+    """
+    key = request.headers.get("Sec-WebSocket-Key")
+    if key is None or request.headers.get("Sec-WebSocket-Version") != "13":
+        raise ValueError("Unsupported WebSocket upgrade request")
+
+    accept = b64encode(sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+    return (
+        "HTTP/1.1 101 Switching Protocols\r\n"
+        "Upgrade: websocket\r\n"
+        "Connection: Upgrade\r\n"
+        f"Sec-WebSocket-Accept: {accept}\r\n"
+        "\r\n"
+    ).encode()
+
+
+def encode_frame(opcode, payload):
+    """Encodes an unmasked, unfragmented frame, as sent by servers.
+
+    :param int opcode: type of frame
+    :param bytes payload: data of the frame
+    :return: bytes
+    """
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 1 << 16:
+        header = bytes([0x80 | opcode, 126]) + _uint16.pack(length)
+    else:
+        header = bytes([0x80 | opcode, 127]) + _uint64.pack(length)
+    return header + payload
+
+
+def _unmask(payload, mask):
+    # XOR the payload with the mask repeated to its length, as one integer
+    repeated_mask = (mask * (len(payload) // 4 + 1))[: len(payload)]
+    return (
+        int.from_bytes(payload, "big") ^ int.from_bytes(repeated_mask, "big")
+    ).to_bytes(len(payload), "big")
+
+
+class WebSocketClosed(ConnectionError):
+    pass
+
+
+class AsyncWebSocket:
+    """A server side WebSocket connection, used by the routes of an
+    :class:`AsyncWebServer`.
+
+    Received messages wait in a bounded queue; while it's full, frames stop
+    being read, so clients sending faster than they're handled are slowed
+    down by TCP instead of using up memory.
+
+    :param asyncio.StreamReader reader: stream of the connection
+    :param asyncio.StreamWriter writer: stream of the connection
+    :param int max_message_size: size of the largest message accepted, in
+        bytes
+    :param int receive_queue_size: number of received messages that can
+        wait to be handled
+    """
+
+    def __init__(self, reader, writer, max_message_size=1 << 20, receive_queue_size=32):
+        self.max_message_size = max_message_size
+
+        self.__reader = reader
+        self.__writer = writer
+        self.__loop = asyncio.get_running_loop()
+        self.__messages = asyncio.Queue(maxsize=receive_queue_size)
+        self.__send_lock = asyncio.Lock()
+        self.__closed = False
+        self.__close_sent = False
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    async def receive(self):
+        """Returns the next message received, waiting for it if necessary.
+
+        :return: str for text messages, bytes for binary ones, or None once
+            the connection is closed
+        """
+        if self.__closed and self.__messages.empty():
+            return None
+        return await self.__messages.get()
+
+    async def send(self, message):
+        """Sends a message, waiting until the connection can take more data.
+
+        :param message: str to send a text message, bytes for a binary one
+        """
+        if isinstance(message, str):
+            await self.__send_frame(TEXT, message.encode())
+        else:
+            await self.__send_frame(BINARY, bytes(message))
+
+    def send_threadsafe(self, message):
+        """Schedules a message to be sent, from any thread, without waiting
+        for it to be sent. Messages scheduled after the connection is closed
+        are dropped.
+
+        :param message: str to send a text message, bytes for a binary one
+        """
+        if self.__closed:
+            return
+
+        coroutine = self.__send_quietly(message)
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        try:
+            if running_loop is self.__loop:
+                self.__loop.create_task(coroutine)
+            else:
+                asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+        except RuntimeError:
+            # The loop has been closed
+            coroutine.close()
+
+    async def close(self, code=NORMAL_CLOSURE):
+        """Closes the connection.
+
+        :param int code: status code to close with
+        """
+        self.__closed = True
+        if self.__close_sent:
+            return
+        self.__close_sent = True
+        try:
+            await self.__send_frame(CLOSE, _uint16.pack(code), force=True)
+        except ConnectionError:
+            pass
+
+    async def __send_quietly(self, message):
+        try:
+            await self.send(message)
+        except ConnectionError:
+            pass
+
+    async def __send_frame(self, opcode, payload, force=False):
+        if self.__closed and not force:
+            raise WebSocketClosed("WebSocket is closed")
+
+        async with self.__send_lock:
+            self.__writer.write(encode_frame(opcode, payload))
+            await self.__writer.drain()
+
+    async def _read_messages(self):
+        """Reads frames until the connection is closed, answering pings and
+        queueing messages to be received."""
+        try:
+            await self.__read_messages()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.__closed = True
+            await self.__messages.put(None)
+
+    async def __read_frame(self):
+        first, second = await self.__reader.readexactly(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        length = second & 0x7F
+        if length == 126:
+            (length,) = _uint16.unpack(await self.__reader.readexactly(2))
+        elif length == 127:
+            (length,) = _uint64.unpack(await self.__reader.readexactly(8))
+
+        if not masked:
+            # Clients must mask the frames they send
+            await self.close(PROTOCOL_ERROR)
+            return None
+        if length > self.max_message_size:
+            await self.close(MESSAGE_TOO_BIG)
+            return None
+
+        mask = await self.__reader.readexactly(4)
+        payload = _unmask(await self.__reader.readexactly(length), mask)
+        return fin, opcode, payload
+
+    async def __read_messages(self):
+        fragments = []
+        fragments_opcode = None
+        while True:
+            frame = await self.__read_frame()
+            if frame is None:
+                return
+            fin, opcode, payload = frame
+
+            if opcode == PING:
+                await self.__send_frame(PONG, payload)
+                continue
+            if opcode == PONG:
+                continue
+            if opcode == CLOSE:
+                await self.close()
+                return
+
+            if opcode == CONTINUATION:
+                if fragments_opcode is None:
+                    await self.close(PROTOCOL_ERROR)
+                    return
+            else:
+                fragments = []
+                fragments_opcode = opcode
+            fragments.append(payload)
+
+            if sum(len(fragment) for fragment in fragments) > self.max_message_size:
+                await self.close(MESSAGE_TOO_BIG)
+                return
+            if not fin:
+                continue
+
+            message = b"".join(fragments)
+            opcode, fragments, fragments_opcode = fragments_opcode, [], None
+            if opcode == TEXT:
+                try:
+                    message = message.decode()
+                except UnicodeDecodeError:
+                    await self.close(INVALID_DATA)
+                    return
+            elif opcode != BINARY:
+                await self.close(PROTOCOL_ERROR)
+                return
+
+            await self.__messages.put(message)
@@ -2,5 +2,6 @@ from .base import BaseBlueprint
 from .controller import ControllerBlueprint
 from .messaging import MessagingBlueprint
 from .rover import RoverControllerBlueprint
+from .telemetry import TelemetryBlueprint
 from .video import VideoBlueprint
 from .webcomponents import WebComponentsBlueprint
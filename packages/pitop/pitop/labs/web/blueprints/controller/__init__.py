@@ -2,13 +2,21 @@ from flask import Blueprint
 
 from pitop.labs.web.blueprints.base import BaseBlueprint
 from pitop.labs.web.blueprints.messaging import MessagingBlueprint
+from pitop.labs.web.blueprints.telemetry import Telemetry, TelemetryBlueprint
 from pitop.labs.web.blueprints.video import VideoBlueprint
 from pitop.labs.web.blueprints.webcomponents import WebComponentsBlueprint
 from pitop.labs.web.utils import uses_flask_1
 
 
 class ControllerBlueprint(Blueprint):
-    def __init__(self, get_frame=None, message_handlers=None, **kwargs):
+    def __init__(
+        self,
+        get_frame=None,
+        message_handlers=None,
+        coalesced_message_types=(),
+        telemetry=None,
+        **kwargs
+    ):
         message_handlers = {} if message_handlers is None else message_handlers
         Blueprint.__init__(
             self,
@@ -19,10 +27,20 @@ class ControllerBlueprint(Blueprint):
             **kwargs
         )
 
+        # latency of messages and video is served at /metrics
+        self.telemetry = Telemetry() if telemetry is None else telemetry
+
         self.base_blueprint = BaseBlueprint()
         self.components_blueprint = WebComponentsBlueprint()
-        self.video_blueprint = VideoBlueprint(get_frame=get_frame)
-        self.messaging_blueprint = MessagingBlueprint(message_handlers=message_handlers)
+        self.video_blueprint = VideoBlueprint(
+            get_frame=get_frame, telemetry=self.telemetry
+        )
+        self.messaging_blueprint = MessagingBlueprint(
+            message_handlers=message_handlers,
+            coalesced_message_types=coalesced_message_types,
+            telemetry=self.telemetry,
+        )
+        self.telemetry_blueprint = TelemetryBlueprint(telemetry=self.telemetry)
 
     def register(self, app, options, *args, **kwargs):
         def register_child_blueprints():
@@ -31,6 +49,7 @@ class ControllerBlueprint(Blueprint):
             app.register_blueprint(self.components_blueprint, **options)
             app.register_blueprint(self.video_blueprint, **options)
             app.register_blueprint(self.messaging_blueprint, **options)
+            app.register_blueprint(self.telemetry_blueprint, **options)
 
         if uses_flask_1():
             register_child_blueprints()
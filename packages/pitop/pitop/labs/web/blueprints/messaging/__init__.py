@@ -1,8 +1,14 @@
+import asyncio
 import json
+from contextlib import suppress
 from inspect import getfullargspec, ismethod
-from time import time
+from threading import Lock
+from time import monotonic, time
 
-from flask import Blueprint
+import gevent
+from flask import Blueprint, request
+
+from .protocol import decode_message, encode_message, negotiate_protocol
 
 
 def log_unhandled_message(message_type, message_data):
@@ -14,8 +20,101 @@ def log_unhandled_message(message_type, message_data):
     print(f'Unhandled message "{message_type}": {pretty_message_data}')
 
 
+def resolve_handler(handler):
+    """Returns a function that calls a message handler with the arguments
+    it takes, given the message data and the send function. The handler's
+    signature is only inspected here, instead of for every message.
+
+    :param function handler: message handler
+    :return: function
+    """
+    spec = getfullargspec(handler)
+    if len(spec.args) == (3 if ismethod(handler) else 2) or spec.varargs:
+        return handler
+
+    if len(spec.args) == (2 if ismethod(handler) else 1):
+        return lambda data, send: handler(data)
+
+    return lambda data, send: handler()
+
+
+class MessageCoalescer:
+    """Keeps only the latest message of each type added, until they're
+    handled by :data:`flush`. Used for high rate messages, e.g. joystick
+    positions, where only the latest one matters.
+    """
+
+    def __init__(self):
+        self.__pending = {}
+        self.__lock = Lock()
+        self.messages_dropped = 0
+
+    def add(self, message_type, *args):
+        """Adds a message, replacing the one of the same type waiting to be
+        handled.
+
+        :param str message_type: type of the message
+        :param args: arguments to handle the message with, e.g. its data
+        """
+        with self.__lock:
+            if message_type in self.__pending:
+                self.messages_dropped += 1
+            self.__pending[message_type] = args
+
+    def flush(self, handle_message):
+        """Handles the latest message of each type added since the last
+        flush.
+
+        :param function handle_message: function called with the type of
+            each message and the arguments it was added with
+        """
+        with self.__lock:
+            pending, self.__pending = self.__pending, {}
+        for message_type, args in pending.items():
+            handle_message(message_type, *args)
+
+
+class ThreadsafeSocket:
+    """Sends messages to an :class:`AsyncWebSocket` from any thread, as
+    message handlers and :data:`MessagingBlueprint.broadcast` do."""
+
+    def __init__(self, ws):
+        self.__ws = ws
+
+    @property
+    def closed(self):
+        return self.__ws.closed
+
+    def send(self, message):
+        self.__ws.send_threadsafe(message)
+
+
 class MessagingBlueprint(Blueprint):
-    def __init__(self, message_handlers=None, **kwargs):
+    """Routes messages from the page to message handlers, over a WebSocket.
+
+    Clients can ask for messages to be sent to them with msgpack instead of
+    JSON by connecting to ``/messaging?protocol=msgpack``. Joystick
+    messages can be sent by clients as compact binary frames, whatever
+    protocol they use.
+
+    :param dict message_handlers: message handlers, by message type
+    :param coalesced_message_types: types of high rate messages of which
+        only the latest one received is handled every
+        :data:`coalesce_interval`
+    :param float coalesce_interval: time between handling coalesced
+        messages, in seconds
+    :param Telemetry telemetry: telemetry to record how long messages wait
+        to be handled, and how long handling them takes, by message type
+    """
+
+    def __init__(
+        self,
+        message_handlers=None,
+        coalesced_message_types=(),
+        coalesce_interval=0.05,
+        telemetry=None,
+        **kwargs,
+    ):
         message_handlers = {} if message_handlers is None else message_handlers
         Blueprint.__init__(
             self,
@@ -26,46 +125,111 @@ class MessagingBlueprint(Blueprint):
             **kwargs,
         )
 
-        def handle_message(message, send):
-            parsed_message = json.loads(message)
-
-            message_type = parsed_message.get("type", "")
-            message_data = parsed_message.get("data")
-
-            handler = message_handlers.get(message_type)
-
-            if handler is None:
-                log_unhandled_message(message_type, message_data)
-                return
+        self.message_handlers = message_handlers
+        self.coalesced_message_types = set(coalesced_message_types)
+        self.coalesce_interval = coalesce_interval
+        self.telemetry = telemetry
 
-            spec = getfullargspec(handler)
-            if len(spec.args) == (3 if ismethod(handler) else 2) or spec.varargs:
-                handler(message_data, send)
-                return
-
-            if len(spec.args) == (2 if ismethod(handler) else 1):
-                handler(message_data)
-                return
-
-            handler()
+        # Resolved handlers by message type, along with the handler they
+        # were resolved from, in case handlers are changed later
+        self.__resolved_handlers = {}
+        for message_type, handler in message_handlers.items():
+            self.__resolve(message_type, handler)
 
         self.sockets = {}
+        self.__socket_protocols = {}
         self.socket_blueprint = Blueprint("messaging_socket", __name__)
 
         @self.socket_blueprint.route("/messaging")
         def pubsub(ws):
             id = time()
+            protocol = negotiate_protocol(request.args.get("protocol"))
             self.sockets[id] = ws
+            self.__socket_protocols[id] = protocol
 
             def send(response_message):
-                ws.send(json.dumps(response_message))
+                ws.send(encode_message(response_message, protocol))
 
-            while not ws.closed:
-                message = ws.receive()
-                if message:
-                    handle_message(message, send)
+            coalescer = MessageCoalescer()
+            flusher = gevent.spawn(self.__flush_periodically, coalescer)
+            try:
+                while not ws.closed:
+                    message = ws.receive()
+                    if message:
+                        received = self.__receive(message, send, coalescer)
+                        if received is not None:
+                            self.handle_message(*received)
+            finally:
+                flusher.kill()
+                coalescer.flush(self.handle_message)
+                del self.sockets[id]
+                del self.__socket_protocols[id]
 
-            del self.sockets[id]
+    def __resolve(self, message_type, handler):
+        resolved = self.__resolved_handlers.get(message_type)
+        if resolved is None or resolved[0] is not handler:
+            resolved = (handler, resolve_handler(handler))
+            self.__resolved_handlers[message_type] = resolved
+        return resolved[1]
+
+    def handle_message(self, message_type, message_data, send, received_at=None):
+        """Calls the handler of a message.
+
+        :param str message_type: type of the message
+        :param message_data: data of the message
+        :param function send: function that sends a message back to the
+            client
+        :param float received_at: time the message was received at, from
+            :func:`time.monotonic`, used for telemetry
+        """
+        handler = self.message_handlers.get(message_type)
+        if handler is None:
+            log_unhandled_message(message_type, message_data)
+            return
+
+        call_handler = self.__resolve(message_type, handler)
+        if self.telemetry is None:
+            call_handler(message_data, send)
+            return
+
+        handler_start = monotonic()
+        try:
+            call_handler(message_data, send)
+        finally:
+            handler_end = monotonic()
+            self.telemetry.record(
+                f"messages.{message_type}.handler", handler_end - handler_start
+            )
+            if received_at is not None:
+                self.telemetry.record(
+                    f"messages.{message_type}.wait", handler_start - received_at
+                )
+                self.telemetry.record(
+                    f"messages.{message_type}.latency", handler_end - received_at
+                )
+
+    def __receive(self, message, send, coalescer):
+        """Decodes a message, adding it to the coalescer if its type is
+        coalesced.
+
+        :return: tuple of the arguments to handle the message with, or None
+        """
+        received_at = monotonic()
+        parsed_message = decode_message(message)
+
+        message_type = parsed_message.get("type", "")
+        message_data = parsed_message.get("data")
+
+        if message_type in self.coalesced_message_types:
+            coalescer.add(message_type, message_data, send, received_at)
+            return None
+
+        return message_type, message_data, send, received_at
+
+    def __flush_periodically(self, coalescer):
+        while True:
+            gevent.sleep(self.coalesce_interval)
+            coalescer.flush(self.handle_message)
 
     def register(self, app, options, *args):
         Blueprint.register(self, app, options, *args)
@@ -77,5 +241,63 @@ class MessagingBlueprint(Blueprint):
         sockets.register_blueprint(self.socket_blueprint)
 
     def broadcast(self, message):
-        for socket in self.sockets.values():
-            socket.send(json.dumps(message))
+        # Messages are encoded once for each protocol in use
+        encoded_messages = {}
+        for id, socket in list(self.sockets.items()):
+            protocol = self.__socket_protocols.get(id)
+            if protocol not in encoded_messages:
+                encoded_messages[protocol] = encode_message(message, protocol)
+            socket.send(encoded_messages[protocol])
+
+    def async_socket_routes(self):
+        """WebSocket routes served by an :class:`AsyncWebServer` on its event
+        loop."""
+        return {"/messaging": self.__serve_async}
+
+    async def __serve_async(self, ws, request):
+        try:
+            protocol = negotiate_protocol(request.args.get("protocol"))
+        except ValueError:
+            await ws.close()
+            return
+
+        socket = ThreadsafeSocket(ws)
+        id = time()
+        self.sockets[id] = socket
+        self.__socket_protocols[id] = protocol
+
+        def send(response_message):
+            socket.send(encode_message(response_message, protocol))
+
+        # Handlers are called on the event loop's thread pool, as they may
+        # block, e.g. writing to motors. The lock keeps them in order.
+        loop = asyncio.get_running_loop()
+        handling = asyncio.Lock()
+
+        async def run(function, *args):
+            async with handling:
+                await loop.run_in_executor(None, function, *args)
+
+        async def flush_periodically():
+            while True:
+                await asyncio.sleep(self.coalesce_interval)
+                await run(coalescer.flush, self.handle_message)
+
+        coalescer = MessageCoalescer()
+        flusher = asyncio.ensure_future(flush_periodically())
+        try:
+            while True:
+                message = await ws.receive()
+                if message is None:
+                    break
+                if message:
+                    received = self.__receive(message, send, coalescer)
+                    if received is not None:
+                        await run(self.handle_message, *received)
+        finally:
+            flusher.cancel()
+            with suppress(asyncio.CancelledError):
+                await flusher
+            await run(coalescer.flush, self.handle_message)
+            del self.sockets[id]
+            del self.__socket_protocols[id]
@@ -10,6 +10,26 @@ window.publish = async function publish(message) {
   socket.send(JSON.stringify(message));
 };
 
+// joystick positions are sent often, so they're sent as binary frames: frame
+// type, length of message type, message type, then degree and distance as
+// little-endian float32s
+const JOYSTICK_FRAME = 0x01;
+const textEncoder = new TextEncoder();
+
+window.publishJoystick = async function publishJoystick(type, data) {
+  const encodedType = textEncoder.encode(type);
+  const buffer = new ArrayBuffer(2 + encodedType.length + 8);
+  const view = new DataView(buffer);
+  view.setUint8(0, JOYSTICK_FRAME);
+  view.setUint8(1, encodedType.length);
+  new Uint8Array(buffer, 2, encodedType.length).set(encodedType);
+  view.setFloat32(2 + encodedType.length, data.angle.degree, true);
+  view.setFloat32(6 + encodedType.length, data.distance, true);
+
+  await socketReady;
+  socket.send(buffer);
+};
+
 window.subscribe = function subscribe(messageHandler) {
   socket.onmessage = function onMessage(message) {
     messageHandler(JSON.parse(message.data));
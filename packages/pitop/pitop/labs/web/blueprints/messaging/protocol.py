@@ -0,0 +1,113 @@
+import json
+import logging
+from struct import Struct
+
+logger = logging.getLogger(__name__)
+
+# Messages are sent as JSON text frames, or as binary frames whose first byte
+# is one of these
+JOYSTICK_FRAME = 0x01
+MSGPACK_FRAME = 0x02
+
+JSON_PROTOCOL = "json"
+MSGPACK_PROTOCOL = "msgpack"
+PROTOCOLS = (JSON_PROTOCOL, MSGPACK_PROTOCOL)
+
+# Joystick frames: frame type, length of message type, then the message type
+# followed by the joystick's angle in degrees and distance from its centre
+_joystick_header = Struct("<BB")
+_joystick_position = Struct("<ff")
+
+
+def import_msgpack():
+    try:
+        import msgpack
+
+        return msgpack
+    except (ImportError, ModuleNotFoundError):
+        raise ModuleNotFoundError(
+            "msgpack Python library is not installed. You can install it by running 'pip3 install msgpack'."
+        ) from None
+
+
+def encode_joystick_message(message_type, degree, distance):
+    """Encodes a joystick message as a binary frame, which is decoded to the
+    same data the joystick component sends as JSON, with only the angle
+    and distance.
+
+    :param str message_type: type of the message, e.g. "right_joystick"
+    :param float degree: angle of the joystick, in degrees
+    :param float distance: distance of the joystick from its centre
+    :return: bytes
+    """
+    encoded_type = message_type.encode()
+    return (
+        _joystick_header.pack(JOYSTICK_FRAME, len(encoded_type))
+        + encoded_type
+        + _joystick_position.pack(degree, distance)
+    )
+
+
+def _decode_joystick_message(message):
+    _, type_length = _joystick_header.unpack_from(message)
+    type_end = _joystick_header.size + type_length
+    degree, distance = _joystick_position.unpack_from(message, type_end)
+    return {
+        "type": bytes(message[_joystick_header.size : type_end]).decode(),
+        "data": {"angle": {"degree": degree}, "distance": distance},
+    }
+
+
+def decode_message(message):
+    """Decodes a message received from a client.
+
+    :param message: JSON text, or binary frame
+    :type message: str or bytes
+    :return: dict with the message's "type" and "data"
+    """
+    if isinstance(message, str):
+        return json.loads(message)
+
+    if len(message) == 0:
+        raise ValueError("Empty binary message")
+
+    frame_type = message[0]
+    if frame_type == JOYSTICK_FRAME:
+        return _decode_joystick_message(message)
+    if frame_type == MSGPACK_FRAME:
+        return import_msgpack().unpackb(bytes(message[1:]))
+    raise ValueError(f"Unknown binary message type {frame_type}")
+
+
+def encode_message(message, protocol=JSON_PROTOCOL):
+    """Encodes a message to send to clients using the given protocol.
+
+    :param dict message: message to send
+    :param str protocol: "json" or "msgpack"
+    :return: str for JSON, bytes for msgpack
+    """
+    if protocol == MSGPACK_PROTOCOL:
+        return bytes([MSGPACK_FRAME]) + import_msgpack().packb(message)
+    return json.dumps(message)
+
+
+def negotiate_protocol(requested):
+    """Returns the protocol to send messages to a client with, given the one
+    it asked for. Clients get JSON if they ask for msgpack and it's not
+    installed.
+
+    :param str requested: protocol asked for, or None
+    :return: str
+    """
+    if requested is None or requested == JSON_PROTOCOL:
+        return JSON_PROTOCOL
+
+    if requested not in PROTOCOLS:
+        raise ValueError(f"Unknown messaging protocol '{requested}'")
+
+    try:
+        import_msgpack()
+    except ModuleNotFoundError as e:
+        logger.warning(f"{e} Using JSON messages instead.")
+        return JSON_PROTOCOL
+    return requested
@@ -1,31 +1,41 @@
 from flask import Blueprint, g
 
 from pitop.labs.web.blueprints.controller import ControllerBlueprint
+from pitop.labs.web.blueprints.telemetry import Telemetry, measure
 from pitop.labs.web.utils import uses_flask_1
 
 from .helpers import calculate_pan_tilt_angle, calculate_velocity_twist
 
 
-def drive_handler(drive, data):
+def drive_handler(drive, data, telemetry=None):
     velocity_twist = calculate_velocity_twist(data)
     linear = velocity_twist.get("linear", 0)
     angular = velocity_twist.get("angular", 0)
 
-    drive.robot_move(linear, angular)
+    with measure(telemetry, "drive.write"):
+        drive.robot_move(linear, angular)
 
 
-def pan_tilt_handler(pan_tilt, data):
+def pan_tilt_handler(pan_tilt, data, telemetry=None):
     angle = calculate_pan_tilt_angle(data)
 
-    pan_tilt.pan_servo.target_angle = angle.get("z")
-    pan_tilt.tilt_servo.target_angle = angle.get("y")
+    with measure(telemetry, "pan_tilt.write"):
+        pan_tilt.pan_servo.target_angle = angle.get("z")
+        pan_tilt.tilt_servo.target_angle = angle.get("y")
 
 
 class RoverControllerBlueprint(Blueprint):
     def __init__(
-        self, drive=None, pan_tilt=None, get_frame=None, message_handlers=None, **kwargs
+        self,
+        drive=None,
+        pan_tilt=None,
+        get_frame=None,
+        message_handlers=None,
+        telemetry=None,
+        **kwargs
     ):
         message_handlers = {} if message_handlers is None else message_handlers
+        self.telemetry = Telemetry() if telemetry is None else telemetry
         Blueprint.__init__(
             self, "rover", __name__, template_folder="templates", **kwargs
         )
@@ -40,19 +50,24 @@ class RoverControllerBlueprint(Blueprint):
         if message_handlers.get("left_joystick") is None:
 
             def left_joystick(data):
-                return pan_tilt_handler(pan_tilt, data)
+                return pan_tilt_handler(pan_tilt, data, self.telemetry)
 
             message_handlers["left_joystick"] = left_joystick
 
         if message_handlers.get("right_joystick") is None:
 
             def right_joystick(data):
-                return drive_handler(drive, data)
+                return drive_handler(drive, data, self.telemetry)
 
             message_handlers["right_joystick"] = right_joystick
 
+        # only the latest joystick positions matter, so they're handled at a
+        # steady rate however fast they're sent
         self.controller_blueprint = ControllerBlueprint(
-            get_frame=get_frame, message_handlers=message_handlers
+            get_frame=get_frame,
+            message_handlers=message_handlers,
+            coalesced_message_types=("left_joystick", "right_joystick"),
+            telemetry=self.telemetry,
         )
 
     def register(self, app, options, *args, **kwargs):
@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+import gevent
+from flask import Blueprint, jsonify, request
+from geventwebsocket.exceptions import WebSocketError
+
+from .telemetry import RollingStatistics, Telemetry, measure  # noqa: F401
+
+
+class TelemetryBlueprint(Blueprint):
+    """Serves a summary of telemetry measurements at ``/metrics``, and
+    pushes it every :data:`push_interval` seconds to WebSocket clients
+    connected to ``/metrics``.
+
+    :param Telemetry telemetry: telemetry to serve; a new one if not
+        provided
+    :param float push_interval: time between pushing summaries to
+        WebSocket clients, in seconds. Clients can ask for a different one
+        with ``/metrics?interval=``
+    """
+
+    MIN_PUSH_INTERVAL = 0.1
+
+    def __init__(self, telemetry=None, push_interval=1.0, **kwargs):
+        Blueprint.__init__(self, "telemetry", __name__, **kwargs)
+
+        self.telemetry = Telemetry() if telemetry is None else telemetry
+        self.push_interval = push_interval
+
+        @self.route("/metrics")
+        def metrics():
+            return jsonify(self.telemetry.summary())
+
+        self.socket_blueprint = Blueprint("telemetry_socket", __name__)
+
+        @self.socket_blueprint.route("/metrics")
+        def metrics_socket(ws):
+            interval = self.__interval(request.args)
+            try:
+                while not ws.closed:
+                    ws.send(json.dumps(self.telemetry.summary()))
+                    gevent.sleep(interval)
+            except WebSocketError:
+                pass
+
+    def __interval(self, args):
+        return max(
+            args.get("interval", self.push_interval, type=float),
+            self.MIN_PUSH_INTERVAL,
+        )
+
+    def async_socket_routes(self):
+        """WebSocket routes served by an :class:`AsyncWebServer` on its event
+        loop."""
+
+        async def metrics_socket(ws, request):
+            interval = self.__interval(request.args)
+            while not ws.closed:
+                await ws.send(json.dumps(self.telemetry.summary()))
+                await asyncio.sleep(interval)
+
+        return {"/metrics": metrics_socket}
+
+    def register(self, app, options, *args):
+        Blueprint.register(self, app, options, *args)
+
+        sockets = options.get("sockets")
+        if sockets is None:
+            raise Exception("Unable to register TelemetryBlueprint without sockets")
+
+        sockets.register_blueprint(self.socket_blueprint)
@@ -0,0 +1,117 @@
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from time import monotonic
+
+
+class RollingStatistics:
+    """Percentiles of the most recent samples of a measurement.
+
+    :param int window: number of recent samples to keep
+    """
+
+    def __init__(self, window=500):
+        self.count = 0
+
+        self.__samples = deque(maxlen=window)
+        self.__lock = Lock()
+
+    def record(self, value) -> None:
+        with self.__lock:
+            self.__samples.append(value)
+            self.count += 1
+
+    def summary(self, percentiles=(50, 90, 99)) -> dict:
+        """Returns the number of samples recorded, and the mean, percentiles
+        and maximum of the recent ones.
+
+        :param percentiles: percentiles to calculate, from 0 to 100
+        :return: dict
+        """
+        with self.__lock:
+            samples = sorted(self.__samples)
+            count = self.count
+
+        summary = {"count": count}
+        if len(samples) == 0:
+            return summary
+
+        summary["mean"] = sum(samples) / len(samples)
+        for percentile in percentiles:
+            # Nearest rank
+            rank = max(0, -(-percentile * len(samples) // 100) - 1)
+            summary[f"p{percentile}"] = samples[min(rank, len(samples) - 1)]
+        summary["max"] = samples[-1]
+        return summary
+
+
+class Telemetry:
+    """Records durations, in seconds, of named measurements, e.g. how long
+    handling a message takes, and keeps rolling percentiles of them.
+
+    :param int window: number of recent samples of each measurement to
+        keep
+    :param percentiles: percentiles to summarise measurements with
+    """
+
+    def __init__(self, window=500, percentiles=(50, 90, 99)):
+        self.window = window
+        self.percentiles = tuple(percentiles)
+
+        self.__statistics = {}
+        self.__lock = Lock()
+
+    def record(self, name, duration) -> None:
+        """Records a sample of a measurement.
+
+        :param str name: name of the measurement, e.g. "drive.write"
+        :param float duration: duration measured, in seconds
+        """
+        statistics = self.__statistics.get(name)
+        if statistics is None:
+            with self.__lock:
+                statistics = self.__statistics.setdefault(
+                    name, RollingStatistics(self.window)
+                )
+        statistics.record(duration)
+
+    @contextmanager
+    def measure(self, name):
+        """Records how long the code in a :code:`with` block takes.
+
+        :param str name: name of the measurement
+        """
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, monotonic() - start)
+
+    def summary(self) -> dict:
+        """Returns a summary of each measurement, by name.
+
+        :return: dict
+        """
+        with self.__lock:
+            statistics = dict(self.__statistics)
+        return {
+            name: statistics[name].summary(self.percentiles)
+            for name in sorted(statistics)
+        }
+
+    def reset(self) -> None:
+        """Forgets all measurements."""
+        with self.__lock:
+            self.__statistics = {}
+
+
+def measure(telemetry, name):
+    """Records how long the code in a :code:`with` block takes if telemetry
+    is provided, doing nothing otherwise.
+
+    :param Telemetry telemetry: telemetry to record to, or None
+    :param str name: name of the measurement
+    """
+    if telemetry is None:
+        return nullcontext()
+    return telemetry.measure(name)
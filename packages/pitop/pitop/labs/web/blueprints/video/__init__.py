@@ -1,32 +1,92 @@
-from io import BytesIO
+import asyncio
+from contextlib import suppress
+from http import HTTPStatus
+from time import monotonic
 
 import gevent
-from flask import Blueprint, Response, abort
+from flask import Blueprint, Response, abort, jsonify, request
+from gevent.event import Event
+
+from .broadcaster import QUALITY_LADDER, FrameBroadcaster, QualityRung  # noqa: F401
 
 
 class VideoResponse(Response):
-    def __init__(self, get_frame=None, *args, **kwargs):
-        if get_frame is None:
-            abort(500, "Unable to get frames")
+    """Streams the frames of a :class:`FrameBroadcaster` to a client as an
+    MJPEG stream. The client is sent the newest frame each time it's ready
+    for one, so frames are dropped for clients that are slow to receive
+    them.
 
-        def _get_frame():
-            try:
-                frame = get_frame()
-                buffered = BytesIO()
-                frame.save(buffered, format="JPEG")
-                return buffered.getvalue()
-            except Exception as e:
-                print(e)
+    :param function get_frame: function that returns the next frame, used
+        to create a broadcaster if one isn't provided
+    :param FrameBroadcaster broadcaster: broadcaster shared between the
+        clients of a video
+    :param str quality: name of the rung of the broadcaster's quality
+        ladder to stream at, or "auto" to change rung depending on how
+        fast the client receives frames
+    :param Telemetry telemetry: telemetry to record the age of frames when
+        they're sent, and how long sending them takes
+    :param str telemetry_name: prefix of the names of the measurements
+    """
+
+    def __init__(
+        self,
+        get_frame=None,
+        broadcaster=None,
+        quality="auto",
+        telemetry=None,
+        telemetry_name="video",
+        *args,
+        **kwargs,
+    ):
+        if broadcaster is None:
+            if get_frame is None:
+                abort(500, "Unable to get frames")
+            broadcaster = FrameBroadcaster(get_frame)
+
+        adaptive = quality == "auto"
+        try:
+            rung = 0 if adaptive else broadcaster.get_rung(quality)
+        except ValueError as e:
+            abort(400, str(e))
 
         def generate_frames():
-            pool = gevent.get_hub().threadpool
-            while True:
-                # get_frame in thread so it won't block handler greenlets
-                frame_bytes = pool.spawn(_get_frame).get()
-                yield (
-                    b"--frame\r\n"
-                    b"Content-Type: image/jpeg\r\n\r\n" + frame_bytes + b"\r\n"
-                )
+            # Frames are got on the broadcaster's thread; it wakes this
+            # greenlet up through the hub when there's a new one
+            new_frame = Event()
+            watcher = gevent.get_hub().loop.async_()
+            watcher.start(new_frame.set)
+            subscriber = broadcaster.subscribe(
+                on_frame=watcher.send, rung=rung, adaptive=adaptive
+            )
+            try:
+                while True:
+                    # Keep to the frame rate of the subscriber's quality
+                    gevent.sleep(subscriber.time_until_next_frame())
+
+                    frame = subscriber.next_frame(timeout=0)
+                    if frame is None:
+                        new_frame.wait()
+                        new_frame.clear()
+                        continue
+
+                    # The server sends the frame before asking for the next
+                    # one, so this measures how long sending it takes
+                    send_start = monotonic()
+                    yield (
+                        b"--frame\r\n"
+                        b"Content-Type: image/jpeg\r\n\r\n" + frame.data + b"\r\n"
+                    )
+                    send_duration = monotonic() - send_start
+                    subscriber.frame_sent(frame, send_duration)
+
+                    if telemetry is not None:
+                        telemetry.record(
+                            f"{telemetry_name}.frame_age", send_start - frame.timestamp
+                        )
+                        telemetry.record(f"{telemetry_name}.send", send_duration)
+            finally:
+                subscriber.close()
+                watcher.close()
 
         Response.__init__(
             self,
@@ -36,8 +96,84 @@ class VideoResponse(Response):
         )
 
 
+async def stream_video(
+    response, broadcaster, quality="auto", telemetry=None, telemetry_name="video"
+):
+    """Streams the frames of a :class:`FrameBroadcaster` to a client of an
+    :class:`AsyncWebServer` as an MJPEG stream, like :class:`VideoResponse`.
+    Sending a frame waits until the client has taken the previous ones, so
+    the time it takes is used to adapt the quality of the stream.
+
+    :param AsyncStreamResponse response: response to stream to
+    :param FrameBroadcaster broadcaster: broadcaster shared between the
+        clients of a video
+    :param str quality: name of the rung of the broadcaster's quality
+        ladder to stream at, or "auto"
+    :param Telemetry telemetry: telemetry to record the age of frames when
+        they're sent, and how long sending them takes
+    :param str telemetry_name: prefix of the names of the measurements
+    """
+    if broadcaster is None:
+        await response.start(HTTPStatus.INTERNAL_SERVER_ERROR)
+        return
+
+    adaptive = quality == "auto"
+    try:
+        rung = 0 if adaptive else broadcaster.get_rung(quality)
+    except ValueError:
+        await response.start(HTTPStatus.BAD_REQUEST)
+        return
+
+    # Frames are got on the broadcaster's thread, which wakes this task up
+    # through the event loop when there's a new one
+    loop = asyncio.get_running_loop()
+    new_frame = asyncio.Event()
+
+    def on_frame():
+        with suppress(RuntimeError):
+            loop.call_soon_threadsafe(new_frame.set)
+
+    subscriber = broadcaster.subscribe(on_frame=on_frame, rung=rung, adaptive=adaptive)
+    try:
+        await response.start(
+            headers=[("Content-Type", "multipart/x-mixed-replace; boundary=frame")]
+        )
+        while True:
+            # Keep to the frame rate of the subscriber's quality
+            await asyncio.sleep(subscriber.time_until_next_frame())
+
+            frame = subscriber.next_frame(timeout=0)
+            if frame is None:
+                await new_frame.wait()
+                new_frame.clear()
+                continue
+
+            send_start = monotonic()
+            await response.write(
+                b"--frame\r\n"
+                b"Content-Type: image/jpeg\r\n\r\n" + frame.data + b"\r\n"
+            )
+            send_duration = monotonic() - send_start
+            subscriber.frame_sent(frame, send_duration)
+
+            if telemetry is not None:
+                telemetry.record(
+                    f"{telemetry_name}.frame_age", send_start - frame.timestamp
+                )
+                telemetry.record(f"{telemetry_name}.send", send_duration)
+    finally:
+        subscriber.close()
+
+
 class VideoBlueprint(Blueprint):
-    def __init__(self, name="video", get_frame=None, **kwargs):
+    def __init__(
+        self,
+        name="video",
+        get_frame=None,
+        quality_ladder=QUALITY_LADDER,
+        telemetry=None,
+        **kwargs,
+    ):
         Blueprint.__init__(
             self,
             name,
@@ -47,6 +183,40 @@ class VideoBlueprint(Blueprint):
             **kwargs,
         )
 
+        # Frames are encoded once for all the clients of the video
+        self.broadcaster = (
+            None
+            if get_frame is None
+            else FrameBroadcaster(get_frame, ladder=quality_ladder)
+        )
+
         @self.route(f"/{name}.mjpg")
         def video():
-            return VideoResponse(get_frame=get_frame)
+            return VideoResponse(
+                broadcaster=self.broadcaster,
+                quality=request.args.get("quality", "auto"),
+                telemetry=telemetry,
+                telemetry_name=name,
+            )
+
+        self.__telemetry = telemetry
+
+        @self.route(f"/{name}/clients")
+        def clients():
+            if self.broadcaster is None:
+                return jsonify([])
+            return jsonify(self.broadcaster.client_statistics())
+
+    def async_routes(self):
+        """Routes served by an :class:`AsyncWebServer` on its event loop."""
+
+        async def video(request, response):
+            await stream_video(
+                response,
+                self.broadcaster,
+                quality=request.args.get("quality", "auto"),
+                telemetry=self.__telemetry,
+                telemetry_name=self.name,
+            )
+
+        return {f"/{self.name}.mjpg": video}
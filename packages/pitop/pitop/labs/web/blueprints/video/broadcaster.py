@@ -0,0 +1,399 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from io import BytesIO
+from threading import Condition, Thread
+from time import monotonic, sleep
+
+logger = logging.getLogger(__name__)
+
+
+def encode_jpeg(frame, quality=None):
+    """Encodes a frame as a JPEG.
+
+    :param frame: OpenCV BGR :class:`numpy.ndarray`, which is encoded with
+        OpenCV without converting it, or :class:`PIL.Image.Image`
+    :param int quality: JPEG quality, from 0 to 100; the encoder's default
+        if not provided
+    :return: bytes
+    """
+    if hasattr(frame, "save"):
+        buffered = BytesIO()
+        options = {} if quality is None else {"quality": quality}
+        frame.save(buffered, format="JPEG", **options)
+        return buffered.getvalue()
+
+    from pitop.core.import_opencv import import_opencv
+
+    cv2 = import_opencv()
+    params = [] if quality is None else [cv2.IMWRITE_JPEG_QUALITY, quality]
+    result, encoded = cv2.imencode(".jpg", frame, params)
+    if not result:
+        raise ValueError("Unable to encode frame as JPEG")
+    return encoded.tobytes()
+
+
+def scale_frame(frame, scale):
+    """Resizes a frame by the given factor.
+
+    :param frame: OpenCV BGR :class:`numpy.ndarray` or
+        :class:`PIL.Image.Image`
+    :param float scale: factor to resize the frame by
+    :return: frame of the same type
+    """
+    if scale == 1:
+        return frame
+
+    if hasattr(frame, "save"):
+        width, height = frame.size
+        return frame.resize(
+            (max(1, round(width * scale)), max(1, round(height * scale)))
+        )
+
+    from pitop.core.import_opencv import import_opencv
+
+    cv2 = import_opencv()
+    height, width = frame.shape[:2]
+    return cv2.resize(
+        frame,
+        (max(1, round(width * scale)), max(1, round(height * scale))),
+        interpolation=cv2.INTER_AREA,
+    )
+
+
+@dataclass(frozen=True)
+class QualityRung:
+    """A level of quality that video can be streamed at.
+
+    :param str name: name of the rung, used to ask for it
+    :param float scale: factor the frames are resized by
+    :param int quality: JPEG quality, from 0 to 100
+    :param float fps: maximum rate at which frames are sent
+    """
+
+    name: str
+    scale: float
+    quality: int
+    fps: float
+
+
+# Rungs from highest to lowest quality. Clients with slow connections
+# stream at lower rungs, which take less bandwidth.
+QUALITY_LADDER = (
+    QualityRung("high", scale=1.0, quality=80, fps=30),
+    QualityRung("medium", scale=0.75, quality=70, fps=20),
+    QualityRung("low", scale=0.5, quality=60, fps=15),
+    QualityRung("lowest", scale=0.25, quality=50, fps=10),
+)
+
+
+@dataclass
+class EncodedFrame:
+    """A frame encoded for sending to clients.
+
+    :param bytes data: encoded frame
+    :param int sequence: number of the frame, counting from 0
+    :param float timestamp: time the frame was got at, from
+        :func:`time.monotonic`
+    """
+
+    data: bytes
+    sequence: int
+    timestamp: float
+
+
+class FrameSubscriber:
+    """A client of a :class:`FrameBroadcaster`. It's only given the newest
+    frame each time it asks for one, so frames are dropped instead of
+    buffered for clients that are slower than the source.
+
+    Frames are given at the subscriber's rung of the broadcaster's quality
+    ladder. If the subscriber is adaptive, it moves down the ladder when
+    sending frames takes too long for the rung's frame rate, and back up
+    when there's plenty of time to spare.
+
+    :param FrameBroadcaster broadcaster: broadcaster subscribed to
+    :param function on_frame: function called, from the broadcaster's
+        thread, when a new frame is available
+    :param int rung: index of the rung of the quality ladder to start at
+    :param bool adaptive: whether to change rung depending on how long
+        sending frames takes
+    """
+
+    # Number of frames sent to measure before changing rung
+    ADAPT_WINDOW = 10
+    # Fractions of the time between frames that sending a frame takes on
+    # average to move down, or up, the ladder
+    STEP_DOWN_THRESHOLD = 0.8
+    STEP_UP_THRESHOLD = 0.3
+
+    def __init__(self, broadcaster, on_frame=None, rung=0, adaptive=False):
+        self.on_frame = on_frame
+        self.adaptive = adaptive
+        self.frames_sent = 0
+        self.frames_dropped = 0
+
+        self.__broadcaster = broadcaster
+        self.__rung = rung
+        self.__last_sequence = None
+        self.__last_send_time = None
+        self.__send_times = deque(maxlen=30)
+        self.__latencies = deque(maxlen=30)
+        self.__send_durations = deque(maxlen=self.ADAPT_WINDOW)
+
+    @property
+    def rung(self) -> int:
+        """Index of the rung of the quality ladder frames are given at."""
+        return self.__rung
+
+    @rung.setter
+    def rung(self, rung):
+        if not 0 <= rung < len(self.__broadcaster.ladder):
+            raise ValueError("Rung must be an index of the quality ladder")
+        self.__rung = rung
+        self.__send_durations.clear()
+
+    @property
+    def quality(self) -> QualityRung:
+        """Rung of the quality ladder frames are given at."""
+        return self.__broadcaster.ladder[self.__rung]
+
+    def next_frame(self, timeout=None):
+        """Returns the newest frame that this subscriber hasn't had yet,
+        waiting for it if necessary.
+
+        :param float timeout: maximum time to wait, in seconds
+        :return: :class:`EncodedFrame`, or None if there's no new frame
+        """
+        frame = self.__broadcaster._wait_for_frame(
+            self.__last_sequence, self.__rung, timeout
+        )
+        if frame is None:
+            return None
+
+        if self.__last_sequence is not None:
+            self.frames_dropped += frame.sequence - self.__last_sequence - 1
+        self.__last_sequence = frame.sequence
+        return frame
+
+    def time_until_next_frame(self) -> float:
+        """Time to wait before sending the next frame, to keep to the
+        rung's frame rate, in seconds."""
+        if self.__last_send_time is None:
+            return 0.0
+        next_send_time = self.__last_send_time + 1 / self.quality.fps
+        return max(0.0, next_send_time - monotonic())
+
+    def frame_sent(self, frame, send_duration=None):
+        """Records that a frame has been sent to the client, to measure the
+        rate and latency of its stream.
+
+        :param EncodedFrame frame: frame sent
+        :param float send_duration: time sending the frame took, in
+            seconds, used to adapt the quality of the stream
+        """
+        now = monotonic()
+        self.frames_sent += 1
+        self.__last_send_time = now
+        self.__send_times.append(now)
+        self.__latencies.append(now - frame.timestamp)
+
+        if send_duration is not None:
+            self.__send_durations.append(send_duration)
+            if self.adaptive:
+                self.__adapt()
+
+    def __adapt(self):
+        if len(self.__send_durations) < self.ADAPT_WINDOW:
+            return
+
+        mean_duration = sum(self.__send_durations) / len(self.__send_durations)
+        ladder = self.__broadcaster.ladder
+        if (
+            mean_duration > self.STEP_DOWN_THRESHOLD / self.quality.fps
+            and self.__rung < len(ladder) - 1
+        ):
+            self.rung = self.__rung + 1
+        elif (
+            self.__rung > 0
+            and mean_duration < self.STEP_UP_THRESHOLD / ladder[self.__rung - 1].fps
+        ):
+            self.rung = self.__rung - 1
+
+    @property
+    def fps(self) -> float:
+        """Rate at which frames were recently sent, in frames per second."""
+        if len(self.__send_times) < 2:
+            return 0.0
+        elapsed = self.__send_times[-1] - self.__send_times[0]
+        return (len(self.__send_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def latency(self) -> float:
+        """Mean time from getting recent frames to sending them, in
+        seconds."""
+        if len(self.__latencies) == 0:
+            return 0.0
+        return sum(self.__latencies) / len(self.__latencies)
+
+    def statistics(self) -> dict:
+        """Returns the quality, frame rate, latency and number of frames
+        sent and dropped of the subscriber.
+
+        :return: dict
+        """
+        return {
+            "quality": self.quality.name,
+            "adaptive": self.adaptive,
+            "fps": self.fps,
+            "latency": self.latency,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+        }
+
+    def close(self):
+        """Unsubscribes from the broadcaster."""
+        self.__broadcaster.unsubscribe(self)
+
+
+class FrameBroadcaster:
+    """Gets frames from a source and encodes each of them once per rung of
+    the quality ladder in use, for any number of clients.
+
+    Frames are only got while there are subscribers, on a thread of the
+    broadcaster's own.
+
+    :param function get_frame: function that returns the next frame,
+        blocking until it's available, e.g. :meth:`Camera.get_frame`
+    :param function encode: function that encodes a frame as bytes, given
+        the frame and the quality; JPEG by default
+    :param ladder: rungs of quality that frames can be given at, from
+        highest to lowest
+    """
+
+    ERROR_RETRY_INTERVAL = 0.1
+
+    def __init__(self, get_frame, encode=encode_jpeg, ladder=QUALITY_LADDER):
+        if len(ladder) == 0:
+            raise ValueError("Quality ladder must have at least one rung")
+
+        self.ladder = tuple(ladder)
+
+        self.__get_frame = get_frame
+        self.__encode = encode
+
+        self.__condition = Condition()
+        self.__subscribers = []
+        # Frame encoded at each rung in use, by index of rung
+        self.__frames = {}
+        self.__sequence = 0
+        self.__thread = None
+
+        self.frames_encoded = 0
+
+    @property
+    def subscribers(self) -> list:
+        with self.__condition:
+            return list(self.__subscribers)
+
+    def client_statistics(self) -> list:
+        """Returns the quality, frame rate, latency and number of frames
+        sent and dropped of each subscriber.
+
+        :return: list of dict
+        """
+        return [subscriber.statistics() for subscriber in self.subscribers]
+
+    def get_rung(self, name) -> int:
+        """Returns the index of the rung of the quality ladder with the given
+        name.
+
+        :param str name: name of the rung
+        """
+        for index, rung in enumerate(self.ladder):
+            if rung.name == name:
+                return index
+        raise ValueError(f"Unknown quality '{name}'")
+
+    def subscribe(self, on_frame=None, rung=0, adaptive=False) -> FrameSubscriber:
+        """Adds a subscriber, starting to get frames if it's the first one.
+
+        :param function on_frame: function called, from the
+            broadcaster's thread, when a new frame is available
+        :param int rung: index of the rung of the quality ladder to start
+            at
+        :param bool adaptive: whether to change rung depending on how long
+            sending frames takes
+        :return: :class:`FrameSubscriber`
+        """
+        subscriber = FrameSubscriber(self, on_frame=on_frame, adaptive=adaptive)
+        subscriber.rung = rung
+        with self.__condition:
+            self.__subscribers.append(subscriber)
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__broadcast, daemon=True)
+                self.__thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber) -> None:
+        """Removes a subscriber. Frames stop being got once there are no
+        subscribers left.
+
+        :param FrameSubscriber subscriber: subscriber to remove
+        """
+        with self.__condition:
+            if subscriber in self.__subscribers:
+                self.__subscribers.remove(subscriber)
+
+    def _wait_for_frame(self, last_sequence, rung, timeout):
+        def has_new_frame():
+            frame = self.__frames.get(rung)
+            return frame is not None and (
+                last_sequence is None or frame.sequence > last_sequence
+            )
+
+        with self.__condition:
+            if not self.__condition.wait_for(has_new_frame, timeout=timeout):
+                return None
+            return self.__frames[rung]
+
+    def __encode_rung(self, frame, rung):
+        return self.__encode(scale_frame(frame, rung.scale), rung.quality)
+
+    def __broadcast(self):
+        while True:
+            with self.__condition:
+                if len(self.__subscribers) == 0:
+                    # Don't give old frames to the next subscribers
+                    self.__frames = {}
+                    self.__thread = None
+                    return
+                rungs = {subscriber.rung for subscriber in self.__subscribers}
+
+            try:
+                frame = self.__get_frame()
+                timestamp = monotonic()
+                # Subscribers on the same rung share its encoding
+                frames = {
+                    rung: EncodedFrame(
+                        self.__encode_rung(frame, self.ladder[rung]),
+                        self.__sequence,
+                        timestamp,
+                    )
+                    for rung in rungs
+                }
+            except Exception as e:
+                logger.error(f"Error getting frame to broadcast: {e}")
+                sleep(self.ERROR_RETRY_INTERVAL)
+                continue
+
+            with self.__condition:
+                self.__frames = frames
+                self.__sequence += 1
+                self.frames_encoded += len(frames)
+                self.__condition.notify_all()
+                subscribers = list(self.__subscribers)
+
+            for subscriber in subscribers:
+                if callable(subscriber.on_frame):
+                    subscriber.on_frame()
@@ -1,15 +1,39 @@
+from .asyncserver import AsyncWebServer
 from .blueprints import ControllerBlueprint, RoverControllerBlueprint
 from .webserver import WebServer
 
+GEVENT_SERVER = "gevent"
+ASYNCIO_SERVER = "asyncio"
+SERVERS = (GEVENT_SERVER, ASYNCIO_SERVER)
+
+
+def _check_server(server):
+    if server not in SERVERS:
+        raise ValueError(f"Server must be one of {', '.join(SERVERS)}")
+
 
 class WebController(WebServer):
+    """A :class:`WebServer` that uses the :class:`ControllerBlueprint`.
+
+    :param str server: "gevent" to serve with gevent, or "asyncio" to serve
+        with an :class:`AsyncWebServer`, which creates an
+        :class:`AsyncWebController` instead
+    """
+
+    def __new__(cls, *args, server=GEVENT_SERVER, **kwargs):
+        _check_server(server)
+        if server == ASYNCIO_SERVER:
+            return AsyncWebController(*args, **kwargs)
+        return WebServer.__new__(cls)
+
     def __init__(
         self,
         get_frame=None,
         message_handlers=None,
         blueprints=None,
         ssl_context=None,
-        **kwargs
+        server=GEVENT_SERVER,
+        **kwargs,
     ):
         message_handlers = {} if message_handlers is None else message_handlers
         blueprints = [] if blueprints is None else blueprints
@@ -29,7 +53,50 @@ class WebController(WebServer):
         self.controller_blueprint.broadcast(message)
 
 
+class AsyncWebController(AsyncWebServer):
+    """An :class:`AsyncWebServer` that uses the :class:`ControllerBlueprint`,
+    like :class:`WebController`."""
+
+    def __init__(
+        self,
+        get_frame=None,
+        message_handlers=None,
+        blueprints=None,
+        ssl_context=None,
+        **kwargs,
+    ):
+        message_handlers = {} if message_handlers is None else message_handlers
+        blueprints = [] if blueprints is None else blueprints
+
+        self.controller_blueprint = ControllerBlueprint(
+            get_frame=get_frame, message_handlers=message_handlers
+        )
+
+        AsyncWebServer.__init__(
+            self,
+            blueprints=[self.controller_blueprint] + blueprints,
+            ssl_context=ssl_context,
+            **kwargs,
+        )
+
+    def broadcast(self, message):
+        self.controller_blueprint.broadcast(message)
+
+
 class RoverWebController(WebServer):
+    """A :class:`WebServer` that uses the :class:`RoverControllerBlueprint`.
+
+    :param str server: "gevent" to serve with gevent, or "asyncio" to serve
+        with an :class:`AsyncWebServer`, which creates an
+        :class:`AsyncRoverWebController` instead
+    """
+
+    def __new__(cls, *args, server=GEVENT_SERVER, **kwargs):
+        _check_server(server)
+        if server == ASYNCIO_SERVER:
+            return AsyncRoverWebController(*args, **kwargs)
+        return WebServer.__new__(cls)
+
     def __init__(
         self,
         get_frame=None,
@@ -39,7 +106,8 @@ class RoverWebController(WebServer):
         blueprints=None,
         ssl_context=None,
         port=None,
-        **kwargs
+        server=GEVENT_SERVER,
+        **kwargs,
     ):
         message_handlers = {} if message_handlers is None else message_handlers
         blueprints = [] if blueprints is None else blueprints
@@ -61,3 +129,40 @@ class RoverWebController(WebServer):
 
     def broadcast(self, message):
         self.rover_blueprint.broadcast(message)
+
+
+class AsyncRoverWebController(AsyncWebServer):
+    """An :class:`AsyncWebServer` that uses the
+    :class:`RoverControllerBlueprint`, like :class:`RoverWebController`."""
+
+    def __init__(
+        self,
+        get_frame=None,
+        drive=None,
+        pan_tilt=None,
+        message_handlers=None,
+        blueprints=None,
+        ssl_context=None,
+        port=None,
+        **kwargs,
+    ):
+        message_handlers = {} if message_handlers is None else message_handlers
+        blueprints = [] if blueprints is None else blueprints
+
+        self.rover_blueprint = RoverControllerBlueprint(
+            get_frame=get_frame,
+            drive=drive,
+            pan_tilt=pan_tilt,
+            message_handlers=message_handlers,
+        )
+
+        AsyncWebServer.__init__(
+            self,
+            blueprints=[self.rover_blueprint] + blueprints,
+            port=port,
+            ssl_context=ssl_context,
+            **kwargs,
+        )
+
+    def broadcast(self, message):
+        self.rover_blueprint.broadcast(message)
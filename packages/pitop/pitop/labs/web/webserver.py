@@ -47,6 +47,22 @@ def create_app(
     return app
 
 
+def log_server_address(port, ssl_context=None):
+    protocol = "https" if ssl_context else "http"
+    ip_addresses = list()
+    for interface in ("wlan0", "ptusb0", "lo", "eth0"):
+        ip_address = get_internal_ip(interface)
+        if is_url(f"{protocol}://{ip_address}"):
+            ip_addresses.append(ip_address)
+
+    print("WebServer is listening at:")
+    if len(ip_addresses) > 0:
+        for ip_address in ip_addresses:
+            print(f"\t- {protocol}://{ip_address}:{port}/")
+    else:
+        print(f"\t- {protocol}://localhost:{port}/ (on same device)")
+
+
 class WebServer(WSGIServer):
     def __init__(
         self,
@@ -87,19 +103,7 @@ class WebServer(WSGIServer):
             )
 
     def _log_address(self):
-        protocol = "https" if self.ssl_context else "http"
-        ip_addresses = list()
-        for interface in ("wlan0", "ptusb0", "lo", "eth0"):
-            ip_address = get_internal_ip(interface)
-            if is_url(f"{protocol}://{ip_address}"):
-                ip_addresses.append(ip_address)
-
-        print("WebServer is listening at:")
-        if len(ip_addresses) > 0:
-            for ip_address in ip_addresses:
-                print(f"\t- {protocol}://{ip_address}:{self.port}/")
-        else:
-            print(f"\t- {protocol}://localhost:{self.port}/ (on same device)")
+        log_server_address(self.port, self.ssl_context)
 
     def start(self):
         self._log_address()
@@ -0,0 +1,218 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Edges of the default frequency bands, in Hz: 7 bands, one for each column
+# of the pi-topPULSE LED matrix
+DEFAULT_BAND_EDGES = (40, 100, 250, 500, 1000, 2000, 4000, 8000)
+
+
+@dataclass
+class AudioFeatures:
+    """Features of a window of audio. Levels are relative to full scale.
+
+    :param float time: seconds of audio analysed up to the end of the
+        window
+    :param float rms: root mean square level, from 0 to 1
+    :param float peak: highest absolute level, from 0 to 1
+    :param float zero_crossing_rate: fraction of consecutive samples that
+        have different signs, from 0 to 1
+    :param band_energies: mean square level of the audio in each frequency
+        band; together they add up to about `rms` squared
+    :type band_energies: :class:`numpy.ndarray`
+    """
+
+    time: float
+    rms: float
+    peak: float
+    zero_crossing_rate: float
+    band_energies: np.ndarray
+
+
+class AudioAnalyser:
+    """Computes features of audio from the pi-topPULSE microphone over
+    sliding windows, as it's captured.
+
+    Pass the frames of audio captured to :meth:`process`, e.g. the frames
+    yielded by :func:`pitop.pulse.microphone.stream`. Every `hop_size`
+    samples, the features of the last `window_size` samples are computed
+    and passed to the callback.
+
+    Example::
+
+        analyser = AudioAnalyser(
+            lambda features: print(features.rms),
+            sample_rate=microphone.get_sample_rate(),
+        )
+        for frame in microphone.stream():
+            analyser.process(frame)
+
+    :param callback: function called with the :class:`AudioFeatures` of
+        each window. If not provided, the features of the last window are
+        only available from :attr:`features`.
+    :param int sample_rate: sample rate of the audio, in Hz
+    :param int window_size: number of samples in each window
+    :param int hop_size: number of samples between the start of each
+        window; half the window size if not provided
+    :param band_edges: increasing frequencies, in Hz, of the edges of the
+        frequency bands whose energy is computed
+    """
+
+    def __init__(
+        self,
+        callback=None,
+        sample_rate=22050,
+        window_size=1024,
+        hop_size=None,
+        band_edges=DEFAULT_BAND_EDGES,
+    ):
+        if hop_size is None:
+            hop_size = window_size // 2
+        if window_size < 2:
+            raise ValueError("Window size must be at least 2 samples")
+        if not 0 < hop_size <= window_size:
+            raise ValueError("Hop size must be between 1 and the window size")
+
+        self.callback = callback
+        self.sample_rate = sample_rate
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.features = None
+
+        self.__band_bins = self.__get_band_bins(band_edges)
+
+        # Preallocated buffers, so that analysing a window doesn't allocate
+        # memory other than for the FFT
+        self.__samples = np.zeros(window_size, dtype=np.float32)
+        self.__window = np.empty(window_size, dtype=np.float32)
+        self.__weighted_window = np.empty(window_size, dtype=np.float32)
+        self.__signs = np.empty(window_size, dtype=bool)
+        self.__crossings = np.empty(window_size - 1, dtype=bool)
+        self.__power = np.empty(window_size // 2 + 1, dtype=np.float64)
+        self.__cumulative_power = np.zeros(window_size // 2 + 2, dtype=np.float64)
+
+        self.__hann_window = np.hanning(window_size).astype(np.float32)
+        # Scales the one-sided power spectrum of the weighted window to mean
+        # square levels
+        self.__power_scale = 2 / (window_size * np.sum(self.__hann_window**2))
+
+        self.__position = 0
+        self.__samples_received = 0
+        self.__samples_since_hop = 0
+
+    def __get_band_bins(self, band_edges):
+        if len(band_edges) < 2 or np.any(np.diff(band_edges) <= 0):
+            raise ValueError("Band edges must be at least 2 increasing frequencies")
+
+        frequencies = np.fft.rfftfreq(self.window_size, 1 / self.sample_rate)
+        band_bins = np.searchsorted(frequencies, band_edges)
+        if np.any(np.diff(band_bins) == 0):
+            raise ValueError(
+                "Each frequency band must contain at least one frequency of the "
+                "window's spectrum; use a larger window or wider bands"
+            )
+        return band_bins
+
+    @staticmethod
+    def __get_scale(dtype):
+        """Offset and scale that convert samples to levels from -1 to 1."""
+        if dtype == np.uint8:
+            return 128, 1 / 128
+        if dtype == np.int16:
+            return 0, 1 / 32768
+        return 0, 1
+
+    def reset(self):
+        """Discards the samples received, to start analysing a new stream of
+        audio."""
+        self.__samples[:] = 0
+        self.__position = 0
+        self.__samples_received = 0
+        self.__samples_since_hop = 0
+        self.features = None
+
+    def process(self, samples):
+        """Adds samples to the audio being analysed, computing the features
+        of each window that's complete.
+
+        :param samples: samples of audio, as captured by the microphone:
+            uint8 at 8-bit or int16 at 16-bit. Float samples are taken as
+            levels from -1 to 1.
+        :type samples: :class:`numpy.ndarray`
+        """
+        samples = np.asarray(samples)
+        offset, scale = self.__get_scale(samples.dtype)
+
+        start = 0
+        while start < len(samples):
+            if self.__samples_received < self.window_size:
+                # The first window is analysed as soon as it's complete
+                samples_needed = self.window_size - self.__samples_received
+            else:
+                samples_needed = self.hop_size - self.__samples_since_hop
+            size = min(len(samples) - start, samples_needed)
+            self.__add(samples[start : start + size], offset, scale)
+            start += size
+
+            if size == samples_needed:
+                self.__samples_since_hop = 0
+                self.__analyse()
+
+    def __add(self, samples, offset, scale):
+        # At most a window of samples is added, so they wrap around the end
+        # of the buffer at most once
+        end = self.__position + len(samples)
+        first_part = min(end, self.window_size) - self.__position
+        for target, source in (
+            (self.__samples[self.__position : end], samples[:first_part]),
+            (self.__samples[: end - self.window_size], samples[first_part:]),
+        ):
+            if len(source) > 0:
+                target[:] = source
+                target -= offset
+                target *= scale
+
+        self.__position = end % self.window_size
+        self.__samples_received += len(samples)
+        self.__samples_since_hop += len(samples)
+
+    def __analyse(self):
+        window = self.__window
+        # Oldest samples first
+        oldest_part = self.window_size - self.__position
+        window[:oldest_part] = self.__samples[self.__position :]
+        window[oldest_part:] = self.__samples[: self.__position]
+
+        rms = np.sqrt(np.dot(window, window) / self.window_size)
+
+        np.signbit(window, out=self.__signs)
+        np.not_equal(self.__signs[1:], self.__signs[:-1], out=self.__crossings)
+        zero_crossing_rate = np.count_nonzero(self.__crossings) / (self.window_size - 1)
+
+        np.multiply(window, self.__hann_window, out=self.__weighted_window)
+        np.abs(np.fft.rfft(self.__weighted_window), out=self.__power)
+        np.square(self.__power, out=self.__power)
+        self.__power *= self.__power_scale
+        np.cumsum(self.__power, out=self.__cumulative_power[1:])
+        band_ends = self.__cumulative_power[self.__band_bins]
+        band_energies = band_ends[1:] - band_ends[:-1]
+
+        np.abs(window, out=window)
+        peak = window.max()
+
+        self.features = AudioFeatures(
+            time=self.__samples_received / self.sample_rate,
+            rms=float(rms),
+            peak=float(peak),
+            zero_crossing_rate=zero_crossing_rate,
+            band_energies=band_energies,
+        )
+
+        if self.callback is not None:
+            try:
+                self.callback(self.features)
+            except Exception as e:
+                logger.error(f"Error in audio analysis callback: {e}")
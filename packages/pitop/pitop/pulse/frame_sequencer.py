@@ -0,0 +1,202 @@
+import logging
+from collections import deque
+from threading import Condition, Thread
+from time import monotonic
+
+import numpy as np
+
+from pitop.pulse import ledmatrix
+
+logger = logging.getLogger(__name__)
+
+
+class FrameSequencer:
+    """Plays sequences of frames on the pi-topPULSE LED matrix from a
+    background thread, e.g. animations or visualisations of audio.
+
+    Frames are shown on a fixed timeline: if showing a frame takes longer
+    than a frame's duration, the frames that are late are skipped instead
+    of slowing the sequence down. Only the columns of the matrix that
+    change between frames are sent to the device.
+
+    Example::
+
+        sequencer = FrameSequencer()
+        sequencer.queue(frames, fps=25)
+        sequencer.wait()
+
+    :param float fps: default rate at which frames are shown, up to 50
+        frames per second
+    """
+
+    def __init__(self, fps=25):
+        self.__validate_fps(fps)
+        self.default_fps = fps
+
+        self.__condition = Condition()
+        self.__sequences = deque()
+        self.__playing = False
+        self.__running = True
+
+        self.frames_shown = 0
+        self.frames_skipped = 0
+        self.__show_times = deque(maxlen=50)
+
+        self.__thread = Thread(target=self.__play_loop, daemon=True)
+        self.__thread.start()
+
+    @staticmethod
+    def __validate_fps(fps):
+        if not 0 < fps <= ledmatrix._max_freq:
+            raise ValueError(
+                f"Frame rate must be greater than 0 and up to {ledmatrix._max_freq}"
+            )
+
+    @property
+    def fps(self) -> float:
+        """Rate at which frames were recently shown, in frames per
+        second."""
+        with self.__condition:
+            if len(self.__show_times) < 2:
+                return 0.0
+            elapsed = self.__show_times[-1] - self.__show_times[0]
+            return (len(self.__show_times) - 1) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def is_playing(self) -> bool:
+        with self.__condition:
+            return self.__playing or len(self.__sequences) > 0
+
+    def queue(self, frames, fps=None, loop=False) -> None:
+        """Queues a sequence of frames to be shown after the sequences
+        already queued.
+
+        :param frames: RGB color of each pixel of each frame, indexed by
+            [frame][y][x], e.g. a NumPy array of shape (frames, 7, 7, 3)
+            with values from 0 to 255
+        :param float fps: rate at which the frames are shown; the
+            sequencer's default rate if not provided
+        :param bool loop: whether to play the sequence again when it
+            finishes. A looping sequence plays until another sequence is
+            queued.
+        """
+        if fps is None:
+            fps = self.default_fps
+        self.__validate_fps(fps)
+
+        width, height = ledmatrix.get_shape()
+        frames = np.asarray(frames)
+        if frames.ndim != 4 or frames.shape[1:] != (height, width, 3):
+            raise ValueError(f"Frames must have shape (frames, {height}, {width}, 3)")
+        if len(frames) == 0:
+            return
+
+        with self.__condition:
+            if not self.__running:
+                raise RuntimeError("Frame sequencer has been stopped")
+            self.__sequences.append((frames, fps, loop))
+            self.__condition.notify_all()
+
+    def play(self, frames, fps=None, loop=False) -> None:
+        """Replaces the queued sequences and the sequence being played
+        with a new sequence of frames.
+
+        Takes the same arguments as :meth:`queue`.
+        """
+        with self.__condition:
+            self.__sequences.clear()
+            self.queue(frames, fps, loop)
+
+    def clear(self) -> None:
+        """Stops playing the current sequence and removes the queued ones.
+
+        The last frame shown stays on the LED matrix.
+        """
+        with self.__condition:
+            self.__sequences.clear()
+            self.__condition.notify_all()
+
+    def wait(self, timeout=None) -> bool:
+        """Waits until all queued sequences have been played.
+
+        Looping sequences never finish, so this returns once they are
+        cleared or the timeout expires.
+
+        :param float timeout: maximum time to wait in seconds
+        :return: False if the timeout expired before then
+        :rtype: bool
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: not self.__playing and len(self.__sequences) == 0, timeout
+            )
+
+    def stop(self) -> None:
+        """Clears the queued sequences and stops the sequencer's thread."""
+        with self.__condition:
+            self.__sequences.clear()
+            self.__running = False
+            self.__condition.notify_all()
+        self.__thread.join()
+
+    def __show(self, frame):
+        ledmatrix.set_frame(frame)
+        ledmatrix.show()
+        with self.__condition:
+            self.frames_shown += 1
+            self.__show_times.append(monotonic())
+
+    def __next_sequence(self):
+        with self.__condition:
+            self.__playing = False
+            self.__condition.notify_all()
+            self.__condition.wait_for(
+                lambda: len(self.__sequences) > 0 or not self.__running
+            )
+            if not self.__running:
+                return None
+            self.__playing = True
+            return self.__sequences[0]
+
+    def __play_sequence(self, sequence):
+        frames, fps, loop = sequence
+        start_time = monotonic()
+        last_index = -1
+
+        while True:
+            index = int((monotonic() - start_time) * fps)
+            if not loop and index >= len(frames):
+                self.frames_skipped += len(frames) - last_index - 1
+                return
+            self.frames_skipped += index - last_index - 1
+            last_index = index
+
+            try:
+                self.__show(frames[index % len(frames)])
+            except Exception as e:
+                logger.error(f"Error showing frame: {e}")
+
+            next_frame_time = start_time + (index + 1) / fps
+            with self.__condition:
+                # stop waiting if the sequence is replaced or a sequence is
+                # queued after a looping one
+                if self.__condition.wait_for(
+                    lambda: not self.__running
+                    or len(self.__sequences) == 0
+                    or self.__sequences[0] is not sequence
+                    or (loop and len(self.__sequences) > 1),
+                    max(next_frame_time - monotonic(), 0),
+                ):
+                    return
+
+    def __play_loop(self):
+        while True:
+            sequence = self.__next_sequence()
+            if sequence is None:
+                return
+
+            self.__play_sequence(sequence)
+
+            with self.__condition:
+                if len(self.__sequences) > 0 and self.__sequences[0] is sequence:
+                    self.__sequences.popleft()
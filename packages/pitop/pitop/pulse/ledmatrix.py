@@ -4,9 +4,10 @@ from copy import deepcopy
 from math import ceil, cos, radians, sin
 from os import path
 from sys import exit
-from threading import Timer
+from threading import RLock, Timer
 from time import sleep
 
+import numpy as np
 from serial import Serial, serialutil
 
 from pitop.pulse import configuration
@@ -289,19 +290,25 @@ _sync = bytearray(
     [7, 127, 127, 127, 127, 127, 127, 127, 127, 127, 127, 127, 127, 127, 127, 127, 127]
 )
 
-_empty = [0, 0, 0]
+# Brightness and gamma corrected value of each 0-255 color value, for the
+# current brightness
+_brightness_correction_lut = np.array(_gamma_correction_arr, dtype=np.uint8)
 
-_empty_map = [
-    [_empty, _empty, _empty, _empty, _empty, _empty, _empty],
-    [_empty, _empty, _empty, _empty, _empty, _empty, _empty],
-    [_empty, _empty, _empty, _empty, _empty, _empty, _empty],
-    [_empty, _empty, _empty, _empty, _empty, _empty, _empty],
-    [_empty, _empty, _empty, _empty, _empty, _empty, _empty],
-    [_empty, _empty, _empty, _empty, _empty, _empty, _empty],
-    [_empty, _empty, _empty, _empty, _empty, _empty, _empty],
-]
+# Brightness corrected RGB value of each LED, indexed by [y][x]
+_pixel_map = np.zeros((_h, _w, 3), dtype=np.uint8)
+
+# Data sent to the device for each column: the column number, then 2 bytes
+# for each of its LEDs and 2 bytes for the ambient light
+_col_data_length = 1 + 2 * (_h + 1)
+_frame_buffer = bytearray(_w * _col_data_length)
+_frame = np.frombuffer(_frame_buffer, dtype=np.uint8).reshape(_w, _col_data_length)
+_frame[:, 0] = np.arange(_w)
 
-_pixel_map = deepcopy(_empty_map)
+# Copy of the frame buffer last sent to the device, so that only the columns
+# that changed since then are sent again; None if the device state is unknown
+_last_sent_frame = None
+
+_lock = RLock()
 
 #######################
 # INTERNAL OPERATIONS #
@@ -316,7 +323,7 @@ def __initialise():
 
     global _initialised
     global _serial_device
-    global _pixel_map
+    global _last_sent_frame
 
     if not _initialised:
         if configuration.mcu_enabled():
@@ -330,6 +337,7 @@ def __initialise():
 
             if _serial_device.isOpen():
                 logger.debug("OK.")
+                _last_sent_frame = None
             else:
                 logger.info("Error: Failed to open serial port!")
                 exit()
@@ -358,18 +366,8 @@ def __get_avg_color():
     Get the average color of the matrix.
     """
 
-    total_rgb = [0, 0, 0]
-    avg_rgb = [0, 0, 0]
-
-    for x in range(_w):
-        for y in range(_h):
-            for c in range(3):
-                total_rgb[c] = total_rgb[c] + _pixel_map[x][y][c]
-
-    for i, val in enumerate(total_rgb):
-        avg_rgb[i] = int(round(val / (_w * _h)))
-
-    return avg_rgb
+    total_rgb = _pixel_map.sum(axis=(0, 1), dtype=np.uint32).tolist()
+    return [int(round(val / (_w * _h))) for val in total_rgb]
 
 
 def __write(data):
@@ -378,21 +376,22 @@ def __write(data):
     Write data to the matrix.
     """
 
-    logger.debug(
-        "{s0:<4}{s1:<4}{s2:<4}{s3:<4}{s4:<4}{s5:<4}{s6:<4}{s7:<4}{s8:<4}{s9:<4}{s10:<4}".format(
-            s0=data[0],
-            s1=data[1],
-            s2=data[2],
-            s3=data[3],
-            s4=data[4],
-            s5=data[5],
-            s6=data[6],
-            s7=data[7],
-            s8=data[8],
-            s9=data[9],
-            s10=data[10],
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "{s0:<4}{s1:<4}{s2:<4}{s3:<4}{s4:<4}{s5:<4}{s6:<4}{s7:<4}{s8:<4}{s9:<4}{s10:<4}".format(
+                s0=data[0],
+                s1=data[1],
+                s2=data[2],
+                s3=data[3],
+                s4=data[4],
+                s5=data[5],
+                s6=data[6],
+                s7=data[7],
+                s8=data[8],
+                s9=data[9],
+                s10=data[10],
+            )
         )
-    )
     _serial_device.write(data)
     sleep(0.002)
 
@@ -421,37 +420,39 @@ def __scale_pixel_to_brightness(original_value):
     return int_new_brightness
 
 
-def __get_rotated_pixel_map():
+def __update_brightness_correction_lut():
     """INTERNAL.
 
-    Get a rotated copy of the current in-memory pixel map.
+    Precompute the brightness and gamma corrected value of every 0-255
+    color value for the current brightness.
     """
 
-    rotated_pixel_map = deepcopy(_pixel_map)
+    global _brightness_correction_lut
 
-    # Some fancy maths to rotate pixel map so that
-    # 0,0 (x,y) - with rotation 0 - is the bottom left LED
-    scaled_rotation = int(_rotation / 90)
-    adjusted_scaled_rotation = scaled_rotation + 1
-    modulo_adjusted_scaled_rotation = adjusted_scaled_rotation % 4
-    count = (6 - modulo_adjusted_scaled_rotation) % 4
-
-    for x in range(count):
-        rotated_pixel_map = list(zip(*rotated_pixel_map[::-1]))
-
-    return rotated_pixel_map
+    _brightness_correction_lut = np.array(
+        [
+            __get_gamma_corrected_value(__scale_pixel_to_brightness(value))
+            for value in range(256)
+        ],
+        dtype=np.uint8,
+    )
 
 
-def __brightness_correct(original_value):
+def __get_rotated_pixel_map():
     """INTERNAL.
 
-    Correct a single color for brightness.
+    Get a rotated view of the current in-memory pixel map.
     """
 
-    brightness_scaled = __scale_pixel_to_brightness(original_value)
-    new_value = __get_gamma_corrected_value(brightness_scaled)
+    # Some fancy maths to rotate pixel map so that
+    # 0,0 (x,y) - with rotation 0 - is the bottom left LED
+    scaled_rotation = int(_rotation / 90)
+    adjusted_scaled_rotation = scaled_rotation + 1
+    modulo_adjusted_scaled_rotation = adjusted_scaled_rotation % 4
+    count = (6 - modulo_adjusted_scaled_rotation) % 4
 
-    return new_value
+    # Rotate clockwise 'count' times
+    return np.rot90(_pixel_map, -count)
 
 
 def __adjust_r_g_b_for_brightness_correction(r, g, b):
@@ -460,11 +461,7 @@ def __adjust_r_g_b_for_brightness_correction(r, g, b):
     Correct LED for brightness.
     """
 
-    r = __brightness_correct(r)
-    g = __brightness_correct(g)
-    b = __brightness_correct(b)
-
-    return r, g, b
+    return _brightness_correction_lut[[int(round(r)), int(round(g)), int(round(b))]]
 
 
 def __sync_with_device():
@@ -482,6 +479,10 @@ def __rgb_to_bytes_to_send(rgb):
     """INTERNAL.
 
     Format the LED data in the device-specific layout.
+
+    :param rgb: uint8 array of RGB values, with the colors in the last
+        axis
+    :return: the two bytes to send for each LED
     """
 
     # Create three 5-bit color vals, splitting the green bits
@@ -489,21 +490,32 @@ def __rgb_to_bytes_to_send(rgb):
     # |XX|G0|G1|R0|R1|R2|R3|R4|
     # |G2|G3|G4|B0|B1|B2|B3|B4|
 
-    r = rgb[0]
-    g = rgb[1]
-    b = rgb[2]
-
-    byte0 = (r >> 3) & 0x1F
-    byte1 = (b >> 3) & 0x1F
-    grnb0 = (g >> 1) & 0x60
-    grnb1 = (g << 2) & 0xE0
+    r = rgb[..., 0]
+    g = rgb[..., 1]
+    b = rgb[..., 2]
 
-    byte0 = (byte0 | grnb0) & 0xFF
-    byte1 = (byte1 | grnb1) & 0xFF
+    byte0 = ((r >> 3) & 0x1F) | ((g >> 1) & 0x60)
+    byte1 = ((b >> 3) & 0x1F) | ((g << 2) & 0xE0)
 
     return byte0, byte1
 
 
+def __pack_frame():
+    """INTERNAL.
+
+    Write the data of every column of the matrix to the frame buffer.
+    """
+
+    rotated_pixel_map = __get_rotated_pixel_map()
+    avg_rgb = np.array(__get_avg_color(), dtype=np.uint8)
+
+    # LEDs of each column, and the ambient lighting color
+    _frame[:, 1 : 2 * _h : 2], _frame[:, 2 : 2 * _h + 1 : 2] = __rgb_to_bytes_to_send(
+        rotated_pixel_map
+    )
+    _frame[:, 2 * _h + 1], _frame[:, 2 * _h + 2] = __rgb_to_bytes_to_send(avg_rgb)
+
+
 def __timer_method():
     """INTERNAL.
 
@@ -526,18 +538,13 @@ def __flip(direction):
 
     global _pixel_map
 
-    flipped_pixel_map = deepcopy(_pixel_map)
-    for x in range(_w):
-        for y in range(_h):
-            if direction == "h":
-                flipped_pixel_map[x][y] = _pixel_map[(_w - 1) - x][y]
-            elif direction == "v":
-                flipped_pixel_map[x][y] = _pixel_map[x][(_h - 1) - y]
-            else:
-                err = "Flip direction must be [h]orizontal or [v]ertical only"
-                raise ValueError(err)
-
-    _pixel_map = flipped_pixel_map
+    if direction == "h":
+        _pixel_map = np.flip(_pixel_map, axis=0).copy()
+    elif direction == "v":
+        _pixel_map = np.flip(_pixel_map, axis=1).copy()
+    else:
+        err = "Flip direction must be [h]orizontal or [v]ertical only"
+        raise ValueError(err)
 
 
 def __set_show_state(enabled):
@@ -586,6 +593,7 @@ def brightness(new_brightness):
     if new_brightness > 1 or new_brightness < 0:
         raise ValueError("Brightness level must be between 0 and 1")
     _brightness = new_brightness
+    __update_brightness_correction_lut()
 
 
 def get_brightness():
@@ -640,7 +648,7 @@ def get_pixel(x, y):
 
     global _pixel_map
 
-    return _pixel_map[y][x]
+    return _pixel_map[y, x].tolist()
 
 
 def set_pixel(x, y, r, g, b):
@@ -655,8 +663,7 @@ def set_pixel(x, y, r, g, b):
 
     global _pixel_map
 
-    new_r, new_g, new_b = __adjust_r_g_b_for_brightness_correction(r, g, b)
-    _pixel_map[y][x] = [new_r, new_g, new_b]
+    _pixel_map[y, x] = __adjust_r_g_b_for_brightness_correction(r, g, b)
 
 
 def set_all(r, g, b):
@@ -664,20 +671,40 @@ def set_all(r, g, b):
 
     global _pixel_map
 
-    for x in range(_w):
-        for y in range(_h):
-            new_r, new_g, new_b = __adjust_r_g_b_for_brightness_correction(r, g, b)
-            _pixel_map[x][y][0] = new_r
-            _pixel_map[x][y][1] = new_g
-            _pixel_map[x][y][2] = new_b
+    _pixel_map[:] = __adjust_r_g_b_for_brightness_correction(r, g, b)
+
+
+def set_frame(pixels):
+    """Set all pixels from an array of RGB colors.
+
+    :param pixels: RGB color of each pixel, indexed by [y][x], e.g. a
+        NumPy array of shape (7, 7, 3) with values from 0 to 255
+    """
+
+    pixels = np.asarray(pixels)
+    if pixels.shape != (_h, _w, 3):
+        raise ValueError(f"Frame must have shape ({_h}, {_w}, 3)")
+
+    if not np.issubdtype(pixels.dtype, np.integer):
+        pixels = np.rint(pixels).astype(np.intp)
+
+    with _lock:
+        _pixel_map[:] = _brightness_correction_lut[pixels]
 
 
 def show():
-    """Update pi-topPULSE with the contents of the display buffer."""
+    """Update pi-topPULSE with the contents of the display buffer.
+
+    Only the columns that changed since the last update are sent to the
+    device. Every column also carries the ambient light color, which is
+    the average color of the matrix, so when a change alters the average
+    color all the columns are sent. The saving applies to updates that
+    leave the average color unchanged, such as moving or recoloring
+    pixels without changing the total, or changes too small to alter the
+    ambient light bytes, which only keep the top 5 bits of each channel.
+    """
 
-    global _pixel_map
-    global _rotation
-    global _show_enabled
+    global _last_sent_frame
 
     wait_counter = 0
 
@@ -702,44 +729,38 @@ def show():
     if attempt_to_show_early:
         logger.debug("pi-topPULSE LEDs re-enabled.")
 
-    __sync_with_device()
+    with _lock:
+        __pack_frame()
 
-    rotated_pixel_map = __get_rotated_pixel_map()
-    avg_rgb = __get_avg_color()
+        __initialise()
 
-    __initialise()
+        if _last_sent_frame is None:
+            changed_cols = range(_w)
+        else:
+            changed_cols = np.flatnonzero((_frame != _last_sent_frame).any(axis=1))
+        if len(changed_cols) == 0:
+            return
 
-    logger.debug("LED data:")
-    # For each col
-    for x in range(_w):
-        # Write col to LED matrix
-        # Start with col no., so LED matrix knows which one it belongs to
-        pixel_map_buffer = chr(x)
-        # Get col's frame buffer, iterating over each pixel
-        for y in range(_h + 1):
-            if y == _h:
-                # Ambient lighting bytes
-                byte0, byte1 = __rgb_to_bytes_to_send(avg_rgb)
-            else:
-                byte0, byte1 = __rgb_to_bytes_to_send(rotated_pixel_map[x][y])
+        __sync_with_device()
 
-            pixel_map_buffer += chr(byte0)
-            pixel_map_buffer += chr(byte1)
+        logger.debug("LED data:")
+        frame_data = memoryview(_frame_buffer)
+        # For each changed col
+        for x in changed_cols:
+            # Write col to LED matrix; its data starts with the col no.,
+            # so LED matrix knows which one it belongs to
+            __write(frame_data[x * _col_data_length : (x + 1) * _col_data_length])
 
-        # Write col to LED matrix
-        arr = bytearray(pixel_map_buffer, "Latin_1")
-        __write(arr)
+            # Prevent another write if it's too fast
+            __disable_show_state()
 
-        # Prevent another write if it's too fast
-        __disable_show_state()
+        _last_sent_frame = _frame.copy()
 
 
 def clear():
     """Clear the buffer."""
 
-    global _pixel_map
-
-    _pixel_map = deepcopy(_empty_map)
+    _pixel_map[:] = 0
 
 
 def off():
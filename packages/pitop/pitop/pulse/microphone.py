@@ -1,13 +1,13 @@
 import logging
 import signal
-from binascii import hexlify, unhexlify
-from os import close, path, remove, rename, stat
-from struct import pack
+import wave
+from os import close, path, remove, rename
+from queue import Empty, Full, Queue
 from sys import exit
 from tempfile import mkstemp
 from threading import Thread
-from time import sleep
 
+import numpy as np
 import serial
 
 from pitop.pulse import configuration
@@ -21,6 +21,13 @@ _thread_running = False
 _exiting = False
 _temp_file_path = ""
 
+# Minimum number of bytes to wait for in each read from the serial port
+_min_read_size = 512
+_default_frame_size = 1024
+# Frames kept for a stream that isn't consumed fast enough; the oldest ones
+# are dropped when there are more
+_max_queued_stream_frames = 64
+
 #######################
 # INTERNAL OPERATIONS #
 #######################
@@ -44,236 +51,222 @@ def __signal_handler(signal, frame):
     exit(0)
 
 
-def __get_size(filename):
-    """INTERNAL.
-
-    Gets the size of a file.
-    """
-
-    file_stats = stat(filename)
-    return file_stats.st_size
-
-
-def __from_hex(value):
+def __convert_samples(data, bitrate):
     """INTERNAL.
 
-    Gets a bytearray from hex data.
+    Converts unsigned 8-bit PCM data from the microphone to samples of the
+    given bit rate: unsigned 8-bit or signed 16-bit.
     """
 
-    return bytearray.fromhex(value)
+    samples = np.frombuffer(data, dtype=np.uint8)
+    if bitrate == 16:
+        # Centre around 0 and scale to the 16-bit range
+        return (samples.astype(np.int16) - 128) << 8
+    return samples.copy()
 
 
-def __space_separated_little_endian(integer_value, byte_len):
+def __call_with_frames(frame_callback, pending_samples, samples, frame_size):
     """INTERNAL.
 
-    Get an integer in format for WAV file header.
+    Calls the frame callback with each complete frame of samples, and
+    returns the samples left over for the next frame.
     """
 
-    if byte_len <= 1:
-        pack_type = "<B"
-    elif byte_len <= 2:
-        pack_type = "<H"
-    elif byte_len <= 4:
-        pack_type = "<I"
-    elif byte_len <= 8:
-        pack_type = "<Q"
-    else:
-        logger.info("Value cannot be represented in 8 bytes - exiting")
-        exit()
-
-    hex_string = pack(pack_type, integer_value)
-    temp = hexlify(hex_string).decode()
-    return " ".join([temp[i : i + 2] for i in range(0, len(temp), 2)])
+    if len(pending_samples) > 0:
+        samples = np.concatenate((pending_samples, samples))
 
+    complete_frames_size = len(samples) - len(samples) % frame_size
+    for frame in samples[:complete_frames_size].reshape(-1, frame_size):
+        try:
+            frame_callback(frame)
+        except Exception as e:
+            logger.error(f"Error in microphone frame callback: {e}")
 
-def __init_header_information():
-    """INTERNAL.
-
-    Create a WAV file header.
-    """
+    return samples[complete_frames_size:]
 
-    RIFF = "52 49 46 46"
-    WAVE = "57 41 56 45"
-    fmt = "66 6d 74 20"
-    DATA = "64 61 74 61"
 
-    if configuration.microphone_sample_rate_is_22khz():
-        capture_sample_rate = 22050
-    else:
-        capture_sample_rate = 16000
-
-    # ChunkID
-    header = __from_hex(RIFF)
-    # ChunkSize - 4 bytes (to be changed depending on length of data...)
-    header += __from_hex(__space_separated_little_endian(0, 4))
-    # Format
-    header += __from_hex(WAVE)
-    # Subchunk1ID
-    header += __from_hex(fmt)
-    # Subchunk1Size (PCM = 16)
-    header += __from_hex(__space_separated_little_endian(16, 4))
-    # AudioFormat   (PCM = 1)
-    header += __from_hex(__space_separated_little_endian(1, 2))
-    header += __from_hex(__space_separated_little_endian(1, 2))  # NumChannels
-    # SampleRate
-    header += __from_hex(__space_separated_little_endian(capture_sample_rate, 4))
-    # ByteRate (Same as SampleRate due to 1 channel, 1 byte per sample)
-    header += __from_hex(__space_separated_little_endian(capture_sample_rate, 4))
-    # BlockAlign - (no. of bytes per sample)
-    header += __from_hex(__space_separated_little_endian(1, 2))
-    # BitsPerSample
-    header += __from_hex(__space_separated_little_endian(_bitrate, 2))
-    # Subchunk2ID
-    header += __from_hex(DATA)
-    # Subchunk2Size - 4 bytes (to be changed depending on length of data...)
-    header += __from_hex(__space_separated_little_endian(0, 4))
-
-    return header
-
-
-def __update_header_in_file(file, position, value):
+def __open_wav_file(file_path, bitrate):
     """INTERNAL.
 
-    Update the WAV header
+    Open a WAV file to write audio from the microphone to.
     """
 
-    hex_value = __space_separated_little_endian(value, 4)
-    data = unhexlify("".join(hex_value.split()))
-
-    file.seek(position)
-    file.write(data)
+    wav_file = wave.open(file_path, "wb")
+    wav_file.setnchannels(1)
+    wav_file.setsampwidth(bitrate // 8)
+    wav_file.setframerate(get_sample_rate())
+    return wav_file
 
 
-def __finalise_wav_file(file_path):
+def __record_audio(frame_callback, frame_size, write_to_file):
     """INTERNAL.
 
-    Update the WAV file header with the size of the data.
+    Open the serial port and capture audio data into a temp file and/or
+    the frame callback.
     """
 
-    size_of_data = __get_size(file_path) - 44
+    global _temp_file_path
 
-    if size_of_data <= 0:
-        logger.info("Error: No data was recorded!")
-        remove(file_path)
-    else:
-        with open(file_path, "rb+") as file:
-            logger.debug("Updating header information...")
+    if not path.exists("/dev/serial0"):
+        logger.info("Error: Could not find serial port - are you sure it's enabled?")
+        return
 
-            __update_header_in_file(file, 4, size_of_data + 36)
-            __update_header_in_file(file, 40, size_of_data)
+    logger.debug("Opening serial device...")
 
+    serial_device = serial.Serial(
+        port="/dev/serial0",
+        timeout=1,
+        baudrate=250000,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        bytesize=serial.EIGHTBITS,
+    )
 
-def __thread_method():
-    """INTERNAL.
+    if not serial_device.isOpen():
+        logger.info("Error: Serial port failed to open")
+        return
 
-    Thread method.
-    """
+    bitrate = _bitrate
+    wav_file = None
+    samples_written = 0
+    pending_samples = np.empty(0, dtype=np.int16 if bitrate == 16 else np.uint8)
 
-    __record_audio()
+    try:
+        logger.debug("Start recording")
 
+        if write_to_file:
+            temp_file_tuple = mkstemp()
+            close(temp_file_tuple[0])
+            _temp_file_path = temp_file_tuple[1]
+            wav_file = __open_wav_file(_temp_file_path, bitrate)
 
-def __record_audio():
-    """INTERNAL.
+        if serial_device.inWaiting():
+            logger.debug("Flushing input and starting from scratch")
+            serial_device.flushInput()
 
-    Open the serial port and capture audio data into a temp file.
-    """
+        while _continue_writing:
+            # Wait for a block of data, or the data that's already waiting
+            # if there's more
+            audio_output = serial_device.read(
+                max(serial_device.inWaiting(), _min_read_size)
+            )
+            if len(audio_output) == 0:
+                continue
 
-    global _temp_file_path
+            samples = __convert_samples(audio_output, bitrate)
 
-    temp_file_tuple = mkstemp()
-    close(temp_file_tuple[0])
-    _temp_file_path = temp_file_tuple[1]
+            if wav_file is not None:
+                wav_file.writeframesraw(samples)
+                samples_written += len(samples)
 
-    if path.exists("/dev/serial0"):
-        logger.debug("Opening serial device...")
+            if frame_callback is not None:
+                pending_samples = __call_with_frames(
+                    frame_callback, pending_samples, samples, frame_size
+                )
 
-        serial_device = serial.Serial(
-            port="/dev/serial0",
-            timeout=1,
-            baudrate=250000,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            bytesize=serial.EIGHTBITS,
-        )
-        serial_device_open = serial_device.isOpen()
+    finally:
+        serial_device.close()
 
-        if serial_device_open is True:
-            try:
-                logger.debug("Start recording")
+        if wav_file is not None:
+            # Closing the file updates the WAV header with the size of the data
+            wav_file.close()
 
-                with open(_temp_file_path, "wb") as file:
-                    logger.debug("WRITING: initial header information")
-                    file.write(__init_header_information())
+            if samples_written == 0:
+                logger.info("Error: No data was recorded!")
+                remove(_temp_file_path)
 
-                    if serial_device.inWaiting():
-                        logger.debug("Flushing input and starting from scratch")
-                        serial_device.flushInput()
+        logger.debug("Finished Recording.")
 
-                    logger.debug("WRITING: wave data")
 
-                    while _continue_writing:
-                        while not serial_device.inWaiting():
-                            sleep(0.01)
+def __start_recording(frame_callback, frame_size, write_to_file):
+    """INTERNAL.
 
-                        audio_output = serial_device.read(serial_device.inWaiting())
-                        bytes_to_write = bytearray()
+    Start the recording thread, if it's not running already.
+    """
 
-                        for pcm_data_block in audio_output:
-                            if _bitrate == 16:
-                                pcm_data_int = 0
-                                pcm_data_int = pcm_data_block
-                                scaled_val = int((pcm_data_int * 32768) / 255)
-                                bytes_to_write += __from_hex(
-                                    __space_separated_little_endian(scaled_val, 2)
-                                )
+    global _thread_running
+    global _continue_writing
+    global _recording_thread
 
-                            else:
-                                pcm_data_int = pcm_data_block
-                                bytes_to_write += __from_hex(
-                                    __space_separated_little_endian(pcm_data_int, 1)
-                                )
+    if frame_size < 1:
+        raise ValueError("Frame size must be at least 1 sample")
 
-                        file.write(bytes_to_write)
+    if not configuration.mcu_enabled():
+        logger.info("Error: pi-topPULSE is not initialised.")
+        exit()
 
-                        sleep(0.1)
+    if _thread_running is True:
+        logger.info("Microphone is already recording!")
+        return False
 
-            finally:
-                serial_device.close()
+    _thread_running = True
+    _continue_writing = True
+    _recording_thread = Thread(
+        group=None,
+        target=__record_audio,
+        args=(frame_callback, frame_size, write_to_file),
+        daemon=True,
+    )
+    _recording_thread.start()
+    return True
 
-                __finalise_wav_file(_temp_file_path)
 
-                logger.debug("Finished Recording.")
+#######################
+# EXTERNAL OPERATIONS #
+#######################
 
-        else:
-            logger.info("Error: Serial port failed to open")
 
-    else:
-        logger.info("Error: Could not find serial port - are you sure it's enabled?")
+def record(frame_callback=None, frame_size=_default_frame_size):
+    """Start recording on the pi-topPULSE microphone.
 
+    :param frame_callback: function called from the recording thread with
+        each frame of audio recorded, to process it while recording. Frames
+        are NumPy arrays of `frame_size` samples: uint8 values at 8-bit, or
+        int16 values at 16-bit.
+    :param int frame_size: number of samples in each frame passed to
+        `frame_callback`
+    """
 
-#######################
-# EXTERNAL OPERATIONS #
-#######################
+    __start_recording(frame_callback, frame_size, write_to_file=True)
 
 
-def record():
-    """Start recording on the pi-topPULSE microphone."""
+def stream(frame_size=_default_frame_size):
+    """Capture audio from the pi-topPULSE microphone without saving it,
+    yielding frames of audio as they are captured.
 
-    global _thread_running
-    global _continue_writing
-    global _recording_thread
+    Frames are NumPy arrays of `frame_size` samples: uint8 values at 8-bit,
+    or int16 values at 16-bit. If frames aren't consumed fast enough, the
+    oldest ones are dropped. Capturing stops when the generator is closed.
 
-    if not configuration.mcu_enabled():
-        logger.info("Error: pi-topPULSE is not initialised.")
-        exit()
+    :param int frame_size: number of samples in each frame
+    """
 
-    if _thread_running is False:
-        _thread_running = True
-        _continue_writing = True
-        _recording_thread = Thread(group=None, target=__thread_method, daemon=True)
-        _recording_thread.start()
-    else:
-        logger.info("Microphone is already recording!")
+    frames = Queue(maxsize=_max_queued_stream_frames)
+
+    def queue_frame(frame):
+        while True:
+            try:
+                frames.put_nowait(frame)
+                return
+            except Full:
+                try:
+                    frames.get_nowait()
+                except Empty:
+                    pass
+
+    if not __start_recording(queue_frame, frame_size, write_to_file=False):
+        return
+
+    recording_thread = _recording_thread
+    try:
+        while True:
+            try:
+                yield frames.get(timeout=0.1)
+            except Empty:
+                if not recording_thread.is_alive():
+                    return
+    finally:
+        stop()
 
 
 def is_recording():
@@ -315,6 +308,14 @@ def save(file_path, overwrite=False):
         logger.info("Microphone is still recording!")
 
 
+def get_sample_rate():
+    """Get the sample rate the microphone is set to record at, in Hz."""
+
+    if configuration.microphone_sample_rate_is_22khz():
+        return 22050
+    return 16000
+
+
 def set_sample_rate_to_16khz():
     """Set the appropriate I2C bits to enable 16,000Hz recording on the
     microphone."""
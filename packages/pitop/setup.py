@@ -72,6 +72,7 @@ __requires__ = [
     # Pulse #
     #########
     "pyserial>=3.5,<4.0",
+    "numpy>1.19.5,<2.0.0",
     #############
     # Webserver #
     #############
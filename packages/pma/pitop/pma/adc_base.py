@@ -1,11 +1,13 @@
+import asyncio
 import time
 
 from pitop.core.mixins import Recreatable, Stateful
+from pitop.pma.async_plate_interface import AsyncPlateInterface, SupportsAsync
 from pitop.pma.common import get_pin_for_port
 from pitop.pma.plate_interface import PlateInterface
 
 
-class ADCBase(Stateful, Recreatable):
+class ADCBase(Stateful, Recreatable, SupportsAsync):
     """Encapsulates the behaviour of an Analog-to-Digital Converter (ADC).
 
     An internal class used as a base for other components.
@@ -19,6 +21,9 @@ class ADCBase(Stateful, Recreatable):
         connected
     """
 
+    # whether recordings use the peak detection registers by default
+    _RECORD_PEAK_DETECTION = False
+
     def __init__(self, port_name, pin_number=1, name="adcbase", number_of_samples=1):
         self._pma_port = port_name
         self.name = name
@@ -70,6 +75,72 @@ class ADCBase(Stateful, Recreatable):
                 time.sleep(delay_between_samples)
         return value / number_of_samples
 
+    async def read_async(
+        self,
+        number_of_samples=None,
+        delay_between_samples=0.05,
+        peak_detection=False,
+        priority=AsyncPlateInterface.PRIORITY_NORMAL,
+    ):
+        """Asynchronous version of :meth:`read`; the event loop and the bus
+        thread are free while waiting between samples.
+
+        :param number_of_samples: Number of samples to take.
+        :param delay_between_samples: Delay between taking samples (if
+            more than one)
+        :param peak_detection: Use peak detection registers (advanced)
+        :param priority: Priority of each sample in the bus queue
+        :return: The value read from the ADC
+        :rtype: float
+        """
+        if number_of_samples is None:
+            number_of_samples = self.number_of_samples
+
+        read_function = self.__read_peak if peak_detection else self.__read
+        value = 0
+        for i in range(0, number_of_samples):
+            value += await AsyncPlateInterface().run(
+                read_function, self.channel, priority=priority
+            )
+            if i != number_of_samples - 1:
+                await asyncio.sleep(delay_between_samples)
+        return value / number_of_samples
+
+    async def _read_async(self, priority):
+        # the samples of a reading are taken one bus operation at a time
+        return await self.read_async(priority=priority)
+
+    def record(self, rate=100.0, duration=60.0, peak_detection=None, path=None):
+        """Start recording raw readings from the ADC in the background.
+
+        Readings are stored with their timestamps in a ring buffer that
+        keeps the last `duration` seconds of samples.
+
+        :param rate: Samples per second
+        :param duration: Seconds of samples kept
+        :param peak_detection: Use peak detection registers (advanced);
+            defaults to the mode used by the sensor's readings
+        :param path: If provided, the samples are kept in a memory-mapped
+            file at this path instead of in memory, for long captures
+        :return: The recorder, which can be stopped with `stop()`
+        :rtype: ADCRecorder
+        """
+        from .adc_recorder import ADCRecorder
+
+        if peak_detection is None:
+            peak_detection = self._RECORD_PEAK_DETECTION
+        read_function = self.__read_peak if peak_detection else self.__read
+
+        recorder = ADCRecorder(
+            lambda: read_function(self.channel),
+            rate=rate,
+            duration=duration,
+            path=path,
+            device=self.__adc_device,
+        )
+        recorder.start()
+        return recorder
+
     # input voltage / output voltage (%)
     def __read(self, channel):
         read_address = 0x30 + channel
@@ -0,0 +1,229 @@
+from math import ceil
+from threading import Lock
+from time import time
+
+import numpy as np
+
+from .polling_scheduler import PollingScheduler
+
+SAMPLE_DTYPE = np.dtype([("timestamp", np.float64), ("value", np.float32)])
+
+
+def signal_statistics(values, percentiles=(5, 50, 95)) -> dict:
+    """Vectorised statistics of a signal.
+
+    :param values: array of samples
+    :param percentiles: percentiles to calculate, from 0 to 100
+    :return: dictionary with the mean, RMS, peak (maximum absolute
+        value), minimum, maximum, standard deviation and the requested
+        percentiles of the signal
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return {}
+
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "rms": float(np.sqrt(np.mean(np.square(values)))),
+        "peak": float(np.abs(values).max()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "std": float(values.std()),
+        "percentiles": dict(
+            zip(percentiles, np.percentile(values, percentiles).tolist())
+        ),
+    }
+
+
+class SampleRingBuffer:
+    """Preallocated ring buffer of (timestamp, value) samples.
+
+    Each sample is stored once, so a memory-mapped buffer takes as much
+    space on disk as the samples it keeps. The latest samples are returned
+    as a view without copying unless they wrap around the end of the
+    buffer.
+
+    :param capacity: maximum number of samples kept
+    :param path: if provided, the buffer is a memory-mapped file at this
+        path instead of being held in memory
+    """
+
+    def __init__(self, capacity: int, path: str = None):
+        if capacity <= 0:
+            raise ValueError("Capacity must be greater than 0")
+
+        self.capacity = capacity
+        self.path = path
+        if path is None:
+            self.__data = np.zeros(capacity, dtype=SAMPLE_DTYPE)
+        else:
+            self.__data = np.memmap(
+                path, dtype=SAMPLE_DTYPE, mode="w+", shape=(capacity,)
+            )
+
+        self.__lock = Lock()
+        self.__next_index = 0
+        self.__total_samples = 0
+
+    def __len__(self):
+        return min(self.__total_samples, self.capacity)
+
+    @property
+    def total_samples(self) -> int:
+        """Number of samples appended since the buffer was created,
+        including the ones already overwritten."""
+        return self.__total_samples
+
+    def append(self, timestamp: float, value: float) -> None:
+        with self.__lock:
+            i = self.__next_index
+            self.__data[i] = (timestamp, value)
+            self.__next_index = (i + 1) % self.capacity
+            self.__total_samples += 1
+
+    def latest(self, number_of_samples: int = None) -> np.ndarray:
+        """Returns the latest samples, oldest first.
+
+        Samples that are contiguous in the buffer are returned as a view
+        that shares memory with it, so copy them if they need to outlive
+        the next `capacity` appends. Samples that wrap around the end of
+        the buffer are copied.
+
+        :param number_of_samples: number of samples; all stored samples
+            if not provided
+        """
+        with self.__lock:
+            length = len(self)
+            if number_of_samples is None or number_of_samples > length:
+                number_of_samples = length
+            end = self.__next_index
+            start = end - number_of_samples
+            if start >= 0:
+                return self.__data[start:end]
+            return np.concatenate((self.__data[start:], self.__data[:end]))
+
+    def window(self, seconds: float) -> np.ndarray:
+        """Returns the samples taken in the last `seconds` seconds,
+        relative to the latest sample; see :meth:`latest`."""
+        with self.__lock:
+            length = len(self)
+            if length == 0:
+                return self.__data[:0]
+
+            # timestamps increase along each of the two parts of the ring
+            end = self.__next_index
+            newer = self.__data["timestamp"][:end]
+            older = self.__data["timestamp"][end + self.capacity - length :]
+            since = self.__data["timestamp"][end - 1] - seconds
+
+            if len(newer) > 0 and newer[0] < since:
+                number_of_samples = len(newer) - np.searchsorted(newer, since)
+            else:
+                number_of_samples = (
+                    len(newer) + len(older) - np.searchsorted(older, since)
+                )
+
+        return self.latest(int(number_of_samples))
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__next_index = 0
+            self.__total_samples = 0
+
+    def flush(self) -> None:
+        """Write a memory-mapped buffer to disk."""
+        if isinstance(self.__data, np.memmap):
+            self.__data.flush()
+
+
+class ADCRecorder:
+    """Samples an ADC in the background at a fixed rate into a
+    :class:`SampleRingBuffer`.
+
+    Sampling runs as a task of the shared :class:`PollingScheduler`.
+    Use :meth:`ADCBase.record` to create one for a sensor.
+
+    :param sample_function: function returning a single ADC reading
+    :param rate: samples per second
+    :param duration: seconds of samples kept in the buffer
+    :param path: file used to memory-map the buffer, for long captures
+    :param device: device read by `sample_function`, to batch reads in
+        the scheduler
+    """
+
+    PRIORITY = 5
+
+    def __init__(
+        self,
+        sample_function,
+        rate: float = 100.0,
+        duration: float = 60.0,
+        path: str = None,
+        device=None,
+    ):
+        if rate <= 0:
+            raise ValueError("Sampling rate must be greater than 0")
+
+        self.__sample_function = sample_function
+        self.rate = rate
+        self.device = device
+        self.buffer = SampleRingBuffer(int(ceil(rate * duration)), path)
+        self.__task = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def is_recording(self) -> bool:
+        return self.__task is not None
+
+    def start(self) -> None:
+        if self.__task is not None:
+            return
+        self.__task = PollingScheduler().register(
+            self.__take_sample,
+            rate=self.rate,
+            priority=self.PRIORITY,
+            device=self.device,
+            name="adc_recorder",
+        )
+
+    def stop(self) -> None:
+        if self.__task is None:
+            return
+        # wait for a sample being taken, so none is added after stopping
+        self.__task.cancel(wait=True)
+        self.__task = None
+        self.buffer.flush()
+
+    @property
+    def deadline_misses(self) -> int:
+        """Number of samples that couldn't be taken on time."""
+        return self.__task.deadline_misses if self.__task else 0
+
+    def samples(self, seconds: float = None) -> np.ndarray:
+        """Returns a view of the recorded samples, as a structured array
+        with "timestamp" and "value" fields.
+
+        :param seconds: only return the samples of the last `seconds`
+            seconds
+        """
+        if seconds is None:
+            return self.buffer.latest()
+        return self.buffer.window(seconds)
+
+    def statistics(self, seconds: float = None, percentiles=(5, 50, 95)) -> dict:
+        """Statistics of the recorded values; see :func:`signal_statistics`.
+
+        :param seconds: only use the samples of the last `seconds` seconds
+        :param percentiles: percentiles to calculate, from 0 to 100
+        """
+        return signal_statistics(self.samples(seconds)["value"], percentiles)
+
+    def __take_sample(self) -> None:
+        self.buffer.append(time(), self.__sample_function())
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from itertools import count
+from queue import PriorityQueue
+from threading import Lock, Thread
+
+from pitop.common.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+def _set_future_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
+
+
+async def _periodic(read, hz):
+    # yields the result of awaiting read() hz times per second, on a fixed
+    # timeline
+    if hz <= 0:
+        raise ValueError("Stream frequency must be greater than 0")
+
+    loop = asyncio.get_running_loop()
+    period = 1.0 / hz
+    next_time = loop.time()
+    while True:
+        yield await read()
+
+        next_time += period
+        delay = next_time - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            next_time = loop.time()
+
+
+class AsyncPlateInterface(metaclass=Singleton):
+    """Runs blocking Expansion Plate operations for asyncio code.
+
+    All operations run one at a time on a single dedicated thread,
+    taken from a priority queue; operations with the same priority run
+    in the order they were submitted. This lets one event loop drive
+    many components without a thread per component, and lets motor
+    commands jump ahead of sensor streams.
+    """
+
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 10
+    PRIORITY_LOW = 20
+
+    # sorts before every job, so that closing doesn't wait for the queue
+    __STOP_PRIORITY = -1
+
+    def __init__(self):
+        self.__queue = PriorityQueue()
+        self.__sequence = count()
+        self.__thread = None
+        self.__thread_lock = Lock()
+
+    async def run(self, func, *args, priority: int = PRIORITY_NORMAL, **kwargs):
+        """Run `func(*args, **kwargs)` on the bus thread and return its
+        result.
+
+        :param func: blocking callable to run
+        :param priority: lower values run first
+        """
+        self.__start()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__queue.put(
+            (priority, next(self.__sequence), (func, args, kwargs, loop, future))
+        )
+        return await future
+
+    async def stream(
+        self, func, *args, hz: float = 10.0, priority: int = PRIORITY_LOW, **kwargs
+    ):
+        """Asynchronous generator that yields the result of `func` `hz`
+        times per second.
+
+        Readings are scheduled against a fixed timeline; if a reading
+        takes longer than the period, the next one starts immediately
+        instead of trying to catch up.
+
+        :param func: blocking callable to run
+        :param hz: readings per second
+        :param priority: priority of each reading in the bus queue
+        """
+        async for reading in _periodic(
+            lambda: self.run(func, *args, priority=priority, **kwargs), hz
+        ):
+            yield reading
+
+    def close(self) -> None:
+        """Stop the bus thread; operations still queued are discarded."""
+        with self.__thread_lock:
+            if self.__thread is None:
+                return
+            self.__queue.put((self.__STOP_PRIORITY, next(self.__sequence), None))
+            self.__thread.join()
+            self.__thread = None
+
+            while not self.__queue.empty():
+                _, _, job = self.__queue.get_nowait()
+                if job is not None:
+                    self.__complete(
+                        job, _set_future_exception, RuntimeError("Interface closed")
+                    )
+
+    def __start(self) -> None:
+        with self.__thread_lock:
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__thread_loop, daemon=True)
+                self.__thread.start()
+
+    def __complete(self, job, setter, value) -> None:
+        loop, future = job[3], job[4]
+        try:
+            loop.call_soon_threadsafe(setter, future, value)
+        except RuntimeError:
+            # event loop already closed
+            pass
+
+    def __thread_loop(self) -> None:
+        while True:
+            _, _, job = self.__queue.get()
+            if job is None:
+                break
+
+            func, args, kwargs, _, future = job
+            if future.cancelled():
+                continue
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.__complete(job, _set_future_exception, e)
+            else:
+                self.__complete(job, _set_future_result, result)
+
+        logger.debug("Exiting async plate interface loop")
+
+
+class SupportsAsync:
+    """Adds asyncio versions of the readings of a component, run through
+    the :class:`AsyncPlateInterface`.
+
+    Components set `async_attribute` to the attribute read when none is
+    given, e.g. "value" for sensors. Components whose readings wait
+    between bus operations override :meth:`_read_async` instead, so that
+    the bus thread is free while they wait.
+    """
+
+    async_attribute = "value"
+
+    async def _read_async(self, priority: int):
+        """Coroutine returning the component's default reading, used when
+        no attribute is given.
+
+        :param priority: priority of the bus operations of the reading
+        """
+        return await AsyncPlateInterface().run(
+            getattr, self, self.async_attribute, priority=priority
+        )
+
+    async def get_async(self, attribute: str = None):
+        """Read an attribute of the component without blocking the event
+        loop.
+
+        :param attribute: name of the attribute (e.g. "value" or
+            "current_speed"); the component's default reading if not
+            provided
+        """
+        if attribute is None:
+            return await self._read_async(AsyncPlateInterface.PRIORITY_NORMAL)
+        return await AsyncPlateInterface().run(getattr, self, attribute)
+
+    def stream(self, hz: float = 10.0, attribute: str = None):
+        """Asynchronous iterator over readings of an attribute of the
+        component, taken `hz` times per second.
+
+        Example: `async for reading in sensor.stream(hz=50): ...`
+
+        :param hz: readings per second
+        :param attribute: name of the attribute to read; the component's
+            default reading if not provided
+        """
+        if attribute is None:
+            return _periodic(
+                lambda: self._read_async(AsyncPlateInterface.PRIORITY_LOW), hz
+            )
+        return AsyncPlateInterface().stream(getattr, self, attribute, hz=hz)
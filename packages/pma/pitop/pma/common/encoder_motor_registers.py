@@ -1,5 +1,7 @@
 from enum import Enum
 
+from pitop.common.smbus_device import RegisterBlock
+
 
 class MotorRegisterTypes:
     CONTROL_MODE = 0
@@ -62,6 +64,24 @@ class MotorControlRegisters(Enum):
     M3 = EncoderMotorM3
 
 
+# tachometer and odometer values for all motor ports, keyed by port name
+MotorTachometerBlock = RegisterBlock.from_registers(
+    {
+        port.name: port.value[MotorRegisterTypes.TACHOMETER]
+        for port in MotorControlRegisters
+    },
+    "h",
+)
+
+MotorOdometerBlock = RegisterBlock.from_registers(
+    {
+        port.name: port.value[MotorRegisterTypes.ODOMETER]
+        for port in MotorControlRegisters
+    },
+    "i",
+)
+
+
 class MotorControlModes(Enum):
     MODE_0 = 0
     MODE_1 = 1
@@ -1,3 +1,6 @@
+from pitop.common.smbus_device import RegisterBlock
+
+
 class RegisterTypes:
     ACC = 0
     GYRO = 1
@@ -91,8 +94,31 @@ ImuDataRegisters = {
 }
 
 
+# 9-axis raw data and orientation, keyed by (RegisterTypes, axis)
+ImuDataBlock = RegisterBlock.from_registers(
+    {
+        (register_type, axis): address
+        for register_type, axes in ImuDataRegisters.items()
+        for axis, address in axes.items()
+    },
+    "h",
+)
+
+# hard and soft iron calibration, keyed by (MagCalRegisterTypes, calibration type)
+MagCalibrationBlock = RegisterBlock.from_registers(
+    {
+        (register_type, calibration_type): address
+        for register_type, calibration_types in MagCalibrationRegisters.items()
+        for calibration_type, address in calibration_types.items()
+    },
+    "h",
+)
+
+
 class ImuRegisters:
     ENABLE = ImuEnableRegisters
     DATA = ImuDataRegisters
     CONFIG = ImuConfigRegisters
     MAGCAL = MagCalibrationRegisters
+    DATA_BLOCK = ImuDataBlock
+    MAGCAL_BLOCK = MagCalibrationBlock
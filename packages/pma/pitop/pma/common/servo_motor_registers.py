@@ -1,5 +1,7 @@
 from enum import Enum
 
+from pitop.common.smbus_device import RegisterBlock
+
 
 class ServoRegisterTypes:
     ACC_MODE = 0
@@ -39,6 +41,16 @@ class ServoControlRegisters(Enum):
     S3 = ServoMotorS3
 
 
+# (duty cycle, speed) for all servo ports, keyed by port name
+ServoAngleAndSpeedBlock = RegisterBlock.from_registers(
+    {
+        port.name: port.value[ServoRegisterTypes.ANGLE_AND_SPEED]
+        for port in ServoControlRegisters
+    },
+    "hh",
+)
+
+
 class ServoMotorSetup:
     REGISTER_MIN_PULSE_WIDTH = 0x4A
     REGISTER_MAX_PULSE_WIDTH = 0x4B
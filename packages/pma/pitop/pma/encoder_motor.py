@@ -3,11 +3,12 @@ from math import floor, pi
 
 from pitop.core.mixins import Recreatable, Stateful
 
+from .async_plate_interface import SupportsAsync
 from .encoder_motor_controller import EncoderMotorController
 from .parameters import BrakingType, Direction, ForwardDirection
 
 
-class EncoderMotor(Stateful, Recreatable):
+class EncoderMotor(Stateful, Recreatable, SupportsAsync):
     """Represents a pi-top motor encoder component.
 
     Note that pi-top motor encoders use a built-in closed-loop control system, that feeds the readings
@@ -50,6 +51,8 @@ class EncoderMotor(Stateful, Recreatable):
     MMK_STANDARD_GEAR_RATIO = 41.8
     MAX_DC_MOTOR_RPM = 4800
 
+    async_attribute = "current_rpm"
+
     def __init__(
         self,
         port_name,
@@ -273,6 +276,10 @@ class EncoderMotor(Stateful, Recreatable):
 
         return output_shaft_rpm_actual
 
+    async def current_rpm_async(self):
+        """Asynchronous version of :data:`current_rpm`."""
+        return await self.get_async("current_rpm")
+
     @property
     def rotation_counter(self):
         """Returns the total or partial number of rotations performed by the
@@ -462,6 +469,10 @@ class EncoderMotor(Stateful, Recreatable):
 
         return (self.current_rpm / 60.0) * self.wheel_circumference
 
+    async def current_speed_async(self):
+        """Asynchronous version of :data:`current_speed`."""
+        return await self.get_async("current_speed")
+
     @property
     def distance(self):
         """Returns the distance the wheel has travelled in meters.
@@ -6,8 +6,11 @@ from .common import type_check
 from .common.encoder_motor_registers import (
     MotorControlModes,
     MotorControlRegisters,
+    MotorOdometerBlock,
     MotorRegisterTypes,
+    MotorTachometerBlock,
 )
+from .plate_command_queue import RegisterWrite
 from .plate_interface import PlateInterface
 
 
@@ -15,12 +18,18 @@ class EncoderMotorController:
     """Class used to read/write motor encoder registers from the MCU."""
 
     _MAX_DC_MOTOR_RPM = 6000
+    # tachometer/odometer registers of all ports are read as a single block;
+    # reads from different motors within this window share one transaction
+    _SNAPSHOT_MAX_AGE = 0.005
 
     def __init__(self, port: str, braking_type: int = 0) -> None:
         if port not in MotorControlRegisters.__members__:
             raise Exception("Invalid port. Motors must be connected to ports M0-M3")
 
-        self._mcu_device = PlateInterface().get_device_mcu()
+        self._plate_interface = PlateInterface()
+        self._mcu_device = self._plate_interface.get_device_mcu()
+        self._command_queue = self._plate_interface.command_queue
+        self._port = port
         self.registers = MotorControlRegisters[port].value
         self.set_braking_type(braking_type)
 
@@ -32,8 +41,21 @@ class EncoderMotorController:
 
     @type_check
     def set_control_mode(self, mode: MotorControlModes) -> None:
-        self._mcu_device.write_byte(
-            self.registers[MotorRegisterTypes.CONTROL_MODE], mode.value
+        self._command_queue.submit(
+            (self._port, MotorRegisterTypes.CONTROL_MODE),
+            [self.__control_mode_write(mode)],
+        )
+
+    def __control_mode_write(self, mode: MotorControlModes) -> RegisterWrite:
+        return RegisterWrite(
+            "write_byte", self.registers[MotorRegisterTypes.CONTROL_MODE], mode.value
+        )
+
+    def __submit_setpoint(self, mode: MotorControlModes, setpoint: RegisterWrite):
+        # only the latest setpoint for this motor is kept if the command
+        # queue is batching
+        self._command_queue.submit(
+            self._port, [self.__control_mode_write(mode), setpoint]
         )
 
     def braking_type(self) -> int:
@@ -51,20 +73,20 @@ class EncoderMotorController:
         )
 
     def tachometer(self) -> int:
-        tachometer_data = 99999
+        tachometer_data = self._plate_interface.read_snapshot(
+            MotorTachometerBlock, max_age=self._SNAPSHOT_MAX_AGE
+        )[self._port]
         while abs(tachometer_data) > self._MAX_DC_MOTOR_RPM:
-            tachometer_data = self._mcu_device.read_signed_word(
-                self.registers[MotorRegisterTypes.TACHOMETER], little_endian=True
-            )
+            tachometer_data = self._plate_interface.read_snapshot(MotorTachometerBlock)[
+                self._port
+            ]
 
         return tachometer_data
 
     def odometer(self) -> int:
-        rotation_counter = self._mcu_device.read_n_signed_bytes(
-            self.registers[MotorRegisterTypes.ODOMETER], 4, little_endian=True
-        )
-
-        return rotation_counter
+        return self._plate_interface.read_snapshot(
+            MotorOdometerBlock, max_age=self._SNAPSHOT_MAX_AGE
+        )[self._port]
 
     @type_check
     def set_odometer(self, rotations: int) -> None:
@@ -72,6 +94,7 @@ class EncoderMotorController:
         self._mcu_device.write_n_bytes(
             self.registers[MotorRegisterTypes.ODOMETER], list_to_send
         )
+        self._plate_interface.invalidate_snapshots(MotorOdometerBlock)
 
     def stop(self):
         current_control_mode = self.control_mode()
@@ -101,12 +124,15 @@ class EncoderMotorController:
                 "Power value sent to Expansion Plate needs to be from -1000 to +1000"
             )
 
-        self.set_control_mode(MotorControlModes.MODE_0)
-        self._mcu_device.write_word(
-            self.registers[MotorRegisterTypes.MODE_0_POWER],
-            power,
-            little_endian=True,
-            signed=True,
+        self.__submit_setpoint(
+            MotorControlModes.MODE_0,
+            RegisterWrite(
+                "write_word",
+                self.registers[MotorRegisterTypes.MODE_0_POWER],
+                power,
+                little_endian=True,
+                signed=True,
+            ),
         )
 
     # -------------------------------------------------------------------------------------------------------------------
@@ -127,12 +153,15 @@ class EncoderMotorController:
                 f"DC motor RPM value must be between {-self._MAX_DC_MOTOR_RPM} and {self._MAX_DC_MOTOR_RPM} (inclusive)"
             )
 
-        self.set_control_mode(MotorControlModes.MODE_1)
-        self._mcu_device.write_word(
-            self.registers[MotorRegisterTypes.MODE_1_RPM],
-            rpm,
-            signed=True,
-            little_endian=True,
+        self.__submit_setpoint(
+            MotorControlModes.MODE_1,
+            RegisterWrite(
+                "write_word",
+                self.registers[MotorRegisterTypes.MODE_1_RPM],
+                rpm,
+                signed=True,
+                little_endian=True,
+            ),
         )
 
     # -------------------------------------------------------------------------------------------------------------------
@@ -161,10 +190,14 @@ class EncoderMotorController:
                 f"DC motor RPM value must be between {-self._MAX_DC_MOTOR_RPM} and {self._MAX_DC_MOTOR_RPM} (inclusive)"
             )
 
-        self.set_control_mode(MotorControlModes.MODE_2)
         list_to_send = split_into_bytes(
             rotations_to_complete, 2, signed=True, little_endian=True
         ) + split_into_bytes(rpm, 2, signed=True, little_endian=True)
-        self._mcu_device.write_n_bytes(
-            self.registers[MotorRegisterTypes.MODE_2_RPM_WITH_ROTATIONS], list_to_send
+        self.__submit_setpoint(
+            MotorControlModes.MODE_2,
+            RegisterWrite(
+                "write_n_bytes",
+                self.registers[MotorRegisterTypes.MODE_2_RPM_WITH_ROTATIONS],
+                list_to_send,
+            ),
         )
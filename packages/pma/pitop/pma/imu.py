@@ -3,6 +3,7 @@ import math
 from abc import ABC
 from dataclasses import astuple, dataclass, fields
 
+from .async_plate_interface import SupportsAsync
 from .imu_controller import ImuController
 
 
@@ -50,7 +51,9 @@ class Orientation(BaseDataType):
     yaw: float = 0.0
 
 
-class IMU:
+class IMU(SupportsAsync):
+    async_attribute = "accelerometer"
+
     def __init__(self):
         self.imu_controller = ImuController()
         atexit.register(self.imu_controller.cleanup)
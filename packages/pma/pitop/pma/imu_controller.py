@@ -21,17 +21,22 @@ class ImuController:
     __16BIT_SIGNED_RANGE = 2**15
     __HARD_IRON_SCALE_FACTOR = 10.0
     __SOFT_IRON_SCALE_FACTOR = 1000.0
+    # data registers are read as a single block; consecutive reads of the
+    # different sensors within this window share one bus transaction
+    _SNAPSHOT_MAX_AGE = 0.005
 
     def __init__(self):
-        device = FirmwareDevice(FirmwareDeviceID.pt4_expansion_plate)
-        if device.get_sch_hardware_version_major() == 4:
+        device_info = FirmwareDevice.get_device_info(
+            FirmwareDeviceID.pt4_expansion_plate
+        )
+        if device_info["sch_hardware_version_major"] == 4:
             raise Exception("This Expansion Plate doesn't have an IMU")
 
-        self.__data_registers = ImuRegisters.DATA
         self.__enable_registers = ImuRegisters.ENABLE
         self.__config_registers = ImuRegisters.CONFIG
         self.__mag_cal_registers = ImuRegisters.MAGCAL
-        self.__mcu_device = PlateInterface().get_device_mcu()
+        self.__plate_interface = PlateInterface()
+        self.__mcu_device = self.__plate_interface.get_device_mcu()
         self.__acc_enable = False
         self.__gyro_enable = False
         self.__mag_enable = False
@@ -179,29 +184,14 @@ class ImuController:
         if not self.orientation_enable:
             self.orientation_enable = True
 
-        roll = (
-            self.__read_imu_data(
-                self.__data_registers[RegisterTypes.ORIENTATION][
-                    OrientationRegisterTypes.ROLL
-                ]
-            )
-            / self.__ORIENTATION_DATA_SCALE
-        )
-        pitch = (
-            self.__read_imu_data(
-                self.__data_registers[RegisterTypes.ORIENTATION][
-                    OrientationRegisterTypes.PITCH
-                ]
+        snapshot = self.__read_data_snapshot()
+        roll, pitch, yaw = (
+            snapshot[(RegisterTypes.ORIENTATION, axis)] / self.__ORIENTATION_DATA_SCALE
+            for axis in (
+                OrientationRegisterTypes.ROLL,
+                OrientationRegisterTypes.PITCH,
+                OrientationRegisterTypes.YAW,
             )
-            / self.__ORIENTATION_DATA_SCALE
-        )
-        yaw = (
-            self.__read_imu_data(
-                self.__data_registers[RegisterTypes.ORIENTATION][
-                    OrientationRegisterTypes.YAW
-                ]
-            )
-            / self.__ORIENTATION_DATA_SCALE
         )
 
         return roll, pitch, yaw
@@ -257,15 +247,17 @@ class ImuController:
                 "Cannot write magnetometer calibration settings - try re-docking Expansion Plate to pi-top [4]."
             )
 
-    def __read_imu_data(self, data_register: int):
-        return self.__mcu_device.read_signed_word(data_register, little_endian=True)
+    def __read_data_snapshot(self):
+        return self.__plate_interface.read_snapshot(
+            ImuRegisters.DATA_BLOCK, max_age=self._SNAPSHOT_MAX_AGE
+        )
 
     def __get_raw_data(self, data_type: int):
-        x = self.__read_imu_data(self.__data_registers[data_type][RawRegisterTypes.X])
-        y = self.__read_imu_data(self.__data_registers[data_type][RawRegisterTypes.Y])
-        z = self.__read_imu_data(self.__data_registers[data_type][RawRegisterTypes.Z])
-
-        return x, y, z
+        snapshot = self.__read_data_snapshot()
+        return tuple(
+            snapshot[(data_type, axis)]
+            for axis in (RawRegisterTypes.X, RawRegisterTypes.Y, RawRegisterTypes.Z)
+        )
 
     def __write_mag_cal(self, word, register_type, calibration_type):
         self.__mcu_device.write_word(
@@ -275,24 +267,22 @@ class ImuController:
             signed=True,
         )
 
+    def __read_mag_cal_snapshot(self):
+        # calibration values are written between reads, so never reuse a snapshot
+        return self.__plate_interface.read_snapshot(ImuRegisters.MAGCAL_BLOCK)
+
     def __read_mag_cal_hard(self):
-        data = []
-        for register_key, register_value in self.__mag_cal_registers[
-            MagCalRegisterTypes.HARD
-        ].items():
-            data.append(
-                self.__mcu_device.read_signed_word(register_value, little_endian=True)
-            )
-        x, y, z = data
+        snapshot = self.__read_mag_cal_snapshot()
+        x, y, z = (
+            snapshot[(MagCalRegisterTypes.HARD, calibration_type)]
+            for calibration_type in self.__mag_cal_registers[MagCalRegisterTypes.HARD]
+        )
         return x, y, z
 
     def __read_mag_cal_soft(self):
-        data = []
-        for register_key, register_value in self.__mag_cal_registers[
-            MagCalRegisterTypes.SOFT
-        ].items():
-            data.append(
-                self.__mcu_device.read_signed_word(register_value, little_endian=True)
-            )
-        xx, yy, zz, xy, xz, yz = data
+        snapshot = self.__read_mag_cal_snapshot()
+        xx, yy, zz, xy, xz, yz = (
+            snapshot[(MagCalRegisterTypes.SOFT, calibration_type)]
+            for calibration_type in self.__mag_cal_registers[MagCalRegisterTypes.SOFT]
+        )
         return xx, yy, zz, xy, xz, yz
@@ -20,6 +20,8 @@ class LightSensor(ADCBase):
     :param str name: Component name, defaults to `light_sensor`. Used to access this component when added to a :class:`pitop.Pitop` object.
     """
 
+    async_attribute = "reading"
+
     def __init__(
         self, port_name, pin_number=1, name="light_sensor", number_of_samples=3
     ):
@@ -53,6 +55,9 @@ class LightSensor(ADCBase):
         else:
             return 0
 
+    async def _read_async(self, priority):
+        return int(await self.read_async(priority=priority))
+
     @property
     def own_state(self):
         return {
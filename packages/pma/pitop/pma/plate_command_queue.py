@@ -0,0 +1,199 @@
+import logging
+from contextlib import contextmanager
+from threading import Event, Lock, RLock, Thread, local
+from time import sleep
+
+logger = logging.getLogger(__name__)
+
+
+class RegisterWrite:
+    """A single register write, expressed as a call to one of the
+    :class:`SMBusDevice` write methods (e.g. "write_byte", "write_word" or
+    "write_n_bytes").
+
+    :param method: name of the SMBusDevice method used for the write
+    :param register: register address to write to
+    :param post_write_delay: time in seconds to wait after the write, for
+        registers that the MCU needs time to process
+    """
+
+    def __init__(
+        self,
+        method: str,
+        register: int,
+        *args,
+        post_write_delay: float = 0.0,
+        **kwargs,
+    ):
+        self.method = method
+        self.register = register
+        self.args = args
+        self.kwargs = kwargs
+        self.post_write_delay = post_write_delay
+
+    def __repr__(self):
+        return f"RegisterWrite({self.method}, {hex(self.register)}, {self.args}, {self.kwargs})"
+
+
+class PlateCommandQueue:
+    """Coalescing queue of register writes to the Expansion Plate MCU.
+
+    Writes are submitted as commands: ordered lists of
+    :class:`RegisterWrite` identified by a key (e.g. the motor port, or
+    the register written).
+    By default (`flush_interval` set to None) commands are written as
+    soon as they are submitted. When a `flush_interval` is set, commands
+    are held and written by a background thread once per tick; a command
+    submitted while another with the same key is pending replaces it, so
+    only the latest setpoint per key reaches the bus.
+
+    Commands that must reach the MCU together, in order, can be submitted
+    within :meth:`group`, which queues them as a single command.
+
+    Every command that's flushed is written in full: the queue doesn't
+    skip writes of values it wrote before, since the MCU's registers can
+    change without it knowing, e.g. when the MCU resets or another
+    process writes to them.
+
+    Note that while a `flush_interval` is set, reading back a register
+    may return its previous value until the next flush.
+    """
+
+    def __init__(self, get_device):
+        self.__get_device = get_device
+
+        self.__pending = {}
+        self.__pending_lock = Lock()
+        self.__write_lock = RLock()
+
+        self.__flush_interval = None
+        self.__flush_thread = None
+        self.__stop_flush_event = Event()
+        self.__groups = local()
+
+        self.__transaction_count = 0
+        self.__coalesced_count = 0
+
+    @property
+    def flush_interval(self):
+        """Time in seconds between writes of the queued commands, or None
+        if commands are written immediately. It's kept after
+        :meth:`cleanup`, so batching resumes with the next command."""
+        return self.__flush_interval
+
+    @flush_interval.setter
+    def flush_interval(self, interval):
+        if interval is not None and interval <= 0:
+            raise ValueError("Flush interval must be greater than 0")
+
+        self.__stop_flush_thread()
+        self.__flush_interval = interval
+
+        # write anything queued with the previous setting
+        self.flush()
+
+        if interval is not None:
+            self.__start_flush_thread()
+
+    @property
+    def transaction_count(self) -> int:
+        """Number of register writes sent to the MCU through the queue."""
+        return self.__transaction_count
+
+    @property
+    def coalesced_count(self) -> int:
+        """Number of register writes discarded because a newer command with
+        the same key replaced them before being flushed."""
+        return self.__coalesced_count
+
+    def submit(self, key, writes: list) -> None:
+        """Submit a command to the queue.
+
+        :param key: identifies the command; a pending command with the
+            same key is replaced
+        :param writes: ordered list of :class:`RegisterWrite`
+        """
+        group = getattr(self.__groups, "writes", None)
+        if group is not None:
+            group.extend(writes)
+            return
+
+        if self.__flush_interval is None:
+            self.__write_command(writes)
+            return
+
+        with self.__pending_lock:
+            if self.__flush_thread is None:
+                self.__start_flush_thread()
+            replaced = self.__pending.pop(key, None)
+            if replaced is not None:
+                self.__coalesced_count += len(replaced)
+            self.__pending[key] = writes
+
+    @contextmanager
+    def group(self, key):
+        """Context manager that submits the commands submitted within it by
+        the same thread as one command with the given key, keeping their
+        order. Nothing is submitted if the context exits with an exception.
+
+        :param key: identifies the grouped command; the keys of the commands
+            in the group are ignored
+        """
+        outer_group = getattr(self.__groups, "writes", None)
+        self.__groups.writes = []
+        try:
+            yield
+            writes = self.__groups.writes
+        finally:
+            self.__groups.writes = outer_group
+
+        self.submit(key, writes)
+
+    def flush(self) -> None:
+        """Write all pending commands, in the order they were submitted."""
+        with self.__pending_lock:
+            pending = self.__pending
+            self.__pending = {}
+
+        for writes in pending.values():
+            self.__write_command(writes)
+
+    def cleanup(self) -> None:
+        """Write the pending commands and stop the background thread until
+        the next command is submitted."""
+        self.__stop_flush_thread()
+        self.flush()
+
+    def __write_command(self, writes: list) -> None:
+        with self.__write_lock:
+            device = self.__get_device()
+            for write in writes:
+                getattr(device, write.method)(
+                    write.register, *write.args, **write.kwargs
+                )
+                self.__transaction_count += 1
+
+                if write.post_write_delay > 0:
+                    sleep(write.post_write_delay)
+
+    def __start_flush_thread(self) -> None:
+        self.__stop_flush_event.clear()
+        self.__flush_thread = Thread(target=self.__flush_thread_loop, daemon=True)
+        self.__flush_thread.start()
+
+    def __stop_flush_thread(self) -> None:
+        if self.__flush_thread is None:
+            return
+
+        self.__stop_flush_event.set()
+        self.__flush_thread.join()
+        self.__flush_thread = None
+
+    def __flush_thread_loop(self) -> None:
+        while not self.__stop_flush_event.wait(self.__flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error writing queued commands to MCU: {e}")
+
+        logger.debug("Exiting command queue flush loop")
@@ -1,21 +1,29 @@
 import logging
-from threading import Lock, Thread
-from time import sleep
+from threading import Lock
+from time import monotonic
 
 from pitop.common.singleton import Singleton
-from pitop.common.smbus_device import SMBusDevice
+from pitop.common.smbus_device import RegisterBlock, SMBusDevice
 
 from .common.plate_registers import PlateRegisters
+from .plate_command_queue import PlateCommandQueue
+from .polling_scheduler import PollingScheduler
 
 logger = logging.getLogger(__name__)
 
 
 class PlateInterface(metaclass=Singleton):
+    # heartbeats run before any other polling task due at the same time
+    HEARTBEAT_PRIORITY = -10
+
     def __init__(self):
         self.__device_mcu = None
         self.__mcu_connected = False
         self.__mcu_thread_lock = Lock()
-        self.__heartbeat_thread = None
+        self.__heartbeat_task = None
+        self.__snapshot_lock = Lock()
+        self.__snapshots = {}
+        self.__command_queue = PlateCommandQueue(self.get_device_mcu)
 
     def __del__(self):
         self.__disconnect_mcu()
@@ -26,6 +34,55 @@ class PlateInterface(metaclass=Singleton):
         # Return the SMBusDevice instance
         return self.__device_mcu
 
+    @property
+    def command_queue(self) -> PlateCommandQueue:
+        """Queue used by motor and servo controllers to write commands to the
+        MCU.
+
+        Set its `flush_interval` to batch and coalesce high-rate
+        commands (e.g. from a joystick) into one write per tick.
+        """
+        return self.__command_queue
+
+    def read_snapshot(self, register_block: RegisterBlock, max_age: float = 0.0):
+        """Read a block of MCU registers in a single transaction.
+
+        A previous snapshot of the same block is returned instead if it
+        was taken less than `max_age` seconds ago, so that components
+        sharing a block (e.g. both motors of a rover) can share reads.
+
+        :param register_block: layout of the registers to read
+        :param max_age: maximum age in seconds of a cached snapshot
+        :return: dictionary of {key: value} as described by the block
+        """
+        device_mcu = self.get_device_mcu()
+
+        with self.__snapshot_lock:
+            now = monotonic()
+            cached = self.__snapshots.get(register_block)
+            if cached is not None and now - cached[0] <= max_age:
+                return cached[1]
+
+            snapshot = device_mcu.read_snapshot(register_block)
+            if snapshot is None:
+                raise IOError(
+                    f"Incomplete read of register block at {hex(register_block.start_address)}"
+                )
+            self.__snapshots[register_block] = (now, snapshot)
+            return snapshot
+
+    def invalidate_snapshots(self, register_block: RegisterBlock = None):
+        """Discard cached snapshots, forcing the next read to hit the bus.
+
+        :param register_block: block to invalidate; if not provided, all
+            cached snapshots are discarded
+        """
+        with self.__snapshot_lock:
+            if register_block is None:
+                self.__snapshots.clear()
+            else:
+                self.__snapshots.pop(register_block, None)
+
     def __connect_mcu(self):
         if self.__mcu_connected:
             logger.debug("Already connected to MCU")
@@ -41,10 +98,13 @@ class PlateInterface(metaclass=Singleton):
             self.__disconnect_mcu()
             raise
 
-        self.__heartbeat_thread = Thread(
-            target=self.__heartbeat_thread_loop, daemon=True
+        self.__heartbeat_task = PollingScheduler().register(
+            self.__heartbeat,
+            rate=1.0 / PlateRegisters.HEARTBEAT_SEND_INTERVAL_SECONDS,
+            priority=self.HEARTBEAT_PRIORITY,
+            device=self.__device_mcu,
+            name="plate_heartbeat",
         )
-        self.__heartbeat_thread.start()
 
     def __disconnect_mcu(self):
         if self.__mcu_connected is False:
@@ -52,11 +112,12 @@ class PlateInterface(metaclass=Singleton):
 
         logger.debug("Disconnecting from MCU...")
 
+        self.__command_queue.cleanup()
         self.__mcu_connected = False
 
-        if self.__heartbeat_thread is not None:
-            self.__heartbeat_thread.join()
-            self.__heartbeat_thread = None
+        if self.__heartbeat_task is not None:
+            self.__heartbeat_task.cancel()
+            self.__heartbeat_task = None
 
         if self.__device_mcu is not None:
             self.__device_mcu.disconnect()
@@ -74,14 +135,12 @@ class PlateInterface(metaclass=Singleton):
                 "Error communicating with Foundation/Expansion plate. Make sure it's connected to your pi-top."
             ) from None
 
-    def __heartbeat_thread_loop(self):
-        while self.__mcu_connected:
-            with self.__mcu_thread_lock:
+    def __heartbeat(self):
+        with self.__mcu_thread_lock:
+            if not self.__mcu_connected:
+                return
+            try:
                 self.__send_heartbeat()
-
-            for _ in range(10):
-                sleep(PlateRegisters.HEARTBEAT_SEND_INTERVAL_SECONDS / 10)
-                if self.__mcu_connected is False:
-                    break
-
-        logger.debug("Exiting heartbeat loop")
+            except IOError as e:
+                logger.error(e)
+                self.__heartbeat_task.cancel()
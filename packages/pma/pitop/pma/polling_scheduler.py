@@ -0,0 +1,227 @@
+import heapq
+import logging
+from itertools import count
+from threading import Condition, Thread, current_thread
+from time import monotonic
+
+from pitop.common.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class PollingTask:
+    """A periodic task registered in the :class:`PollingScheduler`.
+
+    :param callback: function called on every run, without arguments
+    :param rate: runs per second
+    :param priority: tasks due at the same time run in increasing
+        priority order
+    :param device: identifies the device the task reads from; due tasks
+        reading from the same device run back to back
+    :param name: used in log messages
+    """
+
+    def __init__(self, callback, rate: float, priority: int = 0, device=None, name=""):
+        if rate <= 0:
+            raise ValueError("Polling rate must be greater than 0")
+        if not callable(callback):
+            raise AttributeError("Argument 'callback' must be a function")
+
+        self.callback = callback
+        self.period = 1.0 / rate
+        self.priority = priority
+        self.device = device
+        self.name = name or getattr(callback, "__name__", "task")
+
+        self.runs = 0
+        self.deadline_misses = 0
+        self.max_lateness = 0.0
+        self.active = True
+        self._deadline = None
+        self._scheduler = None
+
+    @property
+    def rate(self) -> float:
+        return 1.0 / self.period
+
+    def cancel(self, wait: bool = False) -> None:
+        """Stop running the task.
+
+        :param wait: if the task is running, wait for it to finish, so that
+            it's guaranteed not to run after this returns. Don't wait while
+            holding anything the task's callback waits for.
+        """
+        scheduler = self._scheduler or PollingScheduler()
+        scheduler.unregister(self, wait)
+
+    def __repr__(self):
+        return f"PollingTask({self.name}, rate={self.rate:g}, priority={self.priority})"
+
+
+class PollingScheduler(metaclass=Singleton):
+    """Runs the periodic reads of all the components on a single thread.
+
+    Components register :class:`PollingTask` instances with a rate and
+    a priority instead of starting their own threads. When several tasks
+    are due at once, the ones reading from the same device run back to
+    back, so their bus transactions are batched together.
+
+    A deadline is missed when a task runs a full period or more late; the
+    missed runs are skipped instead of being run in a burst, counted in
+    `deadline_misses` and reported through `on_deadline_miss`.
+
+    Callbacks run on the scheduler thread, which also sends the plate's
+    heartbeat, so they should return quickly; components run user
+    callbacks, which may block, on threads of their own.
+    """
+
+    def __init__(self):
+        self.__condition = Condition()
+        self.__heap = []
+        self.__sequence = count()
+        self.__thread = None
+        self.__running_task = None
+
+        self.deadline_misses = 0
+        # called with (task, lateness in seconds) when a deadline is missed
+        self.on_deadline_miss = None
+
+    @property
+    def tasks(self) -> list:
+        with self.__condition:
+            return [task for _, _, _, task in self.__heap if task.active]
+
+    def register(
+        self, callback, rate: float, priority: int = 0, device=None, name=""
+    ) -> PollingTask:
+        """Register a periodic task; its first run is one period from now.
+
+        :param callback: function called on every run, without arguments
+        :param rate: runs per second
+        :param priority: tasks due at the same time run in increasing
+            priority order
+        :param device: identifies the device the task reads from
+        :param name: used in log messages
+        :return: the registered task, which can be cancelled
+        """
+        task = PollingTask(callback, rate, priority, device, name)
+        task._scheduler = self
+        with self.__condition:
+            task._deadline = monotonic() + task.period
+            self.__push(task)
+            if self.__thread is None:
+                self.__thread = Thread(target=self.__thread_loop, daemon=True)
+                self.__thread.start()
+            self.__condition.notify_all()
+        return task
+
+    def unregister(self, task: PollingTask, wait: bool = False) -> None:
+        """Stop running a task.
+
+        :param wait: if the task is running, wait for it to finish. Ignored
+            when called from a task, which runs on the scheduler thread.
+        """
+        with self.__condition:
+            # removed from the heap lazily, when it's next due
+            task.active = False
+            self.__condition.notify_all()
+            if wait and current_thread() is not self.__thread:
+                self.__condition.wait_for(lambda: self.__running_task is not task)
+
+    def stop(self) -> None:
+        """Cancel all the tasks and stop the scheduler thread. A new thread
+        is started if a task is registered afterwards."""
+        with self.__condition:
+            for _, _, _, task in self.__heap:
+                task.active = False
+            self.__heap = []
+            thread = self.__thread
+            self.__thread = None
+            self.__condition.notify_all()
+
+        if thread is not None and thread is not current_thread():
+            thread.join()
+
+    def __push(self, task: PollingTask) -> None:
+        heapq.heappush(
+            self.__heap, (task._deadline, task.priority, next(self.__sequence), task)
+        )
+
+    def __next_due_tasks(self) -> list:
+        with self.__condition:
+            while True:
+                if current_thread() is not self.__thread:
+                    # the scheduler was stopped
+                    return None
+
+                while self.__heap and not self.__heap[0][3].active:
+                    heapq.heappop(self.__heap)
+
+                if not self.__heap:
+                    self.__condition.wait()
+                    continue
+
+                timeout = self.__heap[0][0] - monotonic()
+                if timeout > 0:
+                    self.__condition.wait(timeout)
+                    continue
+
+                now = monotonic()
+                due = []
+                while self.__heap and self.__heap[0][0] <= now:
+                    _, _, _, task = heapq.heappop(self.__heap)
+                    if task.active:
+                        due.append(task)
+                return due
+
+    def __batch(self, tasks: list) -> list:
+        # group tasks by device, keeping groups in order of their most
+        # urgent task
+        groups = {}
+        for task in sorted(tasks, key=lambda t: (t.priority, t._deadline)):
+            key = task.device if task.device is not None else id(task)
+            groups.setdefault(key, []).append(task)
+        return [task for group in groups.values() for task in group]
+
+    def __run(self, task: PollingTask) -> None:
+        lateness = monotonic() - task._deadline
+        task.max_lateness = max(task.max_lateness, lateness)
+
+        try:
+            task.callback()
+        except Exception as e:
+            logger.error(f"Error running polling task {task.name}: {e}")
+        task.runs += 1
+
+        # keep to the original timeline; skip the runs that can no longer
+        # happen on time
+        task._deadline += task.period
+        now = monotonic()
+        if task._deadline <= now:
+            missed = int((now - task._deadline) // task.period) + 1
+            task._deadline += missed * task.period
+            task.deadline_misses += missed
+            self.deadline_misses += missed
+            logger.debug(
+                f"Polling task {task.name} missed {missed} deadline(s), {lateness:.4f}s late"
+            )
+            if callable(self.on_deadline_miss):
+                self.on_deadline_miss(task, lateness)
+
+    def __thread_loop(self) -> None:
+        while True:
+            due_tasks = self.__next_due_tasks()
+            if due_tasks is None:
+                return
+
+            for task in self.__batch(due_tasks):
+                with self.__condition:
+                    if not task.active:
+                        continue
+                    self.__running_task = task
+                self.__run(task)
+                with self.__condition:
+                    self.__running_task = None
+                    self.__condition.notify_all()
+                    if task.active and self.__thread is current_thread():
+                        self.__push(task)
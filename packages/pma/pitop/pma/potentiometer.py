@@ -18,6 +18,8 @@ class Potentiometer(ADCBase):
     :param str name: Component name, defaults to `potentiometer`. Used to access this component when added to a :class:`pitop.Pitop` object.
     """
 
+    async_attribute = "position"
+
     def __init__(
         self, port_name, pin_number=1, name="potentiometer", number_of_samples=1
     ):
@@ -4,10 +4,12 @@ from pitop.common.bitwise_ops import split_into_bytes
 
 from .common import type_check
 from .common.servo_motor_registers import (
+    ServoAngleAndSpeedBlock,
     ServoControlRegisters,
     ServoMotorSetup,
     ServoRegisterTypes,
 )
+from .plate_command_queue import RegisterWrite
 from .plate_interface import PlateInterface
 
 
@@ -23,6 +25,10 @@ class ServoHardwareSpecs:
 class ServoController:
     """Class used to read/write servo motor registers from the MCU."""
 
+    # angle/speed registers of all ports are read as a single block; reads
+    # from different servos within this window share one transaction
+    _SNAPSHOT_MAX_AGE = 0.005
+
     def __init__(self, port: str):
         if port not in ServoControlRegisters.__members__:
             raise Exception(
@@ -30,7 +36,10 @@ class ServoController:
             )
 
         self.registers = ServoControlRegisters[port].value
-        self._mcu_device = PlateInterface().get_device_mcu()
+        self._plate_interface = PlateInterface()
+        self._mcu_device = self._plate_interface.get_device_mcu()
+        self._command_queue = self._plate_interface.command_queue
+        self._port = port
 
         self.__lower_duty_cycle = 0
         self.__upper_duty_cycle = 0
@@ -79,19 +88,9 @@ class ServoController:
     def get_current_angle_and_speed(self):
         from numpy import interp
 
-        duty_cycle_and_speed = self._mcu_device.read_n_signed_bytes(
-            self.registers[ServoRegisterTypes.ANGLE_AND_SPEED],
-            number_of_bytes=4,
-            little_endian=True,
-        )
-
-        angle_speed_bytes = split_into_bytes(
-            duty_cycle_and_speed, no_of_bytes=4, little_endian=True, signed=True
-        )
-
-        duty_cycle = int.from_bytes(
-            angle_speed_bytes[0:2], byteorder="little", signed=True
-        )
+        duty_cycle, raw_speed = self._plate_interface.read_snapshot(
+            ServoAngleAndSpeedBlock, max_age=self._SNAPSHOT_MAX_AGE
+        )[self._port]
 
         angle = int(
             round(
@@ -106,10 +105,7 @@ class ServoController:
             )
         )
 
-        speed = (
-            int.from_bytes(angle_speed_bytes[2:4], byteorder="little", signed=True)
-            / 10.0
-        )
+        speed = raw_speed / 10.0
 
         return angle, speed
 
@@ -135,9 +131,18 @@ class ServoController:
             mapped_speed, 2, signed=True, little_endian=True
         )
 
-        self._mcu_device.write_n_bytes(
-            self.registers[ServoRegisterTypes.ANGLE_AND_SPEED], list_to_send
+        # only the latest target for this servo is kept if the command queue is batching
+        self._command_queue.submit(
+            self._port,
+            [
+                RegisterWrite(
+                    "write_n_bytes",
+                    self.registers[ServoRegisterTypes.ANGLE_AND_SPEED],
+                    list_to_send,
+                )
+            ],
         )
+        self._plate_interface.invalidate_snapshots(ServoAngleAndSpeedBlock)
 
     def get_acceleration_mode(self):
         return self._mcu_device.read_unsigned_byte(
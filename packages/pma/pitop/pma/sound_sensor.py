@@ -16,6 +16,8 @@ class SoundSensor(ADCBase):
     :param str name: Component name, defaults to `sound_sensor`. Used to access this component when added to a :class:`pitop.Pitop` object.
     """
 
+    _RECORD_PEAK_DETECTION = True
+
     def __init__(
         self, port_name, pin_number=1, name="sound_sensor", number_of_samples=1
     ):
@@ -48,6 +50,9 @@ class SoundSensor(ADCBase):
         value = self.reading
         return 0 if value == 0 else 1
 
+    async def _read_async(self, priority):
+        return await self.read_async(peak_detection=True, priority=priority) / 2
+
     @property
     def own_state(self):
         return {
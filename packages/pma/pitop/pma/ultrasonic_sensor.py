@@ -1,4 +1,5 @@
 from pitop.core.mixins import Recreatable, Stateful
+from pitop.pma.async_plate_interface import SupportsAsync
 from pitop.pma.common.utils import Port
 
 from .ultrasonic_sensor_base import UltrasonicSensorMCU, UltrasonicSensorRPI
@@ -6,7 +7,7 @@ from .ultrasonic_sensor_base import UltrasonicSensorMCU, UltrasonicSensorRPI
 valid_analog_ports = ["A1", "A3"]
 
 
-class UltrasonicSensor(Stateful, Recreatable):
+class UltrasonicSensor(Stateful, Recreatable, SupportsAsync):
     def __init__(
         self,
         port_name,
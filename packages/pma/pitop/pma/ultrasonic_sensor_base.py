@@ -3,7 +3,7 @@ import logging
 import time
 from abc import abstractmethod
 from collections import deque
-from sched import scheduler
+from queue import Queue
 from threading import Event, Lock, Thread
 
 from gpiozero import SmoothedInputDevice
@@ -22,6 +22,7 @@ from .common.ultrasonic_registers import (
     UltrasonicRegisterTypes,
 )
 from .plate_interface import PlateInterface
+from .polling_scheduler import PollingScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -87,11 +88,10 @@ class CompatibilityCheck(metaclass=Singleton):
 
     def check(self):
         try:
-            firmware_device = FirmwareDevice(FirmwareDeviceID.pt4_expansion_plate)
-            if (
-                firmware_device.get_fw_version_major()
-                < self.__MIN_FIRMWARE_MAJOR_VERSION
-            ):
+            device_info = FirmwareDevice.get_device_info(
+                FirmwareDeviceID.pt4_expansion_plate
+            )
+            if device_info["fw_version_major"] < self.__MIN_FIRMWARE_MAJOR_VERSION:
                 raise RuntimeError(
                     "Usage of the analog ports for the Ultrasonic Sensor requires an Expansion Plate with "
                     f"a minimum version version of V{self.__MIN_FIRMWARE_MAJOR_VERSION}. "
@@ -140,31 +140,31 @@ class UltrasonicSensorMCU(UltrasonicSensorBase):
         self.__active = True
 
         # Thread communication
-        self.__new_reading_event = Event()
         self.__activated_event = Event()
         self.__deactivated_event = Event()
-        self._continue_processing = True
 
         if self.__partial:
             self.__data_ready = True
-        else:
-            self.__queue_check = Thread(target=self.__queue_filled_check, daemon=True)
-            self.__queue_check.start()
 
-        # Data read loop
-        self._read_scheduler = Thread(target=self.__read_scheduler, daemon=True)
-        self._read_scheduler.start()
-
-        # Monitor for changes from active to inactive or vice versa
-        self.__state_check = Thread(target=self.__state_monitor, daemon=True)
-        self.__state_check.start()
+        # User callbacks run on a thread of their own, so that a slow callback
+        # doesn't hold up the polling scheduler, which also sends the plate's
+        # heartbeat
+        self.__state_changes = Queue()
+        self.__callback_thread = Thread(target=self.__callback_loop, daemon=True)
+        self.__callback_thread.start()
+
+        # Data reads and state changes are handled by the shared polling scheduler
+        self._read_task = PollingScheduler().register(
+            self.__read_loop,
+            rate=1.0 / self._data_read_dt,
+            device=self.__mcu_device,
+            name=f"ultrasonic_{self._pma_port}",
+        )
 
         atexit.register(self.close)
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        self._continue_processing = False
-        if self._process_image_thread.is_alive():
-            self._process_image_thread.join()
+        self._read_task.cancel()
 
     def __configure_mcu(self):
         self.__mcu_device.write_byte(
@@ -187,6 +187,8 @@ class UltrasonicSensorMCU(UltrasonicSensorBase):
         return None
 
     def close(self):
+        self._read_task.cancel()
+        self.__state_changes.put(None)
         self.__mcu_device.write_byte(
             self.__registers[UltrasonicRegisterTypes.CONFIG], 0x00
         )
@@ -201,26 +203,17 @@ class UltrasonicSensorMCU(UltrasonicSensorBase):
     def wait_for_inactive(self, timeout=None):
         self.__deactivated_event.wait(timeout=timeout)
 
-    def __read_scheduler(self):
-        s = scheduler(time.time, time.sleep)
-        s.enter(self._data_read_dt, 1, self.__read_loop, (s,))
-        s.run()
-
-    def __read_loop(self, s):
+    def __read_loop(self):
         from numpy import median
 
         self.__data_queue.append(self.__read_distance())
         self._filtered_distance = median(self.__data_queue)
-        self.__new_reading_event.set()
-        self.__new_reading_event.clear()
-        if self._continue_processing:
-            s.enter(self._data_read_dt, 1, self.__read_loop, (s,))
 
-    def __state_monitor(self):
-        while self._continue_processing:
-            self.__new_reading_event.wait()
-            if self.__data_ready:
-                self.__check_for_state_change()
+        if not self.__data_ready and self.__queue_len == len(self.__data_queue):
+            self.__data_ready = True
+
+        if self.__data_ready:
+            self.__check_for_state_change()
 
     def __check_for_state_change(self):
         if self.__active and self.__inactive_criteria():
@@ -237,25 +230,27 @@ class UltrasonicSensorMCU(UltrasonicSensorBase):
         return not self.__active_criteria()
 
     def __was_activated(self):
-        if callable(self.when_activated):
-            self.when_activated()
         self.__active = True
-        self.__activated_event.set()
-        self.__activated_event.clear()
+        self.__state_changes.put((self.when_activated, self.__activated_event))
 
     def __was_deactivated(self):
-        if callable(self.when_deactivated):
-            self.when_deactivated()
         self.__active = False
-        self.__deactivated_event.set()
-        self.__deactivated_event.clear()
-
-    def __queue_filled_check(self):
-        while self._continue_processing:
-            self.__new_reading_event.wait()
-            if self.__queue_len == len(self.__data_queue):
-                self.__data_ready = True
-                break
+        self.__state_changes.put((self.when_deactivated, self.__deactivated_event))
+
+    def __callback_loop(self):
+        while True:
+            state_change = self.__state_changes.get()
+            if state_change is None:
+                return
+
+            callback, event = state_change
+            if callable(callback):
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Error in ultrasonic sensor callback: {e}")
+            event.set()
+            event.clear()
 
     def __read_distance(self):
         distance = (
@@ -6,6 +6,7 @@ from typing import Optional, Union
 from pitop.core.mixins import Recreatable, Stateful
 from pitop.pma import EncoderMotor, ForwardDirection
 from pitop.pma.common.encoder_motor_registers import MotorSyncBits, MotorSyncRegisters
+from pitop.pma.plate_command_queue import RegisterWrite
 from pitop.pma.plate_interface import PlateInterface
 
 from .simple_pid import PID
@@ -62,7 +63,7 @@ class DriveController(Stateful, Recreatable):
         )
 
         # Motor syncing
-        self.__mcu_device = PlateInterface().get_device_mcu()
+        self.__command_queue = PlateInterface().command_queue
 
         Stateful.__init__(self, children=["left_motor", "right_motor"])
         Recreatable.__init__(
@@ -74,21 +75,34 @@ class DriveController(Stateful, Recreatable):
             },
         )
 
+    def __sync_write(self, register: MotorSyncRegisters, value: int) -> RegisterWrite:
+        # the post write delay is applied by the command queue, which runs on
+        # a background thread when batching is enabled
+        return RegisterWrite(
+            "write_byte", register.value, value, post_write_delay=POST_WRITE_SLEEP
+        )
+
     def _set_synchronous_motor_movement_mode(self) -> None:
         sync_config = (
             MotorSyncBits[self.left_motor_port].value
             | MotorSyncBits[self.right_motor_port].value
         )
-        self.__mcu_device.write_byte(MotorSyncRegisters.CONFIG.value, sync_config)
-        sleep(POST_WRITE_SLEEP)
+        self.__command_queue.submit(
+            (self.name, MotorSyncRegisters.CONFIG),
+            [self.__sync_write(MotorSyncRegisters.CONFIG, sync_config)],
+        )
 
     def _unset_synchronous_motor_movement_mode(self) -> None:
-        self.__mcu_device.write_byte(MotorSyncRegisters.CONFIG.value, 0b0000000)
-        sleep(POST_WRITE_SLEEP)
+        self.__command_queue.submit(
+            (self.name, MotorSyncRegisters.CONFIG),
+            [self.__sync_write(MotorSyncRegisters.CONFIG, 0b0000000)],
+        )
 
     def _start_synchronous_motor_movement(self) -> None:
-        self.__mcu_device.write_byte(MotorSyncRegisters.START.value, 1)
-        sleep(POST_WRITE_SLEEP)
+        self.__command_queue.submit(
+            (self.name, MotorSyncRegisters.START),
+            [self.__sync_write(MotorSyncRegisters.START, 1)],
+        )
 
     def _calculate_motor_speeds(
         self,
@@ -307,12 +321,15 @@ class DriveController(Stateful, Recreatable):
         if distance is None:
             # run indefinitely
             distance = 0.0
-        self._set_synchronous_motor_movement_mode()
-        self.left_motor.set_target_speed(
-            left_speed, distance=copysign(distance, left_speed)
-        )
-        self.right_motor.set_target_speed(
-            right_speed, distance=copysign(distance, right_speed)
-        )
-        self._start_synchronous_motor_movement()
-        self._unset_synchronous_motor_movement_mode()
+        # the sync config is set and unset around the setpoints, so they're
+        # queued as one command that's never partly replaced when batching
+        with self.__command_queue.group(self.name):
+            self._set_synchronous_motor_movement_mode()
+            self.left_motor.set_target_speed(
+                left_speed, distance=copysign(distance, left_speed)
+            )
+            self.right_motor.set_target_speed(
+                right_speed, distance=copysign(distance, right_speed)
+            )
+            self._start_synchronous_motor_movement()
+            self._unset_synchronous_motor_movement_mode()
@@ -1,6 +1,7 @@
-import sched
 import time
-from threading import Event, Thread
+from threading import Event
+
+from pitop.pma.polling_scheduler import PollingScheduler
 
 
 class MeasurementScheduler:
@@ -16,43 +17,25 @@ class MeasurementScheduler:
         self.state_tracker = state_tracker
         self._measurement_dt = 1.0 / measurement_frequency
 
-        self._continue_processing = True
         self._new_measurement_event = Event()
-        self._measurement_prediction_scheduler = Thread(target=self.start, daemon=True)
-        self._measurement_prediction_scheduler.start()
+        self._previous_time = time.time()
+        self._measurement_task = PollingScheduler().register(
+            self.loop, rate=measurement_frequency, name="odometry_measurement"
+        )
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        self._continue_processing = False
-        if self._measurement_prediction_scheduler.is_alive():
-            self._measurement_prediction_scheduler.join()
+        self._measurement_task.cancel()
 
     def wait_for_measurement(self):
         self._new_measurement_event.wait()
 
-    def start(self):
-        s = sched.scheduler(time.time, time.sleep)
-        current_time = time.time()
-        s.enterabs(
-            current_time + self._measurement_dt,
-            1,
-            self.loop,
-            (s, current_time),
-        )
-        s.run()
-
-    def loop(self, s, previous_time):
+    def loop(self):
         current_time = time.time()
         self.state_tracker.add_measurements(
-            odom_measurements=self.measurement_func(), dt=current_time - previous_time
+            odom_measurements=self.measurement_func(),
+            dt=current_time - self._previous_time,
         )
+        self._previous_time = current_time
 
         self._new_measurement_event.set()
         self._new_measurement_event.clear()
-
-        if self._continue_processing:
-            s.enterabs(
-                current_time + self._measurement_dt,
-                1,
-                self.loop,
-                (s, current_time),
-            )
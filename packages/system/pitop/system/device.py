@@ -51,8 +51,10 @@ def device_firmware(device_id):
     fw_version = None
     if getstatusoutput(f"i2cping {device_address}"):
         try:
-            fw_device = FirmwareDevice(fw_device_id)
-            fw_version = fw_device.get_fw_version()
+            device_info = FirmwareDevice.get_device_info(fw_device_id)
+            fw_version = (
+                f"{device_info['fw_version_major']}.{device_info['fw_version_minor']}"
+            )
         except Exception:
             pass
     return fw_version
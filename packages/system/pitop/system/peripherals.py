@@ -42,8 +42,10 @@ def __get_fw_device_status(device_enum):
     peripheral = {"name": human_readable_name, "fw_version": None, "connected": False}
 
     try:
-        fw_device = FirmwareDevice(device_enum)
-        peripheral["fw_version"] = fw_device.get_fw_version()
+        device_info = FirmwareDevice.get_device_info(device_enum)
+        peripheral["fw_version"] = (
+            f"{device_info['fw_version_major']}.{device_info['fw_version_minor']}"
+        )
         peripheral["connected"] = True
     except Exception:
         pass
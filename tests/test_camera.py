@@ -1,5 +1,5 @@
-from threading import Thread
-from time import perf_counter
+from threading import Event, Thread
+from time import perf_counter, sleep
 from unittest import TestCase, skip
 from unittest.mock import MagicMock, patch
 
@@ -17,8 +17,13 @@ class CameraTestCase(TestCase):
         self.cv2_patch = patch("pitop.camera.core.cameras.usb_camera.import_opencv")
         self.cv2_mock = self.cv2_patch.start()
 
+        def read():
+            # Cameras give frames at their frame rate
+            sleep(1 / 30)
+            return [1, image.data]
+
         self.read_mock = MagicMock()
-        self.read_mock.read.return_value = [1, image.data]
+        self.read_mock.read.side_effect = read
         self.vc_mock = MagicMock()
         self.vc_mock.VideoCapture.return_value = self.read_mock
         self.cv2_mock.return_value = self.vc_mock
@@ -204,3 +209,77 @@ class CameraTestCase(TestCase):
         c = self.Camera()
         with self.assertRaises(ValueError):
             c.start_handling_frames(callback_on_frame=lambda: 1)
+
+    def test_slow_frame_callback_doesnt_slow_capture_down(self):
+        c = self.Camera()
+        release_callback = Event()
+        frames_seen = []
+
+        def on_frame(frame):
+            frames_seen.append(c.last_frame.sequence)
+            release_callback.wait(5)
+
+        c.on_frame = on_frame
+        wait_until(lambda: len(frames_seen) > 0)
+        first_sequence = frames_seen[0]
+        wait_until(lambda: c.last_frame.sequence >= first_sequence + 3)
+        self.assertEqual(len(frames_seen), 1)
+
+        release_callback.set()
+        wait_until(lambda: len(frames_seen) > 1)
+        self.assertGreater(frames_seen[1], first_sequence + 1)
+        self.assertGreaterEqual(c.last_frame.age, 0)
+
+    def test_invalid_frame_policy_fails(self):
+        with self.assertRaises(ValueError):
+            self.Camera(frame_policy="newest")
+
+
+class UsbCameraTestCase(TestCase):
+    def setUp(self):
+        import cv2
+
+        self.frame = numpy.arange(4 * 6 * 3, dtype=numpy.uint8).reshape(4, 6, 3)
+
+        cv2_patch = patch("pitop.camera.core.cameras.usb_camera.import_opencv")
+        cv2_mock = cv2_patch.start()
+        self.addCleanup(cv2_patch.stop)
+        cv2_mock.return_value.VideoCapture.return_value.read.return_value = [
+            1,
+            self.frame,
+        ]
+        for name in (
+            "rotate",
+            "flip",
+            "ROTATE_90_CLOCKWISE",
+            "ROTATE_90_COUNTERCLOCKWISE",
+            "ROTATE_180",
+        ):
+            setattr(cv2_mock.return_value, name, getattr(cv2, name))
+
+    def test_read_frame_rotates_and_flips_like_pil(self):
+        from pitop.camera.core import UsbCamera
+        from pitop.core.ImageFunctions import convert
+
+        for rotate_angle in (-270, -180, -90, 0, 90, 180, 270):
+            for flip_top_bottom in (False, True):
+                for flip_left_right in (False, True):
+                    camera = UsbCamera(
+                        rotate_angle=rotate_angle,
+                        flip_top_bottom=flip_top_bottom,
+                        flip_left_right=flip_left_right,
+                    )
+                    expected = convert(self.frame, "PIL").rotate(
+                        rotate_angle, expand=True
+                    )
+                    if flip_top_bottom:
+                        expected = expected.transpose(Image.FLIP_TOP_BOTTOM)
+                    if flip_left_right:
+                        expected = expected.transpose(Image.FLIP_LEFT_RIGHT)
+
+                    frame = camera.read_frame()
+                    self.assertIsInstance(frame, numpy.ndarray)
+                    numpy.testing.assert_array_equal(frame, convert(expected, "OpenCV"))
+                    self.assertEqual(
+                        list(camera.get_frame().getdata()), list(expected.getdata())
+                    )
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from pitop.camera.core import Frame
+
+
+@pytest.fixture
+def bgr_image():
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+    # blue in OpenCV's BGR order
+    image[..., 0] = 255
+    return image
+
+
+def test_representations_are_computed_once(bgr_image):
+    frame = Frame(bgr_image)
+
+    assert frame.opencv is bgr_image
+    pil = frame.pil
+    assert isinstance(pil, Image.Image)
+    assert pil.getpixel((0, 0)) == (0, 0, 255)
+    assert frame.pil is pil
+
+    gray = frame.grayscale
+    assert gray.shape == (4, 6)
+    assert frame.grayscale is gray
+
+    hsv = frame.hsv
+    assert hsv[0, 0].tolist() == [120, 255, 255]
+    assert frame.hsv is hsv
+
+    assert frame.misses == {"opencv": 1, "pil": 1, "grayscale": 1, "hsv": 1}
+    # grayscale and hsv are derived from the OpenCV frame
+    assert frame.hits == {"opencv": 2, "pil": 1, "grayscale": 1, "hsv": 1}
+
+
+def test_as_format(bgr_image):
+    frame = Frame(bgr_image)
+
+    assert frame.as_format("OpenCV") is bgr_image
+    assert frame.as_format("PIL") is frame.pil
+    with pytest.raises(AssertionError):
+        frame.as_format("jpeg")
+
+
+def test_resized_keeps_aspect_ratio_unless_given_height(bgr_image):
+    frame = Frame(bgr_image)
+
+    assert frame.size == (6, 4)
+    assert frame.resized(3).shape == (2, 3, 3)
+    assert frame.resized(3) is frame.resized(3)
+    assert frame.resized(3, 3).shape == (3, 3, 3)
+    assert frame.misses["resized_3x2"] == 1
+    assert frame.hits["resized_3x2"] == 2
+
+
+def test_pil_frames_are_converted_to_opencv():
+    image = Image.new("RGB", (6, 4), (255, 0, 0))
+    frame = Frame(image)
+
+    assert frame.size == (6, 4)
+    assert frame.pil is image
+    assert frame.opencv[0, 0].tolist() == [0, 0, 255]
+    assert frame.grayscale.shape == (4, 6)
@@ -1,6 +1,11 @@
+from threading import Event
 from unittest.mock import MagicMock
 
-from pitop.camera.core import CaptureActions, FrameHandler
+import numpy as np
+from PIL import Image
+
+from pitop.camera.core import CaptureActions, Frame, FrameHandler
+from tests.utils import wait_until
 
 
 def test_capture_actions_empty_when_instantiating():
@@ -109,3 +114,113 @@ def test_actions_are_processed_on_process_call():
     f.process()
     for process_mock in mock_arr:
         process_mock.assert_called_once()
+
+
+def test_frame_is_converted_once_per_format():
+    """Frames are only converted the first time each format is requested."""
+    f = FrameHandler()
+    f.frame = np.zeros((4, 6, 3), dtype=np.uint8)
+
+    pil_frame = f.converted_frame("PIL")
+    assert f.converted_frame("pil") is pil_frame
+    assert f.converted_frame("OpenCV") is f.frame
+    assert f.cache_misses == {"pil": 1, "opencv": 1}
+    assert f.cache_hits == {"pil": 1}
+
+    f.frame = np.ones((4, 6, 3), dtype=np.uint8)
+    assert f.converted_frame("PIL") is not pil_frame
+    assert f.cache_misses == {"pil": 2, "opencv": 1}
+
+    assert isinstance(pil_frame, Image.Image)
+    assert f.converted_frame() is f.frame
+
+
+def test_actions_share_frame_representations():
+    """Representations computed by an action are reused by the others, and
+    counted across frames."""
+    f = FrameHandler()
+    f.register_action(
+        CaptureActions.DETECT_MOTION,
+        {"callback_on_motion": lambda: None, "moving_object_minimum_area": 1},
+    )
+    f.register_action(
+        CaptureActions.HANDLE_FRAME,
+        {"callback_on_frame": lambda frame: None, "frame_interval": 1},
+    )
+
+    for _ in range(3):
+        f.frame = np.zeros((4, 6, 3), dtype=np.uint8)
+        f.process()
+        assert isinstance(f.current_frame, Frame)
+
+    f.remove_action(CaptureActions.HANDLE_FRAME)
+    f.remove_action(CaptureActions.DETECT_MOTION)
+
+    # grayscale is derived from the OpenCV frame, which is the frame itself
+    assert f.cache_misses == {"grayscale": 3, "opencv": 3, "pil": 3}
+    assert f.cache_hits == {}
+
+    assert f.converted_frame("PIL") is f.converted_frame("PIL")
+    assert f.cache_hits == {"pil": 2}
+
+
+def test_submitted_frames_are_processed_by_each_action_on_its_own_lane():
+    """A slow action drops frames without delaying the others."""
+    release_slow_action = Event()
+    slow_frames = []
+    fast_frames = []
+
+    def slow_callback(frame):
+        release_slow_action.wait(5)
+        slow_frames.append(frame)
+
+    f = FrameHandler()
+    f.register_action(
+        CaptureActions.HANDLE_FRAME,
+        {"callback_on_frame": slow_callback, "frame_interval": 1},
+    )
+    f.register_action(
+        CaptureActions.DETECT_MOTION,
+        {"callback_on_motion": lambda: None, "moving_object_minimum_area": 1},
+    )
+    # callbacks run on an executor, which would hide how long they take
+    generic_action = f._capture_actions[CaptureActions.HANDLE_FRAME]
+    generic_action.process = lambda frame: slow_callback(frame.image)
+    motion_detector = f._capture_actions[CaptureActions.DETECT_MOTION]
+    motion_detector.process = lambda frame: fast_frames.append(frame.image)
+
+    images = [np.full((4, 6, 3), i, dtype=np.uint8) for i in range(5)]
+    for image in images:
+        f.submit(image)
+        wait_until(lambda: len(fast_frames) > 0 and fast_frames[-1] is image)
+
+    release_slow_action.set()
+    assert f.wait(5)
+
+    assert fast_frames == images
+    assert slow_frames == [images[0], images[-1]]
+    statistics = f.lane_statistics()
+    assert statistics["DETECT_MOTION"]["dropped"] == 0
+    assert statistics["HANDLE_FRAME"]["processed"] == 2
+    assert statistics["HANDLE_FRAME"]["dropped"] == 3
+
+    f.remove_action(CaptureActions.HANDLE_FRAME)
+    f.remove_action(CaptureActions.DETECT_MOTION)
+    assert f.lane_statistics() == {}
+
+
+def test_submitted_frame_is_captured_once():
+    """Capture single frame only processes one submitted frame."""
+    f = FrameHandler()
+    f.register_action(CaptureActions.CAPTURE_SINGLE_FRAME, {"output_file_name": "x"})
+    process_mock = f._capture_actions[CaptureActions.CAPTURE_SINGLE_FRAME].process = (
+        MagicMock()
+    )
+
+    f.submit(np.zeros((4, 6, 3), dtype=np.uint8))
+    assert f.wait(5)
+    f.submit(np.zeros((4, 6, 3), dtype=np.uint8))
+    assert f.wait(5)
+
+    process_mock.assert_called_once()
+    assert not f.is_running_action(CaptureActions.CAPTURE_SINGLE_FRAME)
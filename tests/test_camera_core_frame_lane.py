@@ -0,0 +1,131 @@
+from threading import Event, Thread
+
+import pytest
+
+from pitop.camera.core import Frame, FrameLane, FramePolicy
+from tests.utils import wait_until
+
+
+class BlockingProcessor:
+    """Records the sequence numbers of the frames processed, and blocks on
+    the first one until released, so that frames pile up in the lane."""
+
+    def __init__(self):
+        self.processed = []
+        self.started = Event()
+        self.release = Event()
+
+    def __call__(self, frame):
+        self.started.set()
+        assert self.release.wait(5)
+        self.processed.append(frame.sequence)
+
+
+def frames(count):
+    return [Frame(None, sequence=sequence) for sequence in range(count)]
+
+
+@pytest.fixture
+def processor():
+    processor = BlockingProcessor()
+    yield processor
+    processor.release.set()
+
+
+def fill_busy_lane(lane, processor, count):
+    first, *others = frames(count)
+    lane.put(first)
+    assert processor.started.wait(5)
+    for frame in others:
+        lane.put(frame)
+
+
+def test_latest_policy_only_keeps_newest_frame(processor):
+    lane = FrameLane(processor, policy=FramePolicy.LATEST)
+    fill_busy_lane(lane, processor, 5)
+
+    processor.release.set()
+    assert lane.wait(5)
+    lane.stop()
+
+    assert processor.processed == [0, 4]
+    assert lane.frames_processed == 2
+    assert lane.frames_dropped == 3
+    assert lane.latency >= 0
+
+
+def test_queue_policy_drops_oldest_frames(processor):
+    lane = FrameLane(processor, policy="queue", buffer_size=2)
+    fill_busy_lane(lane, processor, 5)
+
+    processor.release.set()
+    assert lane.wait(5)
+    lane.stop()
+
+    assert processor.processed == [0, 3, 4]
+    assert lane.frames_dropped == 2
+
+
+def test_block_policy_waits_for_room(processor):
+    lane = FrameLane(processor, policy=FramePolicy.BLOCK, buffer_size=1)
+    fill_busy_lane(lane, processor, 2)
+
+    put_done = Event()
+
+    def put_frame():
+        lane.put(Frame(None, sequence=2))
+        put_done.set()
+
+    Thread(target=put_frame, daemon=True).start()
+    assert not put_done.wait(0.1)
+
+    processor.release.set()
+    assert put_done.wait(5)
+    assert lane.wait(5)
+    lane.stop()
+
+    assert processor.processed == [0, 1, 2]
+    assert lane.frames_dropped == 0
+
+
+def test_stop_drops_waiting_frames(processor):
+    lane = FrameLane(processor, policy="queue", buffer_size=3)
+    fill_busy_lane(lane, processor, 3)
+
+    # stop waits for the frame being processed
+    stop_thread = Thread(target=lane.stop, daemon=True)
+    stop_thread.start()
+    wait_until(lambda: not lane.is_running)
+    assert stop_thread.is_alive()
+
+    processor.release.set()
+    stop_thread.join(5)
+    lane.put(Frame(None, sequence=3))
+
+    assert not lane.is_running
+    assert processor.processed == [0]
+    assert lane.frames_dropped == 2
+
+
+def test_errors_dont_stop_lane():
+    processed = []
+
+    def process(frame):
+        if frame.sequence == 0:
+            raise RuntimeError("failed")
+        processed.append(frame.sequence)
+
+    lane = FrameLane(process, policy="block")
+    for frame in frames(3):
+        lane.put(frame)
+    assert lane.wait(5)
+    lane.stop()
+
+    assert processed == [1, 2]
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        FrameLane(print, policy="newest")
+    with pytest.raises(ValueError):
+        FrameLane(print, buffer_size=0)
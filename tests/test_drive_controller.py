@@ -1,8 +1,9 @@
-from unittest.mock import patch
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
 from pitop import DriveController, EncoderMotor
+from pitop.pma.common.encoder_motor_registers import MotorSyncBits, MotorSyncRegisters
 
 
 def test_object_has_motorencoder_instances():
@@ -177,3 +178,37 @@ def test_rotate_speeds():
         sleep_mock.assert_called_once_with(0.4)
         sleep_mock.reset_mock()
         set_motor_speeds_mock.reset_mock()
+
+
+def test_synchronised_move_is_written_in_order_when_batching():
+    """Setting the motor speeds writes the sync config, the motor setpoints,
+    the start and the config reset in order, when the command queue batches
+    commands."""
+    d = DriveController(left_motor_port="M3", right_motor_port="M0")
+    command_queue = d._DriveController__command_queue
+    device = MagicMock()
+
+    with patch("pitop.pma.plate_command_queue.Thread"), patch(
+        "pitop.pma.plate_command_queue.sleep"
+    ), patch.object(command_queue, "_PlateCommandQueue__get_device", lambda: device):
+        command_queue.flush_interval = 0.05
+        try:
+            d._set_motor_speeds(0.1, 0.1)
+            d._set_motor_speeds(0.2, 0.2)
+            device.write_byte.assert_not_called()
+            command_queue.flush()
+        finally:
+            command_queue.flush_interval = None
+
+    registers = [method_call.args[0] for method_call in device.method_calls]
+    sync_config = MotorSyncBits.M3.value | MotorSyncBits.M0.value
+    assert device.method_calls[0] == call.write_byte(
+        MotorSyncRegisters.CONFIG.value, sync_config
+    )
+    assert device.method_calls[-2:] == [
+        call.write_byte(MotorSyncRegisters.START.value, 1),
+        call.write_byte(MotorSyncRegisters.CONFIG.value, 0),
+    ]
+    # only the latest move is written, with both motors' setpoints
+    assert registers.count(MotorSyncRegisters.START.value) == 1
+    assert len(device.method_calls) == 7
@@ -3,8 +3,42 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from pitop.common.common_ids import FirmwareDeviceID  # noqa: E402
-from pitop.common.firmware_device import FirmwareDevice  # noqa: E402
+from pitop.common.firmware_device import DeviceInfoCache  # noqa: E402
 from pitop.common.firmware_device import PTInvalidFirmwareDeviceException  # noqa: E402
+from pitop.common.firmware_device import DeviceInfo, FirmwareDevice  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def device_info_cache(tmp_path):
+    DeviceInfoCache.instance = None
+    cache = DeviceInfoCache(path=str(tmp_path / "device_info.json"))
+    yield cache
+    DeviceInfoCache.instance = None
+
+
+def get_device_with_registers(registers):
+    i2c_device = MagicMock()
+    i2c_device.read_unsigned_byte.side_effect = lambda reg: registers[reg]
+    i2c_device.read_unsigned_word.side_effect = lambda reg: registers[reg]
+    i2c_device.read_n_unsigned_bytes.side_effect = lambda reg, n: registers[reg]
+
+    with patch("pitop.common.firmware_device.I2CDevice", return_value=i2c_device):
+        device = get_mocked_firmware_device(0x2222)(
+            FirmwareDeviceID.pt4_expansion_plate
+        )
+    return device, i2c_device
+
+
+REGISTERS = {
+    DeviceInfo.ID__MCU_SOFT_VERS_MAJOR: 22,
+    DeviceInfo.ID__MCU_SOFT_VERS_MINOR: 3,
+    DeviceInfo.ID__SCH_REV_MAJOR: 5,
+    DeviceInfo.FW_UPDATE_SCHEMA_VER: 0x55AA01,
+    DeviceInfo.ID__IS_RELEASE_BUILD: 1,
+    DeviceInfo.ID__GIT_COMMIT_HASH: 0x1234ABCD,
+    DeviceInfo.ID__CI_BUILD_NO: 42,
+    DeviceInfo.ID__BUILD_UNIX_TIMESTAMP: 0,
+}
 
 
 def get_mocked_firmware_device(part_name):
@@ -65,3 +99,122 @@ def test_valid_ids():
     ]
 
     assert set(valid_ids) == set(FirmwareDevice.valid_device_ids())
+
+
+def test_device_info_read_once_for_all_getters():
+    """All device information getters are served from a single read of the
+    device information fields."""
+    device, i2c_device = get_device_with_registers(REGISTERS)
+
+    assert device.get_fw_version() == "22.3"
+    assert device.get_sch_hardware_version_major() == 5
+    assert device.get_fw_version_update_schema() == 1
+    assert device.get_is_release_build() is True
+    assert device.get_git_commit_hash() == "1234abcd"
+    assert device.get_ci_build_no() == 42
+
+    read_registers = [
+        c.args[0]
+        for method in (
+            "read_unsigned_byte",
+            "read_unsigned_word",
+            "read_n_unsigned_bytes",
+        )
+        for c in getattr(i2c_device, method).call_args_list
+    ]
+    assert sorted(read_registers) == sorted(REGISTERS.keys())
+
+
+def test_get_device_info_checks_part_name_then_uses_cache():
+    device, _ = get_device_with_registers(REGISTERS)
+    device.read_device_info()
+
+    with patch("pitop.common.firmware_device.I2CDevice") as i2c_device_mock:
+        info = FirmwareDevice.get_device_info(FirmwareDeviceID.pt4_expansion_plate)
+
+    device.get_part_name.assert_called()
+    i2c_device = i2c_device_mock.return_value
+    i2c_device.read_unsigned_byte.assert_not_called()
+    i2c_device.read_n_unsigned_bytes.assert_not_called()
+    assert info["fw_version_major"] == 22
+
+
+def test_get_device_info_fails_if_device_is_unplugged(device_info_cache):
+    device, _ = get_device_with_registers(REGISTERS)
+    device.read_device_info()
+
+    with patch("pitop.common.firmware_device.I2CDevice"), patch.object(
+        FirmwareDevice, "get_part_name", side_effect=OSError
+    ):
+        with pytest.raises(ConnectionError):
+            FirmwareDevice.get_device_info(FirmwareDeviceID.pt4_expansion_plate)
+
+    assert device_info_cache.get(FirmwareDeviceID.pt4_expansion_plate) is None
+
+
+def test_device_info_cache_expires(device_info_cache):
+    device_info_cache.update(FirmwareDeviceID.pt4_hub, {"fw_version_major": 1})
+    assert device_info_cache.get(FirmwareDeviceID.pt4_hub) == {"fw_version_major": 1}
+
+    device_info_cache.ttl = 0.0
+    assert device_info_cache.get(FirmwareDeviceID.pt4_hub) is None
+
+
+def test_device_info_cache_loaded_from_disk(device_info_cache):
+    device_info_cache.update(FirmwareDeviceID.pt4_hub, {"fw_version_major": 1})
+
+    DeviceInfoCache.instance = None
+    cache = DeviceInfoCache(path=device_info_cache.path)
+    assert cache.get(FirmwareDeviceID.pt4_hub) == {"fw_version_major": 1}
+
+    # entries stored during a different boot are discarded
+    DeviceInfoCache.instance = None
+    with patch("pitop.common.firmware_device.get_boot_id", return_value="other"):
+        cache = DeviceInfoCache(path=device_info_cache.path)
+    assert cache.get(FirmwareDeviceID.pt4_hub) is None
+
+
+def test_device_info_cache_invalidated_on_peripheral_events(device_info_cache):
+    with patch("pitop.common.ptdm.PTDMSubscribeClient") as subscribe_client_mock:
+        device_info_cache.listen_for_peripheral_events()
+
+    callbacks = subscribe_client_mock.return_value.initialise.call_args.args[0]
+    for message_id, callback in callbacks.items():
+        device_info_cache.update(FirmwareDeviceID.pt4_hub, {"fw_version_major": 1})
+        callback()
+        assert device_info_cache.get(FirmwareDeviceID.pt4_hub) is None
+
+    device_info_cache.stop_listening_for_peripheral_events()
+    subscribe_client_mock.return_value.stop_listening.assert_called_once()
+
+
+@patch("pitop.common.firmware_device.I2CDevice")
+def test_device_info_invalidated_on_part_name_mismatch(_, device_info_cache):
+    device_info_cache.update(
+        FirmwareDeviceID.pt4_expansion_plate, {"fw_version_major": 1}
+    )
+    device_info_cache.update(
+        FirmwareDeviceID.pt4_foundation_plate, {"fw_version_major": 1}
+    )
+
+    cls = get_mocked_firmware_device(0x1111)
+    with pytest.raises(PTInvalidFirmwareDeviceException):
+        cls(FirmwareDeviceID.pt4_expansion_plate)
+    assert device_info_cache.get(FirmwareDeviceID.pt4_expansion_plate) is None
+
+    # a device found at the address replaces any other device using it
+    cls(FirmwareDeviceID.pt4_foundation_plate)
+    device_info_cache.update(
+        FirmwareDeviceID.pt4_foundation_plate, {"fw_version_major": 1}
+    )
+    cls = get_mocked_firmware_device(0x2222)
+    cls(FirmwareDeviceID.pt4_expansion_plate)
+    assert device_info_cache.get(FirmwareDeviceID.pt4_foundation_plate) is None
+
+
+def test_device_info_invalidated_on_firmware_update(device_info_cache):
+    device, _ = get_device_with_registers(REGISTERS)
+    device.read_device_info()
+
+    device.send_packet(DeviceInfo.FW__UPGRADE_PACKET, [0x00])
+    assert device_info_cache.get(FirmwareDeviceID.pt4_expansion_plate) is None
@@ -121,15 +121,142 @@ def test_write_n_bytes_writes_data_to_device(setup_mocks):
     )
 
 
-def test_write_n_bytes_sleeps_after_write(setup_mocks):
+def test_write_n_bytes_does_not_sleep_after_write(setup_mocks):
+    from pitop.common.i2c_device import I2CPacing
+
     i2c_device = setup_mocks.get("i2c_device")
     sleep_mock = setup_mocks.get("sleep_mock")
+    i2c_device._pacing = I2CPacing()
 
     i2c_device.connect(read_test=False)
     i2c_device.write_n_bytes(_dummy_register, [0x01, 0x02, 0x03])
     i2c_device.disconnect()
 
-    sleep_mock.assert_called_once_with(i2c_device._post_write_delay)
+    sleep_mock.assert_not_called()
+
+
+def test_transaction_waits_for_remaining_turnaround(setup_mocks):
+    from pitop.common.i2c_device import I2CPacing
+
+    i2c_device = setup_mocks.get("i2c_device")
+    sleep_mock = setup_mocks.get("sleep_mock")
+    i2c_device._pacing = I2CPacing(post_write_delay=10.0)
+
+    i2c_device.connect(read_test=False)
+    i2c_device.write_n_bytes(_dummy_register, [0x01])
+    i2c_device.write_n_bytes(_dummy_register, [0x02])
+    i2c_device.disconnect()
+
+    sleep_mock.assert_called_once()
+    assert 9.0 < sleep_mock.call_args[0][0] <= 10.0
+
+
+def test_transaction_does_not_wait_once_turnaround_elapsed(setup_mocks):
+    from pitop.common.i2c_device import I2CPacing
+
+    i2c_device = setup_mocks.get("i2c_device")
+    sleep_mock = setup_mocks.get("sleep_mock")
+    i2c_device._pacing = I2CPacing(post_write_delay=0.0)
+
+    i2c_device.connect(read_test=False)
+    i2c_device.write_n_bytes(_dummy_register, [0x01])
+    i2c_device.write_n_bytes(_dummy_register, [0x02])
+    i2c_device.disconnect()
+
+    sleep_mock.assert_not_called()
+
+
+def test_set_delays_only_applies_to_device_instance(setup_mocks):
+    from pitop.common.i2c_device import I2CPacing
+
+    i2c_device = setup_mocks.get("i2c_device")
+    sleep_mock = setup_mocks.get("sleep_mock")
+    i2c_device._pacing = I2CPacing(post_write_delay=0.0)
+
+    i2c_device.set_delays(0.1, 10.0)
+
+    assert i2c_device._post_read_delay == 0.1
+    assert i2c_device._post_write_delay == 10.0
+    assert i2c_device._pacing.post_write_delay == 0.0
+
+    i2c_device.connect(read_test=False)
+    i2c_device.write_n_bytes(_dummy_register, [0x01])
+    i2c_device.write_n_bytes(_dummy_register, [0x02])
+    i2c_device.disconnect()
+
+    sleep_mock.assert_called_once()
+    assert 9.0 < sleep_mock.call_args[0][0] <= 10.0
+
+
+def test_pacing_is_shared_by_device():
+    from pitop.common.i2c_device import I2CPacing
+
+    pacing = I2CPacing.for_device("shared_device_path", 0x10, combined_read=True)
+
+    assert I2CPacing.for_device("shared_device_path", 0x10) is pacing
+    assert I2CPacing.for_device("shared_device_path", 0x11) is not pacing
+    assert pacing.combined_read is True
+
+
+def test_pacing_with_conflicting_settings_fails():
+    from pitop.common.i2c_device import I2CPacing
+
+    I2CPacing.for_device("conflicting_device_path", 0x10, combined_read=True)
+
+    assert I2CPacing.for_device(
+        "conflicting_device_path", 0x10, combined_read=True
+    ).combined_read
+    with pytest.raises(ValueError):
+        I2CPacing.for_device("conflicting_device_path", 0x10, combined_read=False)
+
+
+def test_pacing_deadline_is_shared_through_file(tmp_path):
+    from pitop.common.i2c_device import I2CPacing
+
+    path = str(tmp_path / "pacing")
+    pacing = I2CPacing(post_write_delay=10.0, shared_state_path=path)
+    # e.g. in another process
+    other_pacing = I2CPacing(shared_state_path=path)
+
+    pacing.write_done()
+
+    assert other_pacing.ready_at == pacing.ready_at
+    with patch("pitop.common.i2c_device.sleep") as sleep_mock:
+        other_pacing.wait_until_ready()
+    assert 9.0 < sleep_mock.call_args[0][0] <= 10.0
+
+
+def test_combined_read_uses_single_rdwr_ioctl(setup_mocks):
+    from pitop.common.i2c_device import I2CPacing
+
+    i2c_device = setup_mocks.get("i2c_device")
+    ioctl_mock = setup_mocks.get("ioctl_mock")
+    mock_read_device = setup_mocks.get("mock_read_device")
+    _mock_write_device = setup_mocks.get("mock_write_device")
+    sleep_mock = setup_mocks.get("sleep_mock")
+    i2c_device._pacing = I2CPacing(combined_read=True)
+
+    def fill_read_buffer(device, request, ioctl_data):
+        if request != i2c_device.I2C_RDWR:
+            return
+        write_message, read_message = ioctl_data.msgs[0], ioctl_data.msgs[1]
+        assert ioctl_data.nmsgs == 2
+        assert write_message.len == 1
+        assert write_message.buf[0] == _dummy_register
+        assert read_message.flags == i2c_device.I2C_M_RD
+        for i, value in enumerate([0x01, 0x02]):
+            read_message.buf[i] = value
+
+    ioctl_mock.side_effect = fill_read_buffer
+
+    i2c_device.connect(read_test=False)
+    read_value = i2c_device.read_unsigned_word(_dummy_register, little_endian=True)
+    i2c_device.disconnect()
+
+    assert read_value == 0x0201
+    _mock_write_device.write.assert_not_called()
+    mock_read_device.read.assert_not_called()
+    sleep_mock.assert_not_called()
 
 
 @pytest.mark.parametrize(
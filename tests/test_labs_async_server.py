@@ -0,0 +1,193 @@
+import json
+import os
+import socket
+from base64 import b64encode
+from time import sleep
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from pitop.labs import (
+    AsyncRoverWebController,
+    AsyncWebController,
+    AsyncWebServer,
+    MessagingBlueprint,
+    RoverWebController,
+    VideoBlueprint,
+    WebController,
+)
+from pitop.labs.web.asyncserver.websocket import BINARY, TEXT, encode_frame
+from pitop.labs.web.blueprints.messaging.protocol import encode_joystick_message
+from tests.utils import wait_until
+
+
+def get_frame():
+    sleep(0.01)
+    return np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def start_server():
+    servers = []
+
+    def start(**kwargs):
+        server = AsyncWebServer(port=0, **kwargs)
+        server.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def connect(server):
+    return socket.create_connection(("127.0.0.1", server.port), timeout=5)
+
+
+def read_response_head(connection):
+    head = b""
+    while not head.endswith(b"\r\n\r\n"):
+        head += connection.recv(1)
+    return head.decode()
+
+
+def read_response(connection):
+    head = read_response_head(connection)
+    length = int(head.lower().split("content-length: ")[1].split("\r\n")[0])
+    body = b""
+    while len(body) < length:
+        body += connection.recv(length - len(body))
+    return head, body
+
+
+def open_websocket(server, path):
+    connection = connect(server)
+    key = b64encode(os.urandom(16)).decode()
+    connection.sendall(
+        (
+            f"GET {path} HTTP/1.1\r\n"
+            "Host: localhost\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode()
+    )
+    assert read_response_head(connection).startswith("HTTP/1.1 101")
+    return connection
+
+
+def send_message(connection, opcode, payload):
+    # Clients mask the frames they send
+    mask = os.urandom(4)
+    frame = bytearray(encode_frame(opcode, payload))
+    header_length = len(frame) - len(payload)
+    frame[1] |= 0x80
+    masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    connection.sendall(bytes(frame[:header_length]) + mask + masked)
+
+
+def receive_message(connection):
+    def read(length):
+        data = b""
+        while len(data) < length:
+            data += connection.recv(length - len(data))
+        return data
+
+    first, second = read(2)
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(read(2), "big")
+    elif length == 127:
+        length = int.from_bytes(read(8), "big")
+    return first & 0x0F, read(length)
+
+
+def test_serves_flask_app_with_keep_alive(start_server):
+    server = start_server()
+    connection = connect(server)
+
+    for _ in range(2):
+        connection.sendall(b"GET /status HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        head, body = read_response(connection)
+        assert head.startswith("HTTP/1.1 200")
+        assert "Connection: keep-alive" in head
+        assert body == b"OK"
+
+    connection.close()
+
+
+def test_streams_video_and_cancels_on_disconnect(start_server):
+    video = VideoBlueprint(get_frame=get_frame)
+    server = start_server(blueprints=[video])
+
+    connection = connect(server)
+    connection.sendall(b"GET /video.mjpg HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    data = b""
+    while data.count(b"--frame") < 3:
+        data += connection.recv(4096)
+
+    assert data.startswith(b"HTTP/1.1 200")
+    assert b"multipart/x-mixed-replace; boundary=frame" in data
+    assert len(video.broadcaster.subscribers) == 1
+
+    connection.close()
+
+    wait_until(lambda: len(video.broadcaster.subscribers) == 0)
+    assert server.streams_cancelled == 1
+
+
+def test_unknown_video_quality_is_rejected(start_server):
+    server = start_server(blueprints=[VideoBlueprint(get_frame=get_frame)])
+
+    connection = connect(server)
+    connection.sendall(
+        b"GET /video.mjpg?quality=ultra HTTP/1.1\r\nHost: localhost\r\n\r\n"
+    )
+
+    assert read_response_head(connection).startswith("HTTP/1.1 400")
+    connection.close()
+
+
+def test_messaging_over_websocket(start_server):
+    joystick_handler = Mock()
+    messaging = MessagingBlueprint(
+        message_handlers={
+            "ping": lambda data, send: send({"type": "pong", "data": data}),
+            "joystick": lambda data: joystick_handler(data),
+        }
+    )
+    server = start_server(blueprints=[messaging])
+    connection = open_websocket(server, "/messaging")
+
+    send_message(connection, TEXT, json.dumps({"type": "ping", "data": 1}).encode())
+    opcode, payload = receive_message(connection)
+    assert opcode == TEXT
+    assert json.loads(payload) == {"type": "pong", "data": 1}
+
+    send_message(connection, BINARY, encode_joystick_message("joystick", 90, 50))
+    wait_until(lambda: joystick_handler.call_count == 1)
+    joystick_handler.assert_called_once_with({"angle": {"degree": 90}, "distance": 50})
+
+    messaging.broadcast({"type": "reset"})
+    opcode, payload = receive_message(connection)
+    assert json.loads(payload) == {"type": "reset"}
+
+    connection.close()
+    wait_until(lambda: len(messaging.sockets) == 0)
+
+
+def test_controllers_can_use_asyncio_server():
+    controller = WebController(port=0, server="asyncio")
+    assert isinstance(controller, AsyncWebController)
+
+    rover_controller = RoverWebController(
+        drive=Mock(), pan_tilt=Mock(), port=0, server="asyncio"
+    )
+    assert isinstance(rover_controller, AsyncRoverWebController)
+
+    assert isinstance(WebController(port=0), WebController)
+    with pytest.raises(ValueError):
+        WebController(port=0, server="twisted")
@@ -0,0 +1,167 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from flask import Flask
+
+from pitop.labs.web.blueprints import messaging
+from pitop.labs.web.blueprints.messaging import MessageCoalescer, MessagingBlueprint
+from pitop.labs.web.blueprints.messaging.protocol import (
+    JSON_PROTOCOL,
+    MSGPACK_PROTOCOL,
+    decode_message,
+    encode_joystick_message,
+    encode_message,
+    negotiate_protocol,
+)
+
+
+class FakeSocket:
+    """Receives the given messages, then closes."""
+
+    def __init__(self, messages=()):
+        self.messages = list(messages)
+        self.closed = False
+        self.send = Mock()
+
+    def receive(self):
+        if len(self.messages) == 0:
+            self.closed = True
+            return None
+        return self.messages.pop(0)
+
+
+def connect(blueprint, socket, query_string=""):
+    app = Flask(__name__)
+    app.register_blueprint(blueprint.socket_blueprint)
+    with app.test_request_context(f"/messaging?{query_string}"):
+        app.view_functions["messaging_socket.pubsub"](socket)
+
+
+def test_joystick_message_round_trip():
+    message = decode_message(encode_joystick_message("right_joystick", 90.5, 42.25))
+
+    assert message == {
+        "type": "right_joystick",
+        "data": {"angle": {"degree": 90.5}, "distance": 42.25},
+    }
+
+
+def test_decodes_json_messages():
+    message = decode_message(json.dumps({"type": "ping", "data": [1, 2]}))
+
+    assert message == {"type": "ping", "data": [1, 2]}
+
+
+def test_decoding_unknown_binary_message_fails():
+    with pytest.raises(ValueError):
+        decode_message(b"\xff")
+
+
+def test_encodes_json_messages():
+    assert json.loads(encode_message({"type": "reset"})) == {"type": "reset"}
+
+
+def test_negotiates_json_when_msgpack_is_not_installed():
+    with patch.dict("sys.modules", {"msgpack": None}):
+        assert negotiate_protocol(MSGPACK_PROTOCOL) == JSON_PROTOCOL
+    assert negotiate_protocol(None) == JSON_PROTOCOL
+
+    with pytest.raises(ValueError):
+        negotiate_protocol("xml")
+
+
+def test_handler_signatures_are_inspected_once():
+    data_handler = Mock()
+    handlers = {
+        "no_args": lambda: None,
+        "data": lambda data: data_handler(data),
+        "send": lambda data, send: send(data),
+    }
+
+    with patch.object(
+        messaging, "getfullargspec", wraps=messaging.getfullargspec
+    ) as getfullargspec:
+        blueprint = MessagingBlueprint(message_handlers=handlers)
+        send = Mock()
+        for _ in range(3):
+            blueprint.handle_message("data", 1, send)
+            blueprint.handle_message("send", 2, send)
+
+    assert getfullargspec.call_count == len(handlers)
+    assert data_handler.call_count == 3
+    assert send.call_count == 3
+
+
+def test_changed_handlers_are_used():
+    blueprint = MessagingBlueprint(message_handlers={"ping": lambda: None})
+    handler = Mock()
+    blueprint.message_handlers["ping"] = lambda data: handler(data)
+
+    blueprint.handle_message("ping", 1, Mock())
+
+    handler.assert_called_once_with(1)
+
+
+def test_broadcast_encodes_message_once():
+    blueprint = MessagingBlueprint()
+    sockets = [FakeSocket() for _ in range(5)]
+    for id, socket in enumerate(sockets):
+        blueprint.sockets[id] = socket
+
+    with patch.object(
+        messaging, "encode_message", wraps=messaging.encode_message
+    ) as encode:
+        blueprint.broadcast({"type": "reset"})
+
+    assert encode.call_count == 1
+    for socket in sockets:
+        socket.send.assert_called_once_with(json.dumps({"type": "reset"}))
+
+
+def test_coalescer_keeps_latest_message_of_each_type():
+    coalescer = MessageCoalescer()
+    send = Mock()
+    for distance in range(5):
+        coalescer.add("joystick", {"distance": distance}, send)
+    coalescer.add("button", None, send)
+
+    handle_message = Mock()
+    coalescer.flush(handle_message)
+
+    assert coalescer.messages_dropped == 4
+    assert handle_message.call_count == 2
+    handle_message.assert_any_call("joystick", {"distance": 4}, send)
+    handle_message.assert_any_call("button", None, send)
+
+    handle_message.reset_mock()
+    coalescer.flush(handle_message)
+    handle_message.assert_not_called()
+
+
+def test_connection_handles_text_and_binary_messages():
+    handler = Mock()
+    blueprint = MessagingBlueprint(
+        message_handlers={
+            "joystick": lambda data: handler("joystick", data),
+            "ping": lambda data, send: send({"type": "pong", "data": data}),
+        },
+        coalesced_message_types=["joystick"],
+        coalesce_interval=60,
+    )
+    socket = FakeSocket(
+        [
+            encode_joystick_message("joystick", 0, 10),
+            json.dumps({"type": "ping", "data": 1}),
+            encode_joystick_message("joystick", 180, 50),
+        ]
+    )
+
+    connect(blueprint, socket)
+
+    # coalesced messages are handled when the client disconnects
+    handler.assert_called_once_with(
+        "joystick", {"angle": {"degree": 180}, "distance": 50}
+    )
+    socket.send.assert_called_once_with(json.dumps({"type": "pong", "data": 1}))
+    assert blueprint.sockets == {}
@@ -0,0 +1,108 @@
+from time import monotonic
+from unittest.mock import Mock
+
+from flask import Flask
+
+from pitop.common.flask_sockets import Sockets
+from pitop.labs.web.blueprints.messaging import MessagingBlueprint
+from pitop.labs.web.blueprints.rover import drive_handler, pan_tilt_handler
+from pitop.labs.web.blueprints.telemetry import (
+    RollingStatistics,
+    Telemetry,
+    TelemetryBlueprint,
+)
+
+
+def test_rolling_statistics_percentiles():
+    statistics = RollingStatistics(window=100)
+    for value in range(1, 101):
+        statistics.record(value)
+
+    summary = statistics.summary(percentiles=(50, 90, 99))
+
+    assert summary == {
+        "count": 100,
+        "mean": 50.5,
+        "p50": 50,
+        "p90": 90,
+        "p99": 99,
+        "max": 100,
+    }
+
+
+def test_rolling_statistics_only_summarise_recent_samples():
+    statistics = RollingStatistics(window=10)
+    for value in range(100):
+        statistics.record(value)
+
+    summary = statistics.summary(percentiles=(50,))
+
+    assert summary["count"] == 100
+    assert summary["p50"] == 94
+    assert summary["max"] == 99
+
+
+def test_rolling_statistics_without_samples():
+    assert RollingStatistics().summary() == {"count": 0}
+
+
+def test_telemetry_measures_blocks():
+    telemetry = Telemetry()
+
+    with telemetry.measure("block"):
+        pass
+    telemetry.record("other", 1.0)
+
+    summary = telemetry.summary()
+    assert list(summary) == ["block", "other"]
+    assert summary["block"]["count"] == 1
+    assert 0 <= summary["block"]["max"] < 1
+    assert summary["other"]["p99"] == 1.0
+
+
+def test_messages_are_timed():
+    telemetry = Telemetry()
+    blueprint = MessagingBlueprint(
+        message_handlers={"ping": lambda data: None}, telemetry=telemetry
+    )
+
+    blueprint.handle_message("ping", None, Mock(), received_at=monotonic() - 1)
+    blueprint.handle_message("unhandled", None, Mock(), received_at=monotonic())
+
+    summary = telemetry.summary()
+    assert list(summary) == [
+        "messages.ping.handler",
+        "messages.ping.latency",
+        "messages.ping.wait",
+    ]
+    assert summary["messages.ping.wait"]["max"] >= 1
+    assert summary["messages.ping.latency"]["max"] >= 1
+
+
+def test_rover_handlers_time_writes():
+    telemetry = Telemetry()
+    data = {"angle": {"degree": 90}, "distance": 100}
+
+    drive = Mock()
+    drive_handler(drive, data, telemetry)
+    pan_tilt = Mock()
+    pan_tilt_handler(pan_tilt, data, telemetry)
+    drive_handler(drive, data)
+
+    drive.robot_move.assert_called()
+    summary = telemetry.summary()
+    assert summary["drive.write"]["count"] == 1
+    assert summary["pan_tilt.write"]["count"] == 1
+
+
+def test_metrics_are_served():
+    telemetry = Telemetry()
+    telemetry.record("drive.write", 0.5)
+
+    app = Flask(__name__)
+    app.register_blueprint(TelemetryBlueprint(telemetry), sockets=Sockets(app))
+
+    response = app.test_client().get("/metrics")
+
+    assert response.status_code == 200
+    assert response.get_json()["drive.write"]["p50"] == 0.5
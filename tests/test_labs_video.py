@@ -0,0 +1,237 @@
+from io import BytesIO
+from threading import Thread
+from time import sleep
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from pitop.labs.web.blueprints.video.broadcaster import (
+    QUALITY_LADDER,
+    FrameBroadcaster,
+    encode_jpeg,
+    scale_frame,
+)
+from tests.utils import wait_until
+
+
+class FrameSource:
+    """Returns numbered frames at a fixed rate, counting how many are got
+    and encoded."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.frames_got = 0
+        self.frames_encoded = 0
+
+    def get_frame(self):
+        sleep(self.interval)
+        self.frames_got += 1
+        return np.full((8, 8, 3), self.frames_got % 256, dtype=np.uint8)
+
+    def encode(self, frame, quality=None):
+        self.frames_encoded += 1
+        return encode_jpeg(frame, quality)
+
+
+@pytest.fixture
+def source():
+    return FrameSource()
+
+
+@pytest.fixture
+def broadcaster(source):
+    broadcaster = FrameBroadcaster(source.get_frame, encode=source.encode)
+    yield broadcaster
+    for subscriber in broadcaster.subscribers:
+        subscriber.close()
+
+
+def test_encode_jpeg():
+    for frame in (np.zeros((8, 8, 3), dtype=np.uint8), Image.new("RGB", (8, 8))):
+        encoded = encode_jpeg(frame, quality=50)
+        assert encoded[:2] == b"\xff\xd8"
+        assert Image.open(BytesIO(encoded)).size == (8, 8)
+
+
+def test_frames_are_encoded_once_for_all_subscribers(source, broadcaster):
+    subscribers = [broadcaster.subscribe() for _ in range(10)]
+    sequences = [[] for _ in subscribers]
+
+    def receive(subscriber, received):
+        for _ in range(5):
+            frame = subscriber.next_frame(timeout=5)
+            received.append(frame.sequence)
+            subscriber.frame_sent(frame)
+
+    threads = [
+        Thread(target=receive, args=(subscriber, received))
+        for subscriber, received in zip(subscribers, sequences)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    for received in sequences:
+        assert received == sorted(set(received))
+    assert source.frames_encoded == source.frames_got
+    assert source.frames_encoded < 10 * 5
+
+    statistics = broadcaster.client_statistics()
+    assert len(statistics) == 10
+    assert all(client["frames_sent"] == 5 for client in statistics)
+    assert all(client["fps"] > 0 for client in statistics)
+    assert all(client["latency"] >= 0 for client in statistics)
+
+
+def test_slow_subscribers_only_get_newest_frame(broadcaster):
+    subscriber = broadcaster.subscribe()
+    first_frame = subscriber.next_frame(timeout=5)
+
+    wait_until(lambda: broadcaster.frames_encoded >= first_frame.sequence + 3)
+
+    frame = subscriber.next_frame(timeout=5)
+    assert frame.sequence > first_frame.sequence + 1
+    assert subscriber.frames_dropped == frame.sequence - first_frame.sequence - 1
+
+
+def test_frames_are_only_got_while_there_are_subscribers(source, broadcaster):
+    subscriber = broadcaster.subscribe()
+    assert subscriber.next_frame(timeout=5) is not None
+    subscriber.close()
+
+    def frames_stopped():
+        frames_got = source.frames_got
+        sleep(0.05)
+        return source.frames_got == frames_got
+
+    # The frame being got when the subscriber closed is still finished
+    wait_until(frames_stopped)
+    frames_got = source.frames_got
+    sleep(0.05)
+    assert source.frames_got == frames_got
+
+    subscriber = broadcaster.subscribe()
+    assert subscriber.next_frame(timeout=5).sequence == frames_got
+
+
+def test_subscribers_are_notified_of_new_frames(broadcaster):
+    notified = []
+    subscriber = broadcaster.subscribe(on_frame=lambda: notified.append(True))
+
+    assert subscriber.next_frame(timeout=5) is not None
+    assert notified
+
+
+def test_video_is_streamed_to_clients(source):
+    from flask import Flask
+
+    from pitop.labs import VideoBlueprint
+
+    app = Flask(__name__)
+    video_blueprint = VideoBlueprint(get_frame=source.get_frame)
+    app.register_blueprint(video_blueprint)
+
+    with app.test_client() as client:
+        response = client.get("/video.mjpg")
+        assert response.mimetype == "multipart/x-mixed-replace"
+        chunks = response.response
+        for _ in range(3):
+            chunk = next(chunks)
+            assert chunk.startswith(b"--frame\r\nContent-Type: image/jpeg\r\n\r\n")
+
+        assert client.get("/video/clients").json[0]["frames_sent"] == 2
+        response.close()
+
+    assert video_blueprint.broadcaster.subscribers == []
+
+
+def test_scale_frame():
+    assert scale_frame(np.zeros((8, 12, 3), dtype=np.uint8), 0.5).shape == (4, 6, 3)
+    assert scale_frame(Image.new("RGB", (12, 8)), 0.25).size == (3, 2)
+
+
+def frame_size(encoded_frame):
+    return Image.open(BytesIO(encoded_frame.data)).size
+
+
+def test_subscribers_on_same_rung_share_encoding(source, broadcaster):
+    high = broadcaster.subscribe(rung=0)
+    low = broadcaster.subscribe(rung=broadcaster.get_rung("low"))
+    also_low = broadcaster.subscribe(rung=broadcaster.get_rung("low"))
+
+    low_frame = low.next_frame(timeout=5)
+    assert also_low.next_frame(timeout=5) is low_frame
+    high_frame = high.next_frame(timeout=5)
+
+    assert frame_size(high_frame) == (8, 8)
+    assert frame_size(low_frame) == (4, 4)
+    # at most one encoding per rung in use for each frame
+    assert source.frames_encoded <= 2 * source.frames_got
+
+
+def test_unknown_rung_fails(broadcaster):
+    with pytest.raises(ValueError):
+        broadcaster.get_rung("ultra")
+    with pytest.raises(ValueError):
+        broadcaster.subscribe(rung=len(QUALITY_LADDER))
+
+
+def test_adaptive_subscriber_moves_down_ladder_when_sending_is_slow(broadcaster):
+    subscriber = broadcaster.subscribe(adaptive=True)
+    frame = subscriber.next_frame(timeout=5)
+
+    # sending takes the whole time between frames at 30 fps
+    for _ in range(subscriber.ADAPT_WINDOW):
+        subscriber.frame_sent(frame, send_duration=1 / 30)
+    assert subscriber.quality.name == "medium"
+
+    # and isn't fast enough at 20 fps either
+    for _ in range(subscriber.ADAPT_WINDOW - 1):
+        subscriber.frame_sent(frame, send_duration=1 / 20)
+    assert subscriber.quality.name == "medium"
+    subscriber.frame_sent(frame, send_duration=1 / 20)
+    assert subscriber.quality.name == "low"
+
+    # once the connection is fast, it moves back up
+    for _ in range(subscriber.ADAPT_WINDOW):
+        subscriber.frame_sent(frame, send_duration=0.001)
+    assert subscriber.quality.name == "medium"
+    assert subscriber.statistics()["quality"] == "medium"
+
+
+def test_subscribers_with_fixed_quality_dont_adapt(broadcaster):
+    subscriber = broadcaster.subscribe(rung=broadcaster.get_rung("low"))
+    frame = subscriber.next_frame(timeout=5)
+
+    for _ in range(subscriber.ADAPT_WINDOW):
+        subscriber.frame_sent(frame, send_duration=1)
+    assert subscriber.quality.name == "low"
+
+
+def test_subscribers_keep_to_frame_rate_of_rung(broadcaster):
+    subscriber = broadcaster.subscribe(rung=broadcaster.get_rung("lowest"))
+    assert subscriber.time_until_next_frame() == 0
+
+    subscriber.frame_sent(subscriber.next_frame(timeout=5))
+    assert 0.09 < subscriber.time_until_next_frame() <= 0.1
+
+
+def test_video_quality_is_chosen_with_query_parameter(source):
+    from flask import Flask
+
+    from pitop.labs import VideoBlueprint
+
+    app = Flask(__name__)
+    app.register_blueprint(VideoBlueprint(get_frame=source.get_frame))
+
+    with app.test_client() as client:
+        response = client.get("/video.mjpg?quality=lowest")
+        chunk = next(response.response)
+        image = Image.open(BytesIO(chunk.split(b"\r\n\r\n", 1)[1]))
+        assert image.size == (2, 2)
+        assert client.get("/video/clients").json[0]["quality"] == "lowest"
+        response.close()
+
+        assert client.get("/video.mjpg?quality=ultra").status_code == 400
@@ -6,7 +6,7 @@ from unittest.mock import mock_open, patch
 
 import pytest
 
-from pitop.common.lock import PTLock  # noqa: E402
+from pitop.common.lock import LockStats, PTLock, read_lock_stats  # noqa: E402
 
 
 class PTLockTestCase(TestCase):
@@ -19,8 +19,8 @@ class PTLockTestCase(TestCase):
         self.addCleanup(self.chmod_mock.stop)
 
     def tearDown(self) -> None:
-        file = Path(self.lock_file_path)
-        if file.exists():
+        LockStats.for_path(self.lock_file_path).reset()
+        for file in Path("/tmp").glob(".com.pi-top.sdk.dummy.lock*"):
             file.unlink()
 
     @patch("builtins.open", new_callable=mock_open())
@@ -84,3 +84,93 @@ class PTLockTestCase(TestCase):
         thread.join()
         self.assertFalse(thread.is_alive())
         self.assertTrue(lock2.is_locked())
+
+    def test_acquire_is_reentrant(self):
+        lock = PTLock(self._dummy_lock_id)
+        lock.acquire()
+        self.assertTrue(lock.acquire())
+
+        lock.release()
+        # still held until released as many times as it was acquired
+        lock2 = PTLock(self._dummy_lock_id)
+        self.assertFalse(lock2.acquire(blocking=False))
+
+        lock.release()
+        self.assertTrue(lock2.acquire(blocking=False))
+        lock2.release()
+
+    def test_acquire_with_timeout(self):
+        lock = PTLock(self._dummy_lock_id)
+        lock.acquire()
+
+        lock2 = PTLock(self._dummy_lock_id)
+        self.assertFalse(lock2.acquire(timeout=0.05))
+        self.assertEqual(lock2.stats.timeouts, 1)
+
+        lock.release()
+        self.assertTrue(lock2.acquire(timeout=0.05))
+        lock2.release()
+
+    def test_stats_record_acquisitions_and_contention(self):
+        lock = PTLock(self._dummy_lock_id)
+        with lock:
+            pass
+        self.assertEqual(lock.stats.acquisitions, 1)
+        self.assertEqual(lock.stats.contended, 0)
+
+        lock.acquire()
+        lock2 = PTLock(self._dummy_lock_id)
+        thread = Thread(target=lock2.acquire, daemon=True)
+        thread.start()
+        sleep(0.1)
+        lock.release()
+        thread.join()
+        lock2.release()
+
+        # statistics are shared by the locks using the same file
+        stats = lock2.stats
+        self.assertIs(stats, lock.stats)
+        self.assertEqual(stats.acquisitions, 3)
+        self.assertEqual(stats.contended, 1)
+        self.assertGreaterEqual(stats.max_wait_time, 0.1)
+        self.assertEqual(sum(stats.wait_time_histogram), 3)
+
+    def test_published_stats_can_be_read(self):
+        lock = PTLock(self._dummy_lock_id)
+        with lock:
+            pass
+        lock.stats.publish(force=True)
+
+        stats = [s for s in read_lock_stats() if s["path"] == self.lock_file_path]
+        self.assertEqual(len(stats), 1)
+        self.assertEqual(stats[0]["acquisitions"], 1)
+        self.assertIsNone(stats[0]["holder_pid"])
+
+    def test_published_stats_are_removed_at_exit(self):
+        stats = LockStats(self.lock_file_path)
+        with patch("pitop.common.lock.atexit") as atexit_mock:
+            stats.publish(force=True)
+            stats.publish(force=True)
+
+        atexit_mock.register.assert_called_once_with(stats.remove_published)
+        self.assertTrue(Path(stats.stats_path).exists())
+
+        stats.remove_published()
+        self.assertFalse(Path(stats.stats_path).exists())
+
+    def test_stats_publishing_is_throttled(self):
+        lock = PTLock(self._dummy_lock_id)
+        with patch("pitop.common.lock.json") as json_mock:
+            for _ in range(10):
+                with lock:
+                    pass
+        json_mock.dump.assert_not_called()
+
+    def test_stats_of_exited_processes_are_skipped(self):
+        stats_path = Path(f"{self.lock_file_path}.stats.999999999")
+        stats_path.write_text(f'{{"path": "{self.lock_file_path}", "pid": 999999999}}')
+
+        stats = [s for s in read_lock_stats() if s["path"] == self.lock_file_path]
+
+        self.assertEqual(stats, [])
+        self.assertFalse(stats_path.exists())
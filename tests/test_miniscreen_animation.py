@@ -0,0 +1,139 @@
+from io import BytesIO
+from time import monotonic, sleep
+from unittest.mock import patch
+
+import numpy as np
+import PIL.Image
+import pytest
+
+from pitop.miniscreen.oled.animation import Animation, AnimationCache
+from pitop.miniscreen.oled.assistant import MiniscreenAssistant
+from pitop.miniscreen.oled.core.contrib.luma.oled.device import sh1106
+
+SIZE = (128, 64)
+
+
+def frame(x):
+    image = PIL.Image.new("1", SIZE)
+    image.paste(1, box=(x, 0, x + 8, 8))
+    return image
+
+
+def gif_bytes(positions, duration):
+    frames = [frame(x).convert("P") for x in positions]
+    data = BytesIO()
+    frames[0].save(
+        data,
+        format="GIF",
+        save_all=True,
+        append_images=frames[1:],
+        duration=duration,
+        loop=0,
+    )
+    return data.getvalue()
+
+
+@pytest.fixture
+def assistant():
+    return MiniscreenAssistant("1", SIZE)
+
+
+def test_from_image_decodes_and_deduplicates_frames(assistant):
+    image = PIL.Image.open(BytesIO(gif_bytes([0, 10, 0, 10, 20], duration=50)))
+    animation = Animation.from_image(image, assistant)
+
+    assert len(animation) == 5
+    assert animation.pages.shape == (3, 8, 128)
+    assert animation.frame_indices.tolist() == [0, 1, 0, 1, 2]
+    assert animation.duration == pytest.approx(0.25)
+    assert animation.size == SIZE
+    for index, x in enumerate([0, 10, 0, 10, 20]):
+        assert animation.frame_image(index).tobytes() == frame(x).tobytes()
+
+
+def test_frames_without_duration(assistant):
+    animation = Animation.from_image(frame(0), assistant)
+    assert animation.durations.tolist() == [Animation.DEFAULT_FRAME_DURATION]
+
+
+def test_frame_at():
+    pages = np.zeros((3, 8, 128), dtype=np.uint8)
+    animation = Animation(pages, [0, 1, 2], [0.1, 0.2, 0.1])
+
+    assert animation.frame_at(0.0) == (0, pytest.approx(0.1))
+    assert animation.frame_at(0.15) == (1, pytest.approx(0.15))
+    assert animation.frame_at(0.35) == (2, pytest.approx(0.05))
+    assert animation.frame_at(0.4) == (None, 0.0)
+    # looping animations start again
+    assert animation.frame_at(0.45, loop=True) == (0, pytest.approx(0.05))
+    assert animation.frame_at(4.15, loop=True) == (1, pytest.approx(0.15))
+
+
+def test_invalid_animation():
+    with pytest.raises(ValueError):
+        Animation(np.zeros((0, 8, 128)), [], [])
+    with pytest.raises(ValueError):
+        Animation(np.zeros((1, 8, 128)), [0, 0], [0.1])
+
+
+def test_from_file_is_cached(assistant, tmp_path):
+    path = tmp_path / "animation.gif"
+    path.write_bytes(gif_bytes([0, 10, 20], duration=40))
+    cache = AnimationCache(tmp_path / "cache")
+
+    animation = Animation.from_file(str(path), assistant, cache=cache)
+    assert len(list(cache.folder.glob("*.npz"))) == 1
+
+    with patch.object(Animation, "from_image") as from_image_mock:
+        cached = Animation.from_file(str(path), assistant, cache=cache)
+    from_image_mock.assert_not_called()
+    assert np.array_equal(cached.pages, animation.pages)
+    assert cached.frame_indices.tolist() == animation.frame_indices.tolist()
+    assert cached.durations.tolist() == animation.durations.tolist()
+
+    # a different display size is cached separately
+    other_assistant = MiniscreenAssistant("1", (128, 32))
+    assert Animation.from_file(str(path), other_assistant, cache=cache).size == (
+        128,
+        32,
+    )
+    assert len(list(cache.folder.glob("*.npz"))) == 2
+
+
+def test_corrupted_cache_is_ignored(assistant, tmp_path):
+    path = tmp_path / "animation.gif"
+    data = gif_bytes([0, 10], duration=40)
+    path.write_bytes(data)
+    cache = AnimationCache(tmp_path / "cache")
+    cache.folder.mkdir()
+    cache.path(cache.key(data, SIZE)).write_bytes(b"not an animation")
+
+    assert len(Animation.from_file(str(path), assistant, cache=cache)) == 2
+
+
+def test_play_animated_image(oled):
+    image = PIL.Image.open(BytesIO(gif_bytes([0, 10, 0], duration=100)))
+    oled.device.reset_mock()
+
+    start = monotonic()
+    oled.play_animated_image(image)
+    elapsed = monotonic() - start
+
+    assert 0.29 <= elapsed < 2
+    sent = [c.args[0] for c in oled.device.display_pages.call_args_list]
+    # frames are skipped if they can't be shown on time
+    assert 1 <= len(sent) <= 3
+    assert np.array_equal(sent[0], sh1106.encode_pages(frame(0)))
+
+
+def test_stop_looping_animation(oled):
+    image = PIL.Image.open(BytesIO(gif_bytes([0, 10], duration=20)))
+    oled.play_animated_image(image, background=True, loop=True)
+
+    start = monotonic()
+    while oled.device.display_pages.call_count < 4:
+        assert monotonic() - start < 2
+    oled.stop_animated_image()
+    calls = oled.device.display_pages.call_count
+    sleep(0.1)
+    assert oled.device.display_pages.call_count == calls
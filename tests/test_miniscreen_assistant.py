@@ -1,4 +1,5 @@
 import PIL.Image
+import PIL.ImageDraw
 
 from tests.utils import to_bytes
 
@@ -247,3 +248,82 @@ def test_bottom_left():
 
     assistant = MiniscreenAssistant(MODE, SIZE)
     assert assistant.bottom_left() == (0, SIZE[1] - 1)
+
+
+def test_fonts_are_loaded_once(fonts_mock):
+    from pitop.miniscreen.oled.assistant import MiniscreenAssistant
+
+    assistant = MiniscreenAssistant(MODE, SIZE)
+    assert assistant.get_regular_font(20) is assistant.get_regular_font(20)
+    assert assistant.get_regular_font(20) is not assistant.get_regular_font(21)
+
+
+def test_render_text_reuses_rendered_text(fonts_mock):
+    from pitop.miniscreen.oled.assistant import MiniscreenAssistant
+
+    assistant = MiniscreenAssistant(MODE, SIZE)
+    cache = assistant._text_bitmap_cache
+
+    first = PIL.Image.new(MODE, SIZE, "black")
+    assistant.render_text(image=first, text=LOREM_IPSUM)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    second = PIL.Image.new(MODE, SIZE, "black")
+    assistant.render_text(image=second, text=LOREM_IPSUM)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert first.tobytes() == second.tobytes()
+
+    # same bitmap drawn in a different colour
+    inverted = PIL.Image.new(MODE, SIZE, "white")
+    assistant.render_text(image=inverted, text=LOREM_IPSUM, fill=0)
+    assert cache.hits == 2
+    assert assistant.invert(inverted).tobytes() == first.tobytes()
+
+
+def test_render_text_matches_drawing(fonts_mock):
+    from pitop.miniscreen.oled.assistant import MiniscreenAssistant
+
+    assistant = MiniscreenAssistant(MODE, SIZE)
+    for kwargs in ({}, {"wrap": False}, {"xy": (0, 0), "anchor": "la"}):
+        cached = PIL.Image.new(MODE, SIZE, "black")
+        assistant.render_text(image=cached, text=LOREM_IPSUM, **kwargs)
+
+        # an ImageDraw is drawn on directly, without caching
+        drawn = PIL.Image.new(MODE, SIZE, "black")
+        assistant.render_text(
+            image=PIL.ImageDraw.Draw(drawn), text=LOREM_IPSUM, **kwargs
+        )
+        assert cached.tobytes() == drawn.tobytes()
+
+
+def test_text_width_cache(fonts_mock):
+    from pitop.miniscreen.oled.assistant import MiniscreenAssistant
+
+    assistant = MiniscreenAssistant(MODE, SIZE)
+    font = assistant.get_regular_font_path()
+    wrapped = assistant._multiline_split("one two one two", font, 14, 0)
+
+    assert wrapped == assistant._multiline_split("one two one two", font, 14, 0)
+    # " ", "one" and "two" are measured once
+    assert assistant._text_width_cache.misses == 3
+    assert len(assistant._text_width_cache) == 3
+
+
+def test_lru_cache_evicts_by_cost():
+    from pitop.miniscreen.oled.core.text_cache import LRUCache
+
+    cache = LRUCache(max_cost=10, cost=len)
+    cache.put("a", "1234")
+    cache.put("b", "1234")
+    assert cache.get("a") == "1234"
+
+    # "b" is the least recently used
+    cache.put("c", "1234")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.total_cost == 8
+
+    # values larger than the cache are not stored
+    cache.put("d", "x" * 11)
+    assert "d" not in cache
+    assert cache.get("d", "missing") == "missing"
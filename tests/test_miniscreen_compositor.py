@@ -0,0 +1,149 @@
+from unittest.mock import MagicMock
+
+import PIL.Image
+import pytest
+
+from pitop.miniscreen.oled.compositor import Compositor, Layer, Sprite, merge_boxes
+
+SIZE = (128, 64)
+
+
+def square(size=8):
+    return PIL.Image.new("1", (size, size), 1)
+
+
+def expected_image(*boxes):
+    image = PIL.Image.new("1", SIZE)
+    for box in boxes:
+        image.paste(1, box=box)
+    return image
+
+
+@pytest.fixture
+def compositor():
+    compositor = Compositor(size=SIZE)
+    compositor.render()
+    return compositor
+
+
+def test_first_render_draws_whole_screen():
+    compositor = Compositor(size=SIZE)
+    compositor.add_sprite(square(), xy=(4, 4))
+
+    assert compositor.render() == [(0, 0, 128, 64)]
+    assert compositor.framebuffer.tobytes() == expected_image((4, 4, 12, 12)).tobytes()
+    assert compositor.render() == []
+
+
+def test_moving_sprite_damages_old_and_new_position(compositor):
+    sprite = compositor.add_sprite(square(), xy=(0, 0))
+    compositor.render()
+
+    sprite.xy = (50, 30)
+    assert compositor.damaged_regions == [(0, 0, 8, 8), (50, 30, 58, 38)]
+    compositor.render()
+    assert (
+        compositor.framebuffer.tobytes() == expected_image((50, 30, 58, 38)).tobytes()
+    )
+
+
+def test_overlapping_damage_is_merged():
+    assert merge_boxes([(0, 0, 10, 10), (0, 5, 10, 15)]) == [(0, 0, 10, 15)]
+    assert merge_boxes([(0, 0, 10, 10), (50, 50, 60, 60)]) == [
+        (0, 0, 10, 10),
+        (50, 50, 60, 60),
+    ]
+
+
+def test_layers_are_drawn_in_z_order(compositor):
+    top = compositor.add_layer(z=1)
+    # opaque black sprite on top hides the square below it
+    compositor.add_sprite(
+        PIL.Image.new("1", (4, 4), 0), xy=(2, 2), layer=top, transparent=False
+    )
+    compositor.add_sprite(square(), xy=(0, 0))
+    compositor.render()
+
+    image = expected_image((0, 0, 8, 8))
+    image.paste(0, box=(2, 2, 6, 6))
+    assert compositor.framebuffer.tobytes() == image.tobytes()
+
+    top.visible = False
+    assert compositor.damaged_regions == [(2, 2, 6, 6)]
+    compositor.render()
+    assert compositor.framebuffer.tobytes() == expected_image((0, 0, 8, 8)).tobytes()
+
+
+def test_transparent_sprites_show_what_is_behind(compositor):
+    compositor.add_sprite(square(), xy=(0, 0))
+    compositor.add_sprite(PIL.Image.new("1", (4, 4), 0), xy=(2, 2))
+    compositor.render()
+
+    assert compositor.framebuffer.tobytes() == expected_image((0, 0, 8, 8)).tobytes()
+
+
+def test_drawing_on_sprite_marks_it_dirty(compositor):
+    sprite = compositor.add_sprite(PIL.Image.new("1", (10, 10)), xy=(20, 20))
+    compositor.render()
+
+    sprite.draw().rectangle((0, 0, 4, 4), fill=1)
+    assert compositor.damaged_regions == [(20, 20, 30, 30)]
+
+    sprite.image.putpixel((9, 9), 1)
+    sprite.mark_dirty((9, 9, 10, 10))
+    assert compositor.damaged_regions == [(20, 20, 30, 30)]
+    compositor.render()
+    assert compositor.framebuffer.getpixel((29, 29))
+
+
+def test_hidden_and_removed_sprites(compositor):
+    layer = Layer()
+    sprite = layer.add(Sprite(square(), xy=(0, 0)))
+    compositor.add_layer(layer)
+    compositor.render()
+
+    sprite.visible = False
+    compositor.render()
+    assert compositor.framebuffer.getbbox() is None
+
+    # changes to hidden sprites don't damage the screen
+    sprite.xy = (10, 10)
+    assert compositor.damaged_regions == []
+
+    sprite.visible = True
+    layer.remove(sprite)
+    compositor.render()
+    assert compositor.framebuffer.getbbox() is None
+
+
+def test_damage_is_clipped_to_screen(compositor):
+    compositor.add_sprite(square(), xy=(124, -4))
+    assert compositor.damaged_regions == [(124, 0, 128, 4)]
+    compositor.render()
+    assert compositor.framebuffer.getbbox() == (124, 0, 128, 4)
+
+
+def test_present_sends_damaged_regions():
+    miniscreen = MagicMock(size=SIZE)
+    compositor = Compositor(miniscreen)
+    sprite = compositor.add_sprite(square(), xy=(0, 0))
+    compositor.present()
+    miniscreen.display_regions.assert_called_once_with(
+        compositor.framebuffer, [(0, 0, 128, 64)]
+    )
+
+    miniscreen.reset_mock()
+    sprite.xy = (1, 0)
+    compositor.present()
+    miniscreen.display_regions.assert_called_once_with(
+        compositor.framebuffer, [(0, 0, 9, 8)]
+    )
+
+    # nothing to send
+    miniscreen.reset_mock()
+    compositor.present()
+    miniscreen.display_regions.assert_not_called()
+
+    compositor.invalidate()
+    miniscreen.device.invalidate.assert_called_once()
+    assert compositor.damaged_regions == [(0, 0, 128, 64)]
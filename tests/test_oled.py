@@ -1,4 +1,5 @@
 from os import path
+from threading import Event, Thread
 from unittest.mock import MagicMock, call
 
 import PIL.Image
@@ -279,3 +280,42 @@ def test_subscribes_to_pitopd_ready_event(oled):
 
     callback = oled._ptdm_subscribe_client._callback_funcs.get(Message.PUB_PITOPD_READY)
     assert callback is not None
+
+
+def test_display_regions(oled):
+    image = PIL.Image.new("1", (128, 64))
+    image.paste(1, box=(10, 10, 20, 20))
+    oled.display_regions(image, [(10, 10, 20, 20)])
+
+    oled.device.display_region.assert_called_once_with(image, (10, 10, 20, 20))
+    assert oled.image.tobytes() == image.tobytes()
+    assert not oled.should_redisplay(image)
+
+
+def test_commands_wait_for_frame_being_presented(oled):
+    oled.start_background_presenter()
+    displaying = Event()
+    release = Event()
+    sent = []
+
+    def display(image):
+        displaying.set()
+        release.wait(1)
+        sent.append("frame")
+
+    oled.device.display.side_effect = display
+    oled.device.contrast.side_effect = lambda value: sent.append("contrast")
+
+    oled.display_image(PIL.Image.new("1", (128, 64), "white"))
+    assert displaying.wait(1)
+
+    thread = Thread(target=oled.sleep, daemon=True)
+    thread.start()
+    thread.join(0.05)
+    assert sent == []
+
+    release.set()
+    thread.join(1)
+    oled.stop_background_presenter()
+
+    assert sent == ["frame", "contrast"]
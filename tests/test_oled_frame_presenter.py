@@ -0,0 +1,124 @@
+from threading import Event
+from time import sleep
+from unittest.mock import MagicMock
+
+import PIL.Image
+import pytest
+
+from pitop.miniscreen.oled.core import FPS_Regulator, FramePresenter
+
+
+@pytest.fixture
+def presenter():
+    presented = []
+    started = Event()
+    release = Event()
+    release.set()
+
+    def present(image, force):
+        started.set()
+        release.wait()
+        presented.append((image, force))
+
+    presenter = FramePresenter(present)
+    presenter.presented = presented
+    presenter.started = started
+    presenter.release = release
+    yield presenter
+    release.set()
+    presenter.stop()
+
+
+def test_frames_are_presented(presenter):
+    presenter.submit("frame 1")
+    assert presenter.wait(timeout=1)
+    presenter.submit("frame 2", force=True)
+    assert presenter.wait(timeout=1)
+
+    assert presenter.presented == [("frame 1", False), ("frame 2", True)]
+    assert presenter.frames_submitted == 2
+    assert presenter.frames_presented == 2
+    assert presenter.frames_dropped == 0
+    assert 0 < presenter.last_latency <= presenter.max_latency
+    assert presenter.average_latency > 0
+
+
+def test_latest_frame_wins(presenter):
+    presenter.release.clear()
+    presenter.submit("frame 1")
+    assert presenter.started.wait(timeout=1)
+
+    presenter.submit("frame 2", force=True)
+    presenter.submit("frame 3")
+    presenter.release.set()
+    assert presenter.wait(timeout=1)
+
+    assert presenter.presented == [("frame 1", False), ("frame 3", True)]
+    assert presenter.frames_dropped == 1
+    assert presenter.frames_presented == 2
+
+
+def test_submit_does_not_block(presenter):
+    presenter.release.clear()
+    for i in range(10):
+        presenter.submit(i)
+    assert not presenter.wait(timeout=0.05)
+    presenter.release.set()
+    assert presenter.wait(timeout=1)
+    assert presenter.presented[-1] == (9, False)
+    assert presenter.frames_presented + presenter.frames_dropped == 10
+
+
+def test_stop_presents_pending_frame():
+    present = MagicMock()
+    presenter = FramePresenter(present)
+    presenter.submit("frame")
+    presenter.stop()
+
+    present.assert_called_once_with("frame", False)
+    assert not presenter.is_running
+    with pytest.raises(RuntimeError):
+        presenter.submit("frame")
+
+
+def test_errors_are_not_counted_as_presented():
+    presenter = FramePresenter(MagicMock(side_effect=OSError("SPI error")))
+    presenter.submit("frame")
+    assert presenter.wait(timeout=1)
+    presenter.stop()
+    assert presenter.frames_presented == 0
+
+
+def test_frame_rate_is_limited():
+    present = MagicMock()
+    presenter = FramePresenter(present, fps_regulator=FPS_Regulator(max_fps=10))
+    for i in range(5):
+        presenter.submit(i)
+        sleep(0.005)
+    presenter.wait(timeout=1)
+    presenter.stop()
+
+    # frames submitted while waiting for the next frame slot are dropped
+    assert present.call_count < 5
+    assert present.call_args.args[0] == 4
+
+
+def test_oled_background_presenter(oled):
+    oled.start_background_presenter()
+    oled.device.reset_mock()
+
+    image = PIL.Image.new("1", (128, 64), "white")
+    oled.display_image(image)
+    assert oled.presenter.wait(timeout=1)
+    oled.device.display.assert_called_once()
+    assert oled.device.display.call_args.args[0].tobytes() == image.tobytes()
+
+    # unchanged frames aren't submitted
+    oled.display_image(image)
+    assert oled.presenter.frames_submitted == 1
+
+    oled.stop_background_presenter()
+    assert oled.presenter is None
+    oled.device.reset_mock()
+    oled.display_image(PIL.Image.new("1", (128, 64), "black"))
+    oled.device.display.assert_called_once()
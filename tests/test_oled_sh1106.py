@@ -0,0 +1,164 @@
+from unittest.mock import MagicMock, call
+
+import PIL.Image
+import PIL.ImageDraw
+import pytest
+
+from pitop.miniscreen.oled.core.contrib.luma.oled.device import sh1106
+
+
+def encode_pages_per_pixel(image, width=128, pages=8):
+    """Page encoding as done by the original per-pixel implementation."""
+    image_data = image.getdata()
+    encoded = []
+    for page in range(pages):
+        offsets = [page * width * 8 + width * i for i in range(8)]
+        encoded.append(
+            [
+                sum((1 << bit) for bit in range(8) if image_data[x + offsets[bit]])
+                for x in range(width)
+            ]
+        )
+    return encoded
+
+
+@pytest.fixture
+def device():
+    device = sh1106(serial_interface=MagicMock())
+    device._serial_interface.reset_mock()
+    return device
+
+
+def get_test_image():
+    image = PIL.Image.new("1", (128, 64))
+    draw = PIL.ImageDraw.Draw(image)
+    draw.ellipse((10, 5, 100, 60), outline=1)
+    draw.text((20, 20), "pi-top", fill=1)
+    return image
+
+
+def test_encode_pages_matches_per_pixel_encoding(device):
+    image = get_test_image()
+    assert device.encode_pages(image).tolist() == encode_pages_per_pixel(image)
+
+
+def test_first_frame_is_sent_in_full(device):
+    device.invalidate()
+    device.display(get_test_image())
+
+    serial = device._serial_interface
+    assert serial.command.call_args_list == [
+        call(0xB0 + page, 0x02, 0x10) for page in range(8)
+    ]
+    assert [len(c.args[0]) for c in serial.data.call_args_list] == [128] * 8
+    assert device.frame_stats.pages_sent == 8
+    assert device.frame_stats.bytes_sent == 1024
+
+
+def test_unchanged_frame_sends_nothing(device):
+    image = get_test_image()
+    device.display(image)
+    device._serial_interface.reset_mock()
+
+    device.display(image.copy())
+
+    device._serial_interface.command.assert_not_called()
+    device._serial_interface.data.assert_not_called()
+    assert device.frame_stats.pages_sent == 0
+    assert device.frame_stats.bytes_sent == 0
+
+
+def test_only_changed_columns_are_sent(device):
+    image = get_test_image()
+    device.display(image)
+    device._serial_interface.reset_mock()
+
+    # pixels in page 2, columns 40 to 50
+    for x in range(40, 51):
+        image.putpixel((x, 17), 0 if image.getpixel((x, 17)) else 1)
+    device.display(image)
+
+    column = 40 + sh1106.COLUMN_OFFSET
+    device._serial_interface.command.assert_called_once_with(
+        0xB2, column & 0x0F, 0x10 | (column >> 4)
+    )
+    data = device._serial_interface.data.call_args.args[0]
+    assert data == device.encode_pages(image)[2][40:51].tolist()
+    assert device.frame_stats.pages_sent == 1
+    assert device.frame_stats.bytes_sent == 11
+    assert device.frame_stats.frames == 3
+
+
+def test_invalidate_sends_next_frame_in_full(device):
+    image = get_test_image()
+    device.display(image)
+    device.invalidate()
+    device._serial_interface.reset_mock()
+
+    device.display(image)
+    assert device._serial_interface.data.call_count == 8
+
+
+def test_display_region_sends_region_columns(device):
+    image = get_test_image()
+    device.display(image)
+    device._serial_interface.reset_mock()
+
+    image.paste(1, box=(30, 20, 40, 30))
+    image.paste(1, box=(100, 0, 110, 10))
+    device.display_region(image, (30, 20, 40, 30))
+
+    # pages 2 and 3, and only inside the region
+    serial = device._serial_interface
+    column = 30 + sh1106.COLUMN_OFFSET
+    assert serial.command.call_args_list == [
+        call(0xB0 + page, column & 0x0F, 0x10 | (column >> 4)) for page in (2, 3)
+    ]
+    pages = device.encode_pages(image)
+    assert [c.args[0] for c in serial.data.call_args_list] == [
+        pages[2][30:40].tolist(),
+        pages[3][30:40].tolist(),
+    ]
+
+    # the change outside the region is sent with the next frame
+    serial.reset_mock()
+    device.display(image)
+    assert serial.command.call_count == 2
+    assert serial.command.call_args_list[0].args[0] == 0xB0
+
+
+def test_display_region_without_previous_frame_sends_everything(device):
+    device.invalidate()
+    device.display_region(get_test_image(), (0, 0, 8, 8))
+    assert device._serial_interface.data.call_count == 8
+
+
+def test_display_pages(device):
+    image = get_test_image()
+    pages = sh1106.encode_pages(image)
+    assert sh1106.decode_pages(pages).tobytes() == image.tobytes()
+
+    device.display_pages(pages)
+    device._serial_interface.reset_mock()
+    device.display(image)
+    device._serial_interface.data.assert_not_called()
+
+
+@pytest.mark.parametrize("rotate", [1, 2, 3])
+def test_display_pages_on_rotated_device(rotate):
+    device = sh1106(serial_interface=MagicMock(), rotate=rotate)
+    image = get_test_image()
+    if rotate % 2 == 1:
+        image = image.transpose(PIL.Image.ROTATE_90)
+    assert image.size == device.size
+
+    device.invalidate()
+    device._serial_interface.reset_mock()
+    device.display(image)
+    sent = device._serial_interface.data.call_args_list
+
+    device.invalidate()
+    device._serial_interface.reset_mock()
+    device.display_pages(sh1106.encode_pages(image))
+
+    assert device._serial_interface.data.call_args_list == sent
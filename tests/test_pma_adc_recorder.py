@@ -0,0 +1,134 @@
+from itertools import count
+from time import monotonic, sleep
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from pitop.pma.adc_recorder import SAMPLE_DTYPE, SampleRingBuffer, signal_statistics
+from pitop.pma.polling_scheduler import PollingScheduler
+
+
+def test_ring_buffer_keeps_latest_samples():
+    buffer = SampleRingBuffer(capacity=4)
+    for i in range(6):
+        buffer.append(float(i), i * 10)
+
+    assert len(buffer) == 4
+    assert buffer.total_samples == 6
+    samples = buffer.latest()
+    assert samples["timestamp"].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert samples["value"].tolist() == [20, 30, 40, 50]
+    assert buffer.latest(2)["value"].tolist() == [40, 50]
+
+
+def test_ring_buffer_contiguous_samples_arent_copied():
+    buffer = SampleRingBuffer(capacity=4)
+    for i in range(7):
+        buffer.append(float(i), i)
+
+    # the latest 3 samples are at the start of the ring
+    assert np.shares_memory(buffer.latest(3), buffer.latest(1))
+
+    # all the samples wrap around the end of the ring
+    samples = buffer.latest()
+    assert samples["value"].tolist() == [3, 4, 5, 6]
+    assert not np.shares_memory(samples, buffer.latest(1))
+
+
+def test_ring_buffer_window():
+    buffer = SampleRingBuffer(capacity=10)
+    for i in range(10):
+        buffer.append(i * 0.5, i)
+
+    assert buffer.window(1.0)["value"].tolist() == [7, 8, 9]
+    assert len(SampleRingBuffer(capacity=2).window(1.0)) == 0
+
+    # window wrapping around the end of the ring
+    for i in range(10, 13):
+        buffer.append(i * 0.5, i)
+    assert buffer.window(2.0)["value"].tolist() == [8, 9, 10, 11, 12]
+    assert buffer.window(0.5)["value"].tolist() == [11, 12]
+    assert len(buffer.window(100)) == 10
+
+
+def test_ring_buffer_memory_mapped(tmp_path):
+    path = tmp_path / "samples.dat"
+    buffer = SampleRingBuffer(capacity=3, path=str(path))
+    for i in range(5):
+        buffer.append(float(i), i)
+    buffer.flush()
+
+    # samples are stored once
+    assert path.stat().st_size == 3 * SAMPLE_DTYPE.itemsize
+    assert buffer.latest()["value"].tolist() == [2, 3, 4]
+
+
+def test_ring_buffer_invalid_capacity():
+    with pytest.raises(ValueError):
+        SampleRingBuffer(capacity=0)
+
+
+def test_signal_statistics():
+    stats = signal_statistics([-4, 0, 4, 2], percentiles=(50,))
+
+    assert stats["count"] == 4
+    assert stats["mean"] == 0.5
+    assert stats["rms"] == pytest.approx(3.0)
+    assert stats["peak"] == 4
+    assert stats["min"] == -4
+    assert stats["max"] == 4
+    assert stats["percentiles"] == {50: 1.0}
+    assert signal_statistics([]) == {}
+
+
+class FakeClock:
+    """Clock that only moves when the test advances it."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    PollingScheduler.instance = None
+    clock = FakeClock()
+    with patch("pitop.pma.polling_scheduler.monotonic", clock), patch(
+        "pitop.pma.adc_recorder.time", clock
+    ):
+        yield clock
+    PollingScheduler().stop()
+    PollingScheduler.instance = None
+
+
+def test_adc_record(clock):
+    with patch("pitop.pma.adc_base.PlateInterface") as plate_interface_mock:
+        from pitop.pma.adc_base import ADCBase
+
+        device = plate_interface_mock.return_value.get_device_mcu.return_value
+        device.read_unsigned_word.side_effect = count()
+        adc = ADCBase("A1")
+
+        with adc.record(rate=100, duration=1) as recorder:
+            for i in range(1, 21):
+                clock.now += 0.01
+                start = monotonic()
+                while len(recorder.samples()) < i and monotonic() - start < 2:
+                    sleep(0.001)
+            # no sample is taken until the clock moves on
+            sleep(0.05)
+            assert recorder.deadline_misses == 0
+
+    assert not recorder.is_recording
+    samples = recorder.samples()
+    assert len(samples) == 20
+    assert np.diff(samples["timestamp"]) == pytest.approx(np.full(19, 0.01))
+    assert samples["value"].tolist() == list(range(20))
+    # reads the channel's data register
+    device.read_unsigned_word.assert_called_with(0x30 + adc.channel, little_endian=True)
+
+    stats = recorder.statistics(percentiles=(100,))
+    assert stats["max"] == 19
@@ -0,0 +1,191 @@
+import asyncio
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pitop.pma.async_plate_interface import AsyncPlateInterface, SupportsAsync
+
+
+@pytest.fixture
+def interface():
+    AsyncPlateInterface.instance = None
+    interface = AsyncPlateInterface()
+    yield interface
+    interface.close()
+    AsyncPlateInterface.instance = None
+
+
+def test_run_returns_result(interface):
+    async def main():
+        return await interface.run(lambda a, b=0: a + b, 1, b=2)
+
+    assert asyncio.run(main()) == 3
+
+
+def test_run_raises_exceptions_from_function(interface):
+    def fail():
+        raise IOError("bus error")
+
+    async def main():
+        await interface.run(fail)
+
+    with pytest.raises(IOError, match="bus error"):
+        asyncio.run(main())
+
+
+def test_operations_run_by_priority(interface):
+    order = []
+    unblock = Event()
+
+    async def main():
+        blocker = asyncio.ensure_future(interface.run(unblock.wait))
+        await asyncio.sleep(0.05)
+
+        jobs = [
+            asyncio.ensure_future(interface.run(order.append, name, priority=priority))
+            for name, priority in (
+                ("low", AsyncPlateInterface.PRIORITY_LOW),
+                ("normal_1", AsyncPlateInterface.PRIORITY_NORMAL),
+                ("high", AsyncPlateInterface.PRIORITY_HIGH),
+                ("normal_2", AsyncPlateInterface.PRIORITY_NORMAL),
+            )
+        ]
+        # let the jobs get queued before releasing the bus thread
+        await asyncio.sleep(0.05)
+        unblock.set()
+        await asyncio.gather(blocker, *jobs)
+
+    asyncio.run(main())
+    assert order == ["high", "normal_1", "normal_2", "low"]
+
+
+def test_operations_run_in_a_single_thread(interface):
+    from threading import get_ident
+
+    async def main():
+        return await asyncio.gather(*[interface.run(get_ident) for _ in range(20)])
+
+    assert len(set(asyncio.run(main()))) == 1
+
+
+def test_stream_yields_readings_at_frequency(interface):
+    read = MagicMock(side_effect=range(100))
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        readings = []
+        start = loop.time()
+        async for reading in interface.stream(read, hz=50):
+            readings.append(reading)
+            if len(readings) == 5:
+                break
+        return readings, loop.time() - start
+
+    readings, elapsed = asyncio.run(main())
+    assert readings == [0, 1, 2, 3, 4]
+    assert 0.07 <= elapsed < 0.5
+
+
+def test_stream_invalid_frequency(interface):
+    async def main():
+        async for _ in interface.stream(MagicMock(), hz=0):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(main())
+
+
+def test_component_async_readings(interface):
+    class Component(SupportsAsync):
+        value = 5
+        current_speed = 0.2
+
+    component = Component()
+
+    async def main():
+        value = await component.get_async()
+        speed = await component.get_async("current_speed")
+        readings = []
+        async for reading in component.stream(hz=100):
+            readings.append(reading)
+            if len(readings) == 2:
+                break
+        return value, speed, readings
+
+    assert asyncio.run(main()) == (5, 0.2, [5, 5])
+
+
+def test_component_default_async_attribute(interface):
+    class Motor(SupportsAsync):
+        async_attribute = "current_rpm"
+        current_rpm = 120
+
+    motor = Motor()
+
+    async def main():
+        readings = []
+        async for reading in motor.stream(hz=100):
+            readings.append(reading)
+            break
+        return await motor.get_async(), readings
+
+    assert asyncio.run(main()) == (120, [120])
+
+
+def test_components_default_async_attribute_exists():
+    from pitop.pma import IMU, EncoderMotor, UltrasonicSensor
+    from pitop.pma.adc_base import ADCBase
+
+    for component_class in (ADCBase, EncoderMotor, IMU, UltrasonicSensor):
+        assert hasattr(component_class, component_class.async_attribute)
+
+
+def test_adc_read_async(interface):
+    with patch("pitop.pma.adc_base.PlateInterface") as plate_interface_mock:
+        from pitop.pma.adc_base import ADCBase
+
+        device = plate_interface_mock.return_value.get_device_mcu.return_value
+        device.read_unsigned_word.side_effect = [10, 20, 30]
+        adc = ADCBase("A1", number_of_samples=3)
+
+        value = asyncio.run(adc.read_async(delay_between_samples=0))
+
+    assert value == 20
+    assert device.read_unsigned_word.call_count == 3
+
+
+def test_adc_stream_does_not_hold_the_bus_between_samples(interface):
+    order = []
+    first_sample = Event()
+
+    def read_sample(*args, **kwargs):
+        order.append("sample")
+        first_sample.set()
+        return 100
+
+    with patch("pitop.pma.adc_base.PlateInterface") as plate_interface_mock:
+        from pitop.pma import LightSensor
+
+        device = plate_interface_mock.return_value.get_device_mcu.return_value
+        device.read_unsigned_word.side_effect = read_sample
+        light_sensor = LightSensor("A1", number_of_samples=3)
+
+    async def main():
+        readings = light_sensor.stream(hz=50)
+        reading = asyncio.ensure_future(readings.__anext__())
+        while not first_sample.is_set():
+            await asyncio.sleep(0.001)
+
+        # the reading waits between its samples without holding the bus
+        # thread, so motor commands don't wait for the whole reading
+        await interface.run(
+            order.append, "motor", priority=AsyncPlateInterface.PRIORITY_HIGH
+        )
+        result = await reading
+        await readings.aclose()
+        return result, await light_sensor.get_async()
+
+    # light sensors read their "reading" asynchronously, not their binary value
+    assert asyncio.run(main()) == (100, 100)
+    assert order[:4] == ["sample", "motor", "sample", "sample"]
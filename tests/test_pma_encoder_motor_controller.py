@@ -8,7 +8,9 @@ from pitop.pma.common.encoder_motor_registers import (
     EncoderMotorM1,
     MotorControlModes,
     MotorControlRegisters,
+    MotorOdometerBlock,
     MotorRegisterTypes,
+    MotorTachometerBlock,
 )
 from pitop.pma.encoder_motor_controller import EncoderMotorController
 from pitop.pma.parameters import BrakingType
@@ -258,3 +260,44 @@ class EncoderMotorControllerTestCase(TestCase):
             read_n_unsigned_bytes_mock.assert_called_with(
                 mode_1_register, 4, little_endian=True
             )
+
+    def test_tachometer_and_odometer_read_from_shared_snapshot(self):
+        """Tachometer and odometer values are decoded from register block
+        snapshots shared by all ports."""
+        tachometer_values = {"M0": 10, "M1": -20, "M2": 30, "M3": -40}
+        odometer_values = {"M0": 1000, "M1": -2000, "M2": 3000, "M3": -4000}
+
+        for motor_port_registers in MotorControlRegisters:
+            motor_port_name = motor_port_registers.name
+            controller = EncoderMotorController(port=motor_port_name)
+            read_snapshot_mock = controller._plate_interface.read_snapshot = MagicMock()
+            read_snapshot_mock.side_effect = lambda block, max_age=0.0: (
+                tachometer_values if block is MotorTachometerBlock else odometer_values
+            )
+
+            self.assertEqual(
+                controller.tachometer(), tachometer_values[motor_port_name]
+            )
+            self.assertEqual(controller.odometer(), odometer_values[motor_port_name])
+
+    def test_tachometer_rereads_out_of_range_values(self):
+        """Tachometer values out of the valid RPM range are discarded."""
+        controller = EncoderMotorController(port="M0")
+        read_snapshot_mock = controller._plate_interface.read_snapshot = MagicMock()
+        read_snapshot_mock.side_effect = [{"M0": 30000}, {"M0": 500}]
+
+        self.assertEqual(controller.tachometer(), 500)
+        read_snapshot_mock.assert_called_with(MotorTachometerBlock)
+
+    def test_register_blocks_match_register_map(self):
+        """Register blocks start at the M0 register and cover all ports."""
+        self.assertEqual(
+            MotorTachometerBlock.start_address,
+            MotorControlRegisters.M0.value[MotorRegisterTypes.TACHOMETER],
+        )
+        self.assertEqual(MotorTachometerBlock.size, 2 * len(MotorControlRegisters))
+        self.assertEqual(
+            MotorOdometerBlock.start_address,
+            MotorControlRegisters.M0.value[MotorRegisterTypes.ODOMETER],
+        )
+        self.assertEqual(MotorOdometerBlock.size, 4 * len(MotorControlRegisters))
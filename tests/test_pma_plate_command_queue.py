@@ -0,0 +1,143 @@
+from time import sleep
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from pitop.pma.plate_command_queue import PlateCommandQueue, RegisterWrite
+
+
+@pytest.fixture
+def device():
+    return MagicMock()
+
+
+@pytest.fixture
+def command_queue(device):
+    command_queue = PlateCommandQueue(lambda: device)
+    yield command_queue
+    command_queue.cleanup()
+
+
+def test_commands_are_written_immediately_by_default(command_queue, device):
+    command_queue.submit(
+        "M0",
+        [
+            RegisterWrite("write_byte", 0x60, 1),
+            RegisterWrite("write_word", 0x68, 500, signed=True, little_endian=True),
+        ],
+    )
+
+    assert device.method_calls == [
+        call.write_byte(0x60, 1),
+        call.write_word(0x68, 500, signed=True, little_endian=True),
+    ]
+    assert command_queue.transaction_count == 2
+
+
+def test_repeated_values_are_written(command_queue, device):
+    # the MCU's registers can change behind the queue's back, e.g. after a
+    # reset, so the control mode is written with every setpoint
+    for rpm in (100, 200):
+        command_queue.submit(
+            "M0",
+            [
+                RegisterWrite("write_byte", 0x60, 1),
+                RegisterWrite("write_word", 0x68, rpm),
+            ],
+        )
+
+    assert device.method_calls == [
+        call.write_byte(0x60, 1),
+        call.write_word(0x68, 100),
+        call.write_byte(0x60, 1),
+        call.write_word(0x68, 200),
+    ]
+    assert command_queue.transaction_count == 4
+
+
+def test_batched_commands_keep_latest_per_key(command_queue, device):
+    with patch("pitop.pma.plate_command_queue.Thread"):
+        command_queue.flush_interval = 0.05
+
+    for rpm in (100, 200, 300):
+        command_queue.submit("M0", [RegisterWrite("write_word", 0x68, rpm)])
+    command_queue.submit("S0", [RegisterWrite("write_n_bytes", 0x5C, [1, 2, 3, 4])])
+    command_queue.submit("M0", [RegisterWrite("write_word", 0x68, 400)])
+
+    device.write_word.assert_not_called()
+
+    command_queue.flush()
+
+    assert device.method_calls == [
+        call.write_n_bytes(0x5C, [1, 2, 3, 4]),
+        call.write_word(0x68, 400),
+    ]
+    assert command_queue.transaction_count == 2
+    assert command_queue.coalesced_count == 3
+
+
+def test_batched_commands_are_flushed_in_background(command_queue, device):
+    command_queue.flush_interval = 0.01
+    command_queue.submit("M0", [RegisterWrite("write_word", 0x68, 100)])
+
+    command_queue.cleanup()
+
+    device.write_word.assert_called_once_with(0x68, 100)
+
+
+def test_cleanup_keeps_flush_interval(command_queue, device):
+    command_queue.flush_interval = 0.01
+    command_queue.cleanup()
+    assert command_queue.flush_interval == 0.01
+
+    # batching resumes with the next command
+    with patch.object(command_queue, "flush") as flush_mock:
+        command_queue.submit("M0", [RegisterWrite("write_word", 0x68, 200)])
+        device.write_word.assert_not_called()
+        sleep(0.1)
+        flush_mock.assert_called()
+
+
+def test_grouped_commands_are_submitted_as_one(command_queue, device):
+    with patch("pitop.pma.plate_command_queue.Thread"):
+        command_queue.flush_interval = 0.05
+
+    for rpm in (100, 200):
+        with command_queue.group("drive"):
+            command_queue.submit("sync", [RegisterWrite("write_byte", 0x57, 9)])
+            command_queue.submit("M0", [RegisterWrite("write_word", 0x68, rpm)])
+            command_queue.submit("sync", [RegisterWrite("write_byte", 0x57, 0)])
+
+    command_queue.flush()
+
+    assert device.method_calls == [
+        call.write_byte(0x57, 9),
+        call.write_word(0x68, 200),
+        call.write_byte(0x57, 0),
+    ]
+    assert command_queue.coalesced_count == 3
+
+
+def test_group_is_not_submitted_on_error(command_queue, device):
+    with pytest.raises(ValueError):
+        with command_queue.group("drive"):
+            command_queue.submit("sync", [RegisterWrite("write_byte", 0x57, 9)])
+            raise ValueError
+
+    device.write_byte.assert_not_called()
+
+    command_queue.submit("sync", [RegisterWrite("write_byte", 0x57, 0)])
+    device.write_byte.assert_called_once_with(0x57, 0)
+
+
+def test_post_write_delay(command_queue, device):
+    with patch("pitop.pma.plate_command_queue.sleep") as sleep_mock:
+        command_queue.submit(
+            "sync", [RegisterWrite("write_byte", 0x58, 1, post_write_delay=0.02)]
+        )
+        sleep_mock.assert_called_once_with(0.02)
+
+
+def test_invalid_flush_interval(command_queue):
+    with pytest.raises(ValueError):
+        command_queue.flush_interval = 0
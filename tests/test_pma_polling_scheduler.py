@@ -0,0 +1,160 @@
+from threading import Event
+from time import monotonic, sleep
+from unittest.mock import MagicMock
+
+import pytest
+
+from pitop.pma.polling_scheduler import PollingScheduler, PollingTask
+from tests.utils import wait_until
+
+
+@pytest.fixture
+def scheduler():
+    PollingScheduler.instance = None
+    scheduler = PollingScheduler()
+    yield scheduler
+    scheduler.stop()
+    PollingScheduler.instance = None
+
+
+def test_task_runs_at_rate(scheduler):
+    callback = MagicMock()
+    start = monotonic()
+    task = scheduler.register(callback, rate=50)
+
+    # missed runs are skipped rather than queued, so a loaded machine takes
+    # longer to run them, but never runs more than the rate allows
+    wait_until(lambda: callback.call_count >= 4)
+    task.cancel(wait=True)
+    elapsed = monotonic() - start
+
+    assert 4 <= callback.call_count <= int(elapsed * 50) + 1
+    assert task.runs == callback.call_count
+
+
+def test_cancelled_task_stops_running(scheduler):
+    callback = MagicMock()
+    task = scheduler.register(callback, rate=100)
+    sleep(0.05)
+    task.cancel(wait=True)
+    calls = callback.call_count
+
+    sleep(0.05)
+    assert callback.call_count == calls
+    assert task not in scheduler.tasks
+
+
+def test_cancel_can_wait_for_running_task(scheduler):
+    started = Event()
+    finished = Event()
+
+    def callback():
+        started.set()
+        sleep(0.1)
+        finished.set()
+
+    task = scheduler.register(callback, rate=100)
+    assert started.wait(2)
+    task.cancel(wait=True)
+
+    assert finished.is_set()
+
+
+def test_task_can_cancel_itself_and_wait(scheduler):
+    cancelled = Event()
+
+    def callback():
+        task.cancel(wait=True)
+        cancelled.set()
+
+    task = scheduler.register(callback, rate=100)
+
+    assert cancelled.wait(2)
+    assert task not in scheduler.tasks
+
+
+def test_stop_cancels_tasks_and_ends_thread(scheduler):
+    callback = MagicMock()
+    task = scheduler.register(callback, rate=100)
+    sleep(0.05)
+
+    scheduler.stop()
+    calls = callback.call_count
+    sleep(0.05)
+
+    assert callback.call_count == calls
+    assert not task.active
+    assert scheduler.tasks == []
+
+    # registering a task again starts a new thread
+    restarted = Event()
+    scheduler.register(restarted.set, rate=100)
+    assert restarted.wait(2)
+
+
+def test_due_tasks_run_by_priority_and_grouped_by_device(scheduler):
+    order = []
+    done = Event()
+    device_a = object()
+    device_b = object()
+
+    def record(name):
+        def callback():
+            order.append(name)
+            if len(order) == 4:
+                done.set()
+
+        return callback
+
+    block = Event()
+    blocker = scheduler.register(block.wait, rate=100, priority=-1)
+    sleep(0.015)
+
+    # registered while the scheduler is busy, so they're all due together
+    tasks = [
+        scheduler.register(record("b_low"), rate=100, priority=5, device=device_b),
+        scheduler.register(record("a_low"), rate=100, priority=9, device=device_a),
+        scheduler.register(record("a_high"), rate=100, priority=0, device=device_a),
+        scheduler.register(record("b_high"), rate=100, priority=1, device=device_b),
+    ]
+    blocker.cancel()
+    sleep(0.02)
+    block.set()
+
+    assert done.wait(1)
+    for task in tasks:
+        task.cancel()
+    assert order[:4] == ["a_high", "a_low", "b_high", "b_low"]
+
+
+def test_deadline_misses_are_reported(scheduler):
+    on_deadline_miss = MagicMock()
+    scheduler.on_deadline_miss = on_deadline_miss
+
+    task = scheduler.register(lambda: sleep(0.035), rate=100)
+    sleep(0.1)
+    task.cancel(wait=True)
+
+    assert task.deadline_misses > 0
+    assert scheduler.deadline_misses == task.deadline_misses
+    missed_task, lateness = on_deadline_miss.call_args.args
+    assert missed_task is task
+    # missed runs are skipped rather than run in a burst
+    assert task.runs <= 4
+
+
+def test_errors_in_callbacks_dont_stop_the_task(scheduler):
+    callback = MagicMock(side_effect=Exception("read error"))
+    task = scheduler.register(callback, rate=100)
+    sleep(0.05)
+    task.cancel(wait=True)
+
+    assert callback.call_count > 1
+
+
+def test_invalid_task():
+    with pytest.raises(ValueError):
+        PollingTask(MagicMock(), rate=0)
+
+    with pytest.raises(AttributeError):
+        PollingTask("not a function", rate=1)
@@ -1,7 +1,11 @@
+from threading import Event
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
+from pitop.pma.polling_scheduler import PollingScheduler
 from pitop.pma.ultrasonic_sensor import UltrasonicSensor
+from pitop.pma.ultrasonic_sensor_base import UltrasonicSensorMCU
+from tests.utils import wait_until
 
 
 class UltrasonicSensorRPIMock(Mock):
@@ -37,3 +41,49 @@ class UltrasonicSensorTestCase(TestCase):
             ultrasonic_sensor = UltrasonicSensor(port)
             ultrasonic_sensor.threshold_distance = new_value
             self.assertEqual(new_value, ultrasonic_sensor.threshold_distance)
+
+
+def test_blocking_callback_does_not_delay_other_polling_tasks():
+    PollingScheduler.instance = None
+    scheduler = PollingScheduler()
+    heartbeat = scheduler.register(MagicMock(), rate=50, priority=-100)
+
+    device = MagicMock()
+    # 10 cm away, in range of the sensor
+    device.read_unsigned_word.return_value = 10
+    callback_started = Event()
+    release_callback = Event()
+
+    def blocking_callback():
+        callback_started.set()
+        release_callback.wait()
+
+    with patch("pitop.pma.ultrasonic_sensor_base.PlateInterface") as plate_mock, patch(
+        "pitop.pma.ultrasonic_sensor_base.CompatibilityCheck"
+    ):
+        plate_mock.return_value.get_device_mcu.return_value = device
+        sensor = UltrasonicSensorMCU(
+            "A1",
+            queue_len=1,
+            max_distance=3,
+            threshold_distance=0.3,
+            partial=True,
+            name="ultrasonic",
+        )
+    sensor.when_deactivated = blocking_callback
+
+    try:
+        assert callback_started.wait(timeout=5)
+        # the heartbeat and the sensor's reads go on while the callback blocks
+        heartbeat_runs = heartbeat.runs
+        read_runs = sensor._read_task.runs
+        wait_until(
+            lambda: heartbeat.runs >= heartbeat_runs + 10
+            and sensor._read_task.runs >= read_runs + 2
+        )
+        assert not release_callback.is_set()
+    finally:
+        release_callback.set()
+        sensor.close()
+        scheduler.stop()
+        PollingScheduler.instance = None
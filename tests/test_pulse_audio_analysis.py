@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from pitop.pulse.audio_analysis import AudioAnalyser
+
+SAMPLE_RATE = 22050
+
+
+def sine(frequency, amplitude, length):
+    t = np.arange(length) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def analyse(samples, chunk_size=None, **kwargs):
+    results = []
+    analyser = AudioAnalyser(results.append, sample_rate=SAMPLE_RATE, **kwargs)
+    chunk_size = chunk_size or len(samples)
+    for start in range(0, len(samples), chunk_size):
+        analyser.process(samples[start : start + chunk_size])
+    return results
+
+
+def test_features_of_sine_wave():
+    features = analyse(sine(1500, 0.5, 2048))[-1]
+
+    assert features.rms == pytest.approx(0.5 / np.sqrt(2), rel=0.01)
+    assert features.peak == pytest.approx(0.5, rel=0.01)
+    assert features.zero_crossing_rate == pytest.approx(
+        2 * 1500 / SAMPLE_RATE, rel=0.05
+    )
+    # 1.5kHz is in the 1-2kHz band
+    assert np.argmax(features.band_energies) == 4
+    assert len(features.band_energies) == 7
+    assert np.sum(features.band_energies) == pytest.approx(features.rms**2, rel=0.05)
+
+
+def test_features_are_computed_every_hop():
+    results = analyse(sine(440, 0.5, 4096), window_size=1024, hop_size=512)
+
+    assert len(results) == 7
+    assert [features.time for features in results] == pytest.approx(
+        [(1024 + 512 * i) / SAMPLE_RATE for i in range(7)]
+    )
+
+
+def test_features_dont_depend_on_size_of_frames():
+    samples = sine(440, 0.5, 4096) + sine(3000, 0.2, 4096)
+
+    whole = analyse(samples, hop_size=300)
+    chunked = analyse(samples, chunk_size=97, hop_size=300)
+
+    assert len(whole) == len(chunked)
+    for features, chunked_features in zip(whole, chunked):
+        assert chunked_features.rms == pytest.approx(features.rms)
+        assert chunked_features.zero_crossing_rate == features.zero_crossing_rate
+        assert chunked_features.band_energies == pytest.approx(features.band_energies)
+
+
+def test_microphone_samples_are_scaled_to_full_scale():
+    silence = analyse(np.full(1024, 128, dtype=np.uint8))[-1]
+    assert silence.rms == 0
+    assert silence.peak == 0
+
+    loudest = analyse(np.full(1024, -32768, dtype=np.int16))[-1]
+    assert loudest.rms == pytest.approx(1)
+    assert loudest.peak == pytest.approx(1)
+
+
+def test_last_features_are_kept():
+    analyser = AudioAnalyser(sample_rate=SAMPLE_RATE)
+    assert analyser.features is None
+
+    analyser.process(sine(440, 0.5, 1024))
+    assert analyser.features.rms > 0
+
+    analyser.reset()
+    assert analyser.features is None
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        AudioAnalyser(window_size=512, hop_size=1024)
+    with pytest.raises(ValueError):
+        AudioAnalyser(band_edges=(1000, 500))
+    with pytest.raises(ValueError):
+        AudioAnalyser(window_size=64, band_edges=(100, 110))
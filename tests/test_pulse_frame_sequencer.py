@@ -0,0 +1,138 @@
+from time import monotonic, sleep
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+FPS = 32
+
+
+class FakeClock:
+    """Clock that moves on by `show_time` seconds every time a frame is
+    shown, so that frames are shown on time without any real waiting.
+    Times are exact binary fractions, so frame indices don't depend on
+    rounding."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.show_time = 1 / FPS
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    with patch("pitop.pulse.frame_sequencer.monotonic", clock):
+        yield clock
+
+
+@pytest.fixture
+def shown_frames(clock):
+    from pitop.pulse import ledmatrix
+
+    shown = []
+
+    def show():
+        clock.now += clock.show_time
+
+    with patch.object(
+        ledmatrix,
+        "set_frame",
+        side_effect=lambda frame: shown.append(int(frame[0, 0, 0])),
+    ), patch.object(ledmatrix, "show", side_effect=show):
+        yield shown
+
+
+@pytest.fixture
+def sequencer(shown_frames):
+    from pitop.pulse.frame_sequencer import FrameSequencer
+
+    sequencer = FrameSequencer(fps=FPS)
+    yield sequencer
+    sequencer.stop()
+
+
+def frames(*values):
+    sequence = np.zeros((len(values), 7, 7, 3), dtype=np.uint8)
+    for i, value in enumerate(values):
+        sequence[i] = value
+    return sequence
+
+
+def wait_for_frames(shown_frames, count):
+    start = monotonic()
+    while len(shown_frames) < count and monotonic() - start < 5:
+        sleep(0.001)
+
+
+def test_queued_sequences_are_played_in_order(sequencer, shown_frames):
+    sequencer.queue(frames(1, 2, 3))
+    sequencer.queue(frames(4, 5))
+
+    assert sequencer.wait(timeout=5)
+    assert shown_frames == [1, 2, 3, 4, 5]
+    assert sequencer.frames_shown == 5
+    assert sequencer.frames_skipped == 0
+    assert not sequencer.is_playing
+    assert sequencer.fps == pytest.approx(FPS)
+
+
+def test_late_frames_are_skipped(clock, sequencer, shown_frames):
+    # showing a frame takes 2.5 frames' time
+    clock.show_time = 2.5 / FPS
+    sequencer.queue(frames(*range(10)))
+
+    assert sequencer.wait(timeout=5)
+    assert shown_frames == [0, 2, 5, 7]
+    assert sequencer.frames_shown == 4
+    assert sequencer.frames_skipped == 6
+
+
+def test_looping_sequence_plays_until_another_is_queued(sequencer, shown_frames):
+    sequencer.queue(frames(1, 2), loop=True)
+    wait_for_frames(shown_frames, 4)
+    assert not sequencer.wait(timeout=0)
+
+    sequencer.queue(frames(3))
+
+    assert sequencer.wait(timeout=5)
+    assert shown_frames[:4] == [1, 2, 1, 2]
+    assert shown_frames[-1] == 3
+    assert 3 not in shown_frames[:-1]
+
+
+def test_play_replaces_queued_sequences(sequencer, shown_frames):
+    sequencer.queue(frames(1, 1, 1), fps=1)
+    sequencer.queue(frames(2))
+
+    sequencer.play(frames(3))
+
+    assert sequencer.wait(timeout=5)
+    assert 2 not in shown_frames
+    assert shown_frames[-1] == 3
+
+
+def test_clear_stops_playing(sequencer, shown_frames):
+    sequencer.queue(frames(1), loop=True)
+    wait_for_frames(shown_frames, 1)
+
+    sequencer.clear()
+
+    assert sequencer.wait(timeout=5)
+    assert shown_frames
+
+
+def test_invalid_sequences_are_rejected(sequencer):
+    with pytest.raises(ValueError):
+        sequencer.queue(frames(1), fps=100)
+    with pytest.raises(ValueError):
+        sequencer.queue(np.zeros((1, 8, 8, 3)))
+
+
+def test_queue_fails_after_stop(sequencer):
+    sequencer.stop()
+
+    with pytest.raises(RuntimeError):
+        sequencer.queue(frames(1))
@@ -0,0 +1,148 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def ledmatrix():
+    from pitop.pulse import ledmatrix
+
+    sent = []
+    serial_device = MagicMock()
+    serial_device.write.side_effect = lambda data: sent.append(list(data))
+
+    with patch.object(
+        ledmatrix, "_serial_device", serial_device, create=True
+    ), patch.object(ledmatrix, "_initialised", True), patch.object(
+        ledmatrix, "_last_sent_frame", None
+    ), patch.object(
+        ledmatrix, "sleep"
+    ):
+        ledmatrix.clear()
+        ledmatrix.rotation(0)
+        ledmatrix.brightness(1.0)
+        ledmatrix.sent = sent
+        yield ledmatrix
+
+    ledmatrix.clear()
+    ledmatrix.rotation(0)
+    ledmatrix.brightness(1.0)
+
+
+def column(x, leds=(), ambient=(0, 0)):
+    data = [x] + [0] * 16
+    for y, (byte0, byte1) in leds:
+        data[1 + 2 * y] = byte0
+        data[2 + 2 * y] = byte1
+    data[15], data[16] = ambient
+    return data
+
+
+def test_show_sends_sync_then_each_column(ledmatrix):
+    ledmatrix.set_pixel(1, 2, 255, 0, 0)
+    ledmatrix.show()
+
+    assert ledmatrix.sent[0] == list(ledmatrix._sync)
+    assert ledmatrix.sent[1:] == [
+        column(x, leds=[(4, (31, 0))] if x == 1 else []) for x in range(7)
+    ]
+
+
+def test_show_rotates_pixel_map(ledmatrix):
+    ledmatrix.rotation(90)
+    ledmatrix.set_pixel(1, 2, 255, 0, 0)
+    ledmatrix.show()
+
+    assert ledmatrix.sent[1:] == [
+        column(x, leds=[(1, (31, 0))] if x == 2 else []) for x in range(7)
+    ]
+
+
+def test_show_sends_average_color_as_ambient_light(ledmatrix):
+    ledmatrix.set_all(0, 255, 0)
+    ledmatrix.show()
+
+    # green is split across both bytes
+    assert ledmatrix.sent[1] == [0] + [0x60, 0xE0] * 8
+
+
+def test_set_all_corrects_brightness_and_gamma(ledmatrix):
+    ledmatrix.brightness(0.5)
+    ledmatrix.set_all(255, 255, 255)
+
+    assert ledmatrix.get_pixel(0, 0) == [37, 37, 37]
+    assert ledmatrix.get_pixel(6, 6) == [37, 37, 37]
+
+
+def test_set_pixel_uses_brightness_at_time_of_call(ledmatrix):
+    ledmatrix.set_pixel(0, 0, 255, 128, 0)
+    ledmatrix.brightness(0.5)
+    ledmatrix.set_pixel(1, 0, 255, 128, 0)
+
+    assert ledmatrix.get_pixel(0, 0) == [255, 37, 0]
+    assert ledmatrix.get_pixel(1, 0) == [37, 5, 0]
+
+
+def test_flip(ledmatrix):
+    ledmatrix.set_pixel(1, 2, 255, 255, 255)
+
+    ledmatrix.flip_h()
+    assert ledmatrix.get_pixel(1, 4) == [255, 255, 255]
+
+    ledmatrix.flip_v()
+    assert ledmatrix.get_pixel(5, 4) == [255, 255, 255]
+    assert ledmatrix.get_pixel(1, 2) == [0, 0, 0]
+
+
+def test_show_only_sends_changed_columns(ledmatrix):
+    ledmatrix.show()
+    ledmatrix.sent.clear()
+
+    ledmatrix.show()
+    assert ledmatrix.sent == []
+
+    ledmatrix.set_pixel(1, 2, 255, 0, 0)
+    ledmatrix.show()
+    assert ledmatrix.sent == [list(ledmatrix._sync), column(1, leds=[(4, (31, 0))])]
+
+
+def test_show_sends_all_columns_when_ambient_light_changes(ledmatrix):
+    ledmatrix.show()
+    ledmatrix.sent.clear()
+
+    ledmatrix.set_all(255, 0, 0)
+    ledmatrix.show()
+
+    assert len(ledmatrix.sent) == 8
+    assert [data[0] for data in ledmatrix.sent[1:]] == list(range(7))
+
+
+def test_set_frame(ledmatrix):
+    frame = np.zeros((7, 7, 3), dtype=np.uint8)
+    frame[2, 1] = (255, 128, 0)
+    ledmatrix.brightness(0.5)
+
+    ledmatrix.set_frame(frame)
+
+    assert ledmatrix.get_pixel(1, 2) == [37, 5, 0]
+    assert ledmatrix.get_pixel(0, 0) == [0, 0, 0]
+
+
+def test_set_frame_fails_with_wrong_shape(ledmatrix):
+    with pytest.raises(ValueError):
+        ledmatrix.set_frame(np.zeros((7, 7)))
+
+
+def test_show_sends_only_changed_columns_when_average_color_is_unchanged(ledmatrix):
+    ledmatrix.set_all(0, 0, 255)
+    ledmatrix.set_pixel(1, 2, 255, 0, 0)
+    ledmatrix.show()
+    ledmatrix.sent.clear()
+
+    # moving a pixel keeps the average color of the matrix
+    ledmatrix.set_pixel(1, 2, 0, 0, 255)
+    ledmatrix.set_pixel(4, 2, 255, 0, 0)
+    ledmatrix.show()
+
+    assert [data[0] for data in ledmatrix.sent[1:]] == [1, 4]
@@ -0,0 +1,116 @@
+import wave
+from os.path import exists
+from threading import Event
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+AUDIO_DATA = bytes(range(256)) * 20
+
+
+class FakeSerial:
+    """Serial port that returns a fixed amount of audio data, in blocks of
+    at most 1000 bytes, then waits for its read timeout."""
+
+    def __init__(self, data, *args, **kwargs):
+        self.data = data
+        self.finished = Event()
+
+    def isOpen(self):
+        return True
+
+    def inWaiting(self):
+        return 0
+
+    def read(self, size):
+        block_size = min(size, 1000)
+        block, self.data = self.data[:block_size], self.data[block_size:]
+        if not block:
+            self.finished.set()
+            self.finished.wait(0.01)
+        return block
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def microphone():
+    from pitop.pulse import microphone
+
+    serial_device = FakeSerial(AUDIO_DATA)
+    with patch.object(
+        microphone.serial, "Serial", return_value=serial_device
+    ), patch.object(
+        microphone.path,
+        "exists",
+        side_effect=lambda file_path: file_path == "/dev/serial0" or exists(file_path),
+    ), patch.object(
+        microphone.configuration, "mcu_enabled", return_value=True
+    ), patch.object(
+        microphone.configuration,
+        "microphone_sample_rate_is_22khz",
+        return_value=True,
+    ):
+        microphone.serial_device = serial_device
+        yield microphone
+
+    microphone.set_bit_rate_to_unsigned_8()
+
+
+def record_all(microphone, **kwargs):
+    microphone.record(**kwargs)
+    assert microphone.serial_device.finished.wait(5)
+    microphone.stop()
+
+
+def test_record_8_bit(microphone, tmp_path):
+    microphone.set_bit_rate_to_unsigned_8()
+    record_all(microphone)
+    microphone.save(str(tmp_path / "audio.wav"))
+
+    with wave.open(str(tmp_path / "audio.wav"), "rb") as wav_file:
+        assert wav_file.getnchannels() == 1
+        assert wav_file.getsampwidth() == 1
+        assert wav_file.getframerate() == 22050
+        assert wav_file.readframes(wav_file.getnframes()) == AUDIO_DATA
+
+
+def test_record_16_bit(microphone, tmp_path):
+    microphone.set_bit_rate_to_signed_16()
+    record_all(microphone)
+    microphone.save(str(tmp_path / "audio.wav"))
+
+    with wave.open(str(tmp_path / "audio.wav"), "rb") as wav_file:
+        assert wav_file.getsampwidth() == 2
+        samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype="<i2")
+
+    assert len(samples) == len(AUDIO_DATA)
+    assert samples[:3].tolist() == [-32768, -32512, -32256]
+    assert samples[128] == 0
+    assert samples[255] == 32512
+
+
+def test_record_calls_frame_callback_with_fixed_size_frames(microphone):
+    frames = []
+
+    record_all(microphone, frame_callback=frames.append, frame_size=300)
+
+    assert all(frame.shape == (300,) for frame in frames)
+    assert len(frames) == len(AUDIO_DATA) // 300
+    assert np.concatenate(frames).tobytes() == AUDIO_DATA[: len(frames) * 300]
+
+
+def test_stream_yields_frames_until_closed(microphone):
+    microphone.set_bit_rate_to_signed_16()
+    audio_stream = microphone.stream(frame_size=256)
+
+    frames = [next(audio_stream) for _ in range(3)]
+    assert microphone.is_recording()
+    audio_stream.close()
+
+    assert not microphone.is_recording()
+    for frame in frames:
+        assert frame.dtype == np.int16
+        assert frame.tolist() == [(value - 128) << 8 for value in range(256)]
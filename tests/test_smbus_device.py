@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pitop.common.smbus_device import RegisterBlock, SMBusDevice
+
+
+def test_register_block_decodes_fields():
+    block = RegisterBlock(0x10, [("a", "h"), ("b", "H"), ("c", "hh"), ("d", "i")])
+
+    assert block.start_address == 0x10
+    assert block.size == 12
+
+    data = bytes(
+        [0xFF, 0xFF, 0x01, 0x02, 0x0A, 0x00, 0xF6, 0xFF, 0x00, 0x00, 0x01, 0x00]
+    )
+    assert block.decode(data) == {"a": -1, "b": 0x0201, "c": (10, -10), "d": 0x10000}
+
+
+def test_register_block_big_endian():
+    block = RegisterBlock(0x10, [("a", "h")], little_endian=False)
+    assert block.decode(bytes([0x01, 0x02])) == {"a": 0x0102}
+
+
+def test_register_block_from_registers_orders_by_address():
+    block = RegisterBlock.from_registers({"y": 0x21, "x": 0x20, "z": 0x22}, "h")
+
+    assert block.start_address == 0x20
+    assert block.decode(bytes([1, 0, 2, 0, 3, 0])) == {"x": 1, "y": 2, "z": 3}
+
+
+def test_register_block_from_registers_fails_on_gaps():
+    with pytest.raises(ValueError):
+        RegisterBlock.from_registers({"x": 0x20, "y": 0x22}, "h")
+
+
+def test_register_block_fails_if_too_large_for_smbus():
+    with pytest.raises(ValueError):
+        RegisterBlock(0x00, [(i, "i") for i in range(9)])
+
+
+def test_read_snapshot_uses_a_single_block_read():
+    device = SMBusDevice(1, 0x04)
+    device._bus = MagicMock()
+    device._bus.read_i2c_block_data.return_value = [0x02, 0x00, 0xFE, 0xFF]
+
+    block = RegisterBlock(0x80, [("x", "h"), ("y", "h")])
+
+    assert device.read_snapshot(block) == {"x": 2, "y": -2}
+    device._bus.read_i2c_block_data.assert_called_once_with(0x04, 0x80, 4)
+
+
+def test_read_snapshot_returns_none_on_incomplete_read():
+    device = SMBusDevice(1, 0x04)
+    device._bus = MagicMock()
+    device._bus.read_i2c_block_data.return_value = [0x02, 0x00]
+
+    block = RegisterBlock(0x80, [("x", "h"), ("y", "h")])
+
+    assert device.read_snapshot(block) is None